@@ -6,12 +6,13 @@ Provides Elite creators with direct API access to ARRIS capabilities:
 - API key generation and management
 - Direct text analysis and insights
 - Batch processing
+- Streaming chat (Server-Sent Events)
 - Usage tracking and rate limiting
 - Webhook integration for async results
 
 Features:
 - Secure API key with prefix (arris_live_, arris_test_)
-- Rate limiting: 1000 requests/day, 100 requests/hour
+- Rate limiting: 1000 requests/day, 100 requests/hour (sliding windows, shared across workers)
 - Usage analytics and quota tracking
 - Multiple API keys per creator
 - Key rotation and revocation
@@ -19,15 +20,25 @@ Features:
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from enum import Enum
 import logging
 import secrets
 import hashlib
 import json
+import asyncio
+
+from rate_limiter import RateLimiter, create_rate_limiter
+from index_registry import index_registry
 
 logger = logging.getLogger(__name__)
 
+index_registry.register("arris_api_keys", "key_hash", unique=True, owner="arris_api")
+index_registry.register("arris_api_keys", "id", unique=True, owner="arris_api")
+index_registry.register("arris_api_keys", [("creator_id", 1), ("status", 1)], owner="arris_api")
+index_registry.register_query("arris_api_keys", {"key_hash": "0" * 64}, owner="arris_api")
+index_registry.register_query("arris_api_keys", {"creator_id": "CR-1", "status": "active"}, owner="arris_api")
+
 
 class ApiKeyType(str, Enum):
     LIVE = "live"
@@ -56,6 +67,23 @@ RATE_LIMITS = {
     "max_concurrent_requests": 5,
 }
 
+# Concurrent LLM calls per batch request, by subscription tier
+BATCH_CONCURRENCY = {
+    "elite": 5,
+    "premium": 3,
+    "pro": 2,
+    "default": 2,
+}
+
+# Per-item timeout for batch analysis (seconds)
+BATCH_ITEM_TIMEOUT_SECONDS = 60
+
+# Sliding windows enforced per API key: (name, limit, seconds)
+RATE_LIMIT_WINDOWS = [
+    ("hour", RATE_LIMITS["requests_per_hour"], 3600),
+    ("day", RATE_LIMITS["requests_per_day"], 86400),
+]
+
 # Available API capabilities
 API_CAPABILITIES = [
     {
@@ -102,10 +130,19 @@ class ArrisApiService:
     Provides API key management, rate limiting, and direct AI access.
     """
 
-    def __init__(self, db: AsyncIOMotorDatabase, arris_service=None, persona_service=None):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        arris_service=None,
+        persona_service=None,
+        rate_limiter: Optional[RateLimiter] = None,
+        feature_gating=None
+    ):
         self.db = db
         self.arris_service = arris_service
         self.persona_service = persona_service
+        self.feature_gating = feature_gating
+        self.rate_limiter = rate_limiter or create_rate_limiter(db)
 
     # ============== API KEY MANAGEMENT ==============
 
@@ -155,10 +192,7 @@ class ArrisApiService:
             "created_at": now.isoformat(),
             "expires_at": expires_at.isoformat(),
             "last_used_at": None,
-            "usage_count": 0,
-            "daily_usage": 0,
-            "hourly_usage": 0,
-            "last_usage_reset": now.isoformat()
+            "usage_count": 0
         }
         
         await self.db.arris_api_keys.insert_one(key_doc)
@@ -241,10 +275,10 @@ class ArrisApiService:
             name=existing.get("name", "Regenerated Key")
         )
 
-    async def validate_api_key(self, api_key: str) -> Dict[str, Any]:
+    async def validate_api_key(self, api_key: str, cost: int = 1) -> Dict[str, Any]:
         """
         Validate an API key and return creator info if valid.
-        Also checks rate limits.
+        Also checks and consumes `cost` units of the key's rate limits.
         """
         # Hash the provided key
         key_hash = hashlib.sha256(api_key.encode()).hexdigest()
@@ -273,83 +307,61 @@ class ArrisApiService:
             return {"valid": False, "error": "API key has expired"}
         
         # Check rate limits
-        rate_check = await self._check_rate_limits(key_doc)
+        rate_check = await self._check_rate_limits(key_doc, cost)
         if not rate_check["allowed"]:
             return {
                 "valid": False,
                 "error": rate_check["error"],
                 "rate_limited": True,
-                "retry_after": rate_check.get("retry_after")
+                "retry_after": rate_check.get("retry_after"),
+                "rate_limit_headers": rate_check["headers"]
             }
         
+        windows = rate_check["windows"]
         return {
             "valid": True,
             "creator_id": key_doc["creator_id"],
             "key_id": key_doc["id"],
             "key_type": key_doc["key_type"],
             "rate_limits": {
-                "hourly_remaining": RATE_LIMITS["requests_per_hour"] - key_doc.get("hourly_usage", 0),
-                "daily_remaining": RATE_LIMITS["requests_per_day"] - key_doc.get("daily_usage", 0)
-            }
+                "hourly_remaining": windows["hour"]["remaining"],
+                "daily_remaining": windows["day"]["remaining"]
+            },
+            "rate_limit_headers": rate_check["headers"]
         }
 
-    async def _check_rate_limits(self, key_doc: Dict[str, Any]) -> Dict[str, Any]:
-        """Check if request is within rate limits."""
-        now = datetime.now(timezone.utc)
-        last_reset = datetime.fromisoformat(
-            key_doc.get("last_usage_reset", now.isoformat()).replace('Z', '+00:00')
+    async def _check_rate_limits(self, key_doc: Dict[str, Any], cost: int = 1) -> Dict[str, Any]:
+        """
+        Check and consume rate limits for a key in one atomic operation.
+        Sliding hourly and daily windows, shared across workers.
+        """
+        decision = await self.rate_limiter.hit(
+            f"arris_api:{key_doc['id']}",
+            RATE_LIMIT_WINDOWS,
+            cost=cost
         )
+        result = {
+            "allowed": decision["allowed"],
+            "windows": decision["windows"],
+            "headers": self.rate_limiter.headers(decision)
+        }
         
-        # Reset counters if needed
-        hours_since_reset = (now - last_reset).total_seconds() / 3600
-        
-        if hours_since_reset >= 24:
-            # Reset both daily and hourly
-            await self.db.arris_api_keys.update_one(
-                {"id": key_doc["id"]},
-                {
-                    "$set": {
-                        "daily_usage": 0,
-                        "hourly_usage": 0,
-                        "last_usage_reset": now.isoformat()
-                    }
-                }
-            )
-            return {"allowed": True}
-        elif hours_since_reset >= 1:
-            # Reset hourly only
-            await self.db.arris_api_keys.update_one(
-                {"id": key_doc["id"]},
-                {"$set": {"hourly_usage": 0}}
-            )
-            key_doc["hourly_usage"] = 0
-        
-        # Check limits
-        hourly_usage = key_doc.get("hourly_usage", 0)
-        daily_usage = key_doc.get("daily_usage", 0)
-        
-        if hourly_usage >= RATE_LIMITS["requests_per_hour"]:
-            return {
-                "allowed": False,
-                "error": f"Hourly rate limit exceeded ({RATE_LIMITS['requests_per_hour']} requests/hour)",
-                "retry_after": 3600 - int((now - last_reset).total_seconds() % 3600)
-            }
+        if decision["allowed"]:
+            return result
         
-        if daily_usage >= RATE_LIMITS["requests_per_day"]:
-            return {
-                "allowed": False,
-                "error": f"Daily rate limit exceeded ({RATE_LIMITS['requests_per_day']} requests/day)",
-                "retry_after": 86400 - int((now - last_reset).total_seconds())
-            }
-        
-        return {"allowed": True}
+        if decision["violated_window"] == "hour":
+            result["error"] = f"Hourly rate limit exceeded ({RATE_LIMITS['requests_per_hour']} requests/hour)"
+        else:
+            result["error"] = f"Daily rate limit exceeded ({RATE_LIMITS['requests_per_day']} requests/day)"
+        result["retry_after"] = decision["retry_after"]
+        return result
 
-    async def _increment_usage(self, key_id: str):
-        """Increment usage counters for an API key."""
+    async def _increment_usage(self, key_id: str, count: int = 1):
+        """Increment lifetime usage counter for an API key (rate limits are tracked separately)."""
         await self.db.arris_api_keys.update_one(
             {"id": key_id},
             {
-                "$inc": {"usage_count": 1, "daily_usage": 1, "hourly_usage": 1},
+                "$inc": {"usage_count": count},
                 "$set": {"last_used_at": datetime.now(timezone.utc).isoformat()}
             }
         )
@@ -518,59 +530,8 @@ class ArrisApiService:
         await self._increment_usage(key_id)
         
         try:
-            # Get active persona for the creator
-            persona_prompt = ""
-            if self.persona_service:
-                active_persona = await self.persona_service.get_active_persona(creator_id)
-                if active_persona:
-                    persona_prompt = self.persona_service.generate_persona_system_prompt(active_persona)
-            
-            # Build analysis prompt based on type
-            analysis_prompts = {
-                "general": "Provide a comprehensive analysis of this text, including key themes, insights, and actionable recommendations.",
-                "sentiment": "Analyze the sentiment and emotional tone of this text. Identify positive, negative, and neutral aspects.",
-                "content_ideas": "Based on this text, generate creative content ideas and angles that could be explored.",
-                "strategy": "Provide strategic analysis including opportunities, challenges, and recommended next steps."
-            }
-            
-            prompt = analysis_prompts.get(analysis_type, analysis_prompts["general"])
-            
-            # Use ARRIS service for analysis
-            if self.arris_service:
-                from emergentintegrations.llm.chat import LlmChat, UserMessage
-                
-                system_prompt = f"""You are ARRIS, an AI assistant for Creators Hive HQ.
-{persona_prompt}
-
-Your task: {prompt}
-
-Provide your analysis in a structured JSON format with these fields:
-- summary: Brief overview (2-3 sentences)
-- key_points: Array of main points
-- insights: Array of deeper insights
-- recommendations: Array of actionable recommendations
-- confidence_score: 0-100 indicating analysis confidence"""
-                
-                chat = LlmChat(
-                    api_key=self.arris_service.api_key,
-                    session_id=f"arris-api-{request_id}",
-                    system_message=system_prompt
-                ).with_model("openai", "gpt-4o")
-                
-                user_message = UserMessage(text=f"Analyze this text:\n\n{text}\n\nContext: {json.dumps(context or {})}")
-                response = await chat.send_message(user_message)
-                
-                # Parse response (response is a string)
-                try:
-                    analysis = json.loads(response)
-                except json.JSONDecodeError:
-                    analysis = {
-                        "summary": response[:500] if isinstance(response, str) else str(response)[:500],
-                        "raw_response": response if isinstance(response, str) else str(response)
-                    }
-            else:
-                # Fallback analysis
-                analysis = self._generate_fallback_analysis(text, analysis_type)
+            persona_prompt = await self._get_active_persona_prompt(creator_id)
+            analysis = await self._run_analysis(request_id, text, analysis_type, context, persona_prompt)
             
             processing_time = int((time.time() - start_time) * 1000)
             
@@ -604,6 +565,70 @@ Provide your analysis in a structured JSON format with these fields:
             )
             return {"success": False, "error": str(e), "request_id": request_id}
 
+    async def _get_active_persona_prompt(self, creator_id: str) -> str:
+        """Get the system prompt fragment for the creator's active persona."""
+        if not self.persona_service:
+            return ""
+        active_persona = await self.persona_service.get_active_persona(creator_id)
+        if not active_persona:
+            return ""
+        return self.persona_service.generate_persona_system_prompt(active_persona)
+
+    async def _run_analysis(
+        self,
+        request_id: str,
+        text: str,
+        analysis_type: str,
+        context: Optional[Dict[str, Any]],
+        persona_prompt: str
+    ) -> Dict[str, Any]:
+        """Run a single text analysis against the LLM (no usage tracking or logging)."""
+        # Build analysis prompt based on type
+        analysis_prompts = {
+            "general": "Provide a comprehensive analysis of this text, including key themes, insights, and actionable recommendations.",
+            "sentiment": "Analyze the sentiment and emotional tone of this text. Identify positive, negative, and neutral aspects.",
+            "content_ideas": "Based on this text, generate creative content ideas and angles that could be explored.",
+            "strategy": "Provide strategic analysis including opportunities, challenges, and recommended next steps."
+        }
+        
+        prompt = analysis_prompts.get(analysis_type, analysis_prompts["general"])
+        
+        # Use ARRIS service for analysis
+        if not self.arris_service:
+            return self._generate_fallback_analysis(text, analysis_type)
+        
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
+        
+        system_prompt = f"""You are ARRIS, an AI assistant for Creators Hive HQ.
+{persona_prompt}
+
+Your task: {prompt}
+
+Provide your analysis in a structured JSON format with these fields:
+- summary: Brief overview (2-3 sentences)
+- key_points: Array of main points
+- insights: Array of deeper insights
+- recommendations: Array of actionable recommendations
+- confidence_score: 0-100 indicating analysis confidence"""
+        
+        chat = LlmChat(
+            api_key=self.arris_service.api_key,
+            session_id=f"arris-api-{request_id}",
+            system_message=system_prompt
+        ).with_model("openai", "gpt-4o")
+        
+        user_message = UserMessage(text=f"Analyze this text:\n\n{text}\n\nContext: {json.dumps(context or {})}")
+        response = await chat.send_message(user_message)
+        
+        # Parse response (response is a string)
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            return {
+                "summary": response[:500] if isinstance(response, str) else str(response)[:500],
+                "raw_response": response if isinstance(response, str) else str(response)
+            }
+
     async def generate_insights(
         self,
         creator_id: str,
@@ -754,37 +779,11 @@ Return as JSON array with each suggestion having:
         await self._increment_usage(key_id)
         
         try:
-            # Get persona
-            persona_prompt = ""
-            if self.persona_service:
-                if persona_id:
-                    persona = await self.persona_service.get_persona(creator_id, persona_id)
-                else:
-                    persona = await self.persona_service.get_active_persona(creator_id)
-                
-                if persona:
-                    persona_prompt = self.persona_service.generate_persona_system_prompt(persona)
-            
-            # Get conversation history
-            history = await self.db.arris_api_conversations.find(
-                {"conversation_id": conversation_id, "creator_id": creator_id}
-            ).sort("created_at", 1).to_list(20)
-            
-            # Build conversation context
-            history_text = "\n".join([
-                f"User: {h['user_message']}\nARRIS: {h['arris_response']}"
-                for h in history[-5:]  # Last 5 exchanges
-            ])
+            system_prompt = await self._build_chat_system_prompt(creator_id, conversation_id, persona_id)
             
             if self.arris_service:
                 from emergentintegrations.llm.chat import LlmChat, UserMessage
                 
-                system_prompt = f"""You are ARRIS, an AI assistant for Creators Hive HQ.
-{persona_prompt}
-
-You're having a conversation with a creator. Be helpful, encouraging, and provide actionable advice.
-{f'Previous conversation: {history_text}' if history_text else ''}"""
-                
                 chat = LlmChat(
                     api_key=self.arris_service.api_key,
                     session_id=f"arris-chat-{conversation_id}",
@@ -796,27 +795,12 @@ You're having a conversation with a creator. Be helpful, encouraging, and provid
                 
                 arris_response = response if isinstance(response, str) else str(response)
             else:
-                arris_response = f"Thank you for your message about '{message[:50]}...'. As ARRIS, I'm here to help you succeed as a creator. How can I assist you further?"
-            
-            # Store conversation
-            await self.db.arris_api_conversations.insert_one({
-                "conversation_id": conversation_id,
-                "creator_id": creator_id,
-                "user_message": message,
-                "arris_response": arris_response,
-                "persona_id": persona_id,
-                "created_at": datetime.now(timezone.utc).isoformat()
-            })
+                arris_response = self._fallback_chat_response(message)
             
             processing_time = int((time.time() - start_time) * 1000)
-            
-            await self._log_api_request(
-                creator_id=creator_id,
-                key_id=key_id,
-                request_id=request_id,
-                endpoint="chat",
-                status=RequestStatus.COMPLETED.value,
-                processing_time_ms=processing_time
+            await self._complete_chat(
+                creator_id, key_id, request_id, conversation_id, persona_id,
+                message, arris_response, processing_time
             )
             
             return {
@@ -831,6 +815,151 @@ You're having a conversation with a creator. Be helpful, encouraging, and provid
             logger.error(f"Chat error for {creator_id}: {e}")
             return {"success": False, "error": str(e), "request_id": request_id}
 
+    async def stream_chat_with_arris(
+        self,
+        creator_id: str,
+        key_id: str,
+        message: str,
+        conversation_id: Optional[str] = None,
+        persona_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of chat_with_arris.
+        
+        Yields (event, data) tuples: "start", then "token" for each chunk,
+        then "complete" with the same payload chat_with_arris returns
+        (or "error").
+        """
+        import time
+        from arris_streaming import stream_llm_text
+        
+        start_time = time.time()
+        request_id = f"REQ-{secrets.token_hex(6).upper()}"
+        
+        if not conversation_id:
+            conversation_id = f"CONV-{secrets.token_hex(6).upper()}"
+        
+        await self._increment_usage(key_id)
+        yield "start", {"request_id": request_id, "conversation_id": conversation_id}
+        
+        try:
+            system_prompt = await self._build_chat_system_prompt(creator_id, conversation_id, persona_id)
+            
+            chunks = []
+            time_to_first_token = None
+            if self.arris_service:
+                async for chunk in stream_llm_text(
+                    api_key=self.arris_service.api_key,
+                    session_id=f"arris-chat-{conversation_id}",
+                    system_message=system_prompt,
+                    text=message
+                ):
+                    if time_to_first_token is None:
+                        time_to_first_token = int((time.time() - start_time) * 1000)
+                    chunks.append(chunk)
+                    yield "token", {"text": chunk}
+            else:
+                chunk = self._fallback_chat_response(message)
+                time_to_first_token = int((time.time() - start_time) * 1000)
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+            
+            arris_response = "".join(chunks)
+            processing_time = int((time.time() - start_time) * 1000)
+            await self._complete_chat(
+                creator_id, key_id, request_id, conversation_id, persona_id,
+                message, arris_response, processing_time
+            )
+            
+            yield "complete", {
+                "success": True,
+                "request_id": request_id,
+                "conversation_id": conversation_id,
+                "response": arris_response,
+                "time_to_first_token_ms": time_to_first_token,
+                "processing_time_ms": processing_time
+            }
+            
+        except Exception as e:
+            logger.error(f"Streaming chat error for {creator_id}: {e}")
+            await self._log_api_request(
+                creator_id=creator_id,
+                key_id=key_id,
+                request_id=request_id,
+                endpoint="chat",
+                status=RequestStatus.FAILED.value,
+                error=str(e)
+            )
+            yield "error", {"success": False, "error": str(e), "request_id": request_id}
+
+    async def _build_chat_system_prompt(
+        self,
+        creator_id: str,
+        conversation_id: str,
+        persona_id: Optional[str] = None
+    ) -> str:
+        """Build the chat system prompt from persona and recent conversation history."""
+        # Get persona
+        persona_prompt = ""
+        if self.persona_service:
+            if persona_id:
+                persona = await self.persona_service.get_persona(creator_id, persona_id)
+            else:
+                persona = await self.persona_service.get_active_persona(creator_id)
+            
+            if persona:
+                persona_prompt = self.persona_service.generate_persona_system_prompt(persona)
+        
+        # Get conversation history
+        history = await self.db.arris_api_conversations.find(
+            {"conversation_id": conversation_id, "creator_id": creator_id}
+        ).sort("created_at", 1).to_list(20)
+        
+        # Build conversation context
+        history_text = "\n".join([
+            f"User: {h['user_message']}\nARRIS: {h['arris_response']}"
+            for h in history[-5:]  # Last 5 exchanges
+        ])
+        
+        return f"""You are ARRIS, an AI assistant for Creators Hive HQ.
+{persona_prompt}
+
+You're having a conversation with a creator. Be helpful, encouraging, and provide actionable advice.
+{f'Previous conversation: {history_text}' if history_text else ''}"""
+
+    def _fallback_chat_response(self, message: str) -> str:
+        return f"Thank you for your message about '{message[:50]}...'. As ARRIS, I'm here to help you succeed as a creator. How can I assist you further?"
+
+    async def _complete_chat(
+        self,
+        creator_id: str,
+        key_id: str,
+        request_id: str,
+        conversation_id: str,
+        persona_id: Optional[str],
+        message: str,
+        arris_response: str,
+        processing_time: int
+    ):
+        """Store the conversation turn and log the request."""
+        await self.db.arris_api_conversations.insert_one({
+            "conversation_id": conversation_id,
+            "creator_id": creator_id,
+            "user_message": message,
+            "arris_response": arris_response,
+            "persona_id": persona_id,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+        
+        await self._log_api_request(
+            creator_id=creator_id,
+            key_id=key_id,
+            request_id=request_id,
+            endpoint="chat",
+            status=RequestStatus.COMPLETED.value,
+            processing_time_ms=processing_time
+        )
+
     async def batch_analyze(
         self,
         creator_id: str,
@@ -838,7 +967,14 @@ You're having a conversation with a creator. Be helpful, encouraging, and provid
         items: List[Dict[str, Any]],
         analysis_type: str = "general"
     ) -> Dict[str, Any]:
-        """Process multiple items in batch."""
+        """
+        Process multiple items in batch.
+        
+        Items run concurrently (bounded per tier by BATCH_CONCURRENCY), each with
+        its own timeout. Failed or timed-out items are reported individually;
+        results keep the input order. Usage is incremented once and all item
+        requests are logged with a single bulk insert.
+        """
         import time
         start_time = time.time()
         request_id = f"BATCH-{secrets.token_hex(6).upper()}"
@@ -850,25 +986,68 @@ You're having a conversation with a creator. Be helpful, encouraging, and provid
                 "error": f"Batch size exceeds maximum ({RATE_LIMITS['max_batch_size']} items)"
             }
         
-        results = []
-        for idx, item in enumerate(items):
+        concurrency = await self._get_batch_concurrency(creator_id)
+        semaphore = asyncio.Semaphore(concurrency)
+        persona_prompt = await self._get_active_persona_prompt(creator_id)
+        
+        async def run_item(idx: int, item: Dict[str, Any]) -> Dict[str, Any]:
+            item_request_id = f"REQ-{secrets.token_hex(6).upper()}"
             text = item.get("text", "")
             item_type = item.get("analysis_type", analysis_type)
+            item_start = time.time()
+            result = {"index": idx, "request_id": item_request_id, "success": False, "analysis": None, "error": None}
             
-            result = await self.analyze_text(
-                creator_id=creator_id,
-                key_id=key_id,
-                text=text,
-                analysis_type=item_type,
-                context=item.get("context")
-            )
+            if len(text) > RATE_LIMITS["max_text_length"]:
+                result["error"] = f"Text exceeds maximum length ({RATE_LIMITS['max_text_length']} characters)"
+                return result
+            
+            async with semaphore:
+                try:
+                    result["analysis"] = await asyncio.wait_for(
+                        self._run_analysis(item_request_id, text, item_type, item.get("context"), persona_prompt),
+                        timeout=BATCH_ITEM_TIMEOUT_SECONDS
+                    )
+                    result["success"] = True
+                except asyncio.TimeoutError:
+                    result["error"] = f"Item timed out after {BATCH_ITEM_TIMEOUT_SECONDS}s"
+                except Exception as e:
+                    logger.error(f"Batch item {idx} error for {creator_id}: {e}")
+                    result["error"] = str(e)
             
-            results.append({
-                "index": idx,
-                "success": result.get("success"),
-                "analysis": result.get("analysis") if result.get("success") else None,
-                "error": result.get("error") if not result.get("success") else None
-            })
+            result["processing_time_ms"] = int((time.time() - item_start) * 1000)
+            return result
+        
+        item_results = await asyncio.gather(*(run_item(idx, item) for idx, item in enumerate(items)))
+        
+        # One usage increment and one bulk log insert for the whole batch
+        await self._increment_usage(key_id, count=len(items))
+        now = datetime.now(timezone.utc).isoformat()
+        log_entries = [
+            {
+                "request_id": r["request_id"],
+                "batch_id": request_id,
+                "creator_id": creator_id,
+                "key_id": key_id,
+                "endpoint": "analyze",
+                "status": RequestStatus.COMPLETED.value if r["success"] else RequestStatus.FAILED.value,
+                "processing_time_ms": r.get("processing_time_ms", 0),
+                "error": r["error"],
+                "created_at": now
+            }
+            for r in item_results
+        ]
+        if log_entries:
+            await self.db.arris_api_requests.insert_many(log_entries)
+        
+        results = [
+            {
+                "index": r["index"],
+                "success": r["success"],
+                "analysis": r["analysis"],
+                "error": r["error"]
+            }
+            for r in item_results
+        ]
         
         processing_time = int((time.time() - start_time) * 1000)
         
@@ -879,9 +1058,18 @@ You're having a conversation with a creator. Be helpful, encouraging, and provid
             "successful": sum(1 for r in results if r["success"]),
             "failed": sum(1 for r in results if not r["success"]),
             "results": results,
+            "concurrency": concurrency,
             "total_processing_time_ms": processing_time
         }
 
+    async def _get_batch_concurrency(self, creator_id: str) -> int:
+        """Get the batch worker pool size for the creator's tier."""
+        if not self.feature_gating:
+            return BATCH_CONCURRENCY["default"]
+        tier, _ = await self.feature_gating.get_creator_tier(creator_id)
+        tier_name = (tier.value if hasattr(tier, "value") else str(tier)).lower()
+        return BATCH_CONCURRENCY.get(tier_name, BATCH_CONCURRENCY["default"])
+
     # ============== USAGE & ANALYTICS ==============
 
     async def get_usage_stats(self, creator_id: str, days: int = 30) -> Dict[str, Any]:
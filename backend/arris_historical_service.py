@@ -16,6 +16,9 @@ from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from collections import defaultdict
 
+from bson_dates import iso, add_date_range, date_range, date_key, bucket_counts_pipeline
+from time_series_rollups import time_series_rollups
+
 logger = logging.getLogger(__name__)
 
 
@@ -172,38 +175,23 @@ class ArrisHistoricalService:
             metric: What to chart - memories, patterns, accuracy, interactions
             granularity: daily, weekly, monthly
         """
-        # Determine time window based on granularity
+        # Determine time window and bucket unit based on granularity
         if granularity == "daily":
             days = 30
-            date_format = "%Y-%m-%d"
+            unit = "day"
         elif granularity == "weekly":
             days = 90
-            date_format = "%Y-W%W"
+            unit = "week"
         else:  # monthly
             days = 365
-            date_format = "%Y-%m"
+            unit = "month"
         
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        # Get data points based on metric
-        if metric == "memories":
-            data_points = await self._get_memory_growth_data(
-                creator_id, start_date, date_format
-            )
-        elif metric == "patterns":
-            data_points = await self._get_pattern_growth_data(
-                creator_id, start_date, date_format
-            )
-        elif metric == "accuracy":
-            data_points = await self._get_accuracy_growth_data(
-                creator_id, start_date, date_format
-            )
-        elif metric == "interactions":
-            data_points = await self._get_interaction_growth_data(
-                creator_id, start_date, date_format
-            )
-        else:
-            data_points = []
+        # Read pre-aggregated rollups; aggregate raw memories only until they are built
+        data_points = await self._get_rollup_growth_data(creator_id, metric, start_date, unit)
+        if data_points is None:
+            data_points = await self._get_raw_growth_data(creator_id, metric, start_date, unit)
         
         return {
             "creator_id": creator_id,
@@ -239,15 +227,16 @@ class ArrisHistoricalService:
         """Get memory accumulation over time"""
         query = {"creator_id": creator_id}
         if start_date:
-            query["created_at"] = {"$gte": start_date.isoformat()}
+            add_date_range(query, "created_at", gte=start_date)
         
         pipeline = [
             {"$match": query},
             {"$project": {
-                "date": {"$substr": ["$created_at", 0, 10]},
+                "date": date_key("created_at", "day"),
                 "memory_type": 1,
                 "importance": 1
             }},
+            {"$match": {"date": {"$ne": None}}},
             {"$group": {
                 "_id": {"date": "$date", "type": "$memory_type"},
                 "count": {"$sum": 1},
@@ -291,7 +280,7 @@ class ArrisHistoricalService:
             "memory_type": "pattern"
         }
         if start_date:
-            query["created_at"] = {"$gte": start_date.isoformat()}
+            add_date_range(query, "created_at", gte=start_date)
         
         patterns = await self.db.arris_memories.find(
             query,
@@ -302,7 +291,7 @@ class ArrisHistoricalService:
         for p in patterns:
             content = p.get("content", {})
             timeline.append({
-                "date": p.get("created_at", "")[:10],
+                "date": iso(p.get("created_at"))[:10],
                 "category": content.get("category"),
                 "title": content.get("title"),
                 "confidence": content.get("confidence"),
@@ -323,7 +312,7 @@ class ArrisHistoricalService:
             "memory_type": "outcome"
         }
         if start_date:
-            query["created_at"] = {"$gte": start_date.isoformat()}
+            add_date_range(query, "created_at", gte=start_date)
         
         outcomes = await self.db.arris_memories.find(
             query,
@@ -344,7 +333,7 @@ class ArrisHistoricalService:
             accuracy_rate = (accurate / total) * 100 if total > 0 else 0
             
             progression.append({
-                "date": o.get("created_at", "")[:10],
+                "date": iso(o.get("created_at"))[:10],
                 "cumulative_predictions": total,
                 "cumulative_accurate": accurate,
                 "accuracy_rate": round(accuracy_rate, 1),
@@ -368,7 +357,7 @@ class ArrisHistoricalService:
                 "type": "first_memory",
                 "title": "First Memory Created",
                 "description": "ARRIS started learning about you",
-                "date": first_memory.get("created_at", "")[:10],
+                "date": iso(first_memory.get("created_at"))[:10],
                 "icon": "🧠"
             })
         
@@ -383,7 +372,7 @@ class ArrisHistoricalService:
                 "type": "first_pattern",
                 "title": "First Pattern Detected",
                 "description": first_pattern.get("content", {}).get("title", "Pattern identified"),
-                "date": first_pattern.get("created_at", "")[:10],
+                "date": iso(first_pattern.get("created_at"))[:10],
                 "icon": "🔮"
             })
         
@@ -412,7 +401,7 @@ class ArrisHistoricalService:
                         "type": f"memories_{threshold}",
                         "title": title,
                         "description": desc,
-                        "date": milestone_memory.get("created_at", "")[:10],
+                        "date": iso(milestone_memory.get("created_at"))[:10],
                         "icon": icon
                     })
         
@@ -447,29 +436,26 @@ class ArrisHistoricalService:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Get statistics for a specific time period"""
-        date_query = {
-            "$gte": start_date.isoformat(),
-            "$lte": end_date.isoformat()
-        }
+        date_query = date_range("created_at", gte=start_date, lte=end_date)
         
         # Memory stats
         memory_count = await self.db.arris_memories.count_documents({
             "creator_id": creator_id,
-            "created_at": date_query
+            **date_query
         })
         
         # Pattern stats
         pattern_count = await self.db.arris_memories.count_documents({
             "creator_id": creator_id,
             "memory_type": "pattern",
-            "created_at": date_query
+            **date_query
         })
         
         # Outcome/prediction stats
         outcomes = await self.db.arris_memories.find({
             "creator_id": creator_id,
             "memory_type": "outcome",
-            "created_at": date_query
+            **date_query
         }, {"_id": 0, "content": 1}).to_list(100)
         
         accurate_predictions = len([o for o in outcomes if o.get("content", {}).get("prediction_accurate")])
@@ -480,12 +466,12 @@ class ArrisHistoricalService:
         interactions = await self.db.arris_memories.count_documents({
             "creator_id": creator_id,
             "memory_type": "interaction",
-            "created_at": date_query
+            **date_query
         })
         
         # Calculate avg importance
         pipeline = [
-            {"$match": {"creator_id": creator_id, "created_at": date_query}},
+            {"$match": {"creator_id": creator_id, **date_query}},
             {"$group": {"_id": None, "avg_importance": {"$avg": "$importance"}}}
         ]
         avg_result = await self.db.arris_memories.aggregate(pipeline).to_list(1)
@@ -578,7 +564,7 @@ class ArrisHistoricalService:
                 s["_id"]: {
                     "count": s["count"],
                     "avg_importance": round(s["avg_importance"], 2),
-                    "latest": s["latest"][:10] if s.get("latest") else None
+                    "latest": iso(s["latest"])[:10] if s.get("latest") else None
                 }
                 for s in type_stats
             }
@@ -602,7 +588,7 @@ class ArrisHistoricalService:
                 "confidence": p.get("content", {}).get("confidence"),
                 "recommendation": p.get("content", {}).get("recommendation"),
                 "importance": p.get("importance"),
-                "discovered": p.get("created_at", "")[:10]
+                "discovered": iso(p.get("created_at"))[:10]
             }
             for p in patterns
         ]
@@ -670,8 +656,8 @@ class ArrisHistoricalService:
                 "type": r.get("memory_type"),
                 "summary": self._summarize_activity(r.get("memory_type"), content),
                 "importance": r.get("importance"),
-                "date": r.get("created_at", "")[:10],
-                "time": r.get("created_at", "")[11:19] if len(r.get("created_at", "")) > 19 else ""
+                "date": iso(r.get("created_at"))[:10],
+                "time": iso(r.get("created_at"))[11:19]
             })
         
         return activity
@@ -743,28 +729,80 @@ class ArrisHistoricalService:
             }
         }
     
+    async def _get_rollup_growth_data(
+        self,
+        creator_id: str,
+        metric: str,
+        start_date: datetime,
+        unit: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Growth chart data from time-series rollups (None if not built yet)"""
+        series = {
+            "memories": "memories",
+            "interactions": "memories",
+            "patterns": "patterns",
+            "accuracy": "outcomes",
+        }.get(metric)
+        if series is None:
+            return None
+        buckets = await time_series_rollups.query(series, creator_id, start=start_date, granularity=unit)
+        if buckets is None:
+            return None
+        
+        data_points = []
+        cumulative = 0
+        accurate = 0
+        for b in buckets:
+            if metric == "accuracy":
+                cumulative += b["count"]
+                accurate += b["sums"].get("accurate", 0)
+                data_points.append({
+                    "date": b["date"],
+                    "predictions": cumulative,
+                    "accurate": accurate,
+                    "accuracy_rate": round(accurate / cumulative * 100, 1)
+                })
+                continue
+            count = b["by"].get("interaction", 0) if metric == "interactions" else b["count"]
+            if not count:
+                continue
+            cumulative += count
+            point = {"date": b["date"], "daily": count, "cumulative": cumulative}
+            if metric == "patterns":
+                point["by_category"] = b["by"]
+            data_points.append(point)
+        
+        return data_points
+    
+    async def _get_raw_growth_data(
+        self,
+        creator_id: str,
+        metric: str,
+        start_date: datetime,
+        unit: str
+    ) -> List[Dict[str, Any]]:
+        """Growth chart data aggregated from raw memories"""
+        if metric == "memories":
+            return await self._get_memory_growth_data(creator_id, start_date, unit)
+        elif metric == "patterns":
+            return await self._get_pattern_growth_data(creator_id, start_date, unit)
+        elif metric == "accuracy":
+            return await self._get_accuracy_growth_data(creator_id, start_date, unit)
+        elif metric == "interactions":
+            return await self._get_interaction_growth_data(creator_id, start_date, unit)
+        return []
+    
     async def _get_memory_growth_data(
         self,
         creator_id: str,
         start_date: datetime,
-        date_format: str
+        unit: str
     ) -> List[Dict[str, Any]]:
-        """Get memory growth chart data"""
-        pipeline = [
-            {"$match": {
-                "creator_id": creator_id,
-                "created_at": {"$gte": start_date.isoformat()}
-            }},
-            {"$project": {
-                "date_key": {"$substr": ["$created_at", 0, 10 if "W" not in date_format else 7]},
-                "memory_type": 1
-            }},
-            {"$group": {
-                "_id": "$date_key",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id": 1}}
-        ]
+        """Get memory growth chart data (bucketed server-side with $dateTrunc)"""
+        pipeline = bucket_counts_pipeline(
+            add_date_range({"creator_id": creator_id}, "created_at", gte=start_date),
+            "created_at", unit
+        )
         
         results = await self.db.arris_memories.aggregate(pipeline).to_list(500)
         
@@ -774,7 +812,7 @@ class ArrisHistoricalService:
         for r in results:
             cumulative += r["count"]
             data_points.append({
-                "date": r["_id"],
+                "date": r["_id"]["date"],
                 "daily": r["count"],
                 "cumulative": cumulative
             })
@@ -785,25 +823,15 @@ class ArrisHistoricalService:
         self,
         creator_id: str,
         start_date: datetime,
-        date_format: str
+        unit: str
     ) -> List[Dict[str, Any]]:
         """Get pattern discovery growth chart data"""
-        pipeline = [
-            {"$match": {
-                "creator_id": creator_id,
-                "memory_type": "pattern",
-                "created_at": {"$gte": start_date.isoformat()}
-            }},
-            {"$project": {
-                "date_key": {"$substr": ["$created_at", 0, 10]},
-                "category": "$content.category"
-            }},
-            {"$group": {
-                "_id": {"date": "$date_key", "category": "$category"},
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id.date": 1}}
-        ]
+        pipeline = bucket_counts_pipeline(
+            add_date_range(
+                {"creator_id": creator_id, "memory_type": "pattern"}, "created_at", gte=start_date
+            ),
+            "created_at", unit, group_by="content.category"
+        )
         
         results = await self.db.arris_memories.aggregate(pipeline).to_list(500)
         
@@ -813,7 +841,7 @@ class ArrisHistoricalService:
         
         for r in results:
             date = r["_id"]["date"]
-            category = r["_id"]["category"]
+            category = r["_id"].get("group")
             date_groups[date]["by_category"][category] = r["count"]
             date_groups[date]["total"] += r["count"]
         
@@ -833,14 +861,13 @@ class ArrisHistoricalService:
         self,
         creator_id: str,
         start_date: datetime,
-        date_format: str
+        unit: str
     ) -> List[Dict[str, Any]]:
         """Get prediction accuracy growth chart data"""
-        outcomes = await self.db.arris_memories.find({
+        outcomes = await self.db.arris_memories.find(add_date_range({
             "creator_id": creator_id,
-            "memory_type": "outcome",
-            "created_at": {"$gte": start_date.isoformat()}
-        }, {"_id": 0, "created_at": 1, "content": 1}).sort("created_at", 1).to_list(500)
+            "memory_type": "outcome"
+        }, "created_at", gte=start_date), {"_id": 0, "created_at": 1, "content": 1}).sort("created_at", 1).to_list(500)
         
         cumulative_total = 0
         cumulative_accurate = 0
@@ -854,7 +881,7 @@ class ArrisHistoricalService:
             accuracy = (cumulative_accurate / cumulative_total) * 100
             
             data_points.append({
-                "date": o.get("created_at", "")[:10],
+                "date": iso(o.get("created_at"))[:10],
                 "predictions": cumulative_total,
                 "accurate": cumulative_accurate,
                 "accuracy_rate": round(accuracy, 1)
@@ -866,24 +893,15 @@ class ArrisHistoricalService:
         self,
         creator_id: str,
         start_date: datetime,
-        date_format: str
+        unit: str
     ) -> List[Dict[str, Any]]:
         """Get interaction growth chart data"""
-        pipeline = [
-            {"$match": {
-                "creator_id": creator_id,
-                "memory_type": "interaction",
-                "created_at": {"$gte": start_date.isoformat()}
-            }},
-            {"$project": {
-                "date_key": {"$substr": ["$created_at", 0, 10]}
-            }},
-            {"$group": {
-                "_id": "$date_key",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id": 1}}
-        ]
+        pipeline = bucket_counts_pipeline(
+            add_date_range(
+                {"creator_id": creator_id, "memory_type": "interaction"}, "created_at", gte=start_date
+            ),
+            "created_at", unit
+        )
         
         results = await self.db.arris_memories.aggregate(pipeline).to_list(500)
         
@@ -892,7 +910,7 @@ class ArrisHistoricalService:
         for r in results:
             cumulative += r["count"]
             data_points.append({
-                "date": r["_id"],
+                "date": r["_id"]["date"],
                 "daily": r["count"],
                 "cumulative": cumulative
             })
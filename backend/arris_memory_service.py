@@ -18,8 +18,28 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from collections import defaultdict
 import json
 
+from memory_search_index import MemorySearchIndex, IndexSource
+from index_registry import index_registry
+from bson_dates import register_date_fields, parse_datetime, utc_now
+from time_series_rollups import time_series_rollups
+
 logger = logging.getLogger(__name__)
 
+index_registry.register("arris_memories", "id", unique=True, owner="arris_memory")
+index_registry.register("arris_memories", [("creator_id", 1), ("importance", -1), ("created_at", -1)], owner="arris_memory")
+index_registry.register("arris_memories", [("creator_id", 1), ("memory_type", 1), ("created_at", -1)], owner="arris_memory")
+index_registry.register_query(
+    "arris_memories", {"creator_id": "CR-1", "importance": {"$gte": 1}},
+    sort=[("importance", -1), ("created_at", -1)], owner="arris_memory"
+)
+index_registry.register_query(
+    "arris_memories", {"creator_id": "CR-1", "memory_type": "interaction", "created_at": {"$lt": datetime(2026, 1, 1, tzinfo=timezone.utc)}},
+    owner="arris_memory"
+)
+# Memories are written with native BSON dates; DateMigration converts older ISO strings
+register_date_fields("arris_memories", "created_at")
+register_date_fields("arris_memories_archive", "created_at")
+
 
 # ============== MEMORY TYPES ==============
 
@@ -56,8 +76,9 @@ class ArrisMemoryService:
     and accurate insights over time.
     """
     
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, search_index: Optional[MemorySearchIndex] = None):
         self.db = db
+        self.search_index = search_index or MemorySearchIndex(db)
         
     # ============== MEMORY PALACE ==============
     
@@ -88,11 +109,13 @@ class ArrisMemoryService:
             "tags": tags or [],
             "recall_count": 0,
             "last_recalled": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": utc_now(),
             "expires_at": None  # Important memories never expire
         }
         
         await self.db.arris_memories.insert_one(memory)
+        await time_series_rollups.record("arris_memories", memory)
+        await self.search_index.index_memory(memory, IndexSource.ACTIVE)
         logger.info(f"Stored memory {memory['id']} for creator {creator_id}")
         
         return {k: v for k, v in memory.items() if k != "_id"}
@@ -367,16 +390,12 @@ class ArrisMemoryService:
         day_activity = defaultdict(lambda: {"total": 0, "successful": 0})
         
         for p in proposals:
-            created = p.get("created_at", "")
-            if created:
-                try:
-                    dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                    day_name = dt.strftime("%A")
-                    day_activity[day_name]["total"] += 1
-                    if p.get("status") in ["approved", "completed", "in_progress"]:
-                        day_activity[day_name]["successful"] += 1
-                except Exception:
-                    pass
+            dt = parse_datetime(p.get("created_at"))
+            if dt:
+                day_name = dt.strftime("%A")
+                day_activity[day_name]["total"] += 1
+                if p.get("status") in ["approved", "completed", "in_progress"]:
+                    day_activity[day_name]["successful"] += 1
         
         if day_activity:
             most_active_day = max(day_activity.items(), key=lambda x: x[1]["total"])
@@ -11,15 +11,62 @@ This module implements:
 """
 
 import os
+import re
+import copy
+import time
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from collections import defaultdict
 import statistics
+import numpy as np
+
+from bson_dates import date_expr, date_key, parse_datetime, iso
 
 logger = logging.getLogger(__name__)
 
+# Cohort/ranking engine: "aggregation" (server-side $lookup/$group/$facet)
+# or "columnar" (streams compact per-creator NumPy arrays)
+COHORT_ENGINE = os.environ.get("PATTERN_COHORT_ENGINE", "aggregation").lower()
+COHORT_BATCH_SIZE = int(os.environ.get("PATTERN_COHORT_BATCH_SIZE", "5000"))
+
+# How long one detection run is reused by detect_all_patterns(),
+# get_actionable_insights() and the churn-risk endpoint
+DETECTION_CACHE_SECONDS = int(os.environ.get("PATTERN_DETECTION_CACHE_SECONDS", "120"))
+
+APPROVED_STATUSES = ["approved", "completed", "in_progress"]
+
+ENGAGEMENT_COHORTS = [
+    ("highly_engaged", ">10 proposals"),
+    ("moderately_engaged", "3-10 proposals"),
+    ("low_engaged", "1-2 proposals"),
+    ("inactive", "0 proposals"),
+]
+
+# $sort specs for get_creator_ranking (ties broken by creator id)
+RANKING_SORTS = {
+    "approval_rate": {"approval_rate": -1, "total": -1},
+    "total_proposals": {"total": -1},
+    "approved_proposals": {"approved": -1},
+    "default": {"approval_rate": -1},
+}
+
+
+# Sorts subscriptions with no parseable created_at before any dated one
+EPOCH_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _month_ordinal(value) -> int:
+    """year * 12 + month - 1 for a registration date (-1 if missing/unparseable)"""
+    parsed = parse_datetime(value)
+    return parsed.year * 12 + parsed.month - 1 if parsed else -1
+
+
+def _month_label(ordinal: int) -> str:
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
 
 class PatternType:
     """Types of platform-wide patterns"""
@@ -54,9 +101,13 @@ class ArrisPatternEngine:
     
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
-        self.pattern_cache = {}
+        self.pattern_cache = {}  # cohort/ranking results, see invalidate_cohorts()
         self.cache_ttl = 300  # 5 minutes cache
         self.last_cache_time = None
+        self.detection_cache_seconds = DETECTION_CACHE_SECONDS
+        self._detection_run: Optional[Dict[str, Any]] = None
+        self._detection_monotonic = 0.0
+        self._detection_lock = asyncio.Lock()
     
     # ============== MAIN ANALYSIS METHODS ==============
     
@@ -111,135 +162,66 @@ class ArrisPatternEngine:
     async def detect_all_patterns(self) -> Dict[str, Any]:
         """
         Run comprehensive pattern detection across the platform.
-        Returns categorized patterns with confidence scores and recommendations.
+        Returns categorized patterns with confidence scores and recommendations,
+        plus per-detector timings of the (possibly reused) detection run.
         """
-        patterns = {
-            "success_patterns": await self._detect_success_patterns(),
-            "risk_patterns": await self._detect_risk_patterns(),
-            "churn_patterns": await self._detect_churn_patterns(),
-            "revenue_patterns": await self._detect_revenue_patterns(),
-            "engagement_patterns": await self._detect_engagement_patterns(),
-            "trend_patterns": await self._detect_trend_patterns(),
-            "detected_at": datetime.now(timezone.utc).isoformat(),
-            "total_patterns": 0
-        }
-        
-        # Count total patterns
-        for key in patterns:
-            if isinstance(patterns[key], list):
-                patterns["total_patterns"] += len(patterns[key])
-        
+        run, cached = await self._get_detection_run()
+        patterns = copy.deepcopy(run)
+        patterns["run"]["cached"] = cached
         return patterns
     
     async def get_cohort_analysis(self) -> Dict[str, Any]:
         """
         Analyze creators by cohort (registration month, tier, engagement level).
+
+        Computed without materializing creators/proposals in Python: the
+        aggregation engine joins and groups on the server, the columnar
+        engine streams compact NumPy arrays. Results are cached until a
+        proposal or subscription write invalidates them (or cache_ttl).
         """
-        creators = await self.db.creators.find(
-            {"status": "active"},
-            {"_id": 0, "id": 1, "submitted_at": 1, "platforms": 1, "niche": 1}
-        ).to_list(10000)
-        
-        subscriptions = await self.db.creator_subscriptions.find(
-            {"status": "active"},
-            {"_id": 0, "creator_id": 1, "tier": 1, "plan_id": 1, "created_at": 1}
-        ).to_list(10000)
-        
-        proposals = await self.db.proposals.find(
-            {},
-            {"_id": 0, "user_id": 1, "status": 1, "created_at": 1}
-        ).to_list(50000)
-        
-        # Build creator lookup
-        sub_by_creator = {s["creator_id"]: s for s in subscriptions}
-        proposals_by_creator = defaultdict(list)
-        for p in proposals:
-            proposals_by_creator[p.get("user_id")].append(p)
-        
-        # Cohort by tier
-        tier_cohorts = defaultdict(lambda: {
-            "count": 0,
-            "total_proposals": 0,
-            "approved_proposals": 0,
-            "avg_proposals_per_creator": 0
-        })
-        
-        # Cohort by registration month
-        monthly_cohorts = defaultdict(lambda: {
-            "count": 0,
-            "retained": 0,
-            "churned": 0
-        })
-        
-        # Cohort by engagement level
+        cached = self._get_cached(("cohorts",))
+        if cached is not None:
+            return cached
+
+        if COHORT_ENGINE == "columnar":
+            tier_rows, month_rows, engagement, total = await self._columnar_cohorts()
+        else:
+            tier_rows, month_rows, engagement, total = await self._aggregate_cohorts()
+
+        by_tier = {}
+        for tier, count, total_proposals, approved_proposals in tier_rows:
+            by_tier[tier] = {
+                "count": count,
+                "total_proposals": total_proposals,
+                "approved_proposals": approved_proposals,
+                "avg_proposals_per_creator": round(total_proposals / count, 1),
+                "approval_rate": round((approved_proposals / max(1, total_proposals)) * 100, 1)
+            }
+
+        monthly_list = [
+            {
+                "month": month,
+                "count": count,
+                "retained": retained,
+                "churned": count - retained,
+                "retention_rate": round((retained / count) * 100, 1) if count else 0
+            }
+            for month, count, retained in month_rows
+        ]
+
         engagement_cohorts = {
-            "highly_engaged": {"count": 0, "criteria": ">10 proposals"},
-            "moderately_engaged": {"count": 0, "criteria": "3-10 proposals"},
-            "low_engaged": {"count": 0, "criteria": "1-2 proposals"},
-            "inactive": {"count": 0, "criteria": "0 proposals"}
+            name: {"count": engagement.get(name, 0), "criteria": criteria}
+            for name, criteria in ENGAGEMENT_COHORTS
         }
-        
-        for creator in creators:
-            creator_id = creator.get("id")
-            sub = sub_by_creator.get(creator_id, {})
-            tier = sub.get("tier", "Free")
-            creator_proposals = proposals_by_creator.get(creator_id, [])
-            
-            # Tier cohort
-            tier_cohorts[tier]["count"] += 1
-            tier_cohorts[tier]["total_proposals"] += len(creator_proposals)
-            tier_cohorts[tier]["approved_proposals"] += len([
-                p for p in creator_proposals 
-                if p.get("status") in ["approved", "completed", "in_progress"]
-            ])
-            
-            # Registration month cohort
-            submitted_at = creator.get("submitted_at", "")
-            if submitted_at:
-                month = submitted_at[:7]  # YYYY-MM
-                monthly_cohorts[month]["count"] += 1
-                if sub.get("status") == "active":
-                    monthly_cohorts[month]["retained"] += 1
-                else:
-                    monthly_cohorts[month]["churned"] += 1
-            
-            # Engagement cohort
-            proposal_count = len(creator_proposals)
-            if proposal_count > 10:
-                engagement_cohorts["highly_engaged"]["count"] += 1
-            elif proposal_count >= 3:
-                engagement_cohorts["moderately_engaged"]["count"] += 1
-            elif proposal_count >= 1:
-                engagement_cohorts["low_engaged"]["count"] += 1
-            else:
-                engagement_cohorts["inactive"]["count"] += 1
-        
-        # Calculate averages for tier cohorts
-        for tier, data in tier_cohorts.items():
-            if data["count"] > 0:
-                data["avg_proposals_per_creator"] = round(data["total_proposals"] / data["count"], 1)
-                data["approval_rate"] = round(
-                    (data["approved_proposals"] / max(1, data["total_proposals"])) * 100, 1
-                )
-        
-        # Calculate retention rates for monthly cohorts
-        monthly_list = []
-        for month, data in sorted(monthly_cohorts.items(), reverse=True)[:12]:
-            total = data["count"]
-            if total > 0:
-                data["retention_rate"] = round((data["retained"] / total) * 100, 1)
-            else:
-                data["retention_rate"] = 0
-            monthly_list.append({"month": month, **data})
-        
-        return {
-            "by_tier": dict(tier_cohorts),
+
+        return self._set_cached(("cohorts",), {
+            "by_tier": by_tier,
             "by_registration_month": monthly_list,
             "by_engagement": engagement_cohorts,
-            "total_creators_analyzed": len(creators),
+            "total_creators_analyzed": total,
             "analysis_timestamp": datetime.now(timezone.utc).isoformat()
-        }
-    
+        })
+
     async def get_creator_ranking(
         self, 
         sort_by: str = "approval_rate",
@@ -249,65 +231,332 @@ class ArrisPatternEngine:
         """
         Get ranked list of creators by performance metrics.
         """
-        creators = await self.db.creators.find(
-            {"status": "active"},
-            {"_id": 0, "id": 1, "name": 1, "email": 1, "platforms": 1}
-        ).to_list(10000)
-        
-        subscriptions = await self.db.creator_subscriptions.find(
-            {"status": "active"},
-            {"_id": 0, "creator_id": 1, "tier": 1}
-        ).to_list(10000)
-        
-        sub_by_creator = {s["creator_id"]: s.get("tier", "Free") for s in subscriptions}
-        
-        proposals = await self.db.proposals.find(
-            {},
-            {"_id": 0, "user_id": 1, "status": 1, "created_at": 1}
-        ).to_list(50000)
-        
-        proposals_by_creator = defaultdict(list)
-        for p in proposals:
-            proposals_by_creator[p.get("user_id")].append(p)
-        
-        rankings = []
-        for creator in creators:
-            creator_id = creator.get("id")
-            tier = sub_by_creator.get(creator_id, "Free")
-            
-            if tier_filter and tier.lower() != tier_filter.lower():
+        key = ("ranking", sort_by, limit, (tier_filter or "").lower())
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+
+        if COHORT_ENGINE == "columnar":
+            rankings = await self._columnar_ranking(sort_by, limit, tier_filter)
+        else:
+            rankings = await self._aggregate_ranking(sort_by, limit, tier_filter)
+        return self._set_cached(key, rankings)
+
+    # ============== COHORT CACHE ==============
+
+    def _get_cached(self, key: Tuple) -> Optional[Any]:
+        entry = self.pattern_cache.get(key)
+        if entry is None:
+            return None
+        cached_at, value = entry
+        if (datetime.now(timezone.utc) - cached_at).total_seconds() > self.cache_ttl:
+            self.pattern_cache.pop(key, None)
+            return None
+        return copy.deepcopy(value)
+
+    def _set_cached(self, key: Tuple, value: Any) -> Any:
+        self.last_cache_time = datetime.now(timezone.utc)
+        self.pattern_cache[key] = (self.last_cache_time, copy.deepcopy(value))
+        return value
+
+    def invalidate_cohorts(self):
+        """Drop cached cohorts/rankings (call after proposal or subscription writes)"""
+        self.pattern_cache.clear()
+
+    # ============== COHORT AGGREGATION ENGINE ==============
+
+    @staticmethod
+    def _creator_stats_stages() -> List[Dict[str, Any]]:
+        """
+        Per active creator: tier/has_sub from its active subscription and
+        proposal totals grouped inside the $lookup, so each creator carries
+        two numbers instead of its proposal list. With several active
+        subscriptions the most recently created one (then highest id) sets
+        the tier, as in _load_creator_columns.
+        """
+        return [
+            {"$lookup": {
+                "from": "creator_subscriptions",
+                "localField": "id",
+                "foreignField": "creator_id",
+                "pipeline": [
+                    {"$match": {"status": "active"}},
+                    {"$set": {"created": date_expr("created_at")}},
+                    {"$sort": {"created": -1, "id": -1}},
+                    {"$project": {"_id": 0, "tier": {"$cond": [
+                        {"$eq": [{"$ifNull": ["$tier", ""]}, ""]}, "Free", "$tier"
+                    ]}}}
+                ],
+                "as": "subs"
+            }},
+            {"$lookup": {
+                "from": "proposals",
+                "localField": "id",
+                "foreignField": "user_id",
+                "pipeline": [
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "approved": {"$sum": {"$cond": [{"$in": ["$status", APPROVED_STATUSES]}, 1, 0]}}
+                    }}
+                ],
+                "as": "proposal_stats"
+            }},
+            {"$set": {
+                "tier": {"$ifNull": [{"$first": "$subs.tier"}, "Free"]},
+                "has_sub": {"$gt": [{"$size": "$subs"}, 0]},
+                "total": {"$ifNull": [{"$first": "$proposal_stats.total"}, 0]},
+                "approved": {"$ifNull": [{"$first": "$proposal_stats.approved"}, 0]}
+            }},
+            {"$unset": ["subs", "proposal_stats"]}
+        ]
+
+    async def _aggregate_cohorts(self) -> Tuple[List[Tuple], List[Tuple], Dict[str, int], int]:
+        pipeline = [
+            {"$match": {"status": "active"}},
+            {"$project": {"_id": 0, "id": 1, "submitted_at": 1}},
+            *self._creator_stats_stages(),
+            {"$facet": {
+                "by_tier": [
+                    {"$group": {
+                        "_id": "$tier",
+                        "count": {"$sum": 1},
+                        "total_proposals": {"$sum": "$total"},
+                        "approved_proposals": {"$sum": "$approved"}
+                    }}
+                ],
+                "by_month": [
+                    {"$group": {
+                        "_id": date_key("submitted_at", "month"),
+                        "count": {"$sum": 1},
+                        "retained": {"$sum": {"$cond": ["$has_sub", 1, 0]}}
+                    }},
+                    {"$match": {"_id": {"$ne": None}}},
+                    {"$sort": {"_id": -1}},
+                    {"$limit": 12}
+                ],
+                "by_engagement": [
+                    {"$group": {
+                        "_id": {"$switch": {
+                            "branches": [
+                                {"case": {"$gt": ["$total", 10]}, "then": "highly_engaged"},
+                                {"case": {"$gte": ["$total", 3]}, "then": "moderately_engaged"},
+                                {"case": {"$gte": ["$total", 1]}, "then": "low_engaged"}
+                            ],
+                            "default": "inactive"
+                        }},
+                        "count": {"$sum": 1}
+                    }}
+                ],
+                "total": [{"$count": "creators"}]
+            }}
+        ]
+        facets = (await self.db.creators.aggregate(pipeline, allowDiskUse=True).to_list(1))[0]
+
+        tier_rows = [
+            (t["_id"], t["count"], t["total_proposals"], t["approved_proposals"])
+            for t in facets["by_tier"]
+        ]
+        month_rows = [(m["_id"], m["count"], m["retained"]) for m in facets["by_month"]]
+        engagement = {e["_id"]: e["count"] for e in facets["by_engagement"]}
+        total = facets["total"][0]["creators"] if facets["total"] else 0
+        return tier_rows, month_rows, engagement, total
+
+    async def _aggregate_ranking(
+        self,
+        sort_by: str,
+        limit: int,
+        tier_filter: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        pipeline = [
+            {"$match": {"status": "active"}},
+            {"$project": {"_id": 0, "id": 1, "name": 1, "email": 1, "platforms": 1}},
+            *self._creator_stats_stages()
+        ]
+        if tier_filter:
+            pipeline.append({"$match": {"tier": {"$regex": f"^{re.escape(tier_filter)}$", "$options": "i"}}})
+        pipeline += [
+            {"$match": {"total": {"$gt": 0}}},
+            {"$set": {"approval_rate": {"$round": [
+                {"$multiply": [{"$divide": ["$approved", "$total"]}, 100]}, 1
+            ]}}},
+            {"$sort": {**RANKING_SORTS.get(sort_by, RANKING_SORTS["default"]), "id": 1}},
+            {"$limit": limit}
+        ]
+        rows = await self.db.creators.aggregate(pipeline, allowDiskUse=True).to_list(limit)
+        return [
+            {
+                "creator_id": r.get("id"),
+                "name": r.get("name"),
+                "email": r.get("email"),
+                "tier": r["tier"],
+                "total_proposals": r["total"],
+                "approved_proposals": r["approved"],
+                "approval_rate": r["approval_rate"],
+                "platforms": r.get("platforms", [])
+            }
+            for r in rows
+        ]
+
+    # ============== COHORT COLUMNAR ENGINE ==============
+
+    async def _load_creator_columns(self) -> Dict[str, Any]:
+        """
+        Stream active creators, subscriptions and proposals into per-creator
+        arrays (creator index, tier code, month ordinal, proposal totals).
+        Memory is O(creators) plus one proposal batch, at any proposal count.
+        """
+        ids: List[str] = []
+        months: List[int] = []
+        async for creator in self.db.creators.find({"status": "active"}, {"_id": 0, "id": 1, "submitted_at": 1}):
+            ids.append(creator.get("id"))
+            months.append(_month_ordinal(creator.get("submitted_at")))
+        index = {creator_id: i for i, creator_id in enumerate(ids)}
+        n = len(ids)
+
+        tier_names: List[str] = []
+        tier_codes: Dict[str, int] = {}
+        tier = np.full(n, -1, dtype=np.int32)
+        # Most recently created active subscription wins, then highest id
+        tier_since: Dict[int, Tuple[datetime, str]] = {}
+        subs = self.db.creator_subscriptions.find(
+            {"status": "active"}, {"_id": 0, "id": 1, "creator_id": 1, "tier": 1, "created_at": 1}
+        )
+        async for sub in subs:
+            i = index.get(sub.get("creator_id"))
+            if i is None:
                 continue
-            
-            creator_proposals = proposals_by_creator.get(creator_id, [])
-            total = len(creator_proposals)
-            approved = len([p for p in creator_proposals if p.get("status") in ["approved", "completed", "in_progress"]])
-            
-            if total == 0:
+            since = (parse_datetime(sub.get("created_at")) or EPOCH_MIN, str(sub.get("id") or ""))
+            if i in tier_since and since <= tier_since[i]:
                 continue
-            
-            approval_rate = round((approved / total) * 100, 1)
-            
+            tier_since[i] = since
+            name = sub.get("tier") or "Free"
+            if name not in tier_codes:
+                tier_codes[name] = len(tier_names)
+                tier_names.append(name)
+            tier[i] = tier_codes[name]
+
+        totals = np.zeros(n, dtype=np.int64)
+        approved = np.zeros(n, dtype=np.int64)
+        batch_idx: List[int] = []
+        batch_ok: List[bool] = []
+
+        def flush():
+            if not batch_idx:
+                return
+            idx = np.asarray(batch_idx, dtype=np.int64)
+            totals[:] += np.bincount(idx, minlength=n)
+            approved[:] += np.bincount(idx[np.asarray(batch_ok, dtype=bool)], minlength=n)
+            batch_idx.clear()
+            batch_ok.clear()
+
+        cursor = self.db.proposals.find({}, {"_id": 0, "user_id": 1, "status": 1}).batch_size(COHORT_BATCH_SIZE)
+        async for proposal in cursor:
+            i = index.get(proposal.get("user_id"))
+            if i is None:
+                continue
+            batch_idx.append(i)
+            batch_ok.append(proposal.get("status") in APPROVED_STATUSES)
+            if len(batch_idx) >= COHORT_BATCH_SIZE:
+                flush()
+        flush()
+
+        return {
+            "ids": ids,
+            "month": np.asarray(months, dtype=np.int32),
+            "tier": tier,
+            "tier_names": tier_names,
+            "totals": totals,
+            "approved": approved,
+        }
+
+    @staticmethod
+    def _tier_index(cols: Dict[str, Any]) -> Tuple[np.ndarray, List[str]]:
+        """Tier code per creator with no active subscription mapped to "Free" """
+        names = list(cols["tier_names"])
+        if "Free" not in names:
+            names.append("Free")
+        return np.where(cols["tier"] >= 0, cols["tier"], names.index("Free")), names
+
+    async def _columnar_cohorts(self) -> Tuple[List[Tuple], List[Tuple], Dict[str, int], int]:
+        cols = await self._load_creator_columns()
+        totals, approved = cols["totals"], cols["approved"]
+        tier_idx, tier_names = self._tier_index(cols)
+        k = len(tier_names)
+
+        counts = np.bincount(tier_idx, minlength=k)
+        tier_totals = np.bincount(tier_idx, weights=totals, minlength=k)
+        tier_approved = np.bincount(tier_idx, weights=approved, minlength=k)
+        tier_rows = [
+            (tier_names[t], int(counts[t]), int(tier_totals[t]), int(tier_approved[t]))
+            for t in range(k) if counts[t]
+        ]
+
+        valid = cols["month"] >= 0
+        months, inverse = np.unique(cols["month"][valid], return_inverse=True)
+        month_counts = np.bincount(inverse, minlength=len(months))
+        month_retained = np.bincount(inverse, weights=(cols["tier"][valid] >= 0), minlength=len(months))
+        month_rows = [
+            (_month_label(int(months[m])), int(month_counts[m]), int(month_retained[m]))
+            for m in range(len(months) - 1, max(-1, len(months) - 13), -1)
+        ]
+
+        engagement = {
+            "highly_engaged": int(np.count_nonzero(totals > 10)),
+            "moderately_engaged": int(np.count_nonzero((totals >= 3) & (totals <= 10))),
+            "low_engaged": int(np.count_nonzero((totals >= 1) & (totals < 3))),
+            "inactive": int(np.count_nonzero(totals == 0)),
+        }
+        return tier_rows, month_rows, engagement, len(cols["ids"])
+
+    async def _columnar_ranking(
+        self,
+        sort_by: str,
+        limit: int,
+        tier_filter: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        cols = await self._load_creator_columns()
+        totals, approved = cols["totals"], cols["approved"]
+        tier_idx, tier_names = self._tier_index(cols)
+
+        mask = totals > 0
+        if tier_filter:
+            wanted = [i for i, name in enumerate(tier_names) if name.lower() == tier_filter.lower()]
+            mask &= np.isin(tier_idx, wanted)
+        candidates = np.flatnonzero(mask)
+
+        rates = np.round(approved[candidates] / totals[candidates] * 100, 1)
+        creator_ids = np.asarray([cols["ids"][c] or "" for c in candidates], dtype=str)
+        keys = {
+            "approval_rate": (-totals[candidates], -rates),
+            "total_proposals": (-totals[candidates],),
+            "approved_proposals": (-approved[candidates],),
+        }.get(sort_by, (-rates,))
+        # lexsort sorts by the last key first: ties fall back to creator id like the $sort
+        top = np.lexsort((creator_ids, *keys))[:limit]
+
+        chosen = [cols["ids"][candidates[i]] for i in top]
+        profiles = {
+            c["id"]: c async for c in self.db.creators.find(
+                {"id": {"$in": chosen}}, {"_id": 0, "id": 1, "name": 1, "email": 1, "platforms": 1}
+            )
+        }
+        rankings = []
+        for i in top:
+            c = candidates[i]
+            creator_id = cols["ids"][c]
+            profile = profiles.get(creator_id, {})
             rankings.append({
                 "creator_id": creator_id,
-                "name": creator.get("name"),
-                "email": creator.get("email"),
-                "tier": tier,
-                "total_proposals": total,
-                "approved_proposals": approved,
-                "approval_rate": approval_rate,
-                "platforms": creator.get("platforms", [])
+                "name": profile.get("name"),
+                "email": profile.get("email"),
+                "tier": tier_names[tier_idx[c]],
+                "total_proposals": int(totals[c]),
+                "approved_proposals": int(approved[c]),
+                "approval_rate": float(rates[i]),
+                "platforms": profile.get("platforms", [])
             })
-        
-        # Sort by the specified metric
-        sort_key = {
-            "approval_rate": lambda x: (-x["approval_rate"], -x["total_proposals"]),
-            "total_proposals": lambda x: -x["total_proposals"],
-            "approved_proposals": lambda x: -x["approved_proposals"]
-        }.get(sort_by, lambda x: -x["approval_rate"])
-        
-        rankings.sort(key=sort_key)
-        
-        return rankings[:limit]
+        return rankings
     
     async def get_revenue_analysis(self, period_days: int = 90) -> Dict[str, Any]:
         """
@@ -397,7 +646,8 @@ class ArrisPatternEngine:
         insights = []
         
         # Insight 1: Churn risk analysis
-        churn_patterns = await self._detect_churn_patterns()
+        run, _ = await self._get_detection_run()
+        churn_patterns = run["churn_patterns"]
         if churn_patterns:
             high_risk_count = len([p for p in churn_patterns if p.get("risk_level") == "high"])
             if high_risk_count > 0:
@@ -486,28 +736,117 @@ class ArrisPatternEngine:
         
         return insights
     
-    # ============== PATTERN DETECTION METHODS ==============
+    # ============== DETECTION RUNNER ==============
     
-    async def _detect_success_patterns(self) -> List[Dict[str, Any]]:
-        """Detect platform-wide success patterns."""
-        patterns = []
-        
-        # Aggregate proposal success by platform
-        pipeline = [
+    def _detectors(self) -> List[Tuple[str, Any]]:
+        return [
+            ("success", self._detect_success_patterns),
+            ("risk", self._detect_risk_patterns),
+            ("churn", self._detect_churn_patterns),
+            ("revenue", self._detect_revenue_patterns),
+            ("engagement", self._detect_engagement_patterns),
+            ("trend", self._detect_trend_patterns),
+        ]
+    
+    def _detection_fresh(self) -> bool:
+        return (
+            self._detection_run is not None
+            and time.monotonic() - self._detection_monotonic < self.detection_cache_seconds
+        )
+    
+    async def _get_detection_run(self) -> Tuple[Dict[str, Any], bool]:
+        """
+        The memoized detection run and whether it was reused. Concurrent
+        callers (the admin dashboard fetches several pattern endpoints at
+        once) wait on the lock and share the run started by the first.
+        """
+        if self._detection_fresh():
+            return self._detection_run, True
+        async with self._detection_lock:
+            if self._detection_fresh():
+                return self._detection_run, True
+            self._detection_run = await self._run_detection()
+            self._detection_monotonic = time.monotonic()
+            return self._detection_run, False
+    
+    async def _run_detection(self) -> Dict[str, Any]:
+        """Load the shared snapshot, then run every detector concurrently"""
+        start = time.monotonic()
+        snapshot = await self._load_detection_snapshot()
+        snapshot_ms = round((time.monotonic() - start) * 1000, 1)
+        
+        results = await asyncio.gather(*(
+            self._run_detector(name, detector, snapshot) for name, detector in self._detectors()
+        ))
+        
+        patterns: Dict[str, Any] = {f"{name}_patterns": found for name, found, _ in results}
+        patterns["detected_at"] = snapshot["now"].isoformat()
+        patterns["total_patterns"] = sum(len(found) for _, found, _ in results)
+        patterns["run"] = {
+            "snapshot_ms": snapshot_ms,
+            "total_ms": round((time.monotonic() - start) * 1000, 1),
+            "detectors": {name: timing for name, _, timing in results},
+            "cache_seconds": self.detection_cache_seconds,
+        }
+        logger.info(f"Pattern detection run: {patterns['total_patterns']} patterns in {patterns['run']['total_ms']}ms")
+        return patterns
+    
+    async def _run_detector(self, name: str, detector, snapshot: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """Time one detector; a failing detector reports its error instead of failing the run"""
+        start = time.monotonic()
+        timing: Dict[str, Any] = {}
+        try:
+            found = await detector(snapshot)
+        except Exception as e:
+            logger.error(f"Pattern detector {name} failed: {e}")
+            found = []
+            timing["error"] = str(e)
+        timing["ms"] = round((time.monotonic() - start) * 1000, 1)
+        timing["patterns"] = len(found)
+        return name, found, timing
+    
+    async def _load_detection_snapshot(self) -> Dict[str, Any]:
+        """
+        Base data shared by the detectors of one run, loaded concurrently:
+        per-platform proposal outcomes (success + risk), active creators
+        (churn) and active subscriptions (churn + revenue).
+        """
+        platform_pipeline = [
             {"$unwind": {"path": "$platforms", "preserveNullAndEmptyArrays": True}},
             {"$group": {
                 "_id": "$platforms",
                 "total": {"$sum": 1},
-                "approved": {"$sum": {"$cond": [
-                    {"$in": ["$status", ["approved", "completed", "in_progress"]]}, 1, 0
-                ]}}
+                "approved": {"$sum": {"$cond": [{"$in": ["$status", APPROVED_STATUSES]}, 1, 0]}},
+                "rejected": {"$sum": {"$cond": [{"$eq": ["$status", "rejected"]}, 1, 0]}}
             }},
             {"$match": {"total": {"$gte": 5}}}
         ]
+        platform_stats, creators, subscriptions = await asyncio.gather(
+            self.db.proposals.aggregate(platform_pipeline).to_list(20),
+            self.db.creators.find(
+                {"status": "active"},
+                {"_id": 0, "id": 1, "name": 1, "email": 1, "submitted_at": 1}
+            ).to_list(10000),
+            self.db.creator_subscriptions.find(
+                {"status": "active"},
+                {"_id": 0, "creator_id": 1, "tier": 1}
+            ).to_list(None)
+        )
+        return {
+            "now": datetime.now(timezone.utc),
+            "platform_stats": platform_stats,
+            "creators": creators,
+            "subscriptions": subscriptions,
+        }
+    
+    # ============== PATTERN DETECTION METHODS ==============
+    
+    async def _detect_success_patterns(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Detect platform-wide success patterns."""
+        patterns = []
         
-        platform_stats = await self.db.proposals.aggregate(pipeline).to_list(20)
-        
-        for stat in platform_stats:
+        # Proposal success by platform
+        for stat in snapshot["platform_stats"]:
             platform = stat["_id"] or "Unspecified"
             total = stat["total"]
             approved = stat["approved"]
@@ -557,24 +896,12 @@ class ArrisPatternEngine:
         
         return patterns
     
-    async def _detect_risk_patterns(self) -> List[Dict[str, Any]]:
+    async def _detect_risk_patterns(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect platform-wide risk patterns."""
         patterns = []
         
         # High rejection rate platforms
-        pipeline = [
-            {"$unwind": {"path": "$platforms", "preserveNullAndEmptyArrays": True}},
-            {"$group": {
-                "_id": "$platforms",
-                "total": {"$sum": 1},
-                "rejected": {"$sum": {"$cond": [{"$eq": ["$status", "rejected"]}, 1, 0]}}
-            }},
-            {"$match": {"total": {"$gte": 5}}}
-        ]
-        
-        platform_stats = await self.db.proposals.aggregate(pipeline).to_list(20)
-        
-        for stat in platform_stats:
+        for stat in snapshot["platform_stats"]:
             platform = stat["_id"] or "Unspecified"
             total = stat["total"]
             rejected = stat["rejected"]
@@ -594,7 +921,7 @@ class ArrisPatternEngine:
         # Creators with declining approval
         # (Simplified: check creators with recent rejections)
         recent_rejections = await self.db.proposals.find(
-            {"status": "rejected", "created_at": {"$gte": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()}},
+            {"status": "rejected", "created_at": {"$gte": (snapshot["now"] - timedelta(days=30)).isoformat()}},
             {"_id": 0, "user_id": 1}
         ).to_list(1000)
         
@@ -616,51 +943,43 @@ class ArrisPatternEngine:
         
         return patterns
     
-    async def _detect_churn_patterns(self) -> List[Dict[str, Any]]:
+    async def _detect_churn_patterns(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect churn risk indicators."""
         patterns = []
         
-        # Get active creators
-        creators = await self.db.creators.find(
-            {"status": "active"},
-            {"_id": 0, "id": 1, "name": 1, "email": 1, "submitted_at": 1}
-        ).to_list(10000)
+        # Last proposal per creator in one grouped query (instead of one lookup per creator)
+        last_proposals = await self.db.proposals.aggregate([
+            {"$group": {"_id": "$user_id", "last_created_at": {"$max": "$created_at"}}}
+        ]).to_list(None)
+        last_proposal_at = {p["_id"]: iso(p.get("last_created_at")) for p in last_proposals}
         
-        # Get their recent activity
-        thirty_days_ago = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-        ninety_days_ago = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+        subscription_by_creator: Dict[str, Dict[str, Any]] = {}
+        for sub in snapshot["subscriptions"]:
+            subscription_by_creator.setdefault(sub.get("creator_id"), sub)
+        
+        thirty_days_ago = (snapshot["now"] - timedelta(days=30)).isoformat()
+        ninety_days_ago = (snapshot["now"] - timedelta(days=90)).isoformat()
         
-        for creator in creators:
+        for creator in snapshot["creators"]:
             creator_id = creator.get("id")
-            
-            # Check last proposal date
-            last_proposal = await self.db.proposals.find_one(
-                {"user_id": creator_id},
-                {"_id": 0, "created_at": 1},
-                sort=[("created_at", -1)]
-            )
-            
-            # Check subscription status
-            subscription = await self.db.creator_subscriptions.find_one(
-                {"creator_id": creator_id, "status": "active"},
-                {"_id": 0, "tier": 1, "created_at": 1}
-            )
+            last_created_at = last_proposal_at.get(creator_id)
+            subscription = subscription_by_creator.get(creator_id)
             
             # Calculate risk score
             risk_score = 0
             risk_factors = []
             
-            if not last_proposal:
+            if not last_created_at:
                 risk_score += 40
                 risk_factors.append("No proposals ever submitted")
-            elif last_proposal.get("created_at", "") < ninety_days_ago:
+            elif last_created_at < ninety_days_ago:
                 risk_score += 30
                 risk_factors.append("No proposals in 90+ days")
-            elif last_proposal.get("created_at", "") < thirty_days_ago:
+            elif last_created_at < thirty_days_ago:
                 risk_score += 15
                 risk_factors.append("No proposals in 30+ days")
             
-            if subscription and subscription.get("tier", "").lower() not in ["premium", "elite"]:
+            if subscription and (subscription.get("tier") or "").lower() not in ["premium", "elite"]:
                 # Lower tier = easier to churn
                 risk_score += 10
                 risk_factors.append(f"On {subscription.get('tier', 'Free')} tier")
@@ -688,18 +1007,14 @@ class ArrisPatternEngine:
         
         return patterns[:50]  # Top 50 at-risk creators
     
-    async def _detect_revenue_patterns(self) -> List[Dict[str, Any]]:
+    async def _detect_revenue_patterns(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect revenue-related patterns."""
         patterns = []
         
-        # Get subscription tier distribution
-        tier_pipeline = [
-            {"$match": {"status": "active"}},
-            {"$group": {"_id": "$tier", "count": {"$sum": 1}}}
-        ]
-        
-        tier_stats = await self.db.creator_subscriptions.aggregate(tier_pipeline).to_list(10)
-        tier_dict = {t["_id"]: t["count"] for t in tier_stats}
+        # Subscription tier distribution
+        tier_dict = defaultdict(int)
+        for sub in snapshot["subscriptions"]:
+            tier_dict[sub.get("tier")] += 1
         total_subs = sum(tier_dict.values())
         
         if total_subs > 0:
@@ -729,13 +1044,13 @@ class ArrisPatternEngine:
         
         return patterns
     
-    async def _detect_engagement_patterns(self) -> List[Dict[str, Any]]:
+    async def _detect_engagement_patterns(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect engagement-related patterns."""
         patterns = []
         
         # ARRIS usage patterns
         arris_logs = await self.db.arris_usage_log.find(
-            {"timestamp": {"$gte": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()}},
+            {"timestamp": {"$gte": (snapshot["now"] - timedelta(days=30)).isoformat()}},
             {"_id": 0, "user_id": 1, "query_category": 1, "success": 1}
         ).to_list(10000)
         
@@ -776,13 +1091,13 @@ class ArrisPatternEngine:
         
         return patterns
     
-    async def _detect_trend_patterns(self) -> List[Dict[str, Any]]:
+    async def _detect_trend_patterns(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect temporal trend patterns."""
         patterns = []
         
         # Weekly proposal submission trend
         weekly_pipeline = [
-            {"$match": {"created_at": {"$gte": (datetime.now(timezone.utc) - timedelta(days=56)).isoformat()}}},
+            {"$match": {"created_at": {"$gte": (snapshot["now"] - timedelta(days=56)).isoformat()}}},
             {"$project": {
                 "week": {"$dateToString": {"format": "%Y-W%V", "date": {"$dateFromString": {"dateString": "$created_at"}}}}
             }},
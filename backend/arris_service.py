@@ -7,12 +7,13 @@ With Priority Queue Processing for Premium Users
 import os
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, List, Callable, Awaitable, AsyncIterator
 from datetime import datetime, timezone
 from enum import Enum
 import json
 import time
 from collections import deque
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -38,8 +39,11 @@ class ProcessingStats:
         self.total_processing_time = 0.0
         self.standard_processing_time = 0.0
         self.fast_processing_time = 0.0
+        self.standard_wait_time = 0.0
+        self.fast_wait_time = 0.0
+        self.rejected_requests = 0
         
-    def record(self, priority: str, processing_time: float):
+    def record(self, priority: str, processing_time: float, wait_time: float = 0.0):
         """Record processing statistics"""
         self.total_requests += 1
         self.total_processing_time += processing_time
@@ -47,9 +51,15 @@ class ProcessingStats:
         if priority == ProcessingPriority.FAST:
             self.fast_requests += 1
             self.fast_processing_time += processing_time
+            self.fast_wait_time += wait_time
         else:
             self.standard_requests += 1
             self.standard_processing_time += processing_time
+            self.standard_wait_time += wait_time
+    
+    def record_rejection(self):
+        """Record a request rejected because the queue was full"""
+        self.rejected_requests += 1
     
     def get_stats(self) -> Dict[str, Any]:
         """Get processing statistics"""
@@ -57,75 +67,278 @@ class ProcessingStats:
             "total_requests": self.total_requests,
             "standard_requests": self.standard_requests,
             "fast_requests": self.fast_requests,
+            "rejected_requests": self.rejected_requests,
             "avg_processing_time": self.total_processing_time / max(1, self.total_requests),
             "avg_standard_time": self.standard_processing_time / max(1, self.standard_requests),
             "avg_fast_time": self.fast_processing_time / max(1, self.fast_requests),
+            "avg_standard_wait_time": self.standard_wait_time / max(1, self.standard_requests),
+            "avg_fast_wait_time": self.fast_wait_time / max(1, self.fast_requests),
         }
 
 
 # ============== ARRIS PRIORITY QUEUE ==============
 
+# Worker pool configuration
+QUEUE_WORKERS = int(os.environ.get("ARRIS_QUEUE_WORKERS", "3"))
+QUEUE_MAX_SIZE = int(os.environ.get("ARRIS_QUEUE_MAX_SIZE", "100"))
+
+# FAST jobs picked per STANDARD job when both lanes are waiting
+FAST_LANE_WEIGHT = int(os.environ.get("ARRIS_FAST_LANE_WEIGHT", "3"))
+
+# Concurrent LLM calls allowed per provider (across all workers)
+PROVIDER_CONCURRENCY = {
+    "openai": int(os.environ.get("ARRIS_OPENAI_CONCURRENCY", "3")),
+}
+
+
+class ArrisQueueFullError(Exception):
+    """Raised when the ARRIS queue is at capacity and rejects new work"""
+    pass
+
+
 class ArrisPriorityQueue:
     """
-    Priority queue for ARRIS processing requests.
-    Premium/Elite users (FAST priority) get processed before Standard users.
+    Priority queue and worker pool for ARRIS processing requests.
+    
+    Requests are submitted as jobs and run by a fixed pool of async workers.
+    Workers drain the FAST (Premium/Elite) and STANDARD lanes with weighted-fair
+    selection: FAST_LANE_WEIGHT fast jobs per standard job when both are waiting,
+    so standard work still progresses under sustained premium load. Each
+    provider has its own concurrency limit. When max_queue_size jobs are
+    waiting, new submissions are rejected with ArrisQueueFullError.
+    
+    Usage:
+        result = await queue.submit(request_id, priority, lambda: call_llm(...))
+        
+        async with queue.slot(request_id, priority):
+            ...  # long-lived work such as streaming, holds one worker
     """
     
-    def __init__(self, max_concurrent: int = 3):
+    def __init__(
+        self,
+        max_concurrent: int = QUEUE_WORKERS,
+        max_queue_size: int = QUEUE_MAX_SIZE,
+        fast_weight: int = FAST_LANE_WEIGHT,
+        provider_limits: Optional[Dict[str, int]] = None
+    ):
         self.fast_queue = deque()      # High priority queue
         self.standard_queue = deque()  # Standard priority queue
         self.processing = set()         # Currently processing request IDs
         self.max_concurrent = max_concurrent
+        self.max_queue_size = max_queue_size
+        self.fast_weight = max(1, fast_weight)
+        self.provider_limits = provider_limits or PROVIDER_CONCURRENCY
         self.lock = asyncio.Lock()
         self.stats = ProcessingStats()
+        self._fast_credit = 0
+        self._provider_active: Dict[str, int] = {}
+        self._job_available: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+    
+    # ============== SUBMISSION ==============
+    
+    async def submit(
+        self,
+        request_id: str,
+        priority: str,
+        func: Callable[[], Awaitable[Any]],
+        provider: str = "openai"
+    ) -> Any:
+        """
+        Queue a job and wait for its result.
+        
+        Raises:
+            ArrisQueueFullError: the queue is at capacity
+        """
+        future = await self.enqueue(request_id, priority, func, provider)
+        return await future
+    
+    @asynccontextmanager
+    async def slot(self, request_id: str, priority: str, provider: str = "openai"):
+        """
+        Hold a worker (and provider slot) for the duration of the block.
+        For work that can't be wrapped in a single coroutine, e.g. streaming.
+        """
+        started = asyncio.get_running_loop().create_future()
+        finished = asyncio.Event()
+        
+        async def hold():
+            if not started.done():
+                started.set_result(True)
+            await finished.wait()
+        
+        future = await self.enqueue(request_id, priority, hold, provider)
+        try:
+            await started
+            yield
+        finally:
+            finished.set()
+            if not started.done():
+                future.cancel()
+    
+    async def enqueue(
+        self,
+        request_id: str,
+        priority: str = ProcessingPriority.STANDARD,
+        func: Optional[Callable[[], Awaitable[Any]]] = None,
+        provider: str = "openai"
+    ) -> asyncio.Future:
+        """Add a job to the appropriate lane; returns a future for its result"""
+        self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        job = {
+            "request_id": request_id,
+            "priority": priority,
+            "func": func,
+            "provider": provider,
+            "future": loop.create_future(),
+            "enqueued_at": time.time(),
+        }
         
-    async def enqueue(self, request_id: str, priority: str = ProcessingPriority.STANDARD):
-        """Add request to appropriate queue based on priority"""
         async with self.lock:
+            if len(self.fast_queue) + len(self.standard_queue) >= self.max_queue_size:
+                self.stats.record_rejection()
+                raise ArrisQueueFullError(
+                    f"ARRIS queue is full ({self.max_queue_size} requests waiting)"
+                )
             if priority == ProcessingPriority.FAST:
-                self.fast_queue.append(request_id)
+                self.fast_queue.append(job)
                 logger.info(f"ARRIS Queue: Added {request_id} to FAST queue (position: {len(self.fast_queue)})")
             else:
-                self.standard_queue.append(request_id)
+                self.standard_queue.append(job)
                 logger.info(f"ARRIS Queue: Added {request_id} to STANDARD queue (position: {len(self.standard_queue)})")
+            self._job_available.set()
+        
+        return job["future"]
     
     async def get_queue_position(self, request_id: str, priority: str) -> int:
         """Get position in queue (0 = processing next)"""
         async with self.lock:
+            fast_ids = [job["request_id"] for job in self.fast_queue]
             if priority == ProcessingPriority.FAST:
                 try:
-                    return list(self.fast_queue).index(request_id)
+                    return fast_ids.index(request_id)
                 except ValueError:
                     return 0
             else:
                 # Standard queue position includes fast queue length
-                fast_count = len(self.fast_queue)
                 try:
-                    std_pos = list(self.standard_queue).index(request_id)
-                    return fast_count + std_pos
+                    std_pos = [job["request_id"] for job in self.standard_queue].index(request_id)
+                    return len(fast_ids) + std_pos
                 except ValueError:
                     return 0
     
-    async def dequeue(self) -> Optional[str]:
-        """Get next request to process (FAST queue has priority)"""
+    async def dequeue(self) -> Optional[Dict[str, Any]]:
+        """
+        Get next job to process using weighted-fair lane selection.
+        
+        Only jobs whose provider has a free slot are eligible, and the slot is
+        taken here before the job leaves its lane. A job that can't start yet
+        stays queued, so a FAST submission arriving meanwhile still goes first.
+        Release the slot with release_provider() when the job is done.
+        """
         async with self.lock:
-            # Always process FAST queue first
-            if self.fast_queue:
-                return self.fast_queue.popleft()
-            elif self.standard_queue:
-                return self.standard_queue.popleft()
-            return None
+            fast_job = self._next_runnable(self.fast_queue)
+            standard_job = self._next_runnable(self.standard_queue)
+            use_fast = fast_job is not None and (
+                standard_job is None or self._fast_credit < self.fast_weight
+            )
+            if use_fast:
+                job = fast_job
+                self.fast_queue.remove(job)
+                self._fast_credit += 1
+            elif standard_job is not None:
+                job = standard_job
+                self.standard_queue.remove(job)
+                self._fast_credit = 0
+            else:
+                # Nothing can start until a job is enqueued or a provider slot frees up
+                self._job_available.clear()
+                return None
+            
+            self._provider_active[job["provider"]] = self._provider_active.get(job["provider"], 0) + 1
+            return job
+    
+    async def release_provider(self, provider: str):
+        """Free a provider slot taken by dequeue() and wake workers for waiting jobs"""
+        async with self.lock:
+            self._provider_active[provider] = max(0, self._provider_active.get(provider, 0) - 1)
+            if self.fast_queue or self.standard_queue:
+                self._job_available.set()
+    
+    def _next_runnable(self, lane: deque) -> Optional[Dict[str, Any]]:
+        """First job in the lane whose provider has a free slot (call under lock)"""
+        for job in list(lane):
+            # Drop jobs whose caller has gone away
+            if job["future"].cancelled():
+                lane.remove(job)
+            elif self._provider_has_capacity(job["provider"]):
+                return job
+        return None
+    
+    def _provider_has_capacity(self, provider: str) -> bool:
+        limit = self.provider_limits.get(provider, self.max_concurrent)
+        return self._provider_active.get(provider, 0) < limit
     
     async def mark_processing(self, request_id: str):
         """Mark request as currently processing"""
         async with self.lock:
             self.processing.add(request_id)
     
-    async def mark_complete(self, request_id: str, priority: str, processing_time: float):
+    async def mark_complete(self, request_id: str, priority: str, processing_time: float, wait_time: float = 0.0):
         """Mark request as complete and record stats"""
         async with self.lock:
             self.processing.discard(request_id)
-            self.stats.record(priority, processing_time)
+            self.stats.record(priority, processing_time, wait_time)
+    
+    # ============== WORKERS ==============
+    
+    def _ensure_workers(self):
+        """Start the worker pool on first use (needs a running event loop)"""
+        if self._job_available is None:
+            self._job_available = asyncio.Event()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrent:
+            self._workers.append(asyncio.create_task(self._worker(len(self._workers))))
+    
+    async def _worker(self, worker_id: int):
+        while True:
+            await self._job_available.wait()
+            job = await self.dequeue()
+            if job is None:
+                continue
+            
+            try:
+                await self._run_job(job)
+            finally:
+                await self.release_provider(job["provider"])
+    
+    async def _run_job(self, job: Dict[str, Any]):
+        future = job["future"]
+        if future.cancelled():
+            return
+        
+        start_time = time.time()
+        wait_time = start_time - job["enqueued_at"]
+        await self.mark_processing(job["request_id"])
+        try:
+            result = await job["func"]()
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            await self.mark_complete(
+                job["request_id"], job["priority"], time.time() - start_time, wait_time
+            )
+    
+    async def shutdown(self):
+        """Stop the worker pool"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
     
     def get_queue_stats(self) -> Dict[str, Any]:
         """Get current queue statistics"""
@@ -133,10 +346,45 @@ class ArrisPriorityQueue:
             "fast_queue_length": len(self.fast_queue),
             "standard_queue_length": len(self.standard_queue),
             "currently_processing": len(self.processing),
+            "workers": self.max_concurrent,
+            "max_queue_size": self.max_queue_size,
+            "fast_lane_weight": self.fast_weight,
+            "provider_limits": dict(self.provider_limits),
+            "provider_active": dict(self._provider_active),
             "processing_stats": self.stats.get_stats()
         }
 
 
+# System prompt for proposal insights (shared by blocking and streaming paths)
+PROPOSAL_INSIGHTS_SYSTEM_MESSAGE = """You are ARRIS, an AI assistant for Creators Hive HQ - a platform that helps content creators build successful businesses.
+
+Your role is to analyze project proposals and provide strategic insights. You have access to the creator's profile and historical patterns.
+
+When analyzing a proposal, provide:
+1. A brief summary (2-3 sentences)
+2. Key strengths of the proposal (2-4 points)
+3. Potential risks or challenges (2-4 points)
+4. Strategic recommendations (3-5 actionable points)
+5. Estimated complexity (Low/Medium/High)
+6. Success probability assessment (with reasoning)
+7. Suggested milestones (3-5 key milestones)
+8. Resource suggestions (tools, skills, or support needed)
+
+Be encouraging but realistic. Focus on actionable insights that help the creator succeed.
+
+Respond in JSON format with these exact keys:
+{
+  "summary": "...",
+  "strengths": ["...", "..."],
+  "risks": ["...", "..."],
+  "recommendations": ["...", "..."],
+  "estimated_complexity": "Low|Medium|High",
+  "success_probability": "...",
+  "suggested_milestones": ["...", "..."],
+  "resource_suggestions": "..."
+}"""
+
+
 # ============== ARRIS AI SERVICE ==============
 
 class ArrisService:
@@ -147,12 +395,107 @@ class ArrisService:
         self.model = "gpt-4o"
         self.provider = "openai"
         self.queue = ArrisPriorityQueue()
+        self.llm_cache = None  # LlmResponseCache, set at startup
+    
+    def set_llm_cache(self, llm_cache):
+        """Attach the shared LLM response cache"""
+        self.llm_cache = llm_cache
+    
+    async def complete(
+        self,
+        system_message: str,
+        user_message: str,
+        model: Optional[str] = None,
+        session_id: Optional[str] = None,
+        use_cache: bool = True,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> Tuple[str, bool]:
+        """
+        Single-turn LLM completion through the response cache.
+        
+        Returns:
+            (response text, served from cache)
+        """
+        model = model or self.model
+        params = {
+            key: value for key, value in (("temperature", temperature), ("max_tokens", max_tokens))
+            if value is not None
+        }
+        # Sampling parameters change the answer, so they are part of the cache key
+        cache_model = f"{self.provider}/{model}"
+        if params:
+            cache_model += "?" + "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+        
+        async def send():
+            from emergentintegrations.llm.chat import LlmChat, UserMessage
+            
+            chat = LlmChat(
+                api_key=self.api_key,
+                session_id=session_id or f"arris-{int(time.time() * 1000)}",
+                system_message=system_message
+            ).with_model(self.provider, model)
+            if params:
+                chat = chat.with_params(**params)
+            return await chat.send_message(UserMessage(text=user_message))
+        
+        if not self.llm_cache:
+            response = await send()
+            return (response if isinstance(response, str) else str(response)), False
+        
+        return await self.llm_cache.get_or_generate(
+            model=cache_model,
+            system_message=system_message,
+            user_message=user_message,
+            generate=send,
+            bypass=not use_cache
+        )
+    
+    async def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Chat-completions style wrapper used by services that take an llm_client
+        (auto-approval assessments and onboarding step insights, both behind
+        their own env flags).
+        
+        Returns an OpenAI-shaped dict: {"choices": [{"message": {"content": ...}}]}
+        """
+        system_message = "\n\n".join(m["content"] for m in messages if m.get("role") == "system")
+        user_message = "\n\n".join(m["content"] for m in messages if m.get("role") != "system")
+        
+        response, cached = await self.complete(
+            system_message,
+            user_message,
+            model=model,
+            use_cache=use_cache,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        
+        return {
+            "model": model,
+            "cached": cached,
+            "choices": [{"message": {"role": "assistant", "content": response}}]
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get LLM response cache metrics"""
+        if not self.llm_cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.llm_cache.get_metrics()}
         
     async def generate_project_insights(
         self,
         proposal: Dict[str, Any],
         memory_palace_data: Optional[Dict[str, Any]] = None,
-        processing_speed: str = "standard"
+        processing_speed: str = "standard",
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate AI-powered insights for a project proposal
@@ -162,91 +505,148 @@ class ArrisService:
             proposal: The proposal to analyze
             memory_palace_data: Historical data for context
             processing_speed: 'standard' or 'fast' (Premium/Elite users)
+            use_cache: Serve identical prompts from the LLM response cache
+                (False forces a fresh generation, which then refreshes the cache)
         """
         request_id = f"ARRIS-{proposal.get('id', 'unknown')}-{int(time.time())}"
         priority = ProcessingPriority.FAST if processing_speed == "fast" else ProcessingPriority.STANDARD
         
-        # Add to priority queue
-        await self.queue.enqueue(request_id, priority)
-        
         # Record start time
         start_time = time.time()
         
-        try:
-            # Mark as processing
-            await self.queue.mark_processing(request_id)
-            
-            from emergentintegrations.llm.chat import LlmChat, UserMessage
-            
-            # Build context from proposal
-            context = self._build_proposal_context(proposal, memory_palace_data)
-            
-            # System prompt for ARRIS
-            system_message = """You are ARRIS, an AI assistant for Creators Hive HQ - a platform that helps content creators build successful businesses.
-
-Your role is to analyze project proposals and provide strategic insights. You have access to the creator's profile and historical patterns.
-
-When analyzing a proposal, provide:
-1. A brief summary (2-3 sentences)
-2. Key strengths of the proposal (2-4 points)
-3. Potential risks or challenges (2-4 points)
-4. Strategic recommendations (3-5 actionable points)
-5. Estimated complexity (Low/Medium/High)
-6. Success probability assessment (with reasoning)
-7. Suggested milestones (3-5 key milestones)
-8. Resource suggestions (tools, skills, or support needed)
-
-Be encouraging but realistic. Focus on actionable insights that help the creator succeed.
-
-Respond in JSON format with these exact keys:
-{
-  "summary": "...",
-  "strengths": ["...", "..."],
-  "risks": ["...", "..."],
-  "recommendations": ["...", "..."],
-  "estimated_complexity": "Low|Medium|High",
-  "success_probability": "...",
-  "suggested_milestones": ["...", "..."],
-  "resource_suggestions": "..."
-}"""
-
-            # Initialize chat
-            chat = LlmChat(
-                api_key=self.api_key,
-                session_id=f"arris-proposal-{proposal.get('id', 'unknown')}",
-                system_message=system_message
-            ).with_model(self.provider, self.model)
-            
-            # Create user message with proposal details
-            user_message = UserMessage(text=context)
+        # Build context from proposal
+        context = self._build_proposal_context(proposal, memory_palace_data)
+        queue_wait = 0.0
+        
+        async def run_llm() -> str:
+            async def send():
+                nonlocal queue_wait
+                queue_wait = time.time() - start_time
+                response, _ = await self.complete(
+                    PROPOSAL_INSIGHTS_SYSTEM_MESSAGE,
+                    context,
+                    session_id=f"arris-proposal-{proposal.get('id', 'unknown')}",
+                    use_cache=False
+                )
+                return response
             
-            # Get response
-            response = await chat.send_message(user_message)
+            # Run on the worker pool (FAST lane gets weighted priority)
+            return await self.queue.submit(request_id, priority, send, provider=self.provider)
+        
+        try:
+            # Identical prompts are answered from the cache without queueing
+            if self.llm_cache:
+                response, cached = await self.llm_cache.get_or_generate(
+                    model=f"{self.provider}/{self.model}",
+                    system_message=PROPOSAL_INSIGHTS_SYSTEM_MESSAGE,
+                    user_message=context,
+                    generate=run_llm,
+                    bypass=not use_cache
+                )
+            else:
+                response, cached = await run_llm(), False
             
             # Calculate processing time
             processing_time = time.time() - start_time
             
-            # Mark as complete
-            await self.queue.mark_complete(request_id, priority, processing_time)
-            
             # Parse JSON response
-            insights = self._parse_insights_response(response)
-            insights["generated_at"] = datetime.now(timezone.utc).isoformat()
-            insights["model_used"] = self.model
-            insights["processing_speed"] = processing_speed
-            insights["processing_time_seconds"] = round(processing_time, 2)
-            insights["priority_processed"] = priority == ProcessingPriority.FAST
+            insights = self._finalize_insights(response, processing_speed, processing_time, priority)
+            insights["queue_wait_seconds"] = round(queue_wait, 2)
+            insights["cached"] = cached
             
             logger.info(f"ARRIS: Generated insights for {request_id} in {processing_time:.2f}s (priority: {priority})")
             
             return insights
             
+        except ArrisQueueFullError as e:
+            logger.warning(f"ARRIS: Rejected {request_id}: {e}")
+            insights = self._get_fallback_insights(proposal, processing_speed)
+            insights["queue_full"] = True
+            return insights
+            
         except Exception as e:
-            processing_time = time.time() - start_time
-            await self.queue.mark_complete(request_id, priority, processing_time)
             logger.error(f"Error generating ARRIS insights: {str(e)}")
             return self._get_fallback_insights(proposal, processing_speed)
     
+    async def stream_project_insights(
+        self,
+        proposal: Dict[str, Any],
+        memory_palace_data: Optional[Dict[str, Any]] = None,
+        processing_speed: str = "standard"
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of generate_project_insights.
+        
+        Yields (event, data) tuples: "start", "processing" once a worker picks
+        the request up, "token" for each text chunk, "section" whenever a top-level insight field finishes parsing, and
+        finally "complete" with the same insights dict the blocking call returns.
+        """
+        from arris_streaming import stream_llm_text, IncrementalJSONParser
+        
+        request_id = f"ARRIS-{proposal.get('id', 'unknown')}-{int(time.time())}"
+        priority = ProcessingPriority.FAST if processing_speed == "fast" else ProcessingPriority.STANDARD
+        
+        start_time = time.time()
+        yield "start", {"request_id": request_id, "processing_speed": processing_speed}
+        
+        chunks = []
+        try:
+            # Hold a worker for the whole stream so streaming obeys the same limits
+            async with self.queue.slot(request_id, priority, provider=self.provider):
+                yield "processing", {"queue_wait_seconds": round(time.time() - start_time, 2)}
+                
+                context = self._build_proposal_context(proposal, memory_palace_data)
+                parser = IncrementalJSONParser()
+                time_to_first_token = None
+                
+                async for chunk in stream_llm_text(
+                    api_key=self.api_key,
+                    session_id=f"arris-proposal-{proposal.get('id', 'unknown')}",
+                    system_message=PROPOSAL_INSIGHTS_SYSTEM_MESSAGE,
+                    text=context,
+                    provider=self.provider,
+                    model=self.model
+                ):
+                    if time_to_first_token is None:
+                        time_to_first_token = round(time.time() - start_time, 2)
+                    chunks.append(chunk)
+                    yield "token", {"text": chunk}
+                    for key, value in parser.feed(chunk):
+                        yield "section", {"key": key, "value": value}
+            
+            processing_time = time.time() - start_time
+            insights = self._finalize_insights("".join(chunks), processing_speed, processing_time, priority)
+            insights["time_to_first_token_seconds"] = time_to_first_token
+            
+            logger.info(f"ARRIS: Streamed insights for {request_id} in {processing_time:.2f}s (first token {time_to_first_token}s)")
+            
+        except ArrisQueueFullError as e:
+            logger.warning(f"ARRIS: Rejected {request_id}: {e}")
+            insights = self._get_fallback_insights(proposal, processing_speed)
+            insights["queue_full"] = True
+            
+        except Exception as e:
+            logger.error(f"Error streaming ARRIS insights: {str(e)}")
+            insights = self._get_fallback_insights(proposal, processing_speed)
+        
+        yield "complete", {"insights": insights}
+    
+    def _finalize_insights(
+        self,
+        response: str,
+        processing_speed: str,
+        processing_time: float,
+        priority: str
+    ) -> Dict[str, Any]:
+        """Parse a full LLM response and attach processing metadata"""
+        insights = self._parse_insights_response(response)
+        insights["generated_at"] = datetime.now(timezone.utc).isoformat()
+        insights["model_used"] = self.model
+        insights["processing_speed"] = processing_speed
+        insights["processing_time_seconds"] = round(processing_time, 2)
+        insights["priority_processed"] = priority == ProcessingPriority.FAST
+        return insights
+    
     def _build_proposal_context(
         self,
         proposal: Dict[str, Any],
@@ -0,0 +1,256 @@
+"""
+ARRIS Streaming for Creators Hive HQ
+Token-by-token delivery of LLM responses
+
+This module implements:
+- stream_llm_text: async generator of text chunks from the LLM
+- IncrementalJSONParser: emits top-level JSON fields as soon as they complete
+- Server-Sent Events formatting with optional WebSocket mirroring via ws_manager
+  (lifecycle events only; tokens stay on the SSE response)
+
+Streaming source (first available wins):
+1. LlmChat.stream_message when the installed integration exposes it
+2. litellm streaming completion, only when ARRIS_STREAM_API_KEY and
+   ARRIS_STREAM_API_BASE are both configured for the provider
+3. LlmChat.send_message, delivered as a single chunk
+
+Fallbacks only happen before the first token, so a client never sees a
+response restart midway. When neither 1 nor 2 is available (the default
+configuration) the first SSE event of every stream carries
+"streaming": false, so clients know the text will arrive in one piece.
+"""
+
+import os
+import json
+import uuid
+import logging
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Provider credentials for litellm streaming (e.g. an LLM proxy). The
+# Emergent key passed to LlmChat is never sent to this endpoint.
+STREAM_API_KEY = os.environ.get("ARRIS_STREAM_API_KEY")
+STREAM_API_BASE = os.environ.get("ARRIS_STREAM_API_BASE")
+
+# Events mirrored to the user's WebSocket connections. Tokens are not: with
+# the cross-worker backplane every mirrored event is a Mongo insert.
+WS_MIRRORED_EVENTS = {"start", "complete", "error"}
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+# ============== LLM TOKEN STREAM ==============
+
+@lru_cache(maxsize=1)
+def _llm_chat_streams() -> bool:
+    try:
+        from emergentintegrations.llm.chat import LlmChat
+    except ImportError:
+        return False
+    return hasattr(LlmChat, "stream_message")
+
+
+def streaming_available() -> bool:
+    """Whether stream_llm_text can deliver tokens incrementally"""
+    return bool(STREAM_API_KEY and STREAM_API_BASE) or _llm_chat_streams()
+
+
+async def stream_llm_text(
+    api_key: str,
+    session_id: str,
+    system_message: str,
+    text: str,
+    provider: str = "openai",
+    model: str = "gpt-4o"
+) -> AsyncIterator[str]:
+    """
+    Stream a single-turn LLM response as text chunks.
+
+    Args:
+        api_key: LLM key for LlmChat (not used for the litellm fallback)
+        session_id: LlmChat session id
+        system_message: System prompt
+        text: User message
+        provider: LLM provider
+        model: Model name
+    """
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+    chat = LlmChat(
+        api_key=api_key,
+        session_id=session_id,
+        system_message=system_message
+    ).with_model(provider, model)
+
+    yielded = False
+
+    stream_message = getattr(chat, "stream_message", None)
+    if stream_message is not None:
+        try:
+            async for chunk in stream_message(UserMessage(text=text)):
+                if chunk:
+                    yielded = True
+                    yield chunk
+            return
+        except Exception as e:
+            if yielded:
+                raise
+            logger.warning(f"LlmChat streaming unavailable, trying litellm: {e}")
+
+    if STREAM_API_KEY and STREAM_API_BASE:
+        try:
+            import litellm
+
+            response = await litellm.acompletion(
+                model=f"{provider}/{model}",
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": text}
+                ],
+                api_key=STREAM_API_KEY,
+                api_base=STREAM_API_BASE,
+                stream=True
+            )
+            async for part in response:
+                delta = part.choices[0].delta.content if part.choices else None
+                if delta:
+                    yielded = True
+                    yield delta
+            if yielded:
+                return
+        except Exception as e:
+            if yielded:
+                raise
+            logger.warning(f"litellm streaming failed, falling back to full response: {e}")
+
+    # Last resort: one chunk with the whole response
+    response = await chat.send_message(UserMessage(text=text))
+    yield response if isinstance(response, str) else str(response)
+
+
+# ============== INCREMENTAL JSON ==============
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Feed raw text chunks; every top-level "key": value pair is returned as
+    soon as its closing delimiter arrives. Text before the opening brace
+    (e.g. a ```json fence) is ignored.
+
+    Usage:
+        parser = IncrementalJSONParser()
+        for key, value in parser.feed(chunk):
+            ...
+    """
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self._member: List[str] = []
+        self._depth = 0
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk and return newly completed (key, value) pairs"""
+        completed: List[Tuple[str, Any]] = []
+
+        for ch in chunk:
+            if self._done:
+                break
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._done = True
+                    self._emit(completed)
+                    break
+            elif ch == "," and self._depth == 1:
+                self._emit(completed)
+                continue
+
+            self._member.append(ch)
+
+        return completed
+
+    def _emit(self, completed: List[Tuple[str, Any]]):
+        member = "".join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except ValueError:
+            return
+        for key, value in parsed.items():
+            self.values[key] = value
+            completed.append((key, value))
+
+
+# ============== SERVER-SENT EVENTS ==============
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def sse_event_stream(
+    events: AsyncIterator[Tuple[str, Dict[str, Any]]],
+    ws_manager=None,
+    user_id: Optional[str] = None,
+    stream_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Turn (event, data) tuples into SSE text, mirroring lifecycle events
+    (WS_MIRRORED_EVENTS) to the user's WebSocket connections when ws_manager
+    and user_id are given. The first event carries "streaming": whether
+    token events arrive incrementally or as one chunk.
+    """
+    from websocket_service import NotificationType
+
+    stream_id = stream_id or f"STREAM-{uuid.uuid4().hex[:12].upper()}"
+    first = True
+
+    async for event, data in events:
+        payload = {"stream_id": stream_id, **data}
+        if first:
+            payload["streaming"] = streaming_available()
+            first = False
+        if ws_manager is not None and user_id and event in WS_MIRRORED_EVENTS:
+            await ws_manager.send_to_user(
+                user_id,
+                NotificationType.ARRIS_STREAM,
+                {"event": event, **payload}
+            )
+        yield format_sse(event, payload)
@@ -8,7 +8,7 @@ import logging
 import asyncio
 import tempfile
 import base64
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, AsyncIterator
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
@@ -212,28 +212,8 @@ class ArrisVoiceService:
         from emergentintegrations.llm.chat import LlmChat, UserMessage
         
         try:
-            # Build context for voice query
-            system_message = """You are ARRIS, a friendly AI assistant for Creators Hive HQ. You help content creators build successful businesses.
-
-You are currently having a VOICE conversation, so:
-- Keep responses concise (2-4 sentences max)
-- Be conversational and friendly
-- Avoid bullet points or complex formatting
-- Speak naturally as if talking to a friend
-- Be encouraging and supportive
-
-If the creator asks about their projects, proposals, or business strategy, provide helpful guidance.
-If they have a specific question, answer it directly."""
-
-            # Add creator context if available
-            if creator_context:
-                system_message += f"""
-
-Creator Profile:
-- Name: {creator_context.get('name', 'Creator')}
-- Platforms: {', '.join(creator_context.get('platforms', []))}
-- Niche: {creator_context.get('niche', 'Content Creation')}"""
-
+            system_message = self._build_voice_system_message(creator_context)
+            
             # Initialize chat
             chat = LlmChat(
                 api_key=self.api_key,
@@ -280,6 +260,106 @@ Creator Profile:
         
         return result
     
+    async def stream_voice_query(
+        self,
+        audio_data: bytes,
+        filename: str,
+        creator_context: Optional[Dict[str, Any]] = None,
+        respond_with_voice: bool = True,
+        voice: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of voice_query.
+        
+        Yields (event, data) tuples: "transcription", "token" for each chunk of
+        the ARRIS reply, "response" once the text is complete, "audio" when TTS
+        was requested, and finally "complete" with the same dict voice_query returns.
+        """
+        from arris_streaming import stream_llm_text
+        
+        result = {
+            "transcription": None,
+            "arris_response": None,
+            "audio_response": None,
+            "total_processing_time": 0,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        
+        total_start = datetime.now(timezone.utc)
+        
+        transcription = await self.transcribe_audio(audio_data, filename)
+        result["transcription"] = transcription
+        yield "transcription", transcription
+        
+        if not transcription.get("success") or not transcription.get("text"):
+            result["error"] = "Failed to transcribe audio"
+            yield "complete", result
+            return
+        
+        user_query = transcription["text"]
+        error_text = "I'm sorry, I encountered an error processing your request. Please try again."
+        
+        try:
+            chunks = []
+            async for chunk in stream_llm_text(
+                api_key=self.api_key,
+                session_id=f"arris-voice-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                system_message=self._build_voice_system_message(creator_context),
+                text=user_query
+            ):
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+            
+            response = "".join(chunks)
+            result["arris_response"] = {
+                "success": True,
+                "text": response,
+                "query": user_query
+            }
+        except Exception as e:
+            logger.error(f"ARRIS Voice: Streaming query error - {str(e)}")
+            response = error_text
+            result["arris_response"] = {
+                "success": False,
+                "error": str(e),
+                "text": error_text
+            }
+        yield "response", result["arris_response"]
+        
+        if respond_with_voice and response:
+            result["audio_response"] = await self.generate_speech(text=response, voice=voice)
+            yield "audio", result["audio_response"]
+        
+        result["total_processing_time"] = round(
+            (datetime.now(timezone.utc) - total_start).total_seconds(), 2
+        )
+        yield "complete", result
+    
+    def _build_voice_system_message(self, creator_context: Optional[Dict[str, Any]] = None) -> str:
+        """Build the system prompt for a voice conversation"""
+        system_message = """You are ARRIS, a friendly AI assistant for Creators Hive HQ. You help content creators build successful businesses.
+
+You are currently having a VOICE conversation, so:
+- Keep responses concise (2-4 sentences max)
+- Be conversational and friendly
+- Avoid bullet points or complex formatting
+- Speak naturally as if talking to a friend
+- Be encouraging and supportive
+
+If the creator asks about their projects, proposals, or business strategy, provide helpful guidance.
+If they have a specific question, answer it directly."""
+
+        # Add creator context if available
+        if creator_context:
+            system_message += f"""
+
+Creator Profile:
+- Name: {creator_context.get('name', 'Creator')}
+- Platforms: {', '.join(creator_context.get('platforms', []))}
+- Niche: {creator_context.get('niche', 'Content Creation')}"""
+        
+        return system_message
+    
     def get_available_voices(self) -> Dict[str, Any]:
         """Get list of available TTS voices"""
         return {
@@ -10,6 +10,8 @@ from passlib.context import CryptContext
 from pydantic import BaseModel, Field, EmailStr
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import uuid
 import os
 
@@ -19,11 +21,36 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# BCRYPT_ROUNDS is the cost factor for new hashes; stored hashes with any
+# other cost are transparently rehashed on the next successful login.
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+# bcrypt is CPU-bound; run it off the event loop on a bounded pool
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "4"))
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
 
 # Security scheme
 security = HTTPBearer()
 
+# Principal cache (set at startup); lets the dependencies below skip the
+# per-request user lookup
+_principal_cache = None
+
+def set_principal_cache(cache):
+    """Resolve authenticated users through a PrincipalCache"""
+    global _principal_cache
+    _principal_cache = cache
+
 # ============== MODELS ==============
 
 class AdminUser(BaseModel):
@@ -66,6 +93,28 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+async def _run_password_work(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, func, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password thread pool"""
+    return await _run_password_work(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password thread pool"""
+    return await _run_password_work(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    Verify a password and, if its hash uses an outdated cost factor, return
+    a fresh hash to store.
+
+    Returns:
+        (valid, new_hash or None)
+    """
+    return await _run_password_work(pwd_context.verify_and_update, plain_password, hashed_password)
+
 # ============== JWT UTILITIES ==============
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -112,6 +161,13 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise credentials_exception
     
     # If db is provided, verify user exists
+    if db is not None and _principal_cache is not None:
+        try:
+            principal = await _principal_cache.resolve(token, user_type="admin")
+        except HTTPException:
+            raise credentials_exception
+        return principal["data"]
+    
     if db is not None:
         user = await db.admin_users.find_one({"email": token_data.email}, {"_id": 0, "hashed_password": 0})
         if user is None:
@@ -136,8 +192,11 @@ async def authenticate_user(db, email: str, password: str) -> Optional[dict]:
     user = await db.admin_users.find_one({"email": email})
     if not user:
         return None
-    if not verify_password(password, user["hashed_password"]):
+    valid, new_hash = await verify_and_update_password(password, user["hashed_password"])
+    if not valid:
         return None
+    if new_hash:
+        await db.admin_users.update_one({"id": user["id"]}, {"$set": {"hashed_password": new_hash}})
     return user
 
 async def create_admin_user(db, user_data: AdminUserCreate) -> dict:
@@ -154,7 +213,7 @@ async def create_admin_user(db, user_data: AdminUserCreate) -> dict:
     admin_user = AdminUser(
         email=user_data.email,
         name=user_data.name,
-        hashed_password=get_password_hash(user_data.password)
+        hashed_password=await get_password_hash_async(user_data.password)
     )
     
     doc = admin_user.model_dump()
@@ -215,7 +274,7 @@ async def seed_default_admin(db):
             id="ADMIN-0001",
             email="admin@hivehq.com",
             name="System Admin",
-            hashed_password=get_password_hash("admin123"),
+            hashed_password=await get_password_hash_async("admin123"),
             role="superadmin"
         )
         doc = default_admin.model_dump()
@@ -233,8 +292,11 @@ async def authenticate_creator(db, email: str, password: str) -> Optional[dict]:
         return None
     if not creator.get("hashed_password"):
         return None
-    if not verify_password(password, creator["hashed_password"]):
+    valid, new_hash = await verify_and_update_password(password, creator["hashed_password"])
+    if not valid:
         return None
+    if new_hash:
+        await db.creators.update_one({"id": creator["id"]}, {"$set": {"hashed_password": new_hash}})
     return creator
 
 async def login_creator(db, email: str, password: str):
@@ -304,6 +366,13 @@ async def get_current_creator(credentials: HTTPAuthorizationCredentials = Depend
         raise credentials_exception
     
     # If db is provided, verify creator exists
+    if db is not None and _principal_cache is not None:
+        try:
+            principal = await _principal_cache.resolve(token, user_type="creator")
+        except HTTPException:
+            raise credentials_exception
+        return principal["data"]
+    
     if db is not None:
         creator = await db.creators.find_one(
             {"email": token_data.email}, 
@@ -21,6 +21,10 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# LLM assessment of edge-case applications. Off by default: with
+# arris_override_enabled a HIGH-confidence answer can auto-approve or reject.
+ARRIS_APPROVAL_ASSESSMENT_ENABLED = os.environ.get("ARRIS_APPROVAL_ASSESSMENT_ENABLED", "false").lower() == "true"
+
 
 # ============== DEFAULT APPROVAL RULES ==============
 
@@ -151,9 +155,11 @@ class AutoApprovalService:
     - Admin rule management
     """
     
-    def __init__(self, db: AsyncIOMotorDatabase, llm_client=None):
+    def __init__(self, db: AsyncIOMotorDatabase, llm_client=None, metrics_service=None, pattern_engine=None):
         self.db = db
         self.llm_client = llm_client
+        self.metrics_service = metrics_service
+        self.pattern_engine = pattern_engine
         self.approval_threshold = 70  # Default: 70% score to auto-approve
         
     async def initialize(self):
@@ -547,7 +553,7 @@ class AutoApprovalService:
         rule_results: List[Dict]
     ) -> Optional[Dict[str, Any]]:
         """Get ARRIS AI assessment for edge cases"""
-        if not self.llm_client:
+        if not self.llm_client or not ARRIS_APPROVAL_ASSESSMENT_ENABLED:
             return None
         
         try:
@@ -693,6 +699,12 @@ CONFIDENCE: [HIGH/MEDIUM/LOW]"""
                 # Mark for manual review
                 action_taken = await self._mark_for_review(creator_id, evaluation)
                 new_status = "pending_review"
+            
+            # Status changed: recompute the materialized metrics row (tier included)
+            if self.metrics_service:
+                await self.metrics_service.refresh_creator(creator_id)
+            if self.pattern_engine:
+                self.pattern_engine.invalidate_cohorts()
         
         # Notify admin if configured
         if config.get("notify_admin_on_auto_approve") and new_status == "approved":
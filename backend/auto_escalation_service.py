@@ -4,15 +4,40 @@ Auto-Escalation Service (Module B5)
 Automatically escalates stalled proposals for admin review.
 Monitors proposal status, tracks time in each stage, and escalates
 when thresholds are exceeded.
+
+Scans are set-based: one aggregation computes time-in-status for every
+monitored proposal against the configured thresholds and joins its open
+escalations; escalations, tasks, priority boosts and webhook events are
+then written in bulk, batch by batch.
 """
 
+import os
+import time
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
+from pymongo import UpdateMany
+from index_registry import index_registry
+from websocket_service import NotificationType
 import uuid
 
 logger = logging.getLogger(__name__)
 
+index_registry.register("escalation_log", [("proposal_id", 1)], owner="auto_escalation")
+index_registry.register("escalation_log", [("created_at", -1)], owner="auto_escalation")
+index_registry.register("escalation_log", [("level", 1)], owner="auto_escalation")
+index_registry.register("escalation_log", [("resolved", 1)], owner="auto_escalation")
+index_registry.register("escalation_log", [("proposal_id", 1), ("resolved", 1), ("level", 1)], owner="auto_escalation")
+index_registry.register_query("escalation_log", {"proposal_id": "PROP-1", "resolved": False}, owner="auto_escalation")
+
+ESCALATION_SCAN_BATCH_SIZE = int(os.environ.get("ESCALATION_SCAN_BATCH_SIZE", "1000"))
+ESCALATION_NOTIFY_CONCURRENCY = int(os.environ.get("ESCALATION_NOTIFY_CONCURRENCY", "20"))
+# Above this many new escalations in one scan, admins get a single digest
+ESCALATION_ADMIN_DIGEST_THRESHOLD = int(os.environ.get("ESCALATION_ADMIN_DIGEST_THRESHOLD", "25"))
+# Cap on escalations echoed back in the scan result
+ESCALATION_SCAN_RESULT_LIMIT = 100
+
 
 # Escalation levels
 class EscalationLevel:
@@ -100,12 +125,14 @@ class AutoEscalationService:
         db,
         ws_manager=None,
         notification_service=None,
-        email_service=None
+        email_service=None,
+        pattern_engine=None
     ):
         self.db = db
         self.ws_manager = ws_manager
         self.notification_service = notification_service
         self.email_service = email_service
+        self.pattern_engine = pattern_engine
         self.thresholds = DEFAULT_THRESHOLDS.copy()
     
     async def initialize(self):
@@ -116,12 +143,6 @@ class AutoEscalationService:
             self.thresholds.update(config.get("thresholds", {}))
             logger.info("Loaded custom escalation thresholds from database")
         
-        # Ensure indexes
-        await self.db.escalation_log.create_index([("proposal_id", 1)])
-        await self.db.escalation_log.create_index([("created_at", -1)])
-        await self.db.escalation_log.create_index([("level", 1)])
-        await self.db.escalation_log.create_index([("resolved", 1)])
-        
         logger.info("Auto-Escalation Service initialized")
     
     async def get_config(self) -> Dict[str, Any]:
@@ -289,12 +310,10 @@ class AutoEscalationService:
         actions = ESCALATION_ACTIONS.get(escalation_level, {})
         actions_taken = []
         
-        if actions.get("notify_admin") and self.notification_service:
-            await self._notify_admin(escalation_record)
+        if actions.get("notify_admin") and await self._notify_admin(escalation_record):
             actions_taken.append("admin_notified")
         
-        if actions.get("notify_creator") and self.notification_service:
-            await self._notify_creator(escalation_record)
+        if actions.get("notify_creator") and await self._notify_creator(escalation_record):
             actions_taken.append("creator_notified")
         
         if actions.get("create_task"):
@@ -313,6 +332,7 @@ class AutoEscalationService:
         
         # Create webhook event
         await self._create_webhook_event(escalation_record)
+        self._invalidate_cohorts()
         
         return {
             "success": True,
@@ -347,8 +367,10 @@ class AutoEscalationService:
     async def scan_all_proposals(self) -> Dict[str, Any]:
         """
         Scan all proposals for escalation needs.
-        This should be run periodically (e.g., hourly via cron).
+        Runs hourly via the job scheduler.
         """
+        scan_started = time.monotonic()
+        timings = {"select": 0.0, "escalation_log": 0.0, "actions": 0.0, "notifications": 0.0}
         results = {
             "scanned": 0,
             "needs_escalation": 0,
@@ -356,50 +378,315 @@ class AutoEscalationService:
             "errors": [],
             "escalations": []
         }
+        now = datetime.now(timezone.utc)
         
-        # Find all proposals in monitored statuses
-        proposals = await self.db.proposals.find(
-            {"status": {"$in": list(self.thresholds.keys())}},
-            {"proposal_id": 1, "id": 1, "_id": 0}
-        ).to_list(1000)
-        
-        results["scanned"] = len(proposals)
+        results["scanned"] = await self.db.proposals.count_documents(
+            {"status": {"$in": list(self.thresholds.keys())}}
+        )
         
-        for proposal in proposals:
-            # Support both 'id' and 'proposal_id' field names
-            proposal_id = proposal.get("proposal_id") or proposal.get("id")
-            if not proposal_id:
-                continue
+        phase = time.monotonic()
+        cursor = self.db.proposals.aggregate(
+            self._escalation_pipeline(now, escalatable_only=True),
+            allowDiskUse=True
+        )
+        while True:
+            batch = await cursor.to_list(ESCALATION_SCAN_BATCH_SIZE)
+            timings["select"] += time.monotonic() - phase
+            if not batch:
+                break
             
+            results["needs_escalation"] += len(batch)
             try:
-                check = await self.check_proposal(proposal_id)
-                
-                if check.get("needs_escalation"):
-                    results["needs_escalation"] += 1
-                    
-                    # Auto-escalate
-                    escalation = await self.escalate_proposal(
-                        proposal_id=proposal_id,
-                        reason=EscalationReason.REVIEW_TIMEOUT
-                    )
-                    
-                    if escalation.get("success"):
-                        results["escalated"] += 1
-                        results["escalations"].append(escalation)
-                        
+                records = await self._apply_escalations(batch, now, timings)
             except Exception as e:
-                logger.error(f"Error checking proposal {proposal_id}: {e}")
-                results["errors"].append({"proposal_id": proposal_id, "error": str(e)})
+                logger.error(f"Escalation batch failed: {e}")
+                results["errors"].append({
+                    "proposal_ids": [row["pid"] for row in batch],
+                    "error": str(e)
+                })
+                phase = time.monotonic()
+                continue
+            
+            results["escalated"] += len(records)
+            room = ESCALATION_SCAN_RESULT_LIMIT - len(results["escalations"])
+            results["escalations"].extend(
+                {
+                    "success": True,
+                    "escalation_id": record["escalation_id"],
+                    "level": record["level"],
+                    "proposal_id": record["proposal_id"],
+                    "actions_taken": record["actions_taken"]
+                }
+                for record in records[:max(room, 0)]
+            )
+            phase = time.monotonic()
+        
+        timings["total"] = time.monotonic() - scan_started
+        results["phase_timings_ms"] = {k: round(v * 1000, 1) for k, v in timings.items()}
         
         # Log scan results
         await self.db.escalation_scan_log.insert_one({
             "scan_id": f"SCAN-{uuid.uuid4().hex[:8].upper()}",
-            "scanned_at": datetime.now(timezone.utc).isoformat(),
-            "results": results
+            "scanned_at": now.isoformat(),
+            "results": results,
+            "phase_timings_ms": results["phase_timings_ms"]
         })
         
+        logger.info(
+            f"Escalation scan: {results['scanned']} monitored, {results['escalated']} escalated "
+            f"in {results['phase_timings_ms']['total']}ms"
+        )
         return results
     
+    def _escalation_pipeline(
+        self,
+        now: datetime,
+        escalatable_only: bool = False,
+        min_hours: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregation over monitored proposals yielding proposal id, status,
+        last status change, current escalation level (or None) and whether
+        that level already has an open escalation.
+        """
+        statuses = list(self.thresholds.keys())
+        
+        # Highest level first, as in check_proposal
+        branches = []
+        for status in statuses:
+            for level in [EscalationLevel.CRITICAL, EscalationLevel.URGENT, EscalationLevel.ELEVATED]:
+                threshold = self.thresholds[status].get(level)
+                if threshold:
+                    branches.append({
+                        "case": {"$and": [
+                            {"$eq": ["$status", status]},
+                            self._changed_before("$last_change", now - timedelta(hours=threshold))
+                        ]},
+                        "then": level
+                    })
+        
+        pipeline = [
+            {"$match": {"status": {"$in": statuses}}},
+            {"$project": {
+                "_id": 0,
+                "pid": {"$ifNull": ["$proposal_id", "$id"]},
+                "status": 1,
+                "title": 1,
+                "user_id": 1,
+                "fallback_change": {"$ifNull": ["$updated_at", "$created_at"]},
+                # changed_at of every history entry for the current status
+                "status_changes": {"$map": {
+                    "input": {"$filter": {
+                        "input": {"$ifNull": ["$status_history", []]},
+                        "as": "entry",
+                        "cond": {"$eq": ["$$entry.status", "$status"]}
+                    }},
+                    "as": "entry",
+                    "in": "$$entry.changed_at"
+                }}
+            }},
+            {"$addFields": {"last_change": {"$ifNull": [
+                {"$arrayElemAt": ["$status_changes", -1]},
+                "$fallback_change"
+            ]}}},
+            {"$project": {"status_changes": 0, "fallback_change": 0}},
+            # No timestamps at all: the proposal can't be aged, and a null
+            # would sort below every cutoff and match the highest level
+            {"$match": {"pid": {"$ne": None}, "last_change": {"$ne": None}}},
+            {"$addFields": {"level": {"$switch": {"branches": branches, "default": None}}}}
+        ]
+        
+        if escalatable_only:
+            pipeline.append({"$match": {"level": {"$ne": None}}})
+        if min_hours is not None:
+            pipeline.append({"$match": {"$expr": self._changed_before(
+                "$last_change", now - timedelta(hours=min_hours)
+            )}})
+        
+        pipeline += [
+            # Only open escalations; (proposal_id, resolved, level) index
+            {"$lookup": {
+                "from": "escalation_log",
+                "localField": "pid",
+                "foreignField": "proposal_id",
+                "pipeline": [
+                    {"$match": {"resolved": False}},
+                    {"$project": {"_id": 0, "level": 1}}
+                ],
+                "as": "open_escalations"
+            }},
+            {"$addFields": {"already_escalated": {"$in": ["$level", "$open_escalations.level"]}}},
+            {"$project": {"open_escalations": 0}}
+        ]
+        
+        if escalatable_only:
+            pipeline.append({"$match": {"already_escalated": False}})
+        return pipeline
+    
+    def _changed_before(self, field: str, cutoff: datetime) -> Dict[str, Any]:
+        """$expr: field (ISO string or BSON date) is at or before cutoff"""
+        return {"$cond": [
+            {"$eq": [{"$type": field}, "date"]},
+            {"$lte": [field, cutoff]},
+            {"$lte": [field, cutoff.isoformat()]}
+        ]}
+    
+    def _hours_since(self, value, now: datetime) -> float:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (now - value).total_seconds() / 3600
+    
+    async def _apply_escalations(
+        self,
+        rows: List[Dict[str, Any]],
+        now: datetime,
+        timings: Dict[str, float]
+    ) -> List[Dict[str, Any]]:
+        """Create escalations for a batch of scan rows with bulk writes"""
+        phase = time.monotonic()
+        created_at = now.isoformat()
+        
+        records = []
+        for row in rows:
+            level = row["level"]
+            actions = ESCALATION_ACTIONS.get(level, {})
+            # Notification actions are recorded once they have been sent
+            actions_taken = []
+            if actions.get("create_task"):
+                actions_taken.append("task_created")
+            if actions.get("priority_boost"):
+                actions_taken.append(f"priority_boosted_by_{actions['priority_boost']}")
+            
+            records.append({
+                "escalation_id": f"ESC-{uuid.uuid4().hex[:8].upper()}",
+                "proposal_id": row["pid"],
+                "proposal_title": row.get("title"),
+                "creator_id": row.get("user_id"),
+                "status": row.get("status"),
+                "level": level,
+                "reason": EscalationReason.REVIEW_TIMEOUT,
+                "notes": None,
+                "hours_in_status": round(self._hours_since(row["last_change"], now), 1),
+                "escalated_by": "system",
+                "actions_taken": actions_taken,
+                "resolved": False,
+                "resolved_at": None,
+                "resolved_by": None,
+                "resolution_notes": None,
+                "created_at": created_at
+            })
+        
+        await self.db.escalation_log.insert_many([dict(r) for r in records], ordered=False)
+        timings["escalation_log"] += time.monotonic() - phase
+        
+        phase = time.monotonic()
+        tasks = [
+            self._escalation_task_doc(record, now)
+            for record in records
+            if ESCALATION_ACTIONS.get(record["level"], {}).get("create_task")
+        ]
+        if tasks:
+            await self.db.tasks.insert_many(tasks, ordered=False)
+        
+        # One UpdateMany per boost amount
+        boosts: Dict[int, List[str]] = {}
+        for record in records:
+            amount = ESCALATION_ACTIONS.get(record["level"], {}).get("priority_boost")
+            if amount:
+                boosts.setdefault(amount, []).append(record["proposal_id"])
+        if boosts:
+            await self.db.proposals.bulk_write([
+                UpdateMany(
+                    {"$or": [{"proposal_id": {"$in": ids}}, {"id": {"$in": ids}}]},
+                    self._priority_boost_update(amount, created_at)
+                )
+                for amount, ids in boosts.items()
+            ], ordered=False)
+        
+        await self.db.webhook_events.insert_many(
+            [self._webhook_event_doc(record, now) for record in records],
+            ordered=False
+        )
+        self._invalidate_cohorts()
+        timings["actions"] += time.monotonic() - phase
+        
+        phase = time.monotonic()
+        await self._notify_batch(records)
+        timings["notifications"] += time.monotonic() - phase
+        
+        return records
+    
+    def _invalidate_cohorts(self):
+        """
+        Drop the pattern engine's cached cohorts/rankings. creator_metrics
+        needs no refresh: escalation never writes the status or platforms
+        it is computed from.
+        """
+        if self.pattern_engine:
+            self.pattern_engine.invalidate_cohorts()
+    
+    async def _notify_batch(self, records: List[Dict[str, Any]]):
+        """
+        Admin + creator notifications for a batch, with bounded concurrency.
+        Records "admin_notified" / "creator_notified" only for sends that succeeded.
+        """
+        if not self.notification_service:
+            return
+        
+        admin_records = [r for r in records if ESCALATION_ACTIONS.get(r["level"], {}).get("notify_admin")]
+        creator_records = [r for r in records if ESCALATION_ACTIONS.get(r["level"], {}).get("notify_creator")]
+        
+        semaphore = asyncio.Semaphore(ESCALATION_NOTIFY_CONCURRENCY)
+        
+        async def bounded(action: str, batch: List[Dict[str, Any]], coro):
+            async with semaphore:
+                return action, batch, await coro
+        
+        jobs = [bounded("creator_notified", [r], self._notify_creator(r)) for r in creator_records]
+        if len(admin_records) > ESCALATION_ADMIN_DIGEST_THRESHOLD:
+            jobs.append(bounded("admin_notified", admin_records, self._notify_admin_digest(admin_records)))
+        else:
+            jobs += [bounded("admin_notified", [r], self._notify_admin(r)) for r in admin_records]
+        
+        notified: Dict[str, List[str]] = {}
+        for action, batch, sent in await asyncio.gather(*jobs):
+            if not sent:
+                continue
+            for record in batch:
+                record["actions_taken"].append(action)
+                notified.setdefault(action, []).append(record["escalation_id"])
+        
+        if notified:
+            await self.db.escalation_log.bulk_write([
+                UpdateMany({"escalation_id": {"$in": ids}}, {"$push": {"actions_taken": action}})
+                for action, ids in notified.items()
+            ], ordered=False)
+    
+    async def _notify_admin_digest(self, records: List[Dict[str, Any]]) -> bool:
+        """Single admin notification summarizing a large batch of escalations."""
+        by_level: Dict[str, int] = {}
+        for record in records:
+            by_level[record["level"]] = by_level.get(record["level"], 0) + 1
+        
+        try:
+            await self.notification_service.manager.broadcast_to_admins(
+                NotificationType.SYSTEM_ALERT,
+                {
+                    "type": "escalation.batch_created",
+                    "count": len(records),
+                    "by_level": by_level,
+                    "escalation_ids": [r["escalation_id"] for r in records[:ESCALATION_SCAN_RESULT_LIMIT]],
+                    "message": f"{len(records)} proposals escalated by the scheduled scan",
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to notify admins about escalation batch: {e}")
+            return False
+    
     async def get_escalation_dashboard(self) -> Dict[str, Any]:
         """Get dashboard data for escalation management."""
         now = datetime.now(timezone.utc)
@@ -500,28 +787,24 @@ class AutoEscalationService:
         Get all proposals that are stalled (nearing escalation).
         Useful for proactive admin monitoring.
         """
-        stalled = []
-        
-        proposals = await self.db.proposals.find(
-            {"status": {"$in": list(self.thresholds.keys())}},
-            {"_id": 0}
-        ).to_list(1000)
+        now = datetime.now(timezone.utc)
+        rows = await self.db.proposals.aggregate(
+            self._escalation_pipeline(now, min_hours=threshold_hours),
+            allowDiskUse=True
+        ).to_list(None)
         
-        for proposal in proposals:
-            # Support both 'id' and 'proposal_id' field names
-            proposal_id = proposal.get("proposal_id") or proposal.get("id")
-            check = await self.check_proposal(proposal_id)
-            
-            if check.get("hours_in_status", 0) >= threshold_hours:
-                stalled.append({
-                    "proposal_id": proposal_id,
-                    "title": proposal.get("title"),
-                    "status": proposal.get("status"),
-                    "creator_id": proposal.get("user_id"),
-                    "hours_stalled": check.get("hours_in_status"),
-                    "escalation_level": check.get("escalation_level"),
-                    "already_escalated": check.get("already_escalated", False)
-                })
+        stalled = [
+            {
+                "proposal_id": row["pid"],
+                "title": row.get("title"),
+                "status": row.get("status"),
+                "creator_id": row.get("user_id"),
+                "hours_stalled": round(self._hours_since(row["last_change"], now), 1),
+                "escalation_level": row.get("level"),
+                "already_escalated": row.get("already_escalated", False)
+            }
+            for row in rows
+        ]
         
         # Sort by hours stalled (most urgent first)
         stalled.sort(key=lambda x: x.get("hours_stalled", 0), reverse=True)
@@ -627,41 +910,46 @@ class AutoEscalationService:
         else:
             return "healthy"
     
-    async def _notify_admin(self, escalation: Dict[str, Any]):
-        """Send admin notification for escalation."""
+    async def _notify_admin(self, escalation: Dict[str, Any]) -> bool:
+        """Send admin notification for escalation. Returns True if it was sent."""
         if not self.notification_service:
             logger.warning("Notification service not available for admin escalation alert")
-            return
+            return False
         
         try:
-            await self.notification_service.broadcast_to_admins({
-                "type": "escalation.created",
-                "escalation_id": escalation.get("escalation_id"),
-                "proposal_id": escalation.get("proposal_id"),
-                "proposal_title": escalation.get("proposal_title"),
-                "level": escalation.get("level"),
-                "reason": escalation.get("reason"),
-                "hours_in_status": escalation.get("hours_in_status"),
-                "message": f"Proposal '{escalation.get('proposal_title')}' escalated to {escalation.get('level')} level",
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            })
+            await self.notification_service.manager.broadcast_to_admins(
+                NotificationType.SYSTEM_ALERT,
+                {
+                    "type": "escalation.created",
+                    "escalation_id": escalation.get("escalation_id"),
+                    "proposal_id": escalation.get("proposal_id"),
+                    "proposal_title": escalation.get("proposal_title"),
+                    "level": escalation.get("level"),
+                    "reason": escalation.get("reason"),
+                    "hours_in_status": escalation.get("hours_in_status"),
+                    "message": f"Proposal '{escalation.get('proposal_title')}' escalated to {escalation.get('level')} level",
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }
+            )
+            return True
         except Exception as e:
             logger.error(f"Failed to notify admins about escalation: {e}")
+            return False
     
-    async def _notify_creator(self, escalation: Dict[str, Any]):
-        """Send creator notification about their escalated proposal."""
+    async def _notify_creator(self, escalation: Dict[str, Any]) -> bool:
+        """Send creator notification about their escalated proposal. Returns True if it was sent."""
         if not self.notification_service:
-            return
+            return False
         
         creator_id = escalation.get("creator_id")
         if not creator_id:
-            return
+            return False
         
         try:
-            await self.notification_service.send_to_user(
-                user_id=creator_id,
-                user_type="creator",
-                notification={
+            await self.notification_service.manager.send_to_user(
+                creator_id,
+                NotificationType.SYSTEM_ALERT,
+                {
                     "type": "proposal.escalated",
                     "proposal_id": escalation.get("proposal_id"),
                     "proposal_title": escalation.get("proposal_title"),
@@ -671,12 +959,19 @@ class AutoEscalationService:
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
             )
+            return True
         except Exception as e:
             logger.error(f"Failed to notify creator about escalation: {e}")
+            return False
     
     async def _create_escalation_task(self, escalation: Dict[str, Any]):
         """Create a task for the escalated proposal."""
-        task = {
+        task = self._escalation_task_doc(escalation, datetime.now(timezone.utc))
+        await self.db.tasks.insert_one(task)
+        logger.info(f"Created escalation task {task['task_id']} for proposal {escalation.get('proposal_id')}")
+    
+    def _escalation_task_doc(self, escalation: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        return {
             "task_id": f"TASK-ESC-{uuid.uuid4().hex[:6].upper()}",
             "title": f"Review Escalated Proposal: {escalation.get('proposal_title', 'Unknown')}",
             "description": f"Proposal has been in '{escalation.get('status')}' status for {escalation.get('hours_in_status')} hours. Escalation level: {escalation.get('level')}",
@@ -686,34 +981,39 @@ class AutoEscalationService:
             "related_proposal_id": escalation.get("proposal_id"),
             "related_escalation_id": escalation.get("escalation_id"),
             "assigned_to": None,  # Admin assignment needed
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "due_date": (datetime.now(timezone.utc) + timedelta(hours=24)).isoformat()
+            "created_at": now.isoformat(),
+            "due_date": (now + timedelta(hours=24)).isoformat()
         }
-        
-        await self.db.tasks.insert_one(task)
-        logger.info(f"Created escalation task {task['task_id']} for proposal {escalation.get('proposal_id')}")
     
     async def _boost_priority(self, proposal_id: str, boost_amount: int):
         """Boost the priority of an escalated proposal."""
         # Update proposal with priority boost
         await self.db.proposals.update_one(
             {"proposal_id": proposal_id},
-            {
-                "$set": {"escalation_priority_boost": boost_amount},
-                "$push": {
-                    "status_history": {
-                        "action": "priority_boosted",
-                        "boost_amount": boost_amount,
-                        "changed_at": datetime.now(timezone.utc).isoformat(),
-                        "changed_by": "auto_escalation"
-                    }
+            self._priority_boost_update(boost_amount, datetime.now(timezone.utc).isoformat())
+        )
+    
+    def _priority_boost_update(self, boost_amount: int, changed_at: str) -> Dict[str, Any]:
+        return {
+            "$set": {"escalation_priority_boost": boost_amount},
+            "$push": {
+                "status_history": {
+                    "action": "priority_boosted",
+                    "boost_amount": boost_amount,
+                    "changed_at": changed_at,
+                    "changed_by": "auto_escalation"
                 }
             }
-        )
+        }
     
     async def _create_webhook_event(self, escalation: Dict[str, Any]):
         """Create a webhook event for the escalation."""
-        event = {
+        await self.db.webhook_events.insert_one(
+            self._webhook_event_doc(escalation, datetime.now(timezone.utc))
+        )
+    
+    def _webhook_event_doc(self, escalation: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        return {
             "event_id": f"EVT-{uuid.uuid4().hex[:8].upper()}",
             "event_type": "proposal.escalated",
             "payload": {
@@ -724,8 +1024,6 @@ class AutoEscalationService:
                 "reason": escalation.get("reason"),
                 "status": escalation.get("status")
             },
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": now.isoformat(),
             "processed": False
         }
-        
-        await self.db.webhook_events.insert_one(event)
@@ -0,0 +1,295 @@
+"""
+Native BSON Date Storage for Creators Hive HQ
+Write real dates, read either representation, bucket on the server
+
+This module implements:
+- Writers: utc_now() / to_bson_date() produce timezone-aware datetimes that
+  Motor stores as BSON dates (8 bytes, indexable, usable in date operators)
+- Tolerant readers: parse_datetime() and iso() accept a datetime, an ISO
+  string or None, so code works before, during and after the migration;
+  iso_dates() does the same for every date in a nested document
+- Dual-read filters: date_range() matches a field whether it still holds
+  an ISO string or already holds a BSON date
+- Aggregation helpers: date_expr() converts either representation
+  server-side, date_trunc() / date_key() bucket with $dateTrunc
+  (MongoDB 5.0+) instead of $substr on strings or Python loops
+- DateMigration: background, batched, resumable conversion of registered
+  string fields to BSON dates ($convert in an update pipeline; values that
+  do not parse are left untouched), run by the job scheduler
+
+A collection/field pair opts in with register_date_fields() next to the
+code that writes it; once its writers use to_bson_date() and its readers
+use the tolerant helpers, the migration converts the existing documents.
+Set DATE_DUAL_READ=false after the migration reports no string values
+left to drop the string branch from range filters.
+"""
+
+import os
+import logging
+from typing import Dict, Any, List, Optional, Union
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+DATE_DUAL_READ = os.environ.get("DATE_DUAL_READ", "true").lower() == "true"
+DATE_MIGRATION_BATCH_SIZE = int(os.environ.get("DATE_MIGRATION_BATCH_SIZE", "1000"))
+DATE_MIGRATION_MAX_BATCHES = int(os.environ.get("DATE_MIGRATION_MAX_BATCHES", "50"))
+
+DateLike = Union[datetime, str, None]
+
+# $dateToString formats for date_key() buckets
+DATE_KEY_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%G-W%V",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+
+# collection -> fields migrated to BSON dates
+DATE_FIELDS: Dict[str, List[str]] = {}
+
+
+def register_date_fields(collection: str, *fields: str):
+    """Opt a collection's fields into native date storage and migration"""
+    registered = DATE_FIELDS.setdefault(collection, [])
+    registered.extend(f for f in fields if f not in registered)
+
+
+# ============== WRITERS & READERS ==============
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def parse_datetime(value: DateLike) -> Optional[datetime]:
+    """Timezone-aware UTC datetime from a datetime or ISO string (None if unparseable)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+    return None
+
+
+def to_bson_date(value: DateLike) -> Optional[datetime]:
+    """Value to store: a datetime for anything parseable, else unchanged"""
+    parsed = parse_datetime(value)
+    return parsed if parsed is not None else value
+
+
+def iso(value: DateLike) -> str:
+    """ISO string for API output and string slicing ("" for None)"""
+    if isinstance(value, datetime):
+        return parse_datetime(value).isoformat()
+    return value or ""
+
+
+def iso_dates(value: Any) -> Any:
+    """Copy of a document (or list) with every datetime as an ISO string with offset"""
+    if isinstance(value, datetime):
+        return iso(value)
+    if isinstance(value, dict):
+        return {k: iso_dates(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [iso_dates(v) for v in value]
+    return value
+
+
+# ============== QUERY FILTERS ==============
+
+def date_range(field: str, **bounds: DateLike) -> Dict[str, Any]:
+    """
+    Filter clause for a date field holding either representation.
+    Bounds may be datetimes or ISO strings; an unparseable bound raises
+    ValueError rather than silently widening the filter.
+
+    Example:
+        query.update(date_range("created_at", gte=start, lt=end))
+    """
+    date_bounds = {}
+    for op, value in bounds.items():
+        if value is None:
+            continue
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f"Invalid date for {field}: {value!r}")
+        date_bounds[f"${op}"] = parsed
+    if not DATE_DUAL_READ:
+        return {field: date_bounds}
+    string_bounds = {op: v.isoformat() for op, v in date_bounds.items()}
+    return {"$or": [{field: date_bounds}, {field: string_bounds}]}
+
+
+def add_date_range(query: Dict[str, Any], field: str, **bounds: DateLike) -> Dict[str, Any]:
+    """AND a date_range() clause into an existing query (keeps other $or clauses)"""
+    clause = date_range(field, **bounds)
+    if "$or" in clause:
+        query.setdefault("$and", []).append(clause)
+    else:
+        query.update(clause)
+    return query
+
+
+# ============== AGGREGATION ==============
+
+def date_expr(field: str) -> Dict[str, Any]:
+    """Aggregation expression: the field as a date whichever way it is stored"""
+    return {"$convert": {"input": f"${field}", "to": "date", "onError": None, "onNull": None}}
+
+
+def date_trunc(field: str, unit: str = "day", tz: str = "UTC", bin_size: int = 1) -> Dict[str, Any]:
+    """$dateTrunc bucket start for the field (unit: day, week, month, year...)"""
+    trunc = {"date": date_expr(field), "unit": unit, "binSize": bin_size, "timezone": tz}
+    if unit == "week":
+        trunc["startOfWeek"] = "monday"
+    return {"$dateTrunc": trunc}
+
+
+def date_key(field: str, unit: str = "day", tz: str = "UTC") -> Dict[str, Any]:
+    """Bucket label string ("2026-03-01", "2026-W09", "2026-03") for charts"""
+    return {"$dateToString": {
+        "format": DATE_KEY_FORMATS[unit],
+        "date": date_trunc(field, unit, tz),
+        "timezone": tz,
+    }}
+
+
+def bucket_counts_pipeline(
+    match: Dict[str, Any],
+    field: str,
+    unit: str = "day",
+    group_by: Optional[str] = None,
+    tz: str = "UTC"
+) -> List[Dict[str, Any]]:
+    """
+    Count documents per time bucket (and optionally per another field).
+    Output documents: {"_id": {"date": "2026-03-01"[, "group": ...]}, "count": n}
+    """
+    bucket_id: Dict[str, Any] = {"date": date_key(field, unit, tz)}
+    if group_by:
+        bucket_id["group"] = f"${group_by}"
+    return [
+        {"$match": match},
+        {"$group": {"_id": bucket_id, "count": {"$sum": 1}}},
+        {"$match": {"_id.date": {"$ne": None}}},
+        {"$sort": {"_id.date": 1}},
+    ]
+
+
+# ============== MIGRATION ==============
+
+class DateMigration:
+    """
+    Batched, resumable conversion of registered string date fields.
+
+    Each run walks every registered collection in _id order from where the
+    previous run stopped (state in date_migration_state), converting up to
+    max_batches batches. When a pass reaches the end it starts over, so
+    strings written by code that has not moved to to_bson_date() yet are
+    picked up on the next pass.
+    """
+
+    def __init__(
+        self,
+        db,
+        fields: Optional[Dict[str, List[str]]] = None,
+        batch_size: int = DATE_MIGRATION_BATCH_SIZE,
+        max_batches: int = DATE_MIGRATION_MAX_BATCHES
+    ):
+        self.db = db
+        self.fields = fields if fields is not None else DATE_FIELDS
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+
+    @staticmethod
+    def _string_filter(fields: List[str]) -> Dict[str, Any]:
+        return {"$or": [{f: {"$type": "string"}} for f in fields]}
+
+    @staticmethod
+    def _convert_pipeline(field: str) -> List[Dict[str, Any]]:
+        return [{"$set": {field: {"$convert": {
+            "input": f"${field}", "to": "date", "onError": f"${field}", "onNull": None
+        }}}}]
+
+    async def run(self) -> Dict[str, Any]:
+        """Scheduler entry point: advance every registered collection"""
+        summary = {"collections": 0, "converted": 0, "batches": 0, "passes_completed": 0}
+        budget = self.max_batches
+        for collection, fields in self.fields.items():
+            if budget <= 0:
+                break
+            result = await self.migrate_collection(collection, fields, max_batches=budget)
+            budget -= result["batches"]
+            summary["collections"] += 1
+            summary["converted"] += result["converted"]
+            summary["batches"] += result["batches"]
+            summary["passes_completed"] += int(result["pass_completed"])
+        logger.info(f"Date migration run: {summary}")
+        return summary
+
+    async def migrate_collection(self, collection: str, fields: List[str], max_batches: int) -> Dict[str, Any]:
+        state = await self.db.date_migration_state.find_one({"_id": collection}) or {}
+        last_id = state.get("last_id")
+        converted = batches = 0
+        pass_completed = False
+
+        while batches < max_batches:
+            query = self._string_filter(fields)
+            if last_id is not None:
+                query = {"$and": [{"_id": {"$gt": last_id}}, query]}
+            docs = await self.db[collection].find(query, {"_id": 1}).sort("_id", 1).limit(self.batch_size).to_list(self.batch_size)
+            if not docs:
+                last_id = None
+                pass_completed = True
+                break
+
+            ids = [d["_id"] for d in docs]
+            for field in fields:
+                result = await self.db[collection].update_many(
+                    {"_id": {"$in": ids}, field: {"$type": "string"}},
+                    self._convert_pipeline(field)
+                )
+                converted += result.modified_count
+            last_id = ids[-1]
+            batches += 1
+
+        update: Dict[str, Any] = {
+            "$set": {"last_id": last_id, "fields": fields, "updated_at": utc_now()},
+            "$inc": {"converted": converted, "passes": int(pass_completed)},
+        }
+        await self.db.date_migration_state.update_one({"_id": collection}, update, upsert=True)
+        return {"collection": collection, "converted": converted, "batches": batches, "pass_completed": pass_completed}
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Per collection: string values left per field and migration progress"""
+        states = {s["_id"]: s async for s in self.db.date_migration_state.find({})}
+        collections = []
+        for collection, fields in self.fields.items():
+            remaining = {
+                field: await self.db[collection].count_documents({field: {"$type": "string"}})
+                for field in fields
+            }
+            state = states.get(collection, {})
+            collections.append({
+                "collection": collection,
+                "fields": fields,
+                "remaining_strings": remaining,
+                "converted": state.get("converted", 0),
+                "passes": state.get("passes", 0),
+                "in_progress": state.get("last_id") is not None,
+                "updated_at": iso(state.get("updated_at")) or None,
+            })
+        return {
+            "dual_read": DATE_DUAL_READ,
+            "complete": all(sum(c["remaining_strings"].values()) == 0 for c in collections),
+            "collections": collections,
+        }
+
+
+# Global migration instance (initialized in server.py startup)
+date_migration = None
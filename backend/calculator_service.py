@@ -15,9 +15,12 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum
+import asyncio
 import logging
 from dateutil.relativedelta import relativedelta
 
+from time_series_rollups import time_series_rollups, PLATFORM_SCOPE
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,12 +114,17 @@ class CalculatorService:
             "month": current_month
         }
     
-    async def get_arr(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+    async def get_arr(
+        self,
+        user_id: Optional[str] = None,
+        mrr_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate Annual Recurring Revenue (ARR).
         ARR = MRR × 12
+        Pass mrr_data to reuse an MRR result already computed.
         """
-        mrr_data = await self.get_mrr(user_id)
+        mrr_data = mrr_data or await self.get_mrr(user_id)
         arr = mrr_data["mrr"] * 12
         prev_arr = mrr_data["mrr_previous"] * 12
         
@@ -165,14 +173,22 @@ class CalculatorService:
             "health_indicator": "excellent" if churn_rate < 3 else "good" if churn_rate < 7 else "concerning" if churn_rate < 15 else "critical"
         }
     
-    async def get_ltv(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+    async def get_ltv(
+        self,
+        user_id: Optional[str] = None,
+        mrr_data: Optional[Dict[str, Any]] = None,
+        churn_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Calculate Customer Lifetime Value (LTV).
         LTV = ARPU × Average Customer Lifetime
         where Average Customer Lifetime = 1 / Monthly Churn Rate
+        Pass mrr_data / churn_data to reuse results already computed.
         """
-        mrr_data = await self.get_mrr(user_id)
-        churn_data = await self.get_churn_rate(user_id)
+        if mrr_data is None:
+            mrr_data = await self.get_mrr(user_id)
+        if churn_data is None:
+            churn_data = await self.get_churn_rate(user_id)
         
         arpu = mrr_data["avg_revenue_per_subscription"]
         monthly_churn = churn_data["churn_rate_percent"] / 100
@@ -271,23 +287,34 @@ class CalculatorService:
         """
         Analyze revenue trends over time.
         """
-        start_date = (datetime.now(timezone.utc) - relativedelta(months=months_back)).strftime("%Y-%m")
-        
-        match_stage = {"category": "Income", "month_year": {"$gte": start_date}}
-        if user_id:
-            match_stage["user_id"] = user_id
+        start_month = datetime.now(timezone.utc) - relativedelta(months=months_back)
+        start_date = start_month.strftime("%Y-%m")
         
-        pipeline = [
-            {"$match": match_stage},
-            {"$group": {
-                "_id": "$month_year",
-                "revenue": {"$sum": "$revenue"},
-                "transactions": {"$sum": 1}
-            }},
-            {"$sort": {"_id": 1}}
-        ]
-        
-        results = await self.db.calculator.aggregate(pipeline).to_list(months_back + 1)
+        # Monthly revenue buckets from rollups; raw calculator rows until they are built
+        buckets = await time_series_rollups.query(
+            "revenue", user_id or PLATFORM_SCOPE, start=start_month, end=datetime.max, granularity="month"
+        )
+        if buckets is not None:
+            results = [
+                {"_id": b["date"], "revenue": b["sums"].get("revenue", 0), "transactions": b["count"]}
+                for b in buckets[:months_back + 1]
+            ]
+        else:
+            match_stage = {"category": "Income", "month_year": {"$gte": start_date}}
+            if user_id:
+                match_stage["user_id"] = user_id
+            
+            pipeline = [
+                {"$match": match_stage},
+                {"$group": {
+                    "_id": "$month_year",
+                    "revenue": {"$sum": "$revenue"},
+                    "transactions": {"$sum": 1}
+                }},
+                {"$sort": {"_id": 1}}
+            ]
+            
+            results = await self.db.calculator.aggregate(pipeline).to_list(months_back + 1)
         
         if len(results) < 2:
             return {
@@ -627,14 +654,18 @@ class CalculatorService:
     async def get_platform_financial_dashboard(self) -> Dict[str, Any]:
         """
         Get comprehensive platform-wide financial dashboard.
+        The independent sections run concurrently; ARR and LTV are derived
+        from the single MRR / churn computation.
         """
-        mrr = await self.get_mrr()
-        arr = await self.get_arr()
-        churn = await self.get_churn_rate()
-        ltv = await self.get_ltv()
-        loop_status = await self.get_self_funding_loop_status()
-        profit = await self.get_profit_analysis(months_back=3)
-        forecast = await self.forecast_revenue(months_ahead=3)
+        mrr, churn, loop_status, profit, forecast = await asyncio.gather(
+            self.get_mrr(),
+            self.get_churn_rate(),
+            self.get_self_funding_loop_status(),
+            self.get_profit_analysis(months_back=3),
+            self.forecast_revenue(months_ahead=3)
+        )
+        arr = await self.get_arr(mrr_data=mrr)
+        ltv = await self.get_ltv(mrr_data=mrr, churn_data=churn)
         
         return {
             "key_metrics": {
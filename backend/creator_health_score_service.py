@@ -3,15 +3,37 @@ Creator Health Score Service (Module B4)
 =========================================
 Computes daily health scores for Pro+ creators.
 Analyzes engagement, proposal success, platform activity, and provides actionable insights.
+
+All five components are scored from one "creator facts" fetch: a single
+$group over the creator's proposals plus one over arris_usage, run
+concurrently with the profile and trend lookups. The same fetch works for
+a batch of creators, which the nightly job uses to score every Pro+
+creator and write creator_health_history in bulk.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
-import uuid
+from typing import Dict, Any, List
+from pymongo import UpdateOne
+from index_registry import index_registry
+from bson_dates import date_expr, parse_datetime
 
 logger = logging.getLogger(__name__)
 
+index_registry.register("creator_health_history", [("creator_id", 1), ("date", 1)], unique=True, owner="creator_health_score")
+index_registry.register("creator_health_history", [("date", 1), ("overall_score", -1)], owner="creator_health_score")
+index_registry.register_query(
+    "creator_health_history", {"creator_id": "CR-1", "date": {"$gte": "2026-01-01"}},
+    sort=[("date", 1)], owner="creator_health_score"
+)
+
+HEALTH_BATCH_SIZE = 500
+
+APPROVED_STATUSES = ["approved", "completed", "in_progress"]
+
+HEALTH_SCORE_TIERS = ["pro", "premium", "elite"]
+
 
 # Health score components and weights
 HEALTH_COMPONENTS = {
@@ -90,7 +112,7 @@ class CreatorHealthScoreService:
         tier_value = tier.value if hasattr(tier, 'value') else tier
         
         # Pro, Premium, and Elite have access
-        has_access = tier_value in ["pro", "premium", "elite"]
+        has_access = tier_value in HEALTH_SCORE_TIERS
         
         return {
             "has_access": has_access,
@@ -112,17 +134,18 @@ class CreatorHealthScoreService:
                 "tier": access["tier"]
             }
         
-        # Get creator data
-        creator = await self.db.creators.find_one(
-            {"id": creator_id},
-            {"_id": 0}
+        # Creator profile, facts and trend are independent lookups
+        creator, facts, trend = await asyncio.gather(
+            self.db.creators.find_one({"id": creator_id}, {"_id": 0}),
+            self._fetch_creator_facts([creator_id]),
+            self._get_score_trend(creator_id)
         )
         
         if not creator:
             return {"error": "Creator not found"}
         
         # Calculate component scores
-        components = await self._calculate_components(creator_id, creator)
+        components = self._calculate_components(creator, facts[creator_id])
         
         # Calculate overall score
         overall_score = self._calculate_overall_score(components)
@@ -130,11 +153,8 @@ class CreatorHealthScoreService:
         # Determine status
         status = self._get_status(overall_score)
         
-        # Get trend data
-        trend = await self._get_score_trend(creator_id)
-        
         # Get achievements
-        achievements = await self._get_achievements(creator_id, creator, components)
+        achievements = self._get_achievements(facts[creator_id], components)
         
         # Get recommendations
         recommendations = self._get_recommendations(components, overall_score)
@@ -189,27 +209,35 @@ class CreatorHealthScoreService:
         # Get recent health scores
         today = datetime.now(timezone.utc).isoformat()[:10]
         
-        scores = await self.db.creator_health_history.find(
-            {"date": today},
-            {"_id": 0}
-        ).sort("overall_score", -1).limit(limit).to_list(limit)
+        rows = await self.db.creator_health_history.aggregate([
+            {"$match": {"date": today}},
+            {"$sort": {"overall_score": -1}},
+            {"$limit": limit},
+            {"$lookup": {
+                "from": "creators",
+                "localField": "creator_id",
+                "foreignField": "id",
+                "as": "creator"
+            }},
+            {"$unwind": "$creator"},
+            {"$project": {
+                "_id": 0,
+                "overall_score": 1,
+                "name": {"$ifNull": ["$creator.name", "Anonymous"]}
+            }}
+        ]).to_list(limit)
         
         # Mask names for privacy
         leaderboard = []
-        for i, score in enumerate(scores):
-            creator = await self.db.creators.find_one(
-                {"id": score.get("creator_id")},
-                {"name": 1, "email": 1}
-            )
-            if creator:
-                name = creator.get("name", "Anonymous")
-                masked_name = name[:2] + "***" + name[-1] if len(name) > 3 else name[:1] + "***"
-                leaderboard.append({
-                    "rank": i + 1,
-                    "name": masked_name,
-                    "score": score.get("overall_score", 0),
-                    "status": self._get_status(score.get("overall_score", 0))
-                })
+        for i, row in enumerate(rows):
+            name = row["name"]
+            masked_name = name[:2] + "***" + name[-1] if len(name) > 3 else name[:1] + "***"
+            leaderboard.append({
+                "rank": i + 1,
+                "name": masked_name,
+                "score": row.get("overall_score", 0),
+                "status": self._get_status(row.get("overall_score", 0))
+            })
         
         return {"leaderboard": leaderboard, "date": today}
     
@@ -256,91 +284,142 @@ class CreatorHealthScoreService:
             "access_denied": False
         }
     
+    async def run_daily_scores(self) -> Dict[str, Any]:
+        """
+        Score every Pro+ creator and upsert today's creator_health_history.
+        Runs nightly via the job scheduler.
+        """
+        today = datetime.now(timezone.utc).isoformat()[:10]
+        scored = 0
+        
+        cursor = self.db.creators.find({}, {"_id": 0})
+        while True:
+            creators = await cursor.to_list(HEALTH_BATCH_SIZE)
+            if not creators:
+                break
+            
+            creators = [c for c in creators if c.get("id")]
+            if self.feature_gating:
+                tiers = await self.feature_gating.get_tiers([c["id"] for c in creators])
+                creators = [
+                    c for c in creators
+                    if getattr(tiers[c["id"]][0], "value", tiers[c["id"]][0]) in HEALTH_SCORE_TIERS
+                ]
+            if not creators:
+                continue
+            
+            facts = await self._fetch_creator_facts([c["id"] for c in creators])
+            updated_at = datetime.now(timezone.utc).isoformat()
+            operations = []
+            for creator in creators:
+                components = self._calculate_components(creator, facts[creator["id"]])
+                operations.append(UpdateOne(
+                    {"creator_id": creator["id"], "date": today},
+                    {"$set": {
+                        "overall_score": self._calculate_overall_score(components),
+                        "components": {name: data["score"] for name, data in components.items()},
+                        "updated_at": updated_at
+                    }},
+                    upsert=True
+                ))
+            await self.db.creator_health_history.bulk_write(operations, ordered=False)
+            scored += len(operations)
+        
+        logger.info(f"Daily health scores stored for {scored} creators")
+        return {"date": today, "creators_scored": scored}
+    
     # ============== PRIVATE CALCULATION METHODS ==============
     
-    async def _calculate_components(
-        self,
-        creator_id: str,
-        creator: Dict
-    ) -> Dict[str, Any]:
-        """Calculate all health score components."""
-        components = {}
-        
-        # 1. Engagement Score
-        engagement = await self._calculate_engagement(creator_id)
-        components["engagement"] = {
-            **HEALTH_COMPONENTS["engagement"],
-            "score": engagement["score"],
-            "metrics": engagement["metrics"]
-        }
-        
-        # 2. Proposal Success Score
-        proposal_success = await self._calculate_proposal_success(creator_id)
-        components["proposal_success"] = {
-            **HEALTH_COMPONENTS["proposal_success"],
-            "score": proposal_success["score"],
-            "metrics": proposal_success["metrics"]
-        }
-        
-        # 3. Consistency Score
-        consistency = await self._calculate_consistency(creator_id)
-        components["consistency"] = {
-            **HEALTH_COMPONENTS["consistency"],
-            "score": consistency["score"],
-            "metrics": consistency["metrics"]
-        }
-        
-        # 4. ARRIS Utilization Score
-        arris = await self._calculate_arris_utilization(creator_id)
-        components["arris_utilization"] = {
-            **HEALTH_COMPONENTS["arris_utilization"],
-            "score": arris["score"],
-            "metrics": arris["metrics"]
-        }
+    async def _fetch_creator_facts(self, creator_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Everything the five components need, for a batch of creators:
+        one $group over proposals and one over arris_usage, run concurrently.
+        """
+        now = datetime.now(timezone.utc)
+        cutoff_30d = now - timedelta(days=30)
+        cutoff_90d = now - timedelta(days=90)
+        # Dates are compared as BSON dates whether stored as ISO strings or dates
+        created = date_expr("created_at")
+        
+        proposal_rows, arris_rows = await asyncio.gather(
+            self.db.proposals.aggregate([
+                {"$match": {"user_id": {"$in": creator_ids}}},
+                {"$group": {
+                    "_id": "$user_id",
+                    "total": {"$sum": 1},
+                    "approved": {"$sum": {"$cond": [{"$in": ["$status", APPROVED_STATUSES]}, 1, 0]}},
+                    "rejected": {"$sum": {"$cond": [{"$eq": ["$status", "rejected"]}, 1, 0]}},
+                    "with_arris": {"$sum": {"$cond": [{"$gt": ["$arris_insights", None]}, 1, 0]}},
+                    "recent_30d": {"$sum": {"$cond": [{"$gte": [created, cutoff_30d]}, 1, 0]}},
+                    "last_created_at": {"$max": created},
+                    "dates_90d": {"$push": {"$cond": [
+                        {"$gte": [created, cutoff_90d]}, created, "$$REMOVE"
+                    ]}}
+                }}
+            ], allowDiskUse=True).to_list(None),
+            self.db.arris_usage.aggregate([
+                {"$match": {"user_id": {"$in": creator_ids}}},
+                {"$group": {
+                    "_id": "$user_id",
+                    "total": {"$sum": 1},
+                    "recent_30d": {"$sum": {"$cond": [{"$gte": [date_expr("timestamp"), cutoff_30d]}, 1, 0]}}
+                }}
+            ]).to_list(None)
+        )
         
-        # 5. Profile Completeness Score
-        profile = await self._calculate_profile_completeness(creator_id, creator)
-        components["profile_completeness"] = {
-            **HEALTH_COMPONENTS["profile_completeness"],
-            "score": profile["score"],
-            "metrics": profile["metrics"]
+        proposals = {row["_id"]: row for row in proposal_rows}
+        arris = {row["_id"]: row for row in arris_rows}
+        
+        facts = {}
+        for creator_id in creator_ids:
+            row = proposals.get(creator_id, {})
+            arris_row = arris.get(creator_id, {})
+            facts[creator_id] = {
+                "now": now,
+                "total_proposals": row.get("total", 0),
+                "approved": row.get("approved", 0),
+                "rejected": row.get("rejected", 0),
+                "proposals_with_arris": row.get("with_arris", 0),
+                "recent_proposals": row.get("recent_30d", 0),
+                "last_proposal_at": parse_datetime(row.get("last_created_at")),
+                "proposal_dates_90d": sorted(parse_datetime(d) for d in row.get("dates_90d", []) if d),
+                "arris_uses": arris_row.get("total", 0),
+                "arris_uses_30d": arris_row.get("recent_30d", 0)
+            }
+        return facts
+    
+    def _calculate_components(self, creator: Dict, facts: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate all health score components."""
+        scorers = {
+            "engagement": lambda: self._calculate_engagement(facts),
+            "proposal_success": lambda: self._calculate_proposal_success(facts),
+            "consistency": lambda: self._calculate_consistency(facts),
+            "arris_utilization": lambda: self._calculate_arris_utilization(facts),
+            "profile_completeness": lambda: self._calculate_profile_completeness(creator),
         }
         
+        components = {}
+        for name, scorer in scorers.items():
+            result = scorer()
+            components[name] = {
+                **HEALTH_COMPONENTS[name],
+                "score": result["score"],
+                "metrics": result["metrics"]
+            }
         return components
     
-    async def _calculate_engagement(self, creator_id: str) -> Dict[str, Any]:
+    def _calculate_engagement(self, facts: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate engagement score based on platform activity."""
-        now = datetime.now(timezone.utc)
+        now = facts["now"]
         
         # Last 30 days activity
-        cutoff_30d = now - timedelta(days=30)
-        
-        # Count proposals in last 30 days
-        recent_proposals = await self.db.proposals.count_documents({
-            "user_id": creator_id,
-            "created_at": {"$gte": cutoff_30d.isoformat()}
-        })
-        
-        # Count ARRIS interactions in last 30 days
-        arris_interactions = await self.db.arris_usage.count_documents({
-            "user_id": creator_id,
-            "timestamp": {"$gte": cutoff_30d.isoformat()}
-        })
+        recent_proposals = facts["recent_proposals"]
+        arris_interactions = facts["arris_uses_30d"]
         
         # Last activity
-        last_proposal = await self.db.proposals.find_one(
-            {"user_id": creator_id},
-            {"created_at": 1},
-            sort=[("created_at", -1)]
-        )
-        
         days_since_last = 30
-        if last_proposal:
-            try:
-                last_date = datetime.fromisoformat(last_proposal.get("created_at", "").replace("Z", "+00:00"))
-                days_since_last = (now - last_date).days
-            except:
-                pass
+        if facts["last_proposal_at"]:
+            days_since_last = (now - facts["last_proposal_at"]).days
         
         # Calculate score
         score = 0
@@ -368,19 +447,15 @@ class CreatorHealthScoreService:
             }
         }
     
-    async def _calculate_proposal_success(self, creator_id: str) -> Dict[str, Any]:
+    def _calculate_proposal_success(self, facts: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate proposal success score."""
-        proposals = await self.db.proposals.find(
-            {"user_id": creator_id},
-            {"status": 1}
-        ).to_list(100)
+        total = facts["total_proposals"]
         
-        if not proposals:
+        if not total:
             return {"score": 50, "metrics": {"total": 0, "approved": 0, "approval_rate": 0}}
         
-        total = len(proposals)
-        approved = len([p for p in proposals if p.get("status") in ["approved", "completed", "in_progress"]])
-        rejected = len([p for p in proposals if p.get("status") == "rejected"])
+        approved = facts["approved"]
+        rejected = facts["rejected"]
         
         approval_rate = approved / total if total > 0 else 0
         
@@ -403,34 +478,16 @@ class CreatorHealthScoreService:
             }
         }
     
-    async def _calculate_consistency(self, creator_id: str) -> Dict[str, Any]:
+    def _calculate_consistency(self, facts: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate consistency score based on regular activity."""
-        now = datetime.now(timezone.utc)
-        
-        # Get proposals from last 90 days
-        cutoff = now - timedelta(days=90)
-        proposals = await self.db.proposals.find(
-            {
-                "user_id": creator_id,
-                "created_at": {"$gte": cutoff.isoformat()}
-            },
-            {"created_at": 1}
-        ).sort("created_at", 1).to_list(100)
+        # Proposal datetimes from last 90 days, oldest first (converted server-side)
+        dates = facts["proposal_dates_90d"]
         
-        if not proposals:
+        if not dates:
             return {"score": 30, "metrics": {"weeks_active": 0, "current_streak": 0, "avg_gap_days": None}}
         
         # Calculate weeks with activity
-        weeks_active = set()
-        dates = []
-        for p in proposals:
-            try:
-                dt = datetime.fromisoformat(p.get("created_at", "").replace("Z", "+00:00"))
-                week = dt.isocalendar()[1]
-                weeks_active.add((dt.year, week))
-                dates.append(dt)
-            except:
-                pass
+        weeks_active = {(dt.year, dt.isocalendar()[1]) for dt in dates}
         
         # Calculate average gap between submissions
         gaps = []
@@ -481,18 +538,14 @@ class CreatorHealthScoreService:
             }
         }
     
-    async def _calculate_arris_utilization(self, creator_id: str) -> Dict[str, Any]:
+    def _calculate_arris_utilization(self, facts: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate ARRIS utilization score."""
-        # Count proposals with ARRIS insights
-        proposals_with_arris = await self.db.proposals.count_documents({
-            "user_id": creator_id,
-            "arris_insights": {"$exists": True, "$ne": None}
-        })
-        
-        total_proposals = await self.db.proposals.count_documents({"user_id": creator_id})
+        # Proposals with ARRIS insights
+        proposals_with_arris = facts["proposals_with_arris"]
+        total_proposals = facts["total_proposals"]
         
-        # Count ARRIS usage
-        arris_usage = await self.db.arris_usage.count_documents({"user_id": creator_id})
+        # ARRIS usage
+        arris_usage = facts["arris_uses"]
         
         # Calculate utilization rate
         utilization_rate = proposals_with_arris / total_proposals if total_proposals > 0 else 0
@@ -516,11 +569,7 @@ class CreatorHealthScoreService:
             }
         }
     
-    async def _calculate_profile_completeness(
-        self,
-        creator_id: str,
-        creator: Dict
-    ) -> Dict[str, Any]:
+    def _calculate_profile_completeness(self, creator: Dict) -> Dict[str, Any]:
         """Calculate profile completeness score."""
         fields = {
             "name": bool(creator.get("name")),
@@ -612,23 +661,17 @@ class CreatorHealthScoreService:
             "data": history
         }
     
-    async def _get_achievements(
+    def _get_achievements(
         self,
-        creator_id: str,
-        creator: Dict,
+        facts: Dict[str, Any],
         components: Dict
     ) -> List[Dict[str, Any]]:
         """Get earned achievements."""
         earned = []
         
         # Check each achievement
-        proposals = await self.db.proposals.find(
-            {"user_id": creator_id},
-            {"status": 1}
-        ).to_list(100)
-        
-        total = len(proposals)
-        approved = len([p for p in proposals if p.get("status") in ["approved", "completed", "in_progress"]])
+        total = facts["total_proposals"]
+        approved = facts["approved"]
         
         # First proposal
         if total >= 1:
@@ -750,8 +793,6 @@ class CreatorHealthScoreService:
     
     async def _analyze_engagement_details(self, creator_id: str) -> Dict:
         """Get detailed engagement analysis."""
-        now = datetime.now(timezone.utc)
-        
         # Activity by day of week
         proposals = await self.db.proposals.find(
             {"user_id": creator_id},
@@ -760,12 +801,9 @@ class CreatorHealthScoreService:
         
         day_activity = {d: 0 for d in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]}
         for p in proposals:
-            try:
-                dt = datetime.fromisoformat(p.get("created_at", "").replace("Z", "+00:00"))
-                day = dt.strftime("%A")
-                day_activity[day] += 1
-            except:
-                pass
+            dt = parse_datetime(p.get("created_at"))
+            if dt:
+                day_activity[dt.strftime("%A")] += 1
         
         best_day = max(day_activity, key=day_activity.get) if any(day_activity.values()) else None
         
@@ -799,8 +837,6 @@ class CreatorHealthScoreService:
     
     async def _analyze_consistency_details(self, creator_id: str) -> Dict:
         """Get detailed consistency analysis."""
-        now = datetime.now(timezone.utc)
-        
         # Monthly activity
         months = {}
         proposals = await self.db.proposals.find(
@@ -809,12 +845,10 @@ class CreatorHealthScoreService:
         ).to_list(100)
         
         for p in proposals:
-            try:
-                dt = datetime.fromisoformat(p.get("created_at", "").replace("Z", "+00:00"))
+            dt = parse_datetime(p.get("created_at"))
+            if dt:
                 month_key = dt.strftime("%Y-%m")
                 months[month_key] = months.get(month_key, 0) + 1
-            except:
-                pass
         
         return {
             "monthly_activity": months,
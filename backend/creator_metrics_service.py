@@ -0,0 +1,344 @@
+"""
+Creator Metrics Service - Phase 4 Module C (C2 support)
+Materialized per-creator proposal metrics and vectorized similarity
+
+This module implements:
+1. Creator Metrics Materialization - One $group pass over proposals writes the
+   creator_metrics collection (approval rate, velocity, top platforms, totals)
+2. Incremental Refresh - Single-creator recompute on proposal create/status change
+3. Similarity Snapshot - NumPy arrays (platform bitsets, niche codes, metric
+   vectors) for all active creators, ranked in one vectorized pass
+"""
+
+import logging
+import time
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from index_registry import index_registry
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+index_registry.register("creator_metrics", "creator_id", unique=True, owner="creator_metrics")
+
+
+APPROVED_STATUSES = ["approved", "completed", "in_progress"]
+
+# Similarity weights (same as the per-creator loop they replace)
+SIMILARITY_WEIGHTS = {
+    "platform": 0.4,
+    "niche_exact": 0.3,
+    "niche_partial": 0.15,
+    "approval": 0.2,
+    "velocity": 0.1,
+}
+
+
+class CreatorMetricsService:
+    """
+    Materialized creator metrics for cross-creator insights.
+
+    Features:
+    - creator_metrics collection rebuilt with a single aggregation pass
+    - Incremental per-creator refresh hooked into proposal writes
+    - In-process similarity snapshot refreshed on a TTL
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.snapshot_ttl_seconds = 300     # Rebuild similarity arrays after this
+        self.velocity_window_days = 30      # Proposals per month (simplified)
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_built_at = 0.0
+
+    async def initialize(self):
+        """Materialize metrics if the collection is empty"""
+        if await self.db.creator_metrics.estimated_document_count() == 0:
+            await self.refresh_all()
+
+    # ============== MATERIALIZATION ==============
+
+    def _metrics_pipeline(self, match: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Aggregation computing totals, approvals and platform counts per creator.
+        Platforms are unwound and counted per (creator, platform) first, so
+        each creator's row carries one entry per distinct platform rather
+        than every proposal's platform list.
+        """
+        pipeline = []
+        if match:
+            pipeline.append({"$match": match})
+        # Count each proposal once: on its first platform, or its only row if it has none
+        first_row = {"$lte": [{"$ifNull": ["$platform_index", 0]}, 0]}
+        pipeline += [
+            {"$project": {
+                "user_id": 1,
+                "approved": {"$in": ["$status", APPROVED_STATUSES]},
+                "platforms": {"$ifNull": ["$platforms", []]}
+            }},
+            {"$unwind": {
+                "path": "$platforms",
+                "includeArrayIndex": "platform_index",
+                "preserveNullAndEmptyArrays": True
+            }},
+            {"$group": {
+                "_id": {"creator_id": "$user_id", "platform": "$platforms"},
+                "occurrences": {"$sum": 1},
+                "proposals": {"$sum": {"$cond": [first_row, 1, 0]}},
+                "approved": {"$sum": {"$cond": [{"$and": [first_row, "$approved"]}, 1, 0]}}
+            }},
+            {"$group": {
+                "_id": "$_id.creator_id",
+                "total_proposals": {"$sum": "$proposals"},
+                "approved_proposals": {"$sum": "$approved"},
+                "platforms": {"$push": {"platform": "$_id.platform", "count": "$occurrences"}}
+            }},
+        ]
+        return pipeline
+
+    def _build_metrics(self, row: Dict[str, Any], tier: str) -> Dict[str, Any]:
+        """Turn an aggregation row into a creator_metrics document"""
+        total = row.get("total_proposals", 0)
+        approved = row.get("approved_proposals", 0)
+
+        platform_counts: Dict[str, int] = {
+            p["platform"]: p["count"] for p in row.get("platforms", []) if p.get("platform") is not None
+        }
+
+        return {
+            "creator_id": row["_id"],
+            "total_proposals": total,
+            "approved_proposals": approved,
+            "approval_rate": round((approved / total * 100), 1) if total > 0 else 0,
+            "platform_counts": platform_counts,
+            "top_platforms": sorted(platform_counts.items(), key=lambda x: -x[1])[:3],
+            "tier": tier,
+            "proposal_velocity": total / max(1, self.velocity_window_days),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    def _empty_metrics(self, creator_id: str, tier: str = "Free") -> Dict[str, Any]:
+        """Metrics for a creator without proposals"""
+        return self._build_metrics({"_id": creator_id}, tier)
+
+    async def refresh_all(self) -> Dict[str, Any]:
+        """Recompute creator_metrics for every creator in one aggregation pass"""
+        start = time.monotonic()
+
+        tiers = {}
+        async for sub in self.db.creator_subscriptions.find(
+            {"status": "active"}, {"_id": 0, "creator_id": 1, "tier": 1}
+        ):
+            tiers[sub["creator_id"]] = sub.get("tier", "Free")
+
+        ops = []
+        refreshed = 0
+        cursor = self.db.proposals.aggregate(self._metrics_pipeline({}), allowDiskUse=True)
+        async for row in cursor:
+            if not row.get("_id"):
+                continue
+            doc = self._build_metrics(row, tiers.get(row["_id"], "Free"))
+            ops.append(UpdateOne({"creator_id": doc["creator_id"]}, {"$set": doc}, upsert=True))
+            refreshed += 1
+            if len(ops) >= 1000:
+                await self.db.creator_metrics.bulk_write(ops, ordered=False)
+                ops = []
+        if ops:
+            await self.db.creator_metrics.bulk_write(ops, ordered=False)
+
+        self._snapshot = None
+        duration = round(time.monotonic() - start, 3)
+        logger.info(f"Refreshed creator_metrics for {refreshed} creators in {duration}s")
+        return {"creators_refreshed": refreshed, "duration_seconds": duration}
+
+    async def refresh_creator(self, creator_id: str) -> Dict[str, Any]:
+        """Recompute metrics for one creator (call after proposal create/status change)"""
+        if not creator_id:
+            return {}
+
+        rows = await self.db.proposals.aggregate(
+            self._metrics_pipeline({"user_id": creator_id})
+        ).to_list(1)
+        sub = await self.db.creator_subscriptions.find_one(
+            {"creator_id": creator_id, "status": "active"},
+            {"_id": 0, "tier": 1}
+        )
+        tier = sub.get("tier", "Free") if sub else "Free"
+        doc = self._build_metrics(rows[0], tier) if rows else self._empty_metrics(creator_id, tier)
+
+        await self.db.creator_metrics.update_one(
+            {"creator_id": creator_id}, {"$set": doc}, upsert=True
+        )
+        self._update_snapshot_row(doc)
+        return doc
+
+    async def get_metrics(self, creator_id: str) -> Dict[str, Any]:
+        """Get materialized metrics for a creator, computing them on first access"""
+        doc = await self.db.creator_metrics.find_one({"creator_id": creator_id}, {"_id": 0})
+        if doc is None:
+            doc = await self.refresh_creator(creator_id)
+        return doc
+
+    # ============== SIMILARITY SNAPSHOT ==============
+
+    async def _build_snapshot(self) -> Dict[str, Any]:
+        """Load every active creator into column arrays for vectorized scoring"""
+        metrics_by_id = {}
+        async for m in self.db.creator_metrics.find({}, {"_id": 0, "platform_counts": 0}):
+            metrics_by_id[m["creator_id"]] = m
+
+        ids: List[str] = []
+        platform_sets: List[List[str]] = []
+        niches: List[str] = []
+        async for c in self.db.creators.find(
+            {"status": "active"}, {"_id": 0, "id": 1, "platforms": 1, "niche": 1}
+        ):
+            ids.append(c["id"])
+            platform_sets.append(c.get("platforms") or [])
+            niches.append((c.get("niche") or "").lower())
+
+        platform_vocab = {p: i for i, p in enumerate(sorted({p for ps in platform_sets for p in ps}))}
+        platform_matrix = np.zeros((len(ids), max(1, len(platform_vocab))), dtype=np.uint8)
+        for row, ps in enumerate(platform_sets):
+            for p in ps:
+                platform_matrix[row, platform_vocab[p]] = 1
+
+        niche_vocab = sorted(set(niches))
+        niche_index = {n: i for i, n in enumerate(niche_vocab)}
+        niche_codes = np.array([niche_index[n] for n in niches], dtype=np.int32)
+
+        totals = np.zeros(len(ids), dtype=np.float64)
+        rates = np.zeros(len(ids), dtype=np.float64)
+        velocities = np.zeros(len(ids), dtype=np.float64)
+        for row, cid in enumerate(ids):
+            m = metrics_by_id.get(cid)
+            if m:
+                totals[row] = m.get("total_proposals", 0)
+                rates[row] = m.get("approval_rate", 0)
+                velocities[row] = m.get("proposal_velocity", 0)
+
+        return {
+            "ids": ids,
+            "row_by_id": {cid: i for i, cid in enumerate(ids)},
+            "platforms": platform_sets,
+            "platform_vocab": platform_vocab,
+            "platform_matrix": platform_matrix,
+            "platform_sizes": platform_matrix.sum(axis=1).astype(np.int32),
+            "niche_vocab": niche_vocab,
+            "niche_codes": niche_codes,
+            "totals": totals,
+            "rates": rates,
+            "velocities": velocities,
+            "metrics": metrics_by_id,
+        }
+
+    async def _get_snapshot(self) -> Dict[str, Any]:
+        """Return the cached snapshot, rebuilding it when stale"""
+        if self._snapshot is None or time.monotonic() - self._snapshot_built_at > self.snapshot_ttl_seconds:
+            self._snapshot = await self._build_snapshot()
+            self._snapshot_built_at = time.monotonic()
+        return self._snapshot
+
+    def _update_snapshot_row(self, doc: Dict[str, Any]):
+        """Patch a refreshed creator's metrics into the cached snapshot in place"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        row = snapshot["row_by_id"].get(doc["creator_id"])
+        if row is None:
+            return
+        snapshot["totals"][row] = doc["total_proposals"]
+        snapshot["rates"][row] = doc["approval_rate"]
+        snapshot["velocities"][row] = doc["proposal_velocity"]
+        snapshot["metrics"][doc["creator_id"]] = {k: v for k, v in doc.items() if k != "platform_counts"}
+
+    def invalidate_snapshot(self):
+        """Force the next similarity query to reload creators"""
+        self._snapshot = None
+
+    async def find_similar_creators(
+        self,
+        creator_id: str,
+        creator: Dict[str, Any],
+        metrics: Dict[str, Any],
+        min_score: float,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank every active creator against one creator in a single vectorized pass.
+
+        Scoring:
+        - Platform overlap (Jaccard): 40%
+        - Niche: exact 30%, substring 15%
+        - Approval rate similarity: 20% (both active, peer has 3+ proposals)
+        - Proposal velocity similarity: 10% (both active)
+        """
+        snapshot = await self._get_snapshot()
+        n = len(snapshot["ids"])
+        if n == 0:
+            return []
+
+        scores = np.zeros(n, dtype=np.float64)
+
+        # Platform overlap via bitset intersection counts
+        creator_platforms = set(creator.get("platforms") or [])
+        vocab = snapshot["platform_vocab"]
+        vector = np.zeros(snapshot["platform_matrix"].shape[1], dtype=np.int32)
+        for p in creator_platforms:
+            if p in vocab:
+                vector[vocab[p]] = 1
+        if creator_platforms:
+            overlap = snapshot["platform_matrix"] @ vector
+            union = snapshot["platform_sizes"] + len(creator_platforms) - overlap
+            jaccard = np.divide(overlap, union, out=np.zeros(n), where=union > 0)
+            jaccard[snapshot["platform_sizes"] == 0] = 0
+            scores += SIMILARITY_WEIGHTS["platform"] * jaccard
+
+        # Niche similarity evaluated once per distinct niche, then mapped by code
+        creator_niche = (creator.get("niche") or "").lower()
+        if creator_niche:
+            niche_scores = np.array([
+                0.0 if not other else
+                SIMILARITY_WEIGHTS["niche_exact"] if other == creator_niche else
+                SIMILARITY_WEIGHTS["niche_partial"] if (creator_niche in other or other in creator_niche) else
+                0.0
+                for other in snapshot["niche_vocab"]
+            ], dtype=np.float64)
+            scores += niche_scores[snapshot["niche_codes"]]
+
+        # Performance similarity
+        if metrics.get("total_proposals", 0) > 0:
+            totals = snapshot["totals"]
+            rate_similarity = np.maximum(0, 1 - np.abs(metrics["approval_rate"] - snapshot["rates"]) / 100)
+            scores += np.where(totals >= 3, SIMILARITY_WEIGHTS["approval"] * rate_similarity, 0)
+
+            velocity_similarity = np.maximum(
+                0, 1 - np.abs(metrics["proposal_velocity"] - snapshot["velocities"]) / 10
+            )
+            scores += np.where(totals > 0, SIMILARITY_WEIGHTS["velocity"] * velocity_similarity, 0)
+
+        self_row = snapshot["row_by_id"].get(creator_id)
+        if self_row is not None:
+            scores[self_row] = -1
+
+        candidates = np.flatnonzero(scores >= min_score)
+        if candidates.size == 0:
+            return []
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:limit]]
+
+        similar = []
+        for row in top:
+            cid = snapshot["ids"][row]
+            similar.append({
+                "id": cid,
+                "similarity_score": round(float(scores[row]), 2),
+                "metrics": snapshot["metrics"].get(cid) or self._empty_metrics(cid),
+                "platforms": list(snapshot["platforms"][row])
+            })
+        return similar
+
+
+# Global instance (will be initialized in server startup)
+creator_metrics_service = None
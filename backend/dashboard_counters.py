@@ -0,0 +1,279 @@
+"""
+Dashboard Counters for Creators Hive HQ
+Materialized platform counters so GET /api/dashboard never scans collections
+
+This module implements:
+- Collection counts from estimated_document_count (collection metadata, O(1))
+- Running totals in platform_counters (revenue, expenses, ARRIS queries and
+  response time), updated with $inc as calculator / arris_usage_log rows
+  are inserted
+- Background refresher: reloads counts and totals into an in-process
+  snapshot every DASHBOARD_COUNTERS_REFRESH_SECONDS
+- rebuild_totals: recomputes the totals from source to correct any drift;
+  run hourly as the "dashboard_counter_rebuild" JobScheduler job, so one
+  worker rebuilds at a time
+- Staleness metadata (refreshed_at, age_seconds) served with the snapshot
+
+Writers anywhere in the backend call:
+    await dashboard_counters.record_calculator_entry(doc)
+    await dashboard_counters.record_arris_usage(doc)
+right after the insert. Both are no-ops until initialize() has run.
+
+Increments that land while a rebuild aggregates are not lost: each one is
+also kept under gens.<insert minute> and bumps the document's version. The
+rebuild only aggregates rows inserted before its cutoff minute, then writes
+base + gens from the cutoff on, conditioned on the version it read
+(retried on conflict), the same rebase time_series_rollups uses.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone, timedelta
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_COUNTERS_REFRESH_SECONDS = float(os.environ.get("DASHBOARD_COUNTERS_REFRESH_SECONDS", "30"))
+DASHBOARD_COUNTERS_REBASE_RETRIES = 5
+
+PLATFORM_COUNTERS_ID = "platform"
+GEN_KEY_FORMAT = "%Y%m%d%H%M"
+
+DASHBOARD_COLLECTIONS = [
+    "users", "projects", "tasks", "calculator", "subscriptions",
+    "customers", "affiliates", "arris_usage_log", "analytics",
+    "integrations", "marketing_campaigns"
+]
+
+
+def _number(value) -> float:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _insert_gen(doc: Dict[str, Any]) -> Optional[str]:
+    """Minute key of the source row's insert, read from its ObjectId"""
+    doc_id = doc.get("_id")
+    if isinstance(doc_id, ObjectId):
+        return doc_id.generation_time.strftime(GEN_KEY_FORMAT)
+    return None
+
+
+class DashboardCounters:
+    """
+    Materialized dashboard counters.
+
+    Totals live in one platform_counters document shared by all workers;
+    each worker serves the dashboard from its own snapshot of it.
+    """
+
+    def __init__(self, db: Optional[AsyncIOMotorDatabase] = None):
+        self.db = db
+        self.refresh_seconds = DASHBOARD_COUNTERS_REFRESH_SECONDS
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refreshed_at: Optional[datetime] = None
+        self._refreshed_monotonic = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+
+    async def initialize(self, db: AsyncIOMotorDatabase):
+        """Bind the database, seed totals if missing and start the refresher"""
+        self.db = db
+        if await db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID}) is None:
+            await self.rebuild_totals()
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info("Dashboard counters initialized")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # ============== INCREMENTAL UPDATES ==============
+
+    async def record_calculator_entry(self, entry: Dict[str, Any]):
+        """Fold a newly inserted calculator row into the running totals"""
+        revenue = _number(entry.get("revenue")) if entry.get("category") == "Income" else 0
+        expenses = _number(entry.get("expenses"))
+        await self._increment({"total_revenue": revenue, "total_expenses": expenses}, _insert_gen(entry))
+
+    async def record_arris_usage(self, log: Dict[str, Any]):
+        """Fold a newly inserted arris_usage_log row into the running totals"""
+        inc = {"arris_total_queries": 1}
+        time_taken = log.get("time_taken_s")
+        if isinstance(time_taken, (int, float)) and not isinstance(time_taken, bool):
+            inc["arris_time_total"] = time_taken
+            inc["arris_time_samples"] = 1
+        await self._increment(inc, _insert_gen(log))
+
+    async def _increment(self, inc: Dict[str, float], gen: Optional[str] = None):
+        if self.db is None:
+            return
+        inc = {k: v for k, v in inc.items() if v}
+        if not inc:
+            return
+        gen_inc = {f"gens.{gen}.{k}": v for k, v in inc.items()} if gen else {}
+        try:
+            await self.db.platform_counters.update_one(
+                {"_id": PLATFORM_COUNTERS_ID},
+                {
+                    "$inc": {**inc, **gen_inc, "version": 1},
+                    "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            # The periodic rebuild corrects a missed increment
+            logger.warning(f"Dashboard counter increment failed: {e}")
+            return
+        # Read-your-writes on this worker until the next refresh
+        if self._snapshot is not None:
+            totals = self._snapshot["totals"]
+            for key, value in inc.items():
+                totals[key] = totals.get(key, 0) + value
+
+    # ============== REFRESH / REBUILD ==============
+
+    async def rebuild_totals(self) -> Dict[str, Any]:
+        """Recompute totals from calculator and arris_usage_log (full scans)"""
+        start = time.monotonic()
+        # Rows inserted from the cutoff on are carried by their gens; the
+        # extra minute covers inserts still in flight when the scan starts
+        cutoff = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=1)
+        inserted_before = {"$or": [
+            {"_id": {"$lt": ObjectId.from_datetime(cutoff)}},
+            {"_id": {"$not": {"$type": "objectId"}}},
+        ]}
+        income, expenses, arris = await asyncio.gather(
+            self.db.calculator.aggregate([
+                {"$match": {"$and": [{"category": "Income"}, inserted_before]}},
+                {"$group": {"_id": None, "total": {"$sum": "$revenue"}}}
+            ]).to_list(1),
+            self.db.calculator.aggregate([
+                {"$match": inserted_before},
+                {"$group": {"_id": None, "total": {"$sum": "$expenses"}}}
+            ]).to_list(1),
+            self.db.arris_usage_log.aggregate([
+                {"$match": inserted_before},
+                {"$group": {
+                    "_id": None,
+                    "total_queries": {"$sum": 1},
+                    "time_total": {"$sum": "$time_taken_s"},
+                    "time_samples": {"$sum": {"$cond": [{"$isNumber": "$time_taken_s"}, 1, 0]}}
+                }}
+            ]).to_list(1)
+        )
+        arris_row = arris[0] if arris else {}
+        base = {
+            "total_revenue": income[0]["total"] if income else 0,
+            "total_expenses": expenses[0]["total"] if expenses else 0,
+            "arris_total_queries": arris_row.get("total_queries", 0),
+            "arris_time_total": arris_row.get("time_total", 0),
+            "arris_time_samples": arris_row.get("time_samples", 0),
+        }
+        totals = await self._rebase(base, cutoff.strftime(GEN_KEY_FORMAT))
+        logger.info(f"Rebuilt dashboard totals in {round(time.monotonic() - start, 3)}s")
+        return totals
+
+    async def _rebase(self, base: Dict[str, Any], cutoff_gen: str) -> Dict[str, Any]:
+        """
+        Set the totals to the rebuilt base plus the gens from cutoff_gen on,
+        applied only if no increment landed since the document was read
+        """
+        for _ in range(DASHBOARD_COUNTERS_REBASE_RETRIES):
+            current = await self.db.platform_counters.find_one(
+                {"_id": PLATFORM_COUNTERS_ID}, {"version": 1, "gens": 1}
+            )
+            gens = {gen: delta for gen, delta in ((current or {}).get("gens") or {}).items() if gen >= cutoff_gen}
+            totals = dict(base)
+            for delta in gens.values():
+                for key, value in delta.items():
+                    totals[key] = totals.get(key, 0) + value
+
+            version = (current or {}).get("version")
+            now = datetime.now(timezone.utc).isoformat()
+            try:
+                result = await self.db.platform_counters.update_one(
+                    {"_id": PLATFORM_COUNTERS_ID, "version": version if version is not None else {"$exists": False}},
+                    {"$set": {**totals, "gens": gens, "rebuilt_at": now, "updated_at": now}, "$inc": {"version": 1}},
+                    upsert=current is None
+                )
+            except DuplicateKeyError:
+                # Created by an increment since the read
+                continue
+            if result.matched_count or result.upserted_id is not None:
+                return totals
+        raise RuntimeError("Dashboard totals rebuild kept conflicting with increments")
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Reload collection counts and totals into the snapshot"""
+        async with self._refresh_lock:
+            counts = await asyncio.gather(
+                *(self.db[name].estimated_document_count() for name in DASHBOARD_COLLECTIONS)
+            )
+            totals = await self.db.platform_counters.find_one(
+                {"_id": PLATFORM_COUNTERS_ID}, {"_id": 0, "gens": 0}
+            ) or {}
+            self._snapshot = {
+                "stats": dict(zip(DASHBOARD_COLLECTIONS, counts)),
+                "totals": totals,
+            }
+            self._refreshed_at = datetime.now(timezone.utc)
+            self._refreshed_monotonic = time.monotonic()
+            return self._snapshot
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dashboard counter refresh failed: {e}")
+
+    # ============== READ ==============
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Dashboard stats, financials and ARRIS totals from the snapshot.
+        Only touches MongoDB if no snapshot has been taken yet.
+        """
+        if self._snapshot is None:
+            await self.refresh()
+
+        totals = self._snapshot["totals"]
+        revenue = totals.get("total_revenue", 0)
+        expenses = totals.get("total_expenses", 0)
+        samples = totals.get("arris_time_samples", 0)
+
+        return {
+            "stats": dict(self._snapshot["stats"]),
+            "financials": {
+                "total_revenue": revenue,
+                "total_expenses": expenses,
+                "net_profit": revenue - expenses
+            },
+            "arris": {
+                "total_queries": totals.get("arris_total_queries", 0),
+                "avg_response_time": totals.get("arris_time_total", 0) / samples if samples else 0
+            },
+            "counters": {
+                "source": "materialized",
+                "refreshed_at": self._refreshed_at.isoformat() if self._refreshed_at else None,
+                "age_seconds": round(time.monotonic() - self._refreshed_monotonic, 1),
+                "refresh_interval_seconds": self.refresh_seconds,
+                "totals_rebuilt_at": totals.get("rebuilt_at"),
+                "counts_estimated": True
+            }
+        }
+
+
+# Global counters instance (initialized in server.py startup)
+dashboard_counters = DashboardCounters()
@@ -8,6 +8,8 @@ import os
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
+from index_registry import index_registry
+
 # Collection names mapping to Sheet numbers
 COLLECTIONS = {
     "01_users": "users",
@@ -114,33 +116,58 @@ def convert_excel_date(excel_date: float) -> datetime:
     excel_epoch = datetime(1899, 12, 30, tzinfo=timezone.utc)
     return excel_epoch + timedelta(days=excel_date)
 
+# ============== INDEXES ==============
+# Core collections queried all over server.py; service-specific collections
+# declare their indexes in their own modules.
+
+# User ID index on all collections (universal join key)
+COLLECTIONS_WITH_USER_ID = [
+    "users", "branding_kits", "coach_kits", "projects", "tasks",
+    "calculator", "analytics", "customers", "affiliates", "email_log",
+    "notepad", "integrations", "audit", "subscriptions", "arris_usage_log",
+    "terms_of_service", "privacy_policies", "forms_submission", "user_activity_log"
+]
+
+for _coll_name in COLLECTIONS_WITH_USER_ID:
+    index_registry.register(_coll_name, "user_id", owner="database")
+
+# Time-based indexes for Pattern Engine
+index_registry.register("arris_usage_log", "timestamp", owner="database")
+index_registry.register("calculator", "month_year", owner="database")
+index_registry.register("analytics", "date", owner="database")
+index_registry.register("user_activity_log", "timestamp", owner="database")
+
+# Foreign key indexes
+index_registry.register("tasks", "project_id", owner="database")
+index_registry.register("arris_performance", "log_id", owner="database")
+index_registry.register("client_contracts", "customer_id", owner="database")
+index_registry.register("subscriptions", "linked_calc_id", owner="database")
+
+# Unique indexes
+index_registry.register("users", "email", unique=True, sparse=True, owner="database")
+
+# Proposals: lookups by id, per-creator lists and status queues
+index_registry.register("proposals", "id", unique=True, owner="proposals")
+index_registry.register("proposals", [("user_id", 1), ("created_at", -1)], owner="proposals")
+index_registry.register("proposals", [("user_id", 1), ("status", 1)], owner="proposals")
+index_registry.register("proposals", [("status", 1), ("created_at", -1)], owner="proposals")
+index_registry.register_query("proposals", {"id": "PROP-1"}, owner="proposals")
+index_registry.register_query("proposals", {"user_id": "CR-1"}, sort=[("created_at", -1)], owner="proposals")
+index_registry.register_query("proposals", {"user_id": "CR-1", "status": "approved"}, owner="proposals")
+index_registry.register_query("proposals", {"status": {"$in": ["submitted", "under_review"]}}, owner="proposals")
+
+# Creators: auth by email, lookups by id, admin lists by status
+index_registry.register("creators", "id", unique=True, owner="creators")
+index_registry.register("creators", "email", unique=True, owner="creators")
+index_registry.register("creators", [("status", 1), ("submitted_at", -1)], owner="creators")
+index_registry.register_query("creators", {"id": "CR-1"}, owner="creators")
+index_registry.register_query("creators", {"email": "creator@example.com"}, owner="creators")
+index_registry.register_query("creators", {"status": "active"}, owner="creators")
+
+
 async def create_indexes(db):
-    """Create indexes for efficient querying"""
-    # User ID index on all collections (universal join key)
-    collections_with_user_id = [
-        "users", "branding_kits", "coach_kits", "projects", "tasks",
-        "calculator", "analytics", "customers", "affiliates", "email_log",
-        "notepad", "integrations", "audit", "subscriptions", "arris_usage_log",
-        "terms_of_service", "privacy_policies", "forms_submission", "user_activity_log"
-    ]
-    
-    for coll_name in collections_with_user_id:
-        await db[coll_name].create_index("user_id")
-    
-    # Time-based indexes for Pattern Engine
-    await db["arris_usage_log"].create_index("timestamp")
-    await db["calculator"].create_index("month_year")
-    await db["analytics"].create_index("date")
-    await db["user_activity_log"].create_index("timestamp")
-    
-    # Foreign key indexes
-    await db["tasks"].create_index("project_id")
-    await db["arris_performance"].create_index("log_id")
-    await db["client_contracts"].create_index("customer_id")
-    await db["subscriptions"].create_index("linked_calc_id")
-    
-    # Unique indexes
-    await db["users"].create_index("email", unique=True, sparse=True)
+    """Create every registered index that is missing; returns the drift report"""
+    return await index_registry.apply(db)
 
 async def seed_schema_index(db):
     """Seed the schema index (Sheet 15)"""
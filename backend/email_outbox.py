@@ -0,0 +1,525 @@
+"""
+Email Outbox for Creators Hive HQ
+Durable, batched, non-blocking email delivery
+
+This module implements:
+- email_outbox collection: every message is written here first, so request
+  handlers return as soon as the insert is acknowledged
+- Dedup keys: a message with an existing dedup_key is not queued again
+- Async workers that claim due messages in batches and hand them to a
+  transport; failed deliveries retry with jittered exponential backoff
+- SendGridTransport: pooled httpx.AsyncClient against the v3 mail/send API;
+  messages sharing sender, subject and body go out in one request with one
+  personalization (and its substitutions) per recipient. A group rejected
+  with a permanent 4xx is resent one recipient at a time, so one bad
+  address does not fail everyone else in the group
+- FakeTransport: in-memory transport for tests and local development
+  (EMAIL_TRANSPORT=fake)
+- Delivery metrics (queue depth by status, oldest pending age, throughput)
+
+Claiming works like the job scheduler's leases: a worker picks candidate ids,
+flips them to "sending" with one update_many guarded on their current state,
+then reads back the documents carrying its claim id. A worker that dies mid
+batch leaves leases that expire and are claimed again.
+"""
+
+import os
+import uuid
+import random
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from index_registry import index_registry
+import httpx
+
+logger = logging.getLogger(__name__)
+
+EMAIL_TRANSPORT = os.environ.get("EMAIL_TRANSPORT", "sendgrid").lower()
+EMAIL_OUTBOX_WORKERS = int(os.environ.get("EMAIL_OUTBOX_WORKERS", "2"))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("EMAIL_OUTBOX_BATCH_SIZE", "200"))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.environ.get("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+EMAIL_MAX_ATTEMPTS = int(os.environ.get("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE_SECONDS = float(os.environ.get("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_LEASE_SECONDS = 300
+EMAIL_SENT_TTL_DAYS = 30
+
+SENDGRID_API_URL = os.environ.get("SENDGRID_API_URL", "https://api.sendgrid.com")
+SENDGRID_MAX_PERSONALIZATIONS = 1000  # SendGrid limit per mail/send request
+SENDGRID_MAX_CONNECTIONS = int(os.environ.get("SENDGRID_MAX_CONNECTIONS", "10"))
+
+index_registry.register("email_outbox", [("status", 1), ("next_attempt_at", 1)], owner="email_outbox")
+index_registry.register("email_outbox", "claim_id", owner="email_outbox")
+index_registry.register(
+    "email_outbox", "dedup_key", unique=True,
+    partial={"dedup_key": {"$type": "string"}}, owner="email_outbox"
+)
+index_registry.register("email_outbox", "sent_at", ttl_seconds=EMAIL_SENT_TTL_DAYS * 86400, owner="email_outbox")
+index_registry.register_query(
+    "email_outbox", {"status": "pending", "next_attempt_at": {"$lte": datetime.now(timezone.utc)}},
+    sort=[("next_attempt_at", 1)], owner="email_outbox"
+)
+
+
+class OutboxStatus:
+    """Delivery state of an outbox message"""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class DeliveryResult:
+    """Outcome of one message: sent, retryable failure or permanent failure"""
+
+    def __init__(self, sent: bool, retryable: bool = False, error: Optional[str] = None,
+                 provider_id: Optional[str] = None):
+        self.sent = sent
+        self.retryable = retryable
+        self.error = error
+        self.provider_id = provider_id
+
+
+# ============== TRANSPORTS ==============
+
+def _group_key(message: Dict[str, Any]) -> Tuple:
+    return (
+        message.get("from_email"), message.get("from_name"), message["subject"],
+        message["html_content"], message.get("plain_content"), message.get("category")
+    )
+
+
+def render_substitutions(text: Optional[str], substitutions: Optional[Dict[str, str]]) -> Optional[str]:
+    """Apply SendGrid-style substitutions locally (fallback and fake transport)"""
+    if not text or not substitutions:
+        return text
+    for tag, value in substitutions.items():
+        text = text.replace(tag, str(value))
+    return text
+
+
+class SendGridTransport:
+    """SendGrid v3 mail/send over a pooled, keep-alive HTTP client"""
+
+    name = "sendgrid"
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = SENDGRID_API_URL,
+                 max_connections: int = SENDGRID_MAX_CONNECTIONS):
+        self.api_key = api_key if api_key is not None else os.environ.get("SENDGRID_API_KEY")
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send_batch(self, messages: List[Dict[str, Any]]) -> List[DeliveryResult]:
+        """Send messages, one request per group of identical content"""
+        groups: Dict[Tuple, List[int]] = {}
+        for i, message in enumerate(messages):
+            groups.setdefault(_group_key(message), []).append(i)
+
+        requests = []
+        for indexes in groups.values():
+            for start in range(0, len(indexes), SENDGRID_MAX_PERSONALIZATIONS):
+                requests.append(indexes[start:start + SENDGRID_MAX_PERSONALIZATIONS])
+
+        results: List[Optional[DeliveryResult]] = [None] * len(messages)
+        outcomes = await asyncio.gather(*[
+            self._post([messages[i] for i in chunk]) for chunk in requests
+        ])
+        for chunk, outcome in zip(requests, outcomes):
+            if len(chunk) > 1 and not outcome.sent and not outcome.retryable:
+                # The whole request was rejected; find out which recipients are bad
+                singles = await self._post_each([messages[i] for i in chunk])
+                for i, single in zip(chunk, singles):
+                    results[i] = single
+                continue
+            for i in chunk:
+                results[i] = outcome
+        return results
+
+    async def _post_each(self, messages: List[Dict[str, Any]]) -> List[DeliveryResult]:
+        """One request per message, bounded by the connection pool size"""
+        semaphore = asyncio.Semaphore(self.max_connections)
+
+        async def post_one(message):
+            async with semaphore:
+                return await self._post([message])
+
+        return await asyncio.gather(*[post_one(m) for m in messages])
+
+    async def _post(self, messages: List[Dict[str, Any]]) -> DeliveryResult:
+        first = messages[0]
+        content = [{"type": "text/html", "value": first["html_content"]}]
+        if first.get("plain_content"):
+            content.insert(0, {"type": "text/plain", "value": first["plain_content"]})
+
+        personalizations = []
+        for message in messages:
+            personalization: Dict[str, Any] = {"to": [{"email": message["to_email"]}]}
+            if message.get("substitutions"):
+                personalization["substitutions"] = message["substitutions"]
+            personalizations.append(personalization)
+
+        payload: Dict[str, Any] = {
+            "personalizations": personalizations,
+            "from": {"email": first["from_email"], "name": first.get("from_name")},
+            "subject": first["subject"],
+            "content": content,
+        }
+        if first.get("category"):
+            payload["categories"] = [first["category"]]
+
+        try:
+            response = await self.client.post("/v3/mail/send", json=payload)
+        except httpx.HTTPError as e:
+            return DeliveryResult(False, retryable=True, error=f"{type(e).__name__}: {e}")
+
+        if response.status_code in (200, 201, 202):
+            return DeliveryResult(True, provider_id=response.headers.get("X-Message-Id"))
+        error = f"SendGrid {response.status_code}: {response.text[:300]}"
+        # Throttling and provider errors are worth retrying; other 4xx are not
+        retryable = response.status_code == 429 or response.status_code >= 500
+        return DeliveryResult(False, retryable=retryable, error=error)
+
+
+class FakeTransport:
+    """
+    In-memory transport. Records rendered messages in .sent; set .fail_next
+    to a list of DeliveryResults to script failures.
+    """
+
+    name = "fake"
+    configured = True
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.fail_next: List[DeliveryResult] = []
+
+    async def send_batch(self, messages: List[Dict[str, Any]]) -> List[DeliveryResult]:
+        self.requests += len({_group_key(m) for m in messages})
+        results = []
+        for message in messages:
+            if self.fail_next:
+                results.append(self.fail_next.pop(0))
+                continue
+            self.sent.append({
+                "to_email": message["to_email"],
+                "subject": message["subject"],
+                "html_content": render_substitutions(message["html_content"], message.get("substitutions")),
+                "plain_content": render_substitutions(message.get("plain_content"), message.get("substitutions")),
+                "category": message.get("category"),
+            })
+            results.append(DeliveryResult(True, provider_id=f"fake-{len(self.sent)}"))
+        return results
+
+    async def close(self):
+        pass
+
+
+def build_transport(name: str = EMAIL_TRANSPORT):
+    """Transport selected by EMAIL_TRANSPORT (sendgrid | fake)"""
+    if name == "fake":
+        return FakeTransport()
+    return SendGridTransport()
+
+
+# ============== OUTBOX ==============
+
+class EmailOutbox:
+    """
+    Durable email queue drained by background workers.
+
+    Usage:
+        outbox = EmailOutbox(db, build_transport())  # indexes come from index_registry
+        outbox.start()
+        await outbox.enqueue("a@b.com", "Subject", "<p>Hi</p>", dedup_key="welcome:a@b.com")
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        transport,
+        workers: int = EMAIL_OUTBOX_WORKERS,
+        batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+        poll_seconds: float = EMAIL_OUTBOX_POLL_SECONDS,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        retry_base_seconds: float = EMAIL_RETRY_BASE_SECONDS
+    ):
+        self.db = db
+        self.transport = transport
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.sender_email = os.environ.get("SENDER_EMAIL", "notifications@hivehq.com")
+        self.sender_name = os.environ.get("SENDER_NAME", "Creators Hive HQ")
+        self._wake = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._stats = {
+            "batches": 0,
+            "sent": 0,
+            "retried": 0,
+            "failed": 0,
+            "deduplicated": 0,
+            "delivery_ms_total": 0.0,
+        }
+
+    # ============== ENQUEUE ==============
+
+    def _message_doc(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        plain_content: Optional[str] = None,
+        substitutions: Optional[Dict[str, str]] = None,
+        dedup_key: Optional[str] = None,
+        category: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        now = now or datetime.now(timezone.utc)
+        doc = {
+            "id": f"EML-{uuid.uuid4().hex[:12].upper()}",
+            "to_email": to_email,
+            "from_email": self.sender_email,
+            "from_name": self.sender_name,
+            "subject": subject,
+            "html_content": html_content,
+            "plain_content": plain_content,
+            "substitutions": substitutions,
+            "category": category,
+            "status": OutboxStatus.PENDING,
+            "attempts": 0,
+            "created_at": now,
+            "next_attempt_at": now,
+        }
+        if dedup_key:
+            doc["dedup_key"] = dedup_key
+        return doc
+
+    async def enqueue(self, to_email: str, subject: str, html_content: str, **options) -> Dict[str, Any]:
+        """Queue one message; returns {"queued", "id"} or {"queued": False, "duplicate": True}"""
+        doc = self._message_doc(to_email, subject, html_content, **options)
+        try:
+            await self.db.email_outbox.insert_one(doc)
+        except DuplicateKeyError:
+            self._stats["deduplicated"] += 1
+            return {"queued": False, "duplicate": True, "dedup_key": doc.get("dedup_key")}
+        self._wake.set()
+        return {"queued": True, "id": doc["id"]}
+
+    async def enqueue_many(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Queue many messages in one write. Each message is a dict of enqueue()
+        arguments (to_email, subject, html_content, substitutions, dedup_key...).
+        """
+        if not messages:
+            return {"queued": 0, "duplicates": 0}
+        now = datetime.now(timezone.utc)
+        docs = [self._message_doc(now=now, **m) for m in messages]
+        duplicates = 0
+        try:
+            await self.db.email_outbox.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            duplicates = sum(1 for err in errors if err.get("code") == 11000)
+            if duplicates != len(errors):
+                raise
+        self._stats["deduplicated"] += duplicates
+        self._wake.set()
+        return {"queued": len(docs) - duplicates, "duplicates": duplicates}
+
+    async def send_now(self, to_email: str, subject: str, html_content: str, **options) -> DeliveryResult:
+        """Deliver one message immediately through the transport, bypassing the queue"""
+        message = self._message_doc(to_email, subject, html_content, **options)
+        return (await self.transport.send_batch([message]))[0]
+
+    # ============== WORKERS ==============
+
+    def start(self):
+        """Start the delivery workers"""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Email outbox started: {self.workers} workers, transport={self.transport.name}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.transport.close()
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                delivered = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Email outbox worker {index} failed: {e}")
+                delivered = 0
+            if delivered:
+                continue  # More may be waiting; claim the next batch right away
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds * random.uniform(0.8, 1.2))
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch; returns the number of messages handled"""
+        batch = await self._claim_batch()
+        if not batch:
+            return 0
+        await self._deliver(batch)
+        return len(batch)
+
+    async def _claim_batch(self) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        claimable = {"$or": [
+            {"status": OutboxStatus.PENDING, "next_attempt_at": {"$lte": now}},
+            {"status": OutboxStatus.SENDING, "lease_until": {"$lt": now}},
+        ]}
+        candidates = await self.db.email_outbox.find(
+            claimable, {"_id": 1}
+        ).sort("next_attempt_at", 1).limit(self.batch_size).to_list(self.batch_size)
+        if not candidates:
+            return []
+
+        claim_id = uuid.uuid4().hex
+        # Re-checking the claimable filter makes the flip safe against other workers
+        await self.db.email_outbox.update_many(
+            {"$and": [{"_id": {"$in": [c["_id"] for c in candidates]}}, claimable]},
+            {"$set": {
+                "status": OutboxStatus.SENDING,
+                "claim_id": claim_id,
+                "lease_until": now + timedelta(seconds=EMAIL_LEASE_SECONDS),
+            }}
+        )
+        return await self.db.email_outbox.find({"claim_id": claim_id}).to_list(self.batch_size)
+
+    async def _deliver(self, batch: List[Dict[str, Any]]):
+        started = datetime.now(timezone.utc)
+        try:
+            results = await self.transport.send_batch(batch)
+        except Exception as e:
+            logger.error(f"Email transport error: {e}")
+            results = [DeliveryResult(False, retryable=True, error=str(e))] * len(batch)
+        finished = datetime.now(timezone.utc)
+
+        updates = []
+        for doc, result in zip(batch, results):
+            attempts = doc.get("attempts", 0) + 1
+            if result.sent:
+                self._stats["sent"] += 1
+                fields = {
+                    "status": OutboxStatus.SENT,
+                    "sent_at": finished,
+                    "provider_message_id": result.provider_id,
+                    "last_error": None,
+                }
+            elif result.retryable and attempts < self.max_attempts:
+                self._stats["retried"] += 1
+                delay = random.uniform(0.5, 1.0) * self.retry_base_seconds * (2 ** (attempts - 1))
+                fields = {
+                    "status": OutboxStatus.PENDING,
+                    "next_attempt_at": finished + timedelta(seconds=delay),
+                    "last_error": result.error,
+                }
+            else:
+                self._stats["failed"] += 1
+                fields = {
+                    "status": OutboxStatus.FAILED,
+                    "failed_at": finished,
+                    "last_error": result.error,
+                }
+                logger.error(f"Email {doc['id']} to {doc['to_email']} failed permanently: {result.error}")
+            fields.update({"attempts": attempts, "claim_id": None, "lease_until": None})
+            updates.append(UpdateOne({"_id": doc["_id"], "claim_id": doc["claim_id"]}, {"$set": fields}))
+
+        await self.db.email_outbox.bulk_write(updates, ordered=False)
+        self._stats["batches"] += 1
+        self._stats["delivery_ms_total"] += (finished - started).total_seconds() * 1000
+
+    # ============== ADMIN ==============
+
+    async def retry_failed(self, limit: int = 1000) -> Dict[str, Any]:
+        """Put permanently failed messages back in the queue"""
+        failed = await self.db.email_outbox.find(
+            {"status": OutboxStatus.FAILED}, {"_id": 1}
+        ).limit(limit).to_list(limit)
+        result = await self.db.email_outbox.update_many(
+            {"_id": {"$in": [d["_id"] for d in failed]}},
+            {"$set": {
+                "status": OutboxStatus.PENDING,
+                "attempts": 0,
+                "next_attempt_at": datetime.now(timezone.utc),
+            }}
+        )
+        self._wake.set()
+        return {"success": True, "requeued": result.modified_count}
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth by status plus this worker's delivery counters"""
+        by_status = {
+            row["_id"]: row["count"]
+            async for row in self.db.email_outbox.aggregate([
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ])
+        }
+        oldest = await self.db.email_outbox.find_one(
+            {"status": OutboxStatus.PENDING}, {"created_at": 1}, sort=[("created_at", 1)]
+        )
+        oldest_age = None
+        if oldest and isinstance(oldest.get("created_at"), datetime):
+            created_at = oldest["created_at"]
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            oldest_age = round((datetime.now(timezone.utc) - created_at).total_seconds(), 1)
+
+        stats = dict(self._stats)
+        total_ms = stats.pop("delivery_ms_total")
+        return {
+            "transport": self.transport.name,
+            "workers": len(self._tasks),
+            "queue": {status: by_status.get(status, 0) for status in [
+                OutboxStatus.PENDING, OutboxStatus.SENDING, OutboxStatus.SENT, OutboxStatus.FAILED
+            ]},
+            "oldest_pending_seconds": oldest_age,
+            "worker_stats": {
+                **stats,
+                "avg_batch_ms": round(total_ms / stats["batches"], 1) if stats["batches"] else None,
+            },
+        }
+
+
+# Global outbox instance (initialized in server.py startup)
+email_outbox = None
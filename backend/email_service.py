@@ -2,15 +2,22 @@
 Email Service for Creators Hive HQ
 Handles email notifications for proposal status changes using SendGrid.
 Part of the Zero-Human Operational Model.
+
+Once an EmailOutbox is attached (server startup), send_email only writes the
+message to the email_outbox collection and returns; outbox workers deliver
+it. Without an outbox, messages are sent directly on a worker thread.
 """
 
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content, Personalization
 import os
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 
+from email_outbox import render_substitutions
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +37,11 @@ class EmailService:
         self.sender_email = os.environ.get('SENDER_EMAIL', 'notifications@hivehq.com')
         self.sender_name = os.environ.get('SENDER_NAME', 'Creators Hive HQ')
         self._client = None
+        self.outbox = None
+    
+    def attach_outbox(self, outbox):
+        """Route send_email through a durable EmailOutbox"""
+        self.outbox = outbox
         
     @property
     def client(self) -> Optional[SendGridAPIClient]:
@@ -40,6 +52,8 @@ class EmailService:
     
     def is_configured(self) -> bool:
         """Check if email service is properly configured"""
+        if self.outbox is not None:
+            return self.outbox.transport.configured
         return bool(self.api_key)
     
     async def send_email(
@@ -47,7 +61,10 @@ class EmailService:
         to_email: str,
         subject: str,
         html_content: str,
-        plain_content: Optional[str] = None
+        plain_content: Optional[str] = None,
+        dedup_key: Optional[str] = None,
+        category: Optional[str] = None,
+        deliver_now: bool = False
     ) -> bool:
         """
         Send an email via SendGrid.
@@ -57,6 +74,9 @@ class EmailService:
             subject: Email subject line
             html_content: HTML email body
             plain_content: Optional plain text fallback
+            dedup_key: Skip the message if one with this key was already queued
+            category: SendGrid category (for delivery stats)
+            deliver_now: Bypass the outbox and wait for the provider
             
         Returns:
             True if email was accepted for delivery, False otherwise
@@ -65,6 +85,64 @@ class EmailService:
             logger.warning("Email service not configured - SENDGRID_API_KEY missing")
             return False
         
+        if self.outbox is not None:
+            if deliver_now:
+                result = await self.outbox.send_now(
+                    to_email, subject, html_content, plain_content=plain_content, category=category
+                )
+                if not result.sent:
+                    raise EmailDeliveryError(f"Failed to send email: {result.error}")
+                return True
+            queued = await self.outbox.enqueue(
+                to_email, subject, html_content,
+                plain_content=plain_content, dedup_key=dedup_key, category=category
+            )
+            if queued.get("duplicate"):
+                logger.info(f"Email to {to_email} already queued ({dedup_key}), skipping")
+            return True
+        
+        return await self._send_direct(to_email, subject, html_content, plain_content)
+    
+    async def send_bulk(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Queue many messages at once.
+        
+        Each message is a dict with to_email, subject, html_content and
+        optionally plain_content, substitutions, dedup_key and category.
+        Messages that share subject and body (personalised through
+        substitutions, e.g. {"-name-": "Ada"}) are delivered in one provider
+        request.
+        """
+        if not self.is_configured():
+            logger.warning("Email service not configured - SENDGRID_API_KEY missing")
+            return {"queued": 0, "duplicates": 0}
+        
+        if self.outbox is not None:
+            return await self.outbox.enqueue_many(messages)
+        
+        sent = 0
+        for message in messages:
+            substitutions = message.get("substitutions")
+            try:
+                if await self._send_direct(
+                    message["to_email"],
+                    message["subject"],
+                    render_substitutions(message["html_content"], substitutions),
+                    render_substitutions(message.get("plain_content"), substitutions)
+                ):
+                    sent += 1
+            except EmailDeliveryError:
+                pass
+        return {"queued": sent, "duplicates": 0}
+    
+    async def _send_direct(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        plain_content: Optional[str] = None
+    ) -> bool:
+        """Send immediately with the SendGrid SDK (off the event loop)"""
         try:
             message = Mail(
                 from_email=Email(self.sender_email, self.sender_name),
@@ -76,7 +154,7 @@ class EmailService:
             if plain_content:
                 message.add_content(Content("text/plain", plain_content))
             
-            response = self.client.send(message)
+            response = await asyncio.to_thread(self.client.send, message)
             
             if response.status_code in [200, 201, 202]:
                 logger.info(f"Email sent successfully to {to_email}: {subject}")
@@ -19,8 +19,20 @@ from collections import defaultdict
 import hashlib
 import json
 
+from memory_search_index import MemorySearchIndex, IndexSource
+from creator_metrics_service import CreatorMetricsService
+from index_registry import index_registry
+from bson_dates import utc_now, iso, iso_dates, to_bson_date, date_range, add_date_range
+from time_series_rollups import time_series_rollups
+
 logger = logging.getLogger(__name__)
 
+# Most ranked ids _search_collection will widen to when the filter is sparse
+SEARCH_MAX_RANKED = int(os.environ.get("MEMORY_SEARCH_MAX_RANKED", "5000"))
+
+index_registry.register("memory_search_log", [("creator_id", 1), ("searched_at", -1)], owner="memory_palace")
+index_registry.register_query("memory_search_log", {"creator_id": "CR-1"}, owner="memory_palace")
+
 
 class ConsolidationStrategy:
     """Strategies for memory consolidation"""
@@ -50,8 +62,15 @@ class EnhancedMemoryPalace:
     - Similarity-based creator clustering for insights
     """
     
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        search_index: Optional[MemorySearchIndex] = None,
+        metrics_service: Optional[CreatorMetricsService] = None
+    ):
         self.db = db
+        self.search_index = search_index or MemorySearchIndex(db)
+        self.metrics_service = metrics_service or CreatorMetricsService(db)
         self.consolidation_age_days = 30      # Consolidate memories older than this
         self.archive_age_days = 90            # Archive memories older than this
         self.min_similarity_score = 0.6       # Minimum similarity for cross-creator insights
@@ -165,13 +184,13 @@ class EnhancedMemoryPalace:
     async def _merge_similar_memories(self, creator_id: str) -> int:
         """Merge similar memories into consolidated entries"""
         merged_count = 0
-        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=self.consolidation_age_days)).isoformat()
+        cutoff_date = utc_now() - timedelta(days=self.consolidation_age_days)
         
         # Find old interaction memories
         old_interactions = await self.db.arris_memories.find({
             "creator_id": creator_id,
             "memory_type": "interaction",
-            "created_at": {"$lt": cutoff_date},
+            **date_range("created_at", lt=cutoff_date),
             "consolidated": {"$ne": True}
         }).to_list(500)
         
@@ -181,7 +200,7 @@ class EnhancedMemoryPalace:
         # Group by month
         monthly_groups = defaultdict(list)
         for mem in old_interactions:
-            created = mem.get("created_at", "")[:7]  # YYYY-MM
+            created = iso(mem.get("created_at"))[:7]  # YYYY-MM
             monthly_groups[created].append(mem)
         
         # Merge each month's memories
@@ -205,15 +224,19 @@ class EnhancedMemoryPalace:
                 "importance": max(m.get("importance", 0.5) for m in memories),
                 "tags": ["consolidated", "monthly_summary"],
                 "consolidated": True,
-                "created_at": datetime.now(timezone.utc).isoformat(),
+                "created_at": utc_now(),
                 "source_count": len(memories)
             }
             
             # Insert consolidated and remove originals
             await self.db.arris_memories.insert_one(consolidated)
+            await time_series_rollups.record("arris_memories", consolidated)
             await self.db.arris_memories.delete_many({
                 "id": {"$in": [m["id"] for m in memories]}
             })
+            await time_series_rollups.forget("arris_memories", memories)
+            await self.search_index.remove_memories(creator_id, [m["id"] for m in memories], IndexSource.ACTIVE)
+            await self.search_index.index_memory(consolidated, IndexSource.ACTIVE)
             
             merged_count += len(memories) - 1  # Net reduction
         
@@ -222,13 +245,13 @@ class EnhancedMemoryPalace:
     async def _summarize_old_memories(self, creator_id: str) -> int:
         """Summarize old detailed memories into shorter versions"""
         summarized_count = 0
-        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=self.consolidation_age_days * 2)).isoformat()
+        cutoff_date = utc_now() - timedelta(days=self.consolidation_age_days * 2)
         
         # Find old proposal/outcome memories with large content
         old_memories = await self.db.arris_memories.find({
             "creator_id": creator_id,
             "memory_type": {"$in": ["proposal", "outcome"]},
-            "created_at": {"$lt": cutoff_date},
+            **date_range("created_at", lt=cutoff_date),
             "summarized": {"$ne": True}
         }).to_list(200)
         
@@ -255,18 +278,20 @@ class EnhancedMemoryPalace:
                         "summarized_at": datetime.now(timezone.utc).isoformat()
                     }}
                 )
+                mem["content"] = summary_content
+                await self.search_index.index_memory(mem, IndexSource.ACTIVE)
                 summarized_count += 1
         
         return summarized_count
     
     async def _archive_low_value_memories(self, creator_id: str) -> int:
         """Archive low-importance old memories"""
-        cutoff_date = (datetime.now(timezone.utc) - timedelta(days=self.archive_age_days)).isoformat()
+        cutoff_date = utc_now() - timedelta(days=self.archive_age_days)
         
         # Find old, low-importance, never-recalled memories
         query = {
             "creator_id": creator_id,
-            "created_at": {"$lt": cutoff_date},
+            **date_range("created_at", lt=cutoff_date),
             "importance": {"$lt": 0.3},
             "recall_count": {"$lt": 2},
             "archived": {"$ne": True}
@@ -286,6 +311,8 @@ class EnhancedMemoryPalace:
         # Remove from main collection
         archived_ids = [m["id"] for m in memories_to_archive]
         await self.db.arris_memories.delete_many({"id": {"$in": archived_ids}})
+        await time_series_rollups.forget("arris_memories", memories_to_archive)
+        await self.search_index.move_memories(memories_to_archive, IndexSource.ACTIVE, IndexSource.ARCHIVE)
         
         return len(memories_to_archive)
     
@@ -331,10 +358,12 @@ class EnhancedMemoryPalace:
                 "importance": 0.7,
                 "tags": ["compressed", "pattern_summary", category],
                 "compressed": True,
-                "created_at": datetime.now(timezone.utc).isoformat()
+                "created_at": utc_now()
             }
             
             await self.db.arris_memories.insert_one(compressed)
+            await time_series_rollups.record("arris_memories", compressed)
+            await self.search_index.index_memory(compressed, IndexSource.ACTIVE)
             
             # Mark originals as compressed (keep for reference but exclude from queries)
             await self.db.arris_memories.update_many(
@@ -449,35 +478,8 @@ class EnhancedMemoryPalace:
         }
     
     async def _get_creator_metrics(self, creator_id: str) -> Dict[str, Any]:
-        """Get metrics for a creator"""
-        proposals = await self.db.proposals.find(
-            {"user_id": creator_id},
-            {"_id": 0, "status": 1, "platforms": 1, "priority": 1, "created_at": 1}
-        ).to_list(500)
-        
-        total = len(proposals)
-        approved = len([p for p in proposals if p.get("status") in ["approved", "completed", "in_progress"]])
-        
-        # Platform distribution
-        platform_counts = defaultdict(int)
-        for p in proposals:
-            for platform in p.get("platforms", []):
-                platform_counts[platform] += 1
-        
-        # Subscription tier
-        sub = await self.db.creator_subscriptions.find_one(
-            {"creator_id": creator_id, "status": "active"},
-            {"_id": 0, "tier": 1}
-        )
-        
-        return {
-            "total_proposals": total,
-            "approved_proposals": approved,
-            "approval_rate": round((approved / total * 100), 1) if total > 0 else 0,
-            "top_platforms": sorted(platform_counts.items(), key=lambda x: -x[1])[:3],
-            "tier": sub.get("tier", "Free") if sub else "Free",
-            "proposal_velocity": total / max(1, 30)  # Proposals per month (simplified)
-        }
+        """Get metrics for a creator from the creator_metrics materialization"""
+        return await self.metrics_service.get_metrics(creator_id)
     
     async def _find_similar_creators(
         self, 
@@ -485,63 +487,14 @@ class EnhancedMemoryPalace:
         creator: Dict, 
         metrics: Dict
     ) -> List[Dict[str, Any]]:
-        """Find creators similar to the given creator"""
-        # Get all other active creators
-        other_creators = await self.db.creators.find(
-            {"status": "active", "id": {"$ne": creator_id}},
-            {"_id": 0, "id": 1, "platforms": 1, "niche": 1}
-        ).to_list(1000)
-        
-        similar = []
-        creator_platforms = set(creator.get("platforms", []))
-        creator_niche = creator.get("niche", "").lower()
-        
-        for other in other_creators:
-            other_platforms = set(other.get("platforms", []))
-            other_niche = other.get("niche", "").lower()
-            
-            # Calculate similarity score
-            score = 0.0
-            
-            # Platform overlap (40% weight)
-            if creator_platforms and other_platforms:
-                overlap = len(creator_platforms & other_platforms)
-                total = len(creator_platforms | other_platforms)
-                score += 0.4 * (overlap / total if total > 0 else 0)
-            
-            # Niche similarity (30% weight)
-            if creator_niche and other_niche:
-                if creator_niche == other_niche:
-                    score += 0.3
-                elif creator_niche in other_niche or other_niche in creator_niche:
-                    score += 0.15
-            
-            # Get other creator's metrics for performance similarity
-            other_metrics = await self._get_creator_metrics(other["id"])
-            
-            # Approval rate similarity (20% weight)
-            if metrics["total_proposals"] > 0 and other_metrics["total_proposals"] >= 3:
-                rate_diff = abs(metrics["approval_rate"] - other_metrics["approval_rate"])
-                rate_similarity = max(0, 1 - (rate_diff / 100))
-                score += 0.2 * rate_similarity
-            
-            # Activity level similarity (10% weight)
-            if metrics["total_proposals"] > 0 and other_metrics["total_proposals"] > 0:
-                velocity_diff = abs(metrics["proposal_velocity"] - other_metrics["proposal_velocity"])
-                velocity_similarity = max(0, 1 - (velocity_diff / 10))
-                score += 0.1 * velocity_similarity
-            
-            if score >= self.min_similarity_score:
-                similar.append({
-                    "id": other["id"],
-                    "similarity_score": round(score, 2),
-                    "metrics": other_metrics,
-                    "platforms": list(other_platforms)
-                })
-        
-        # Sort by similarity and limit
-        similar.sort(key=lambda x: -x["similarity_score"])
-        return similar[:50]  # Top 50 similar creators
+        """Find creators similar to the given creator (vectorized over all active creators)"""
+        return await self.metrics_service.find_similar_creators(
+            creator_id,
+            creator,
+            metrics,
+            min_score=self.min_similarity_score,
+            limit=50  # Top 50 similar creators
+        )
     
     async def _generate_success_insights(
         self, 
@@ -818,10 +771,10 @@ class EnhancedMemoryPalace:
         archived_count = await self.db.arris_memories_archive.count_documents(query)
         
         # Count old memories (potential consolidation candidates)
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.consolidation_age_days)).isoformat()
+        cutoff = utc_now() - timedelta(days=self.consolidation_age_days)
         old_memories = await self.db.arris_memories.count_documents({
             **query,
-            "created_at": {"$lt": cutoff},
+            **date_range("created_at", lt=cutoff),
             "consolidated": {"$ne": True}
         })
         
@@ -891,7 +844,7 @@ class EnhancedMemoryPalace:
         - Full-text search across memory content, tags, and metadata
         - Filter by memory type, date range, importance
         - Optional inclusion of archived memories
-        - Relevance scoring based on match quality
+        - BM25 relevance scoring over the creator's whole corpus (inverted index)
         
         Args:
             creator_id: The creator's ID (workspace isolation)
@@ -927,13 +880,8 @@ class EnhancedMemoryPalace:
             base_query["importance"] = {"$gte": min_importance}
         
         # Date range filters
-        if date_from:
-            base_query["created_at"] = {"$gte": date_from}
-        if date_to:
-            if "created_at" in base_query:
-                base_query["created_at"]["$lte"] = date_to
-            else:
-                base_query["created_at"] = {"$lte": date_to}
+        if date_from or date_to:
+            add_date_range(base_query, "created_at", gte=date_from, lte=date_to)
         
         # Exclude superseded memories unless specifically requested
         if not include_consolidated:
@@ -942,6 +890,8 @@ class EnhancedMemoryPalace:
         # Search in main memories collection
         main_results = await self._search_collection(
             collection=self.db.arris_memories,
+            creator_id=creator_id,
+            source=IndexSource.ACTIVE,
             query=query,
             base_filter=base_query,
             limit=limit
@@ -953,6 +903,8 @@ class EnhancedMemoryPalace:
             archived_query = base_query.copy()
             archived_results = await self._search_collection(
                 collection=self.db.arris_memories_archive,
+                creator_id=creator_id,
+                source=IndexSource.ARCHIVE,
                 query=query,
                 base_filter=archived_query,
                 limit=limit // 2  # Limit archived results
@@ -968,7 +920,7 @@ class EnhancedMemoryPalace:
         if sort_by == "relevance":
             all_results.sort(key=lambda x: -x.get("_relevance_score", 0))
         elif sort_by == "date":
-            all_results.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            all_results.sort(key=lambda x: iso(x.get("created_at")), reverse=True)
         elif sort_by == "importance":
             all_results.sort(key=lambda x: -x.get("importance", 0))
         
@@ -1023,97 +975,93 @@ class EnhancedMemoryPalace:
     async def _search_collection(
         self,
         collection,
+        creator_id: str,
+        source: str,
         query: str,
         base_filter: Dict[str, Any],
         limit: int
     ) -> List[Dict[str, Any]]:
         """
-        Search a memory collection using multiple matching strategies.
+        Search a memory collection through the inverted index.
         
         Strategies:
-        1. Exact phrase match in content (highest relevance)
-        2. Word match in content fields
-        3. Tag match
-        4. Memory type match
+        1. Rank the creator's whole corpus with BM25 + field boosts (index)
+        2. Page through the ranked ids, applying the base filter in MongoDB
+        3. Re-rank the page with phrase, importance and recall boosts
+        
+        The ranking runs once and pages are sliced from it. It is re-run
+        with a 4x larger limit only if the filter leaves too few results
+        among the ranked ids, so the postings are grouped O(log n) times
+        rather than once per page. Widening stops at SEARCH_MAX_RANKED ids;
+        a filter that sparse returns fewer than limit results.
         """
         results = []
         query_lower = query.lower()
         query_words = query_lower.split()
         
-        # Fetch memories matching base filter
-        memories = await collection.find(
-            base_filter,
-            {"_id": 0}
-        ).limit(limit * 3).to_list(limit * 3)  # Fetch more, then filter
-        
-        for memory in memories:
-            relevance_score = self._calculate_relevance(memory, query_lower, query_words)
+        # Pick up memories written before the index existed or outside the hooks
+        await self.search_index.ensure_creator_indexed(creator_id, source)
+        
+        window = max(limit * 3, 30)
+        rank_limit = min(window * 4, SEARCH_MAX_RANKED)
+        ranked = await self.search_index.rank(creator_id, query, source, limit=rank_limit)
+        offset = 0
+        seen = set()
+        while len(results) < limit:
+            if offset >= len(ranked):
+                if len(ranked) < rank_limit or rank_limit >= SEARCH_MAX_RANKED:
+                    break
+                rank_limit = min(rank_limit * 4, SEARCH_MAX_RANKED)
+                ranked = await self.search_index.rank(creator_id, query, source, limit=rank_limit)
+                continue
+            page = ranked[offset:offset + window]
+            offset += window
+            
+            scores = {memory_id: score for memory_id, score in page if memory_id not in seen}
+            if not scores:
+                continue
+            seen.update(scores)
+            page_filter = {**base_filter, "id": {"$in": list(scores.keys())}}
+            memories = await collection.find(page_filter, {"_id": 0}).to_list(len(scores))
             
-            if relevance_score > 0:
-                memory["_relevance_score"] = relevance_score
+            for memory in memories:
+                relevance_score = scores[memory["id"]] + self._calculate_relevance_bonus(memory, query_lower)
+                memory["_relevance_score"] = round(relevance_score, 2)
                 memory["_match_highlights"] = self._get_match_highlights(memory, query_words)
                 results.append(memory)
         
-        return results
+        results.sort(key=lambda x: -x["_relevance_score"])
+        return results[:limit]
     
-    def _calculate_relevance(
+    def _calculate_relevance_bonus(
         self, 
         memory: Dict[str, Any], 
-        query_lower: str, 
-        query_words: List[str]
+        query_lower: str
     ) -> float:
         """
-        Calculate relevance score for a memory based on query match.
+        Query-dependent boosts the index cannot precompute.
         
-        Scoring:
+        Word-level content, tag, title, summary and type scores come from the
+        index. This adds:
         - Exact phrase match in content: +50 points
-        - Word match in content: +10 points per word
-        - Tag match: +15 points per matching tag
-        - Title/summary match: +20 points
-        - Memory type match: +5 points
+        - Exact phrase in title: +10 points (30 total with the word boost)
+        - Exact phrase in summary: +10 points (25 total with the word boost)
         - Importance boost: +5 * importance
+        - Recall frequency boost: +2 per recall (max 10)
         """
         score = 0.0
         content = memory.get("content", {})
-        content_str = json.dumps(content).lower() if isinstance(content, dict) else str(content).lower()
         
-        # Exact phrase match (highest value)
+        content_str = json.dumps(content).lower() if isinstance(content, dict) else str(content).lower()
         if query_lower in content_str:
             score += 50
         
-        # Word matches in content
-        for word in query_words:
-            if len(word) >= 2 and word in content_str:
-                score += 10
-        
-        # Tag matches
-        tags = [t.lower() for t in memory.get("tags", [])]
-        for word in query_words:
-            if word in tags:
-                score += 15
-            # Partial tag match
-            for tag in tags:
-                if word in tag:
-                    score += 5
-        
-        # Title/summary matches
         title = content.get("title", "").lower() if isinstance(content, dict) else ""
         summary = content.get("summary", "").lower() if isinstance(content, dict) else ""
-        
         if query_lower in title:
-            score += 30
-        elif any(word in title for word in query_words):
-            score += 20
-        
+            score += 10
         if query_lower in summary:
-            score += 25
-        elif any(word in summary for word in query_words):
-            score += 15
-        
-        # Memory type match
-        memory_type = memory.get("memory_type", "").lower()
-        if any(word in memory_type for word in query_words):
-            score += 5
+            score += 10
         
         # Importance boost
         importance = memory.get("importance", 0.5)
@@ -1123,7 +1071,7 @@ class EnhancedMemoryPalace:
         recall_count = memory.get("recall_count", 0)
         score += min(10, recall_count * 2)
         
-        return round(score, 2)
+        return score
     
     def _get_match_highlights(
         self, 
@@ -1363,6 +1311,12 @@ class EnhancedMemoryPalace:
         # Get search history summary (not full logs for privacy)
         search_count = await self.db.memory_search_log.count_documents({"creator_id": creator_id})
         
+        # Dates go out as ISO strings; the checksum must cover exactly what
+        # the client receives so a re-import verifies
+        active_memories = iso_dates(active_memories)
+        archived_memories = iso_dates(archived_memories)
+        learning_metrics = iso_dates(learning_metrics)
+        
         # Prepare export data
         export_data = {
             "export_version": "1.0",
@@ -1438,7 +1392,7 @@ class EnhancedMemoryPalace:
         if not memories:
             return {"earliest": None, "latest": None}
         
-        dates = [m.get("created_at", "") for m in memories if m.get("created_at")]
+        dates = [iso(m.get("created_at")) for m in memories if m.get("created_at")]
         if not dates:
             return {"earliest": None, "latest": None}
         
@@ -1457,7 +1411,7 @@ class EnhancedMemoryPalace:
         }
         
         if include_metadata:
-            portable["created_at"] = memory.get("created_at")
+            portable["created_at"] = iso(memory.get("created_at")) or None
             portable["recall_count"] = memory.get("recall_count", 0)
         
         return portable
@@ -1660,11 +1614,13 @@ class EnhancedMemoryPalace:
                 return "skipped_duplicates"
             elif merge_strategy == "overwrite":
                 # Delete existing and import
-                await self.db.arris_memories.delete_one({
+                existing = await self.db.arris_memories.find_one_and_delete({
                     "creator_id": creator_id,
                     "memory_type": memory.get("memory_type"),
                     "content": memory.get("content")
-                })
+                }, {"_id": 0, "id": 1})
+                if existing:
+                    await self.search_index.remove_memories(creator_id, [existing["id"]], IndexSource.ACTIVE)
         
         # Prepare memory for import
         new_memory = {
@@ -1676,7 +1632,7 @@ class EnhancedMemoryPalace:
             "tags": memory.get("tags", []) + ["imported"],
             "recall_count": 0,  # Reset recall count
             "last_recalled": None,
-            "created_at": memory.get("created_at", datetime.now(timezone.utc).isoformat()),
+            "created_at": to_bson_date(memory.get("created_at")) or utc_now(),
             "imported_at": datetime.now(timezone.utc).isoformat(),
             "expires_at": None
         }
@@ -1686,8 +1642,11 @@ class EnhancedMemoryPalace:
             new_memory["archived"] = True
             new_memory["archived_at"] = datetime.now(timezone.utc).isoformat()
             await self.db.arris_memories_archive.insert_one(new_memory)
+            await self.search_index.index_memory(new_memory, IndexSource.ARCHIVE)
         else:
             await self.db.arris_memories.insert_one(new_memory)
+            await time_series_rollups.record("arris_memories", new_memory)
+            await self.search_index.index_memory(new_memory, IndexSource.ACTIVE)
         
         # Add to signatures to prevent re-importing
         existing_signatures.add(sig)
@@ -1766,12 +1725,10 @@ class EnhancedMemoryPalace:
             query["tags"] = {"$in": tags}
         
         if date_before:
-            query["created_at"] = {"$lt": date_before}
+            add_date_range(query, "created_at", lt=date_before)
         
-        # Find memories to delete
-        memories_to_delete = await self.db.arris_memories.find(
-            query, {"_id": 0}
-        ).to_list(10000)
+        # Find memories to delete (with _id: rollups key deltas on the insert day)
+        memories_to_delete = await self.db.arris_memories.find(query).to_list(10000)
         
         archived_to_delete = []
         if include_archived:
@@ -1798,10 +1755,14 @@ class EnhancedMemoryPalace:
             if memories_to_delete:
                 delete_result = await self.db.arris_memories.delete_many(query)
                 deleted_active = delete_result.deleted_count
+                await time_series_rollups.forget("arris_memories", memories_to_delete)
             
             if include_archived and archived_to_delete:
                 delete_result = await self.db.arris_memories_archive.delete_many(query)
                 deleted_archived = delete_result.deleted_count
+            
+            await self.search_index.remove_memories(creator_id, [m["id"] for m in memories_to_delete], IndexSource.ACTIVE)
+            await self.search_index.remove_memories(creator_id, [m["id"] for m in archived_to_delete], IndexSource.ARCHIVE)
         else:
             # Soft delete - move to deletion queue with 30-day retention
             retention_until = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
@@ -1812,7 +1773,7 @@ class EnhancedMemoryPalace:
                 memory["deletion_reason"] = reason
                 memory["retention_until"] = retention_until
                 memory["original_collection"] = "arris_memories"
-                await self.db.memory_deletion_queue.insert_one(memory)
+                await self.db.memory_deletion_queue.insert_one({k: v for k, v in memory.items() if k != "_id"})
                 deleted_active += 1
             
             for memory in archived_to_delete:
@@ -1827,8 +1788,12 @@ class EnhancedMemoryPalace:
             # Remove from original collections
             if memories_to_delete:
                 await self.db.arris_memories.delete_many(query)
+                await time_series_rollups.forget("arris_memories", memories_to_delete)
             if include_archived and archived_to_delete:
                 await self.db.arris_memories_archive.delete_many(query)
+            
+            await self.search_index.remove_memories(creator_id, [m["id"] for m in memories_to_delete], IndexSource.ACTIVE)
+            await self.search_index.remove_memories(creator_id, [m["id"] for m in archived_to_delete], IndexSource.ARCHIVE)
         
         # Create audit log for GDPR compliance
         audit_log = {
@@ -1908,6 +1873,7 @@ class EnhancedMemoryPalace:
         
         recovered_active = 0
         recovered_archived = 0
+        restored = {IndexSource.ACTIVE: [], IndexSource.ARCHIVE: []}
         
         for memory in memories_to_recover:
             original_collection = memory.pop("original_collection", "arris_memories")
@@ -1920,11 +1886,17 @@ class EnhancedMemoryPalace:
             # Restore to original collection
             if original_collection == "arris_memories":
                 await self.db.arris_memories.insert_one(memory)
+                await time_series_rollups.record("arris_memories", memory)
+                restored[IndexSource.ACTIVE].append(memory)
                 recovered_active += 1
             else:
                 await self.db.arris_memories_archive.insert_one(memory)
+                restored[IndexSource.ARCHIVE].append(memory)
                 recovered_archived += 1
         
+        for source, memories in restored.items():
+            await self.search_index.index_memories(memories, source)
+        
         # Remove from deletion queue
         await self.db.memory_deletion_queue.delete_many(query)
         
@@ -2121,14 +2093,23 @@ class EnhancedMemoryPalace:
             "learning_metrics": 0
         }
         
+        # Only the fields the rollups bucket on, to take the memories out afterwards
+        rollup_fields = await self.db.arris_memories.find(
+            {"creator_id": creator_id}, time_series_rollups.projection("arris_memories")
+        ).to_list(None)
+        
         # Delete all active memories
         result = await self.db.arris_memories.delete_many({"creator_id": creator_id})
         results["active_memories"] = result.deleted_count
+        await time_series_rollups.forget("arris_memories", rollup_fields)
         
         # Delete all archived memories
         result = await self.db.arris_memories_archive.delete_many({"creator_id": creator_id})
         results["archived_memories"] = result.deleted_count
         
+        # Drop the search index entries for the creator
+        await self.search_index.drop_creator(creator_id)
+        
         # Delete from deletion queue
         result = await self.db.memory_deletion_queue.delete_many({"creator_id": creator_id})
         results["deletion_queue"] = result.deleted_count
@@ -1,15 +1,37 @@
 """
 Export Service for Creators Hive HQ
 Handles CSV/JSON export for Pro and Premium analytics
+
+Record exports (proposals, revenue) have two shapes:
+- export_*: JSON-wrapped payload, capped at EXPORT_INLINE_LIMIT rows and
+  flagged "truncated" when the cap is hit
+- stream_*: CSV / NDJSON text streamed from a cursor via streaming_export,
+  uncapped and resumable
+Analytics are computed with $group aggregations over the full date range.
 """
 
+import asyncio
 import csv
 import io
-import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from streaming_export import DocumentStream, csv_rows, ndjson_rows
+
+# Rows returned inline by the JSON-wrapped exports; use streaming for more
+EXPORT_INLINE_LIMIT = 1000
+
+PROPOSAL_FIELDS = [
+    "id", "title", "status", "platforms", "timeline", "priority",
+    "created_at", "submitted_at", "approved_at"
+]
+PROPOSAL_INSIGHT_FIELDS = [
+    "complexity", "processing_time_seconds", "risk_level",
+    "suggested_budget_min", "suggested_budget_max"
+]
+REVENUE_FIELDS = ["id", "month_year", "category", "source", "revenue", "expenses", "net_margin"]
+
 
 class ExportService:
     """
@@ -39,6 +61,47 @@ class ExportService:
             date_range: '7d', '30d', '90d', '1y', or 'all'
             include_insights: Include ARRIS insights (Premium only)
         """
+        query, projection = self._proposals_query(creator_id, date_range, include_insights)
+        
+        proposals = await self.db.proposals.find(query, projection).sort(
+            "created_at", -1
+        ).to_list(EXPORT_INLINE_LIMIT + 1)
+        truncated = len(proposals) > EXPORT_INLINE_LIMIT
+        proposals = proposals[:EXPORT_INLINE_LIMIT]
+        
+        if format == "csv":
+            result = self._proposals_to_csv(proposals, include_insights)
+        else:
+            result = self._proposals_to_json(proposals, date_range)
+        result["truncated"] = truncated
+        return result
+    
+    async def stream_proposals(
+        self,
+        creator_id: str,
+        format: str = "csv",
+        date_range: str = "30d",
+        include_insights: bool = False,
+        cursor: Optional[str] = None,
+        resumable: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream every matching proposal as CSV or NDJSON text, newest first.
+        Raises ExportCursorError for a bad cursor before streaming starts.
+        """
+        query, projection = self._proposals_query(creator_id, date_range, include_insights)
+        stream = DocumentStream(self.db.proposals, query, "created_at", projection, cursor=cursor)
+        
+        if format == "csv":
+            return csv_rows(
+                stream,
+                self._proposal_fieldnames(include_insights),
+                lambda p: self._proposal_row(p, include_insights),
+                resumable=resumable
+            )
+        return ndjson_rows(stream, header={"export": "proposals", "date_range": date_range})
+    
+    def _proposals_query(self, creator_id: str, date_range: str, include_insights: bool):
         time_delta = self._get_time_delta(date_range)
         start_date = datetime.now(timezone.utc) - time_delta
         
@@ -47,56 +110,45 @@ class ExportService:
         if not include_insights:
             projection["arris_insights_full"] = 0
         
-        proposals = await self.db.proposals.find(
-            {"user_id": creator_id, "created_at": {"$gte": start_date.isoformat()}},
-            projection
-        ).sort("created_at", -1).to_list(1000)
+        return {"user_id": creator_id, "created_at": {"$gte": start_date.isoformat()}}, projection
+    
+    def _proposal_fieldnames(self, include_insights: bool) -> List[str]:
+        return PROPOSAL_FIELDS + (PROPOSAL_INSIGHT_FIELDS if include_insights else [])
+    
+    def _proposal_row(self, p: Dict, include_insights: bool) -> Dict[str, Any]:
+        """Flatten a proposal into a CSV row"""
+        row = {
+            "id": p.get("id"),
+            "title": p.get("title"),
+            "status": p.get("status"),
+            "platforms": ", ".join(p.get("platforms", [])),
+            "timeline": p.get("timeline"),
+            "priority": p.get("priority"),
+            "created_at": p.get("created_at"),
+            "submitted_at": p.get("submitted_at"),
+            "approved_at": p.get("approved_at", "")
+        }
         
-        if format == "csv":
-            return self._proposals_to_csv(proposals, include_insights)
-        return self._proposals_to_json(proposals, date_range)
+        if include_insights:
+            insights = p.get("arris_insights") or {}
+            row["complexity"] = insights.get("estimated_complexity")
+            row["processing_time_seconds"] = insights.get("processing_time_seconds")
+            row["risk_level"] = insights.get("risk_assessment", {}).get("level")
+            budget = insights.get("suggested_budget", {})
+            row["suggested_budget_min"] = budget.get("min")
+            row["suggested_budget_max"] = budget.get("max")
+        
+        return row
     
     def _proposals_to_csv(self, proposals: List[Dict], include_insights: bool) -> Dict[str, Any]:
         """Convert proposals to CSV format"""
         output = io.StringIO()
         
-        fieldnames = [
-            "id", "title", "status", "platforms", "timeline", "priority",
-            "created_at", "submitted_at", "approved_at"
-        ]
-        
-        if include_insights:
-            fieldnames.extend([
-                "complexity", "processing_time_seconds", "risk_level",
-                "suggested_budget_min", "suggested_budget_max"
-            ])
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        writer = csv.DictWriter(output, fieldnames=self._proposal_fieldnames(include_insights))
         writer.writeheader()
         
         for p in proposals:
-            row = {
-                "id": p.get("id"),
-                "title": p.get("title"),
-                "status": p.get("status"),
-                "platforms": ", ".join(p.get("platforms", [])),
-                "timeline": p.get("timeline"),
-                "priority": p.get("priority"),
-                "created_at": p.get("created_at"),
-                "submitted_at": p.get("submitted_at"),
-                "approved_at": p.get("approved_at", "")
-            }
-            
-            if include_insights:
-                insights = p.get("arris_insights", {})
-                row["complexity"] = insights.get("estimated_complexity")
-                row["processing_time_seconds"] = insights.get("processing_time_seconds")
-                row["risk_level"] = insights.get("risk_assessment", {}).get("level")
-                budget = insights.get("suggested_budget", {})
-                row["suggested_budget_min"] = budget.get("min")
-                row["suggested_budget_max"] = budget.get("max")
-            
-            writer.writerow(row)
+            writer.writerow(self._proposal_row(p, include_insights))
         
         return {
             "format": "csv",
@@ -134,33 +186,48 @@ class ExportService:
         """
         time_delta = self._get_time_delta(date_range)
         start_date = datetime.now(timezone.utc) - time_delta
-        
-        # Get proposals for analytics
-        proposals = await self.db.proposals.find(
-            {"user_id": creator_id, "created_at": {"$gte": start_date.isoformat()}},
-            {"_id": 0}
-        ).to_list(1000)
+        range_match = {"created_at": {"$gte": start_date.isoformat()}}
+        creator_match = {"user_id": creator_id, **range_match}
         
         # Calculate analytics
-        analytics = self._calculate_analytics(proposals)
+        analytics, arris_groups = await asyncio.gather(
+            self._calculate_analytics(creator_match),
+            self._arris_groups(creator_match)
+        )
         
         if tier == "premium":
             # Add comparative analytics
-            platform_proposals = await self.db.proposals.find(
-                {"created_at": {"$gte": start_date.isoformat()}},
-                {"_id": 0, "status": 1, "arris_insights": 1}
-            ).to_list(10000)
-            
-            analytics["comparative"] = self._calculate_comparative_analytics(proposals, platform_proposals)
-            analytics["arris_performance"] = self._calculate_arris_performance(proposals)
+            platform = await self._platform_totals(range_match)
+            analytics["comparative"] = self._calculate_comparative_analytics(analytics, arris_groups, platform)
+            analytics["arris_performance"] = self._calculate_arris_performance(arris_groups)
         
         if format == "csv":
             return self._analytics_to_csv(analytics, tier)
         return self._analytics_to_json(analytics, date_range, tier)
     
-    def _calculate_analytics(self, proposals: List[Dict]) -> Dict[str, Any]:
-        """Calculate basic analytics from proposals"""
-        if not proposals:
+    async def _breakdown(self, match: Dict[str, Any], field: str, unwind: bool = False) -> Dict[str, int]:
+        """{value: count} for one proposal field ($unwind for array fields)"""
+        pipeline = [{"$match": match}]
+        if unwind:
+            pipeline.append({"$unwind": f"${field}"})
+            key = f"${field}"
+        else:
+            key = {"$ifNull": [f"${field}", "unknown"]}
+        pipeline.append({"$group": {"_id": key, "count": {"$sum": 1}}})
+        rows = await self.db.proposals.aggregate(pipeline).to_list(None)
+        return {row["_id"]: row["count"] for row in rows}
+    
+    async def _calculate_analytics(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate basic analytics for the matching proposals"""
+        status_count, platform_count, priority_count, timeline_count = await asyncio.gather(
+            self._breakdown(match, "status"),
+            self._breakdown(match, "platforms", unwind=True),
+            self._breakdown(match, "priority"),
+            self._breakdown(match, "timeline")
+        )
+        
+        total = sum(status_count.values())
+        if not total:
             return {
                 "total_proposals": 0,
                 "status_breakdown": {},
@@ -170,34 +237,12 @@ class ExportService:
                 "approval_rate": 0
             }
         
-        status_count = {}
-        platform_count = {}
-        priority_count = {}
-        timeline_count = {}
-        
-        for p in proposals:
-            # Status
-            status = p.get("status", "unknown")
-            status_count[status] = status_count.get(status, 0) + 1
-            
-            # Platforms
-            for platform in p.get("platforms", []):
-                platform_count[platform] = platform_count.get(platform, 0) + 1
-            
-            # Priority
-            priority = p.get("priority", "unknown")
-            priority_count[priority] = priority_count.get(priority, 0) + 1
-            
-            # Timeline
-            timeline = p.get("timeline", "unknown")
-            timeline_count[timeline] = timeline_count.get(timeline, 0) + 1
-        
         approved = status_count.get("approved", 0)
         rejected = status_count.get("rejected", 0)
         total_reviewed = approved + rejected
         
         return {
-            "total_proposals": len(proposals),
+            "total_proposals": total,
             "status_breakdown": status_count,
             "platform_breakdown": platform_count,
             "priority_breakdown": priority_count,
@@ -205,28 +250,68 @@ class ExportService:
             "approval_rate": round(approved / total_reviewed * 100, 1) if total_reviewed > 0 else 0
         }
     
+    async def _arris_groups(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Complexity and risk distributions for proposals with ARRIS insights"""
+        insights_match = {**match, "arris_insights": {"$nin": [None, {}]}}
+        complexity_rows, risk_rows = await asyncio.gather(
+            self.db.proposals.aggregate([
+                {"$match": insights_match},
+                {"$group": {
+                    "_id": {"$ifNull": ["$arris_insights.estimated_complexity", "unknown"]},
+                    "count": {"$sum": 1},
+                    "time": {"$sum": {"$ifNull": ["$arris_insights.processing_time_seconds", 0]}}
+                }}
+            ]).to_list(None),
+            self.db.proposals.aggregate([
+                {"$match": insights_match},
+                {"$group": {
+                    "_id": {"$ifNull": ["$arris_insights.risk_assessment.level", "unknown"]},
+                    "count": {"$sum": 1}
+                }}
+            ]).to_list(None)
+        )
+        return {
+            "count": sum(row["count"] for row in complexity_rows),
+            "total_time": sum(row["time"] for row in complexity_rows),
+            "complexity": {row["_id"]: row["count"] for row in complexity_rows},
+            "risk": {row["_id"]: row["count"] for row in risk_rows}
+        }
+    
+    async def _platform_totals(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Platform-wide counts for comparative analytics"""
+        rows = await self.db.proposals.aggregate([
+            {"$match": match},
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "approved": {"$sum": {"$cond": [{"$eq": ["$status", "approved"]}, 1, 0]}},
+                "reviewed": {"$sum": {"$cond": [{"$in": ["$status", ["approved", "rejected"]]}, 1, 0]}},
+                "with_insights": {"$sum": {"$cond": [
+                    {"$in": [{"$ifNull": ["$arris_insights", None]}, [None, {}]]}, 0, 1
+                ]}},
+                "time": {"$sum": {"$ifNull": ["$arris_insights.processing_time_seconds", 0]}}
+            }}
+        ], allowDiskUse=True).to_list(1)
+        return rows[0] if rows else {"total": 0, "approved": 0, "reviewed": 0, "with_insights": 0, "time": 0}
+    
     def _calculate_comparative_analytics(
-        self, 
-        user_proposals: List[Dict], 
-        platform_proposals: List[Dict]
+        self,
+        analytics: Dict[str, Any],
+        arris_groups: Dict[str, Any],
+        platform: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Calculate comparative analytics vs platform averages"""
-        user_approved = sum(1 for p in user_proposals if p.get("status") == "approved")
-        user_total = len([p for p in user_proposals if p.get("status") in ["approved", "rejected"]])
+        status_count = analytics["status_breakdown"]
+        user_approved = status_count.get("approved", 0)
+        user_total = user_approved + status_count.get("rejected", 0)
         user_approval_rate = (user_approved / user_total * 100) if user_total > 0 else 0
         
-        platform_approved = sum(1 for p in platform_proposals if p.get("status") == "approved")
-        platform_total = len([p for p in platform_proposals if p.get("status") in ["approved", "rejected"]])
-        platform_approval_rate = (platform_approved / platform_total * 100) if platform_total > 0 else 0
+        platform_total = platform["reviewed"]
+        platform_approval_rate = (platform["approved"] / platform_total * 100) if platform_total > 0 else 0
         
         # Average processing time
-        user_times = [p.get("arris_insights", {}).get("processing_time_seconds", 0) 
-                     for p in user_proposals if p.get("arris_insights")]
-        user_avg_time = sum(user_times) / len(user_times) if user_times else 0
-        
-        platform_times = [p.get("arris_insights", {}).get("processing_time_seconds", 0) 
-                         for p in platform_proposals if p.get("arris_insights")]
-        platform_avg_time = sum(platform_times) / len(platform_times) if platform_times else 0
+        user_avg_time = arris_groups["total_time"] / arris_groups["count"] if arris_groups["count"] else 0
+        platform_avg_time = platform["time"] / platform["with_insights"] if platform["with_insights"] else 0
         
         return {
             "your_approval_rate": round(user_approval_rate, 1),
@@ -234,35 +319,18 @@ class ExportService:
             "approval_rate_vs_platform": round(user_approval_rate - platform_approval_rate, 1),
             "your_avg_processing_time": round(user_avg_time, 2),
             "platform_avg_processing_time": round(platform_avg_time, 2),
-            "your_total_proposals": len(user_proposals),
-            "platform_total_proposals": len(platform_proposals)
+            "your_total_proposals": analytics["total_proposals"],
+            "platform_total_proposals": platform["total"]
         }
     
-    def _calculate_arris_performance(self, proposals: List[Dict]) -> Dict[str, Any]:
+    def _calculate_arris_performance(self, arris_groups: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate ARRIS performance metrics"""
-        insights_count = 0
-        complexity_counts = {}
-        total_time = 0
-        risk_levels = {}
-        
-        for p in proposals:
-            insights = p.get("arris_insights", {})
-            if insights:
-                insights_count += 1
-                
-                complexity = insights.get("estimated_complexity", "unknown")
-                complexity_counts[complexity] = complexity_counts.get(complexity, 0) + 1
-                
-                total_time += insights.get("processing_time_seconds", 0)
-                
-                risk = insights.get("risk_assessment", {}).get("level", "unknown")
-                risk_levels[risk] = risk_levels.get(risk, 0) + 1
-        
+        insights_count = arris_groups["count"]
         return {
             "proposals_with_insights": insights_count,
-            "complexity_distribution": complexity_counts,
-            "risk_distribution": risk_levels,
-            "avg_processing_time_seconds": round(total_time / insights_count, 2) if insights_count > 0 else 0
+            "complexity_distribution": arris_groups["complexity"],
+            "risk_distribution": arris_groups["risk"],
+            "avg_processing_time_seconds": round(arris_groups["total_time"] / insights_count, 2) if insights_count > 0 else 0
         }
     
     def _analytics_to_csv(self, analytics: Dict, tier: str) -> Dict[str, Any]:
@@ -347,58 +415,105 @@ class ExportService:
         Export revenue/calculator data for a creator.
         Premium tier only.
         """
-        time_delta = self._get_time_delta(date_range)
-        start_date = (datetime.now(timezone.utc) - time_delta).strftime("%Y-%m")
+        query = self._revenue_query(creator_id, date_range)
         
-        entries = await self.db.calculator.find(
-            {"user_id": creator_id, "month_year": {"$gte": start_date}},
-            {"_id": 0}
-        ).sort("month_year", -1).to_list(1000)
+        # Summary covers every entry in range, not just the rows returned
+        summary, entries = await asyncio.gather(
+            self._revenue_summary(query),
+            self.db.calculator.find(query, {"_id": 0}).sort("month_year", -1).to_list(EXPORT_INLINE_LIMIT + 1)
+        )
+        truncated = len(entries) > EXPORT_INLINE_LIMIT
+        entries = entries[:EXPORT_INLINE_LIMIT]
         
-        # Calculate summary
-        total_revenue = sum(e.get("revenue", 0) for e in entries)
-        total_expenses = sum(e.get("expenses", 0) for e in entries)
-        
-        summary = {
-            "total_revenue": round(total_revenue, 2),
-            "total_expenses": round(total_expenses, 2),
-            "net_profit": round(total_revenue - total_expenses, 2),
-            "transaction_count": len(entries)
-        }
+        if format == "csv":
+            result = self._revenue_to_csv(entries, summary)
+        else:
+            result = self._revenue_to_json(entries, summary, date_range)
+        result["truncated"] = truncated
+        return result
+    
+    async def stream_revenue_data(
+        self,
+        creator_id: str,
+        format: str = "csv",
+        date_range: str = "30d",
+        cursor: Optional[str] = None,
+        resumable: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream every calculator entry in range as CSV or NDJSON text.
+        The summary is written first (CSV preamble / NDJSON header line).
+        Raises ExportCursorError for a bad cursor before streaming starts.
+        """
+        query = self._revenue_query(creator_id, date_range)
+        stream = DocumentStream(self.db.calculator, query, "month_year", {"_id": 0}, cursor=cursor)
+        summary = await self._revenue_summary(query)
         
         if format == "csv":
-            return self._revenue_to_csv(entries, summary)
-        return self._revenue_to_json(entries, summary, date_range)
+            preamble = self._revenue_summary_text(summary) + "=== TRANSACTIONS ===\n"
+            return csv_rows(stream, REVENUE_FIELDS, self._revenue_row, preamble=preamble, resumable=resumable)
+        return ndjson_rows(stream, header={"export": "revenue", "date_range": date_range, "summary": summary})
+    
+    def _revenue_query(self, creator_id: str, date_range: str) -> Dict[str, Any]:
+        time_delta = self._get_time_delta(date_range)
+        start_date = (datetime.now(timezone.utc) - time_delta).strftime("%Y-%m")
+        return {"user_id": creator_id, "month_year": {"$gte": start_date}}
+    
+    async def _revenue_summary(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        rows = await self.db.calculator.aggregate([
+            {"$match": query},
+            {"$group": {
+                "_id": None,
+                "revenue": {"$sum": {"$ifNull": ["$revenue", 0]}},
+                "expenses": {"$sum": {"$ifNull": ["$expenses", 0]}},
+                "count": {"$sum": 1}
+            }}
+        ]).to_list(1)
+        totals = rows[0] if rows else {"revenue": 0, "expenses": 0, "count": 0}
+        
+        return {
+            "total_revenue": round(totals["revenue"], 2),
+            "total_expenses": round(totals["expenses"], 2),
+            "net_profit": round(totals["revenue"] - totals["expenses"], 2),
+            "transaction_count": totals["count"]
+        }
+    
+    def _revenue_summary_text(self, summary: Dict) -> str:
+        return (
+            "=== REVENUE SUMMARY ===\n"
+            f"Total Revenue,${summary['total_revenue']}\n"
+            f"Total Expenses,${summary['total_expenses']}\n"
+            f"Net Profit,${summary['net_profit']}\n"
+            f"Transaction Count,{summary['transaction_count']}\n"
+            "\n"
+        )
+    
+    def _revenue_row(self, e: Dict) -> Dict[str, Any]:
+        return {
+            "id": e.get("id"),
+            "month_year": e.get("month_year"),
+            "category": e.get("category"),
+            "source": e.get("source"),
+            "revenue": e.get("revenue", 0),
+            "expenses": e.get("expenses", 0),
+            "net_margin": e.get("net_margin", 0)
+        }
     
     def _revenue_to_csv(self, entries: List[Dict], summary: Dict) -> Dict[str, Any]:
         """Convert revenue data to CSV format"""
         output = io.StringIO()
         
         # Summary
-        output.write("=== REVENUE SUMMARY ===\n")
-        output.write(f"Total Revenue,${summary['total_revenue']}\n")
-        output.write(f"Total Expenses,${summary['total_expenses']}\n")
-        output.write(f"Net Profit,${summary['net_profit']}\n")
-        output.write(f"Transaction Count,{summary['transaction_count']}\n")
-        output.write("\n")
+        output.write(self._revenue_summary_text(summary))
         
         # Transactions
         output.write("=== TRANSACTIONS ===\n")
         if entries:
-            fieldnames = ["id", "month_year", "category", "source", "revenue", "expenses", "net_margin"]
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
+            writer = csv.DictWriter(output, fieldnames=REVENUE_FIELDS)
             writer.writeheader()
             
             for e in entries:
-                writer.writerow({
-                    "id": e.get("id"),
-                    "month_year": e.get("month_year"),
-                    "category": e.get("category"),
-                    "source": e.get("source"),
-                    "revenue": e.get("revenue", 0),
-                    "expenses": e.get("expenses", 0),
-                    "net_margin": e.get("net_margin", 0)
-                })
+                writer.writerow(self._revenue_row(e))
         
         return {
             "format": "csv",
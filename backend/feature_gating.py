@@ -1,50 +1,204 @@
 """
 Creators Hive HQ - Feature Gating Service
 Gates features based on subscription tier
+
+Entitlements (tier, features, subscription summary) and the monthly
+proposal count are memoized per creator for ENTITLEMENT_CACHE_TTL_SECONDS.
+StripeService, SubscriptionLifecycleService and proposal creation call the
+invalidation hooks, so the TTL only bounds staleness across workers.
 """
 
+import os
+import copy
+import time
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, List, Iterable
 from models_subscription import SUBSCRIPTION_PLANS, SubscriptionTier
+from index_registry import index_registry
 
 logger = logging.getLogger(__name__)
 
+# The active subscription is read on every gated request
+index_registry.register("creator_subscriptions", [("creator_id", 1), ("status", 1)], owner="feature_gating")
+index_registry.register("creator_subscriptions", [("status", 1), ("plan_id", 1)], owner="feature_gating")
+index_registry.register_query("creator_subscriptions", {"creator_id": "CR-1", "status": "active"}, owner="feature_gating")
+index_registry.register_query("creator_subscriptions", {"status": "active"}, owner="feature_gating")
+
+ENTITLEMENT_CACHE_TTL_SECONDS = float(os.environ.get("ENTITLEMENT_CACHE_TTL_SECONDS", "60"))
+ENTITLEMENT_CACHE_MAX_ENTRIES = 20000
+
+# Cached proposal counts within this many of the limit are re-read before
+# deciding. The count cache is per process: proposals created through other
+# workers are only seen once the entry is re-read or expires, so with several
+# workers a creator can briefly exceed their monthly limit.
+PROPOSAL_LIMIT_RECHECK_MARGIN = 1
+
 
 class FeatureGatingService:
     """Service for checking feature access based on subscription tier"""
     
-    def __init__(self, db):
+    def __init__(self, db, ttl_seconds: float = ENTITLEMENT_CACHE_TTL_SECONDS):
         self.db = db
+        self.ttl_seconds = ttl_seconds
+        # creator_id -> (expires_at, entitlement)
+        self._entitlements: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # creator_id -> (expires_at, month_start_iso, count)
+        self._proposal_counts: Dict[str, Tuple[float, str, int]] = {}
+        self._metrics = {"hits": 0, "misses": 0, "count_hits": 0, "count_misses": 0, "invalidations": 0}
     
-    async def get_creator_tier(self, creator_id: str) -> Tuple[str, Dict[str, Any]]:
+    # ============== ENTITLEMENT CACHE ==============
+    
+    @staticmethod
+    def _build_entitlement(subscription: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if subscription:
+            plan_id = subscription.get("plan_id", "free")
+            plan = SUBSCRIPTION_PLANS.get(plan_id, SUBSCRIPTION_PLANS["free"])
+            return {
+                "tier": plan.get("tier", SubscriptionTier.FREE),
+                "features": plan.get("features", {}),
+                "plan_id": plan_id,
+                "subscription_active": True,
+                "current_period_end": subscription.get("current_period_end")
+            }
+        
+        # Default to free tier
+        return {
+            "tier": SubscriptionTier.FREE,
+            "features": SUBSCRIPTION_PLANS["free"]["features"],
+            "plan_id": "free",
+            "subscription_active": False,
+            "current_period_end": None
+        }
+    
+    def _cached_entitlement(self, creator_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entitlements.get(creator_id)
+        if entry and entry[0] > time.monotonic():
+            self._metrics["hits"] += 1
+            return entry[1]
+        return None
+    
+    def _store_entitlement(self, creator_id: str, entitlement: Dict[str, Any]):
+        if len(self._entitlements) >= ENTITLEMENT_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            self._entitlements = {k: v for k, v in self._entitlements.items() if v[0] > now}
+            if len(self._entitlements) >= ENTITLEMENT_CACHE_MAX_ENTRIES:
+                self._entitlements.clear()
+        self._entitlements[creator_id] = (time.monotonic() + self.ttl_seconds, entitlement)
+    
+    async def get_entitlement(self, creator_id: str) -> Dict[str, Any]:
         """
-        Get creator's current subscription tier and features.
-        Returns (tier_name, features_dict)
+        Get the (cached) entitlement: tier, features, plan_id, subscription summary.
+        Returns a copy, so callers can modify it without touching the cache.
         """
-        # Check for active subscription
+        entitlement = self._cached_entitlement(creator_id)
+        if entitlement is not None:
+            return copy.deepcopy(entitlement)
+        
+        self._metrics["misses"] += 1
         subscription = await self.db.creator_subscriptions.find_one(
             {"creator_id": creator_id, "status": "active"},
-            {"_id": 0}
+            {"_id": 0, "plan_id": 1, "current_period_end": 1}
         )
+        entitlement = self._build_entitlement(subscription)
+        self._store_entitlement(creator_id, entitlement)
+        return copy.deepcopy(entitlement)
+    
+    async def get_creator_tier(self, creator_id: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Get creator's current subscription tier and features.
+        Returns (tier_name, features_dict)
+        """
+        entitlement = await self.get_entitlement(creator_id)
+        return entitlement["tier"], entitlement["features"]
+    
+    async def get_tiers(self, creator_ids: Iterable[str]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Bulk version of get_creator_tier for listings and cohort analysis.
+        Cache misses are resolved with a single $in query.
+        Returns {creator_id: (tier_name, features_dict)}
+        """
+        result = {}
+        missing: List[str] = []
+        for creator_id in dict.fromkeys(creator_ids):
+            if not creator_id:
+                continue
+            entitlement = self._cached_entitlement(creator_id)
+            if entitlement is not None:
+                result[creator_id] = (entitlement["tier"], copy.deepcopy(entitlement["features"]))
+            else:
+                missing.append(creator_id)
         
-        if subscription:
-            plan_id = subscription.get("plan_id", "free")
-            plan = SUBSCRIPTION_PLANS.get(plan_id, SUBSCRIPTION_PLANS["free"])
-            return plan.get("tier", SubscriptionTier.FREE), plan.get("features", {})
+        if missing:
+            self._metrics["misses"] += len(missing)
+            subscriptions = {}
+            cursor = self.db.creator_subscriptions.find(
+                {"creator_id": {"$in": missing}, "status": "active"},
+                {"_id": 0, "creator_id": 1, "plan_id": 1, "current_period_end": 1}
+            )
+            async for sub in cursor:
+                subscriptions[sub["creator_id"]] = sub
+            
+            for creator_id in missing:
+                entitlement = self._build_entitlement(subscriptions.get(creator_id))
+                self._store_entitlement(creator_id, entitlement)
+                result[creator_id] = (entitlement["tier"], copy.deepcopy(entitlement["features"]))
         
-        # Default to free tier
-        return SubscriptionTier.FREE, SUBSCRIPTION_PLANS["free"]["features"]
+        return result
     
-    async def get_proposals_this_month(self, creator_id: str) -> int:
-        """Count proposals created this month by creator"""
+    def invalidate_creator(self, creator_id: str):
+        """Drop cached entitlement and proposal count (subscription or tier changed)"""
+        self._entitlements.pop(creator_id, None)
+        self._proposal_counts.pop(creator_id, None)
+        self._metrics["invalidations"] += 1
+    
+    def record_proposal_created(self, creator_id: str):
+        """Keep the cached monthly proposal count in step with a new proposal"""
+        entry = self._proposal_counts.get(creator_id)
+        if not entry:
+            return
+        expires_at, month_start, count = entry
+        if month_start == self._month_start() and expires_at > time.monotonic():
+            self._proposal_counts[creator_id] = (expires_at, month_start, count + 1)
+        else:
+            self._proposal_counts.pop(creator_id, None)
+    
+    def clear_cache(self):
+        self._entitlements.clear()
+        self._proposal_counts.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "entitlements_cached": len(self._entitlements),
+            "proposal_counts_cached": len(self._proposal_counts),
+            "hit_rate": round(self._metrics["hits"] / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds
+        }
+    
+    # ============== PROPOSAL LIMITS ==============
+    
+    @staticmethod
+    def _month_start() -> str:
         now = datetime.now(timezone.utc)
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+    
+    async def get_proposals_this_month(self, creator_id: str, fresh: bool = False) -> int:
+        """Count proposals created this month by creator"""
+        start_of_month = self._month_start()
+        
+        entry = self._proposal_counts.get(creator_id)
+        if not fresh and entry and entry[0] > time.monotonic() and entry[1] == start_of_month:
+            self._metrics["count_hits"] += 1
+            return entry[2]
         
+        self._metrics["count_misses"] += 1
         count = await self.db.proposals.count_documents({
             "user_id": creator_id,
-            "created_at": {"$gte": start_of_month.isoformat()}
+            "created_at": {"$gte": start_of_month}
         })
+        self._proposal_counts[creator_id] = (time.monotonic() + self.ttl_seconds, start_of_month, count)
         
         return count
     
@@ -55,19 +209,21 @@ class FeatureGatingService:
         """
         tier, features = await self.get_creator_tier(creator_id)
         limit = features.get("proposals_per_month", 1)
+        used = await self.get_proposals_this_month(creator_id)
         
         # Unlimited proposals
         if limit == -1:
             return {
                 "can_create": True,
                 "limit": -1,
-                "used": await self.get_proposals_this_month(creator_id),
+                "used": used,
                 "remaining": -1,
                 "upgrade_needed": False,
                 "tier": tier.value if hasattr(tier, 'value') else tier
             }
         
-        used = await self.get_proposals_this_month(creator_id)
+        if used >= limit - PROPOSAL_LIMIT_RECHECK_MARGIN:
+            used = await self.get_proposals_this_month(creator_id, fresh=True)
         remaining = max(0, limit - used)
         
         return {
@@ -199,18 +355,13 @@ class FeatureGatingService:
     
     async def get_full_feature_access(self, creator_id: str) -> Dict[str, Any]:
         """Get complete feature access info for a creator"""
-        tier, features = await self.get_creator_tier(creator_id)
+        entitlement = await self.get_entitlement(creator_id)
+        tier, features = entitlement["tier"], entitlement["features"]
         proposal_status = await self.can_create_proposal(creator_id)
         
-        # Get subscription details
-        subscription = await self.db.creator_subscriptions.find_one(
-            {"creator_id": creator_id, "status": "active"},
-            {"_id": 0}
-        )
-        
         return {
             "tier": tier.value if hasattr(tier, 'value') else tier,
-            "plan_id": subscription.get("plan_id") if subscription else "free",
+            "plan_id": entitlement["plan_id"],
             "features": {
                 # Proposals
                 "proposals_per_month": features.get("proposals_per_month", 1),
@@ -235,6 +386,6 @@ class FeatureGatingService:
                 "api_access": features.get("api_access", False),
                 "brand_integrations": features.get("brand_integrations", False)
             },
-            "subscription_active": subscription is not None,
-            "current_period_end": subscription.get("current_period_end") if subscription else None
+            "subscription_active": entitlement["subscription_active"],
+            "current_period_end": entitlement["current_period_end"]
         }
@@ -0,0 +1,285 @@
+"""
+Index Registry for Creators Hive HQ
+Declarative MongoDB indexes, applied at startup, with drift and plan checks
+
+This module implements:
+- IndexSpec: one index (keys plus unique / sparse / TTL / partial options)
+- QueryShape: a representative hot query that must be served by an index
+- IndexRegistry: services declare their indexes and query shapes at import
+  time; apply() creates missing indexes idempotently (one list_indexes and
+  one create_indexes per collection) and reports drift
+- check_query_plans(): runs explain() for every registered query shape and
+  flags plans that fall back to a COLLSCAN
+
+Drift is reported, never silently "fixed": an existing index whose keys
+match a spec but whose options differ (e.g. unique missing, TTL changed) is
+listed under "drifted", and indexes on registered collections that no spec
+declares are listed under "unregistered". Set INDEX_REGISTRY_REBUILD_DRIFTED
+to drop and rebuild drifted indexes at startup.
+
+Usage (module level, in the service that owns the queries):
+    index_registry.register("proposals", [("id", 1)], unique=True, owner="proposals")
+    index_registry.register_query("proposals", {"id": "P-1"}, owner="proposals")
+"""
+
+import os
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+INDEX_REGISTRY_REBUILD_DRIFTED = os.environ.get("INDEX_REGISTRY_REBUILD_DRIFTED", "false").lower() == "true"
+
+IndexKeys = List[Tuple[str, Any]]
+
+
+class IndexSpec:
+    """A declared index"""
+
+    def __init__(
+        self,
+        collection: str,
+        keys: IndexKeys,
+        unique: bool = False,
+        sparse: bool = False,
+        ttl_seconds: Optional[int] = None,
+        partial: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
+        owner: str = ""
+    ):
+        self.collection = collection
+        self.keys = [(field, direction) for field, direction in keys]
+        self.unique = unique
+        self.sparse = sparse
+        self.ttl_seconds = ttl_seconds
+        self.partial = partial
+        self.name = name or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+        self.owner = owner
+
+    def options(self) -> Dict[str, Any]:
+        """Options as they appear in list_indexes output"""
+        options: Dict[str, Any] = {}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.ttl_seconds is not None:
+            options["expireAfterSeconds"] = self.ttl_seconds
+        if self.partial:
+            options["partialFilterExpression"] = self.partial
+        return options
+
+    def model(self) -> IndexModel:
+        return IndexModel(self.keys, name=self.name, **self.options())
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "name": self.name,
+            "keys": dict(self.keys),
+            "owner": self.owner,
+            **self.options(),
+        }
+
+
+class QueryShape:
+    """A hot query that should be served by an index"""
+
+    def __init__(
+        self,
+        collection: str,
+        filter: Dict[str, Any],
+        sort: Optional[IndexKeys] = None,
+        owner: str = ""
+    ):
+        self.collection = collection
+        self.filter = filter
+        self.sort = sort
+        self.owner = owner
+
+
+def _existing_options(index: Dict[str, Any]) -> Dict[str, Any]:
+    options = {}
+    for option in ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression"):
+        if index.get(option) not in (None, False):
+            options[option] = index[option]
+    return options
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """All stage names in an explain() plan tree"""
+    stages = [plan.get("stage")] if plan.get("stage") else []
+    children = plan.get("inputStages") or []
+    if plan.get("inputStage"):
+        children = children + [plan["inputStage"]]
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+class IndexRegistry:
+    """Declared indexes and query shapes, applied at startup"""
+
+    def __init__(self):
+        self.specs: Dict[Tuple[str, str], IndexSpec] = {}
+        self.queries: List[QueryShape] = []
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    # ============== DECLARATION ==============
+
+    def register(self, collection: str, keys, **options) -> IndexSpec:
+        """Declare an index; keys is a field name or a list of (field, direction)"""
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        spec = IndexSpec(collection, keys, **options)
+        existing = self.specs.get((collection, spec.name))
+        if existing and (existing.keys, existing.options()) != (spec.keys, spec.options()):
+            raise ValueError(f"Conflicting index declarations for {collection}.{spec.name}")
+        self.specs[(collection, spec.name)] = spec
+        return spec
+
+    def register_query(self, collection: str, filter: Dict[str, Any], sort=None, owner: str = "") -> QueryShape:
+        """Declare a hot query shape (sample values are fine) for plan checks"""
+        shape = QueryShape(collection, filter, sort, owner)
+        self.queries.append(shape)
+        return shape
+
+    def collections(self) -> List[str]:
+        return sorted({collection for collection, _ in self.specs})
+
+    def specs_for(self, collection: str) -> List[IndexSpec]:
+        return [spec for (coll, _), spec in self.specs.items() if coll == collection]
+
+    # ============== APPLY ==============
+
+    async def apply(self, db, rebuild_drifted: bool = INDEX_REGISTRY_REBUILD_DRIFTED) -> Dict[str, Any]:
+        """
+        Create missing indexes on every registered collection and report drift.
+        Safe to run on every startup; failures are reported, not raised.
+        """
+        report: Dict[str, Any] = {
+            "applied_at": datetime.now(timezone.utc).isoformat(),
+            "created": [],
+            "existing": 0,
+            "drifted": [],
+            "rebuilt": [],
+            "unregistered": [],
+            "failed": [],
+        }
+
+        for collection in self.collections():
+            specs = self.specs_for(collection)
+            try:
+                existing = {ix["name"]: ix async for ix in db[collection].list_indexes()}
+            except PyMongoError as e:
+                report["failed"].append({"collection": collection, "error": str(e)})
+                continue
+            by_keys = {tuple(ix["key"].items()): ix for ix in existing.values()}
+
+            missing: List[IndexSpec] = []
+            matched = {"_id_"}
+            for spec in specs:
+                current = existing.get(spec.name) or by_keys.get(tuple(spec.keys))
+                if current is None:
+                    missing.append(spec)
+                    continue
+                matched.add(current["name"])
+                actual = _existing_options(current)
+                if actual == spec.options() and list(current["key"].items()) == spec.keys:
+                    report["existing"] += 1
+                    continue
+                drift = {**spec.describe(), "actual_name": current["name"], "actual": {
+                    "keys": dict(current["key"]), **actual
+                }}
+                report["drifted"].append(drift)
+                if rebuild_drifted:
+                    try:
+                        await db[collection].drop_index(current["name"])
+                        missing.append(spec)
+                        report["rebuilt"].append(spec.name)
+                    except PyMongoError as e:
+                        report["failed"].append({"collection": collection, "index": spec.name, "error": str(e)})
+
+            report["unregistered"].extend(
+                {"collection": collection, "name": name, "keys": dict(ix["key"])}
+                for name, ix in existing.items()
+                if name not in matched
+            )
+
+            if missing:
+                try:
+                    await db[collection].create_indexes([spec.model() for spec in missing])
+                    report["created"].extend(f"{collection}.{spec.name}" for spec in missing)
+                except PyMongoError:
+                    # Retry one by one so a single bad index (e.g. duplicates
+                    # blocking a unique build) doesn't hold back the rest
+                    for spec in missing:
+                        try:
+                            await db[collection].create_indexes([spec.model()])
+                            report["created"].append(f"{collection}.{spec.name}")
+                        except PyMongoError as e:
+                            report["failed"].append({"collection": collection, "index": spec.name, "error": str(e)})
+
+        if report["created"]:
+            logger.info(f"Index registry created {len(report['created'])} indexes: {', '.join(report['created'])}")
+        for drift in report["drifted"]:
+            logger.warning(
+                f"Index drift on {drift['collection']}.{drift['name']}: "
+                f"found {drift['actual_name']} {drift['actual']}"
+            )
+        for failure in report["failed"]:
+            logger.error(f"Index registry failure: {failure}")
+
+        report["summary"] = {
+            "declared": len(self.specs),
+            "created": len(report["created"]),
+            "drifted": len(report["drifted"]),
+            "unregistered": len(report["unregistered"]),
+            "failed": len(report["failed"]),
+        }
+        self.last_report = report
+        return report
+
+    # ============== QUERY PLANS ==============
+
+    async def check_query_plans(self, db) -> Dict[str, Any]:
+        """explain() every registered query shape; flag COLLSCAN plans"""
+        results = []
+        for shape in self.queries:
+            command: Dict[str, Any] = {"find": shape.collection, "filter": shape.filter}
+            if shape.sort:
+                command["sort"] = dict(shape.sort)
+            entry: Dict[str, Any] = {
+                "collection": shape.collection,
+                "filter": repr(shape.filter),
+                "sort": repr(shape.sort) if shape.sort else None,
+                "owner": shape.owner,
+            }
+            try:
+                explain = await db.command({"explain": command, "verbosity": "queryPlanner"})
+                winning = explain.get("queryPlanner", {}).get("winningPlan", {})
+                # Slot-based engine nests the classic plan under queryPlan
+                stages = _plan_stages(winning.get("queryPlan", winning))
+                entry["stages"] = stages
+                entry["collscan"] = "COLLSCAN" in stages
+            except PyMongoError as e:
+                entry["error"] = str(e)
+                entry["collscan"] = None
+            results.append(entry)
+
+        collscans = [r for r in results if r["collscan"]]
+        for r in collscans:
+            logger.warning(f"COLLSCAN for {r['collection']} {r['filter']} (owner: {r['owner']})")
+        return {
+            "checked": len(results),
+            "collscans": collscans,
+            "errors": [r for r in results if r.get("error")],
+            "plans": results,
+        }
+
+
+# Global registry; services register at import time, server.py applies it at startup
+index_registry = IndexRegistry()
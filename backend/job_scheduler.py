@@ -0,0 +1,463 @@
+"""
+Job Scheduler for Creators Hive HQ
+In-process, leader-elected scheduler for periodic platform sweeps
+
+This module implements:
+- CronSchedule: 5-field cron expressions (minute hour day month weekday)
+  with *, lists, ranges and steps, evaluated in UTC
+- JobScheduler: registers jobs, claims due runs through a MongoDB lease so
+  only one worker runs each job, and records every run in job_runs
+- Per-run timeouts, jittered exponential retries and a global concurrency
+  limit
+- Manual triggering (run_now) for admin endpoints, off the request path,
+  and run_inline for callers that need the result under the job's lease
+
+Every worker runs the same scheduler loop. A due run is claimed with one
+atomic find_one_and_update on job_schedules (next_run_at <= now and lease
+free or expired); the claiming worker holds the lease, renews it while the
+job runs and releases it afterwards. A crashed worker's lease simply
+expires and the next due run is claimed by someone else.
+"""
+
+import os
+import uuid
+import random
+import socket
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Set
+from datetime import datetime, timezone, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from index_registry import index_registry
+
+logger = logging.getLogger(__name__)
+
+JOB_SCHEDULER_ENABLED = os.environ.get("JOB_SCHEDULER_ENABLED", "true").lower() == "true"
+JOB_SCHEDULER_POLL_SECONDS = float(os.environ.get("JOB_SCHEDULER_POLL_SECONDS", "15"))
+JOB_SCHEDULER_MAX_CONCURRENT = int(os.environ.get("JOB_SCHEDULER_MAX_CONCURRENT", "2"))
+JOB_LEASE_SECONDS = 120
+JOB_HISTORY_TTL_DAYS = 30
+
+JobFunc = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+index_registry.register("job_runs", [("job_name", 1), ("started_at", -1)], owner="job_scheduler")
+index_registry.register("job_runs", "started_at", ttl_seconds=JOB_HISTORY_TTL_DAYS * 86400, owner="job_scheduler")
+index_registry.register_query("job_runs", {"job_name": "escalation_scan"}, sort=[("started_at", -1)], owner="job_scheduler")
+
+
+class JobStatus:
+    """Outcome of a job run"""
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+
+
+# ============== CRON ==============
+
+class CronSchedule:
+    """
+    Minimal cron expression: "minute hour day-of-month month day-of-week".
+
+    Examples:
+        "0 * * * *"      hourly, on the hour
+        "*/15 * * * *"   every 15 minutes
+        "30 3 * * *"     daily at 03:30 UTC
+        "0 9 * * 1"      Mondays at 09:00 UTC (0 or 7 = Sunday)
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        fields = [self._parse(part, lo, hi) for part, (lo, hi) in zip(parts, self.FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        # Cron weekday: 0/7 = Sunday; Python weekday(): 0 = Monday
+        self.weekdays = {(d - 1) % 7 for d in weekdays}
+        # Standard cron: if both day fields are restricted, either may match
+        self._day_any = parts[2] == "*"
+        self._weekday_any = parts[4] == "*"
+
+    @staticmethod
+    def _parse(part: str, lo: int, hi: int) -> Set[int]:
+        values = set()
+        for item in part.split(","):
+            step = 1
+            if "/" in item:
+                item, step_str = item.split("/", 1)
+                step = int(step_str)
+            if item == "*":
+                start, end = lo, hi
+            elif "-" in item:
+                start, end = (int(x) for x in item.split("-", 1))
+            else:
+                start = end = int(item)
+                if step > 1:
+                    end = hi
+            if start < lo or end > hi or start > end or step < 1:
+                raise ValueError(f"Cron field '{part}' out of range {lo}-{hi}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = dt.weekday() in self.weekdays
+        if self._day_any:
+            return weekday_ok
+        if self._weekday_any:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after`"""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+
+# ============== JOBS ==============
+
+class ScheduledJob:
+    """A registered job and its run policy"""
+
+    def __init__(
+        self,
+        name: str,
+        schedule: str,
+        func: JobFunc,
+        description: str = "",
+        timeout_seconds: float = 600,
+        max_retries: int = 2,
+        retry_base_seconds: float = 30,
+        enabled: bool = True
+    ):
+        self.name = name
+        self.schedule = CronSchedule(schedule)
+        self.func = func
+        self.description = description
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.enabled = enabled
+
+    def retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, self.retry_base_seconds * (2 ** (attempt - 1)))
+
+
+class JobScheduler:
+    """
+    Leader-elected periodic job runner.
+
+    Usage:
+        scheduler = JobScheduler(db)
+        scheduler.register("escalation_scan", "0 * * * *", service.scan_all_proposals)
+        await scheduler.start()
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        poll_seconds: float = JOB_SCHEDULER_POLL_SECONDS,
+        max_concurrent: int = JOB_SCHEDULER_MAX_CONCURRENT,
+        lease_seconds: float = JOB_LEASE_SECONDS
+    ):
+        self.db = db
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        # job name -> why its lease was lost (set just before the run is cancelled)
+        self._lease_lost: Dict[str, str] = {}
+
+    def register(self, name: str, schedule: str, func: JobFunc, **options) -> ScheduledJob:
+        """Register a job (call before start)"""
+        job = ScheduledJob(name, schedule, func, **options)
+        self.jobs[name] = job
+        return job
+
+    # ============== LIFECYCLE ==============
+
+    async def start(self):
+        """Seed schedules and start polling"""
+        now = datetime.now(timezone.utc)
+        for job in self.jobs.values():
+            try:
+                await self.db.job_schedules.insert_one({
+                    "_id": job.name,
+                    "next_run_at": job.schedule.next_after(now),
+                    "lease_owner": None,
+                    "lease_until": None,
+                })
+            except DuplicateKeyError:
+                pass
+            # Schedule may have changed since the document was written
+            await self.db.job_schedules.update_one(
+                {"_id": job.name},
+                {"$set": {"schedule": job.schedule.expression, "description": job.description}}
+            )
+
+        if JOB_SCHEDULER_ENABLED:
+            self._loop_task = asyncio.create_task(self._poll_loop())
+            logger.info(f"Job scheduler started on {self.worker_id} with {len(self.jobs)} jobs")
+        else:
+            logger.info("Job scheduler disabled (JOB_SCHEDULER_ENABLED=false); manual runs only")
+
+    async def stop(self):
+        tasks = [t for t in [self._loop_task, *self._running.values()] if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._running.clear()
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                for job in self.jobs.values():
+                    if job.enabled and job.name not in self._running:
+                        await self._try_claim(job, due_only=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job scheduler poll failed: {e}")
+            # Jitter so workers don't poll in lockstep
+            await asyncio.sleep(self.poll_seconds * random.uniform(0.8, 1.2))
+
+    # ============== LEASES ==============
+
+    async def _try_claim(self, job: ScheduledJob, due_only: bool, trigger: str = "schedule") -> Optional[str]:
+        """Atomically take the job's lease; start the run if we got it"""
+        if not await self._claim_lease(job, due_only):
+            return None
+
+        run_id = f"JOB-{uuid.uuid4().hex[:10].upper()}"
+        self._running[job.name] = asyncio.create_task(self._run(job, run_id, trigger))
+        return run_id
+
+    async def _claim_lease(self, job: ScheduledJob, due_only: bool) -> bool:
+        now = datetime.now(timezone.utc)
+        query: Dict[str, Any] = {
+            "_id": job.name,
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+        }
+        update: Dict[str, Any] = {
+            "lease_owner": self.worker_id,
+            "lease_until": now + timedelta(seconds=self.lease_seconds),
+        }
+        if due_only:
+            query["next_run_at"] = {"$lte": now}
+            update["next_run_at"] = job.schedule.next_after(now)
+
+        claimed = await self.db.job_schedules.find_one_and_update(
+            query, {"$set": update}, return_document=ReturnDocument.AFTER
+        )
+        return claimed is not None
+
+    async def _renew_lease(self, job_name: str, run_task: asyncio.Task):
+        """Extend the lease while the job runs; abort the run if that fails"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await self.db.job_schedules.update_one(
+                    {"_id": job_name, "lease_owner": self.worker_id},
+                    {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)}}
+                )
+                if renewed.matched_count:
+                    continue
+                reason = "lease is no longer held by this worker"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reason = f"lease renewal failed: {e}"
+            # Another worker may claim the job once the lease expires; stop this run
+            logger.error(f"Job {job_name}: {reason}; aborting run")
+            self._lease_lost[job_name] = reason
+            run_task.cancel()
+            return
+
+    # ============== EXECUTION ==============
+
+    async def _run(self, job: ScheduledJob, run_id: str, trigger: str):
+        started_at = datetime.now(timezone.utc)
+        await self.db.job_runs.insert_one({
+            "id": run_id,
+            "job_name": job.name,
+            "worker_id": self.worker_id,
+            "trigger": trigger,
+            "status": JobStatus.RUNNING,
+            "started_at": started_at,
+        })
+        renew_task = asyncio.create_task(self._renew_lease(job.name, asyncio.current_task()))
+
+        status, result, error, attempt = JobStatus.FAILED, None, None, 0
+        try:
+            while True:
+                attempt += 1
+                # Hold a concurrency slot per attempt, not across the backoff sleep
+                async with self._semaphore:
+                    try:
+                        result = await asyncio.wait_for(job.func(), timeout=job.timeout_seconds)
+                        status, error = JobStatus.SUCCESS, None
+                        break
+                    except asyncio.TimeoutError:
+                        status, error = JobStatus.TIMEOUT, f"Timed out after {job.timeout_seconds}s"
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        status, error = JobStatus.FAILED, str(e)
+                logger.warning(f"Job {job.name} attempt {attempt} {status}: {error}")
+                if attempt > job.max_retries:
+                    break
+                await asyncio.sleep(job.retry_delay(attempt))
+        except asyncio.CancelledError:
+            lease_lost = self._lease_lost.pop(job.name, None)
+            if not lease_lost:
+                status, error = JobStatus.FAILED, "Cancelled (worker shutting down)"
+                raise
+            status, error = JobStatus.FAILED, f"Aborted: {lease_lost}"
+        finally:
+            renew_task.cancel()
+            finished_at = datetime.now(timezone.utc)
+            duration = round((finished_at - started_at).total_seconds(), 3)
+            await asyncio.shield(self._finish(job, run_id, status, attempt, duration, finished_at, result, error))
+            self._running.pop(job.name, None)
+            self._lease_lost.pop(job.name, None)
+            log = logger.info if status == JobStatus.SUCCESS else logger.error
+            log(f"Job {job.name} {status} in {duration}s ({attempt} attempt(s))")
+        return status, result, error
+
+    async def _finish(self, job, run_id, status, attempts, duration, finished_at, result, error):
+        try:
+            await self.db.job_runs.update_one(
+                {"id": run_id},
+                {"$set": {
+                    "status": status,
+                    "attempts": attempts,
+                    "finished_at": finished_at,
+                    "duration_seconds": duration,
+                    "result": self._summarize(result),
+                    "error": error,
+                }}
+            )
+            await self.db.job_schedules.update_one(
+                {"_id": job.name, "lease_owner": self.worker_id},
+                {"$set": {
+                    "lease_owner": None,
+                    "lease_until": None,
+                    "last_run_id": run_id,
+                    "last_status": status,
+                    "last_run_at": finished_at,
+                    "last_duration_seconds": duration,
+                }}
+            )
+        except Exception as e:
+            logger.error(f"Failed to record job run {run_id}: {e}")
+
+    @staticmethod
+    def _summarize(result: Any) -> Any:
+        """Keep scalar fields of a job result for history (drops big lists)"""
+        if not isinstance(result, dict):
+            return None if result is None else str(result)[:500]
+        return {
+            k: v for k, v in result.items()
+            if isinstance(v, (int, float, str, bool)) or v is None
+        }
+
+    # ============== MANUAL RUNS & STATUS ==============
+
+    async def run_now(self, name: str) -> Dict[str, Any]:
+        """Trigger a job outside its schedule (still lease-protected)"""
+        job = self.jobs.get(name)
+        if not job:
+            return {"success": False, "error": f"Unknown job '{name}'"}
+        run_id = await self._try_claim(job, due_only=False, trigger="manual")
+        if not run_id:
+            return {"success": False, "error": "Job is already running"}
+        return {"success": True, "queued": True, "job_name": name, "run_id": run_id}
+
+    async def run_inline(self, name: str) -> Dict[str, Any]:
+        """
+        Run a job now and wait for its result, under the same lease as its
+        scheduled runs. For callers that need the job's output, e.g. building
+        a snapshot on first use. Fails if the job is already running.
+        """
+        job = self.jobs.get(name)
+        if not job:
+            return {"success": False, "error": f"Unknown job '{name}'"}
+        if not await self._claim_lease(job, due_only=False):
+            return {"success": False, "error": "Job is already running"}
+        run_id = f"JOB-{uuid.uuid4().hex[:10].upper()}"
+        task = asyncio.create_task(self._run(job, run_id, "inline"))
+        self._running[job.name] = task
+        # The run continues if the caller goes away
+        status, result, error = await asyncio.shield(task)
+        if status != JobStatus.SUCCESS:
+            return {"success": False, "run_id": run_id, "error": error}
+        return {"success": True, "run_id": run_id, "result": result}
+
+    async def get_jobs(self) -> List[Dict[str, Any]]:
+        """Registered jobs with their schedule and last run"""
+        docs = {
+            d["_id"]: d async for d in self.db.job_schedules.find({"_id": {"$in": list(self.jobs)}})
+        }
+        jobs = []
+        for job in self.jobs.values():
+            doc = docs.get(job.name, {})
+            jobs.append({
+                "name": job.name,
+                "description": job.description,
+                "schedule": job.schedule.expression,
+                "enabled": job.enabled and JOB_SCHEDULER_ENABLED,
+                "timeout_seconds": job.timeout_seconds,
+                "max_retries": job.max_retries,
+                "next_run_at": self._iso(doc.get("next_run_at")),
+                "running_on": doc.get("lease_owner"),
+                "last_status": doc.get("last_status"),
+                "last_run_at": self._iso(doc.get("last_run_at")),
+                "last_duration_seconds": doc.get("last_duration_seconds"),
+            })
+        return jobs
+
+    async def get_history(self, name: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        query = {"job_name": name} if name else {}
+        runs = await self.db.job_runs.find(query, {"_id": 0}).sort("started_at", -1).limit(limit).to_list(limit)
+        for run in runs:
+            run["started_at"] = self._iso(run.get("started_at"))
+            run["finished_at"] = self._iso(run.get("finished_at"))
+        return runs
+
+    @staticmethod
+    def _iso(value) -> Optional[str]:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.isoformat()
+        return value
+
+
+# Global scheduler instance (initialized in server.py startup)
+job_scheduler = None
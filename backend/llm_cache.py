@@ -0,0 +1,235 @@
+"""
+LLM Response Cache for Creators Hive HQ
+Content-addressed cache for deterministic ARRIS prompts
+
+This module implements:
+- Cache keys: SHA-256 of (model, system prompt, normalized user prompt)
+- Memory tier: per-process LRU with TTL (no I/O on hit)
+- Persistent tier: llm_response_cache collection shared by all workers,
+  expired by a TTL index
+- Single-flight: concurrent misses for the same key share one LLM call
+- Hit/miss metrics per tier
+
+Only successful LLM responses are cached; errors and fallbacks never are.
+Callers can bypass the read side (e.g. explicit regeneration) and still
+refresh the stored entry.
+"""
+
+import os
+import re
+import time
+import json
+import hashlib
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+from datetime import datetime, timezone, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a key"""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+class LlmResponseCache:
+    """
+    Two-tier LLM response cache.
+
+    Usage:
+        response, cached = await cache.get_or_generate(
+            model="openai/gpt-4o",
+            system_message=system_prompt,
+            user_message=context,
+            generate=lambda: chat.send_message(UserMessage(text=context))
+        )
+    """
+
+    def __init__(
+        self,
+        db: Optional[AsyncIOMotorDatabase] = None,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS
+    ):
+        self.db = db
+        self.collection = db.llm_response_cache if db is not None else None
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._metrics = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "bypasses": 0,
+            "shared_inflight": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    async def initialize(self):
+        """Create the TTL index for the persistent tier"""
+        if self.collection is not None:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    # ============== KEYS ==============
+
+    @staticmethod
+    def make_key(model: str, system_message: str, user_message: str) -> str:
+        payload = json.dumps(
+            [model, normalize_prompt(system_message), normalize_prompt(user_message)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ============== LOOKUP ==============
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached response (memory first, then persistent)"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._metrics["memory_hits"] += 1
+                return value
+            del self._memory[key]
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one(
+                    {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                    {"response": 1, "expires_at": 1}
+                )
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.warning(f"LLM cache lookup failed: {e}")
+                doc = None
+            if doc:
+                expires_at = doc["expires_at"]
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                self._remember(key, doc["response"], expires_at.timestamp())
+                self._metrics["persistent_hits"] += 1
+                return doc["response"]
+
+        return None
+
+    async def set(self, key: str, value: str, model: Optional[str] = None):
+        """Store a response in both tiers"""
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        self._remember(key, value, expires_at.timestamp())
+
+        if self.collection is not None:
+            try:
+                await self.collection.update_one(
+                    {"_id": key},
+                    {"$set": {
+                        "response": value,
+                        "model": model,
+                        "created_at": datetime.now(timezone.utc),
+                        "expires_at": expires_at
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._metrics["evictions"] += 1
+
+    # ============== READ-THROUGH ==============
+
+    async def get_or_generate(
+        self,
+        model: str,
+        system_message: str,
+        user_message: str,
+        generate: Callable[[], Awaitable[Any]],
+        bypass: bool = False
+    ) -> Tuple[str, bool]:
+        """
+        Return (response, cached). On a miss (or bypass) `generate` is called
+        and its result stored; exceptions from `generate` propagate uncached.
+        """
+        key = self.make_key(model, system_message, user_message)
+
+        if bypass:
+            self._metrics["bypasses"] += 1
+        else:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached, True
+
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self._metrics["shared_inflight"] += 1
+                return await asyncio.shield(inflight), True
+            self._metrics["misses"] += 1
+
+        future = asyncio.get_running_loop().create_future()
+        if not bypass:
+            self._inflight[key] = future
+        try:
+            response = await generate()
+            response = response if isinstance(response, str) else str(response)
+            await self.set(key, response, model)
+            future.set_result(response)
+            return response, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def invalidate(self, model: str, system_message: str, user_message: str):
+        key = self.make_key(model, system_message, user_message)
+        self._memory.pop(key, None)
+        if self.collection is not None:
+            await self.collection.delete_one({"_id": key})
+
+    async def clear(self):
+        """Drop every cached response"""
+        self._memory.clear()
+        if self.collection is not None:
+            await self.collection.delete_many({})
+
+    # ============== METRICS ==============
+
+    def get_metrics(self) -> Dict[str, Any]:
+        m = self._metrics
+        hits = m["memory_hits"] + m["persistent_hits"] + m["shared_inflight"]
+        lookups = hits + m["misses"]
+        return {
+            **m,
+            "hits": hits,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self.collection is not None,
+        }
+
+
+# Global cache instance (initialized in server.py startup)
+llm_response_cache = None
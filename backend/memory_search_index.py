@@ -0,0 +1,461 @@
+"""
+ARRIS Memory Search Index - Phase 4 Module C (C3)
+Per-creator inverted index behind the Memory Search API
+
+This module implements:
+1. Tokenization - Normalizes memory content, tags, titles and summaries into terms
+2. Postings - One posting per (creator, source, term, memory) with term frequency
+   and the precomputed field boost (tags/title/summary/type)
+3. Incremental Maintenance - Index/unindex hooks called by every writer of
+   arris_memories and arris_memories_archive
+4. BM25 Ranking - Server-side scoring so ranking covers a creator's whole corpus
+
+Collections:
+- memory_search_postings: {creator_id, source, term, memory_id, tf, boost, doc_length}
+- memory_search_terms:    {creator_id, source, term, df}
+- memory_search_stats:    {creator_id, source, doc_count, total_length}
+"""
+
+import os
+import time
+import logging
+import math
+import re
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne, InsertOne
+
+logger = logging.getLogger(__name__)
+
+# How long a creator's index is trusted after a reconciliation check
+MEMORY_SEARCH_VERIFY_SECONDS = int(os.environ.get("MEMORY_SEARCH_VERIFY_SECONDS", "300"))
+
+
+class IndexSource:
+    """Memory collections covered by the search index"""
+    ACTIVE = "active"       # arris_memories
+    ARCHIVE = "archive"     # arris_memories_archive
+
+
+SOURCE_COLLECTIONS = {
+    IndexSource.ACTIVE: "arris_memories",
+    IndexSource.ARCHIVE: "arris_memories_archive",
+}
+
+# Field boosts - same weights the substring scorer used before the index existed
+FIELD_BOOSTS = {
+    "tag": 15.0,            # Exact tag match
+    "tag_partial": 5.0,     # Query word is part of a tag
+    "title": 20.0,          # Word appears in content.title
+    "summary": 15.0,        # Word appears in content.summary
+    "memory_type": 5.0,     # Word appears in memory type
+}
+
+# Scale applied to BM25 so a single content hit is worth roughly the old +10
+CONTENT_WEIGHT = 10.0
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Posting term recorded once per memory; never produced by the tokenizer
+DOC_MARKER = ""
+
+
+class MemorySearchIndex:
+    """
+    Inverted index for ARRIS memory search.
+
+    Features:
+    - Tokenized per-creator postings stored in MongoDB (shared across workers)
+    - Document-frequency and length statistics maintained with $inc
+    - BM25 content scoring plus field boosts computed in one aggregation
+    - Self-healing reconciliation for memories written outside the hooks
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.k1 = 1.2                  # BM25 term-frequency saturation
+        self.b = 0.75                  # BM25 length normalization
+        self.min_term_length = 2       # Shorter query words are ignored
+        self.max_terms_per_memory = 500  # Cap postings for very large memories
+        self.verify_seconds = MEMORY_SEARCH_VERIFY_SECONDS
+        self._verified: Dict[Tuple[str, str], float] = {}  # (creator, source) -> monotonic
+
+    async def initialize(self):
+        """Create the indexes the postings collections rely on"""
+        await self.db.memory_search_postings.create_index(
+            [("creator_id", 1), ("source", 1), ("term", 1)]
+        )
+        await self.db.memory_search_postings.create_index(
+            [("creator_id", 1), ("source", 1), ("memory_id", 1)]
+        )
+        await self.db.memory_search_terms.create_index(
+            [("creator_id", 1), ("source", 1), ("term", 1)], unique=True
+        )
+        await self.db.memory_search_stats.create_index(
+            [("creator_id", 1), ("source", 1)], unique=True
+        )
+        logger.info("Memory search index collections ready")
+
+    # ============== TOKENIZATION ==============
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercase and split text into alphanumeric terms"""
+        if not text:
+            return []
+        return TOKEN_PATTERN.findall(str(text).lower())
+
+    def _flatten_content(self, value: Any) -> List[str]:
+        """Collect every string/number value in memory content"""
+        if isinstance(value, dict):
+            parts = []
+            for v in value.values():
+                parts.extend(self._flatten_content(v))
+            return parts
+        if isinstance(value, (list, tuple)):
+            parts = []
+            for v in value:
+                parts.extend(self._flatten_content(v))
+            return parts
+        if isinstance(value, bool) or value is None:
+            return []
+        return [str(value)]
+
+    def build_postings(self, memory: Dict[str, Any]) -> Tuple[int, Dict[str, Dict[str, float]]]:
+        """
+        Build the postings for a single memory.
+
+        Returns:
+            (document length, {term: {"tf": int, "boost": float}})
+        """
+        content = memory.get("content", {})
+        content_terms = self.tokenize(" ".join(self._flatten_content(content)))
+
+        postings: Dict[str, Dict[str, float]] = {}
+        for term in content_terms:
+            entry = postings.setdefault(term, {"tf": 0, "boost": 0.0})
+            entry["tf"] += 1
+
+        def add_boost(term: str, boost: float):
+            entry = postings.setdefault(term, {"tf": 0, "boost": 0.0})
+            entry["boost"] += boost
+
+        # Tags: the whole tag is an exact match, its sub-tokens are partial matches
+        for tag in memory.get("tags", []) or []:
+            if not tag:
+                continue
+            tag_lower = str(tag).lower()
+            add_boost(tag_lower, FIELD_BOOSTS["tag"])
+            for term in set(self.tokenize(tag_lower)):
+                if term != tag_lower:
+                    add_boost(term, FIELD_BOOSTS["tag_partial"])
+
+        if isinstance(content, dict):
+            for field in ("title", "summary"):
+                for term in set(self.tokenize(content.get(field, ""))):
+                    add_boost(term, FIELD_BOOSTS[field])
+
+        for term in set(self.tokenize(memory.get("memory_type", ""))):
+            add_boost(term, FIELD_BOOSTS["memory_type"])
+
+        # Keep the most frequent terms for pathological payloads
+        if len(postings) > self.max_terms_per_memory:
+            kept = sorted(postings.items(), key=lambda x: -(x[1]["tf"] + x[1]["boost"]))
+            postings = dict(kept[:self.max_terms_per_memory])
+
+        return len(content_terms), postings
+
+    # ============== INCREMENTAL MAINTENANCE ==============
+
+    async def index_memory(self, memory: Dict[str, Any], source: str = IndexSource.ACTIVE):
+        """Index (or re-index) a single memory"""
+        await self.index_memories([memory], source)
+
+    async def index_memories(self, memories: List[Dict[str, Any]], source: str = IndexSource.ACTIVE):
+        """Index (or re-index) a batch of memories from one source collection"""
+        memories = [m for m in memories if m.get("id") and m.get("creator_id")]
+        if not memories:
+            return
+
+        # Re-indexing replaces whatever postings already exist
+        by_creator: Dict[str, List[str]] = {}
+        for m in memories:
+            by_creator.setdefault(m["creator_id"], []).append(m["id"])
+        for creator_id, memory_ids in by_creator.items():
+            await self.remove_memories(creator_id, memory_ids, source)
+
+        posting_ops = []
+        term_ops = []
+        stats_delta: Dict[str, Dict[str, int]] = {}
+        now = datetime.now(timezone.utc).isoformat()
+
+        for memory in memories:
+            creator_id = memory["creator_id"]
+            doc_length, postings = self.build_postings(memory)
+
+            # Document marker so empty memories are still counted and removable
+            posting_ops.append(InsertOne({
+                "creator_id": creator_id,
+                "source": source,
+                "term": DOC_MARKER,
+                "memory_id": memory["id"],
+                "tf": 0,
+                "boost": 0.0,
+                "doc_length": doc_length,
+            }))
+
+            for term, entry in postings.items():
+                posting_ops.append(InsertOne({
+                    "creator_id": creator_id,
+                    "source": source,
+                    "term": term,
+                    "memory_id": memory["id"],
+                    "tf": entry["tf"],
+                    "boost": entry["boost"],
+                    "doc_length": doc_length,
+                }))
+                term_ops.append(UpdateOne(
+                    {"creator_id": creator_id, "source": source, "term": term},
+                    {"$inc": {"df": 1}},
+                    upsert=True
+                ))
+
+            delta = stats_delta.setdefault(creator_id, {"doc_count": 0, "total_length": 0})
+            delta["doc_count"] += 1
+            delta["total_length"] += doc_length
+
+        if posting_ops:
+            await self.db.memory_search_postings.bulk_write(posting_ops, ordered=False)
+        if term_ops:
+            await self.db.memory_search_terms.bulk_write(term_ops, ordered=False)
+        await self.db.memory_search_stats.bulk_write([
+            UpdateOne(
+                {"creator_id": creator_id, "source": source},
+                {"$inc": delta, "$set": {"updated_at": now}},
+                upsert=True
+            )
+            for creator_id, delta in stats_delta.items()
+        ], ordered=False)
+
+    async def remove_memories(
+        self,
+        creator_id: str,
+        memory_ids: List[str],
+        source: Optional[str] = None
+    ):
+        """Remove memories from the index (from one source, or both when source is None)"""
+        if not memory_ids:
+            return
+
+        query = {"creator_id": creator_id, "memory_id": {"$in": list(memory_ids)}}
+        if source:
+            query["source"] = source
+
+        postings = await self.db.memory_search_postings.find(
+            query,
+            {"_id": 0, "source": 1, "term": 1, "memory_id": 1, "doc_length": 1}
+        ).to_list(None)
+        if not postings:
+            return
+
+        term_counts: Dict[Tuple[str, str], int] = {}
+        doc_lengths: Dict[Tuple[str, str], int] = {}
+        for p in postings:
+            if p["term"] != DOC_MARKER:
+                key = (p["source"], p["term"])
+                term_counts[key] = term_counts.get(key, 0) + 1
+            doc_lengths[(p["source"], p["memory_id"])] = p.get("doc_length", 0)
+
+        await self.db.memory_search_postings.delete_many(query)
+        if term_counts:
+            await self.db.memory_search_terms.bulk_write([
+                UpdateOne(
+                    {"creator_id": creator_id, "source": src, "term": term},
+                    {"$inc": {"df": -count}}
+                )
+                for (src, term), count in term_counts.items()
+            ], ordered=False)
+        await self.db.memory_search_terms.delete_many(
+            {"creator_id": creator_id, "df": {"$lte": 0}}
+        )
+
+        stats_delta: Dict[str, Dict[str, int]] = {}
+        for (src, _), length in doc_lengths.items():
+            delta = stats_delta.setdefault(src, {"doc_count": 0, "total_length": 0})
+            delta["doc_count"] -= 1
+            delta["total_length"] -= length
+        for src, delta in stats_delta.items():
+            await self.db.memory_search_stats.update_one(
+                {"creator_id": creator_id, "source": src},
+                {"$inc": delta}
+            )
+
+    async def move_memories(self, memories: List[Dict[str, Any]], from_source: str, to_source: str):
+        """Move memories between sources (e.g. consolidation archiving)"""
+        by_creator: Dict[str, List[str]] = {}
+        for m in memories:
+            by_creator.setdefault(m["creator_id"], []).append(m["id"])
+        for creator_id, memory_ids in by_creator.items():
+            await self.remove_memories(creator_id, memory_ids, from_source)
+        await self.index_memories(memories, to_source)
+
+    async def drop_creator(self, creator_id: str):
+        """Remove every index entry for a creator (GDPR erasure)"""
+        for source in SOURCE_COLLECTIONS:
+            self._verified.pop((creator_id, source), None)
+        await self.db.memory_search_postings.delete_many({"creator_id": creator_id})
+        await self.db.memory_search_terms.delete_many({"creator_id": creator_id})
+        await self.db.memory_search_stats.delete_many({"creator_id": creator_id})
+
+    async def ensure_creator_indexed(self, creator_id: str, source: str = IndexSource.ACTIVE) -> int:
+        """
+        Reconcile the index with the source collection.
+
+        Memories written before the index existed (or by code paths that
+        bypass the hooks) are picked up here. The check is a pair of
+        indexed counts; ids are only diffed when the counts disagree. Once
+        verified, a creator is trusted for verify_seconds (the hooks keep the
+        index current), so repeated searches skip the counts.
+
+        Returns:
+            Number of memories added or removed
+        """
+        key = (creator_id, source)
+        now = time.monotonic()
+        verified_at = self._verified.get(key)
+        if verified_at is not None and now - verified_at < self.verify_seconds:
+            return 0
+
+        changed = await self._reconcile(creator_id, source)
+        if len(self._verified) > 10000:
+            self._verified = {
+                k: t for k, t in self._verified.items() if now - t < self.verify_seconds
+            }
+        self._verified[key] = time.monotonic()
+        return changed
+
+    async def _reconcile(self, creator_id: str, source: str) -> int:
+        collection = self.db[SOURCE_COLLECTIONS[source]]
+        actual = await collection.count_documents({"creator_id": creator_id})
+        stats = await self.db.memory_search_stats.find_one(
+            {"creator_id": creator_id, "source": source},
+            {"_id": 0, "doc_count": 1}
+        )
+        indexed = stats.get("doc_count", 0) if stats else 0
+        if actual == indexed:
+            return 0
+
+        source_ids = set(await collection.distinct("id", {"creator_id": creator_id}))
+        indexed_ids = set(await self.db.memory_search_postings.distinct(
+            "memory_id", {"creator_id": creator_id, "source": source, "term": DOC_MARKER}
+        ))
+
+        stale = list(indexed_ids - source_ids)
+        missing = list(source_ids - indexed_ids)
+
+        if stale:
+            await self.remove_memories(creator_id, stale, source)
+        for i in range(0, len(missing), 500):
+            batch = await collection.find(
+                {"creator_id": creator_id, "id": {"$in": missing[i:i + 500]}},
+                {"_id": 0}
+            ).to_list(None)
+            await self.index_memories(batch, source)
+
+        if stale or missing:
+            logger.info(
+                f"Reconciled memory search index for {creator_id} ({source}): "
+                f"+{len(missing)} / -{len(stale)}"
+            )
+        return len(stale) + len(missing)
+
+    # ============== RANKING ==============
+
+    async def rank(
+        self,
+        creator_id: str,
+        query: str,
+        source: str = IndexSource.ACTIVE,
+        limit: int = 50
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank a creator's memories against a query.
+
+        Scoring per matching term:
+        - Content: CONTENT_WEIGHT * BM25(tf, df, doc_length)
+        - Fields: precomputed tag/title/summary/type boosts
+
+        Returns:
+            [(memory_id, score), ...] sorted by descending score
+        """
+        terms = list(dict.fromkeys(
+            t for t in self.tokenize(query) if len(t) >= self.min_term_length
+        ))
+        # Whole-tag matches are indexed under the raw lowercase tag
+        query_lower = query.strip().lower()
+        if query_lower and query_lower not in terms:
+            terms.append(query_lower)
+        if not terms:
+            return []
+
+        stats = await self.db.memory_search_stats.find_one(
+            {"creator_id": creator_id, "source": source},
+            {"_id": 0, "doc_count": 1, "total_length": 1}
+        )
+        doc_count = max(1, stats.get("doc_count", 0)) if stats else 1
+        avg_length = max(1.0, (stats.get("total_length", 0) / doc_count) if stats else 1.0)
+
+        term_docs = await self.db.memory_search_terms.find(
+            {"creator_id": creator_id, "source": source, "term": {"$in": terms}},
+            {"_id": 0, "term": 1, "df": 1}
+        ).to_list(len(terms))
+        if not term_docs:
+            return []
+
+        idf_branches = []
+        for t in term_docs:
+            df = max(0, t.get("df", 0))
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            idf_branches.append({"case": {"$eq": ["$term", t["term"]]}, "then": idf})
+
+        idf_expr = {"$switch": {"branches": idf_branches, "default": 0}}
+        norm_expr = {"$add": [
+            "$tf",
+            {"$multiply": [
+                self.k1,
+                {"$add": [
+                    1 - self.b,
+                    {"$multiply": [self.b, {"$divide": ["$doc_length", avg_length]}]}
+                ]}
+            ]}
+        ]}
+        bm25_expr = {"$cond": [
+            {"$gt": ["$tf", 0]},
+            {"$multiply": [
+                CONTENT_WEIGHT,
+                idf_expr,
+                {"$divide": [{"$multiply": ["$tf", self.k1 + 1]}, norm_expr]}
+            ]},
+            0
+        ]}
+
+        pipeline = [
+            {"$match": {
+                "creator_id": creator_id,
+                "source": source,
+                "term": {"$in": [t["term"] for t in term_docs]}
+            }},
+            {"$group": {
+                "_id": "$memory_id",
+                "score": {"$sum": {"$add": [bm25_expr, "$boost"]}}
+            }},
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": limit}
+        ]
+        ranked = await self.db.memory_search_postings.aggregate(pipeline).to_list(limit)
+        return [(r["_id"], r["score"]) for r in ranked]
+
+
+# Global instance (will be initialized in server startup)
+memory_search_index = None
@@ -0,0 +1,245 @@
+"""
+Notification Backplane for Creators Hive HQ
+Cross-worker pub/sub for WebSocket notifications
+
+Each uvicorn worker only holds its own sockets. The backplane carries every
+notification to every worker, and each worker delivers it to the sockets
+it holds.
+
+This module implements:
+- NotificationBackplane: pluggable interface (start / publish / stop)
+- LocalBackplane: in-process only (single worker, the default)
+- MongoCappedBackplane: capped collection + tailable cursor (any MongoDB)
+- MongoChangeStreamBackplane: change stream on a TTL'd collection (replica sets)
+- create_notification_backplane: factory driven by NOTIFICATION_BACKPLANE
+
+Messages carry the publishing worker's id. The publisher delivers to its own
+sockets right away and skips its own messages when they come back from the
+broker.
+
+Other brokers (Redis, NATS, ...) plug in by subclassing NotificationBackplane
+and implementing publish() plus a receive loop that calls self._receive().
+"""
+
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Callable
+from datetime import datetime, timezone
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_BUS_COLLECTION = "notification_bus"
+NOTIFICATION_BUS_SIZE_BYTES = int(os.environ.get("NOTIFICATION_BUS_SIZE_BYTES", str(16 * 1024 * 1024)))
+NOTIFICATION_EVENT_TTL_SECONDS = 300
+
+# handler(scope, target, text)
+DeliveryHandler = Callable[[str, Optional[str], str], None]
+
+
+class BackplaneType:
+    """Available notification backplanes"""
+    LOCAL = "local"
+    MONGO_CAPPED = "mongo_capped"
+    MONGO_CHANGE_STREAM = "mongo_change_stream"
+
+
+class NotificationBackplane:
+    """
+    Base backplane: delivers locally only.
+
+    Subclasses forward published messages to other workers and feed messages
+    received from them into _receive().
+    """
+
+    name = BackplaneType.LOCAL
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._handler: Optional[DeliveryHandler] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "published": 0,
+            "received": 0,
+            "publish_errors": 0,
+            "receive_errors": 0,
+            "last_receive_lag_ms": None,
+        }
+
+    async def start(self, handler: DeliveryHandler):
+        """Begin delivering messages to `handler`"""
+        self._handler = handler
+
+    async def publish(self, scope: str, target: Optional[str], text: str):
+        """Deliver locally, then forward to the other workers"""
+        self.stats["published"] += 1
+        if self._handler:
+            self._handler(scope, target, text)
+        try:
+            await self._forward(scope, target, text)
+        except Exception as e:
+            self.stats["publish_errors"] += 1
+            logger.error(f"Notification backplane publish failed: {e}")
+
+    async def _forward(self, scope: str, target: Optional[str], text: str):
+        """Send to other workers (no-op for the local backplane)"""
+        pass
+
+    def _envelope(self, scope: str, target: Optional[str], text: str) -> Dict[str, Any]:
+        return {
+            "origin": self.worker_id,
+            "scope": scope,
+            "target": target,
+            "message": text,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    def _receive(self, doc: Dict[str, Any]):
+        """Deliver a message that arrived from the broker"""
+        if doc.get("origin") == self.worker_id:
+            return
+        self.stats["received"] += 1
+        created_at = doc.get("created_at")
+        if isinstance(created_at, datetime):
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            lag = (datetime.now(timezone.utc) - created_at).total_seconds() * 1000
+            self.stats["last_receive_lag_ms"] = round(lag, 1)
+        if self._handler:
+            self._handler(doc.get("scope"), doc.get("target"), doc.get("message", ""))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "worker_id": self.worker_id, **self.stats}
+
+
+class LocalBackplane(NotificationBackplane):
+    """Single-process delivery (no cross-worker fan-out)"""
+    pass
+
+
+class MongoCappedBackplane(NotificationBackplane):
+    """
+    Pub/sub over a capped collection.
+
+    Publishers insert into notification_bus; every worker follows it with a
+    tailable await cursor. Works on standalone MongoDB. The capped size
+    bounds storage; old messages roll off automatically.
+    """
+
+    name = BackplaneType.MONGO_CAPPED
+
+    def __init__(self, db: AsyncIOMotorDatabase, size_bytes: int = NOTIFICATION_BUS_SIZE_BYTES):
+        super().__init__()
+        self.db = db
+        self.size_bytes = size_bytes
+        self.collection = db[NOTIFICATION_BUS_COLLECTION]
+        self._last_id = None
+
+    async def start(self, handler: DeliveryHandler):
+        await super().start(handler)
+        try:
+            await self.db.create_collection(
+                NOTIFICATION_BUS_COLLECTION, capped=True, size=self.size_bytes
+            )
+        except (CollectionInvalid, OperationFailure):
+            pass  # Already exists
+
+        # Start after whatever is already in the bus (no replay on boot)
+        latest = await self.collection.find_one({}, sort=[("$natural", -1)])
+        self._last_id = latest["_id"] if latest else None
+        self._task = asyncio.create_task(self._tail())
+
+    async def _forward(self, scope: str, target: Optional[str], text: str):
+        await self.collection.insert_one(self._envelope(scope, target, text))
+
+    async def _tail(self):
+        while True:
+            try:
+                query = {"_id": {"$gt": self._last_id}} if self._last_id else {}
+                cursor = self.collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        self._last_id = doc["_id"]
+                        self._receive(doc)
+                    await asyncio.sleep(0.1)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["receive_errors"] += 1
+                logger.error(f"Notification backplane tail failed: {e}")
+            # Cursor died (empty collection or error): reopen shortly
+            await asyncio.sleep(1)
+
+
+class MongoChangeStreamBackplane(NotificationBackplane):
+    """
+    Pub/sub over a change stream (requires a replica set or Atlas).
+
+    Messages are inserted into notification_events (expired by TTL index);
+    workers watch the collection for inserts and resume from the last token
+    after a disconnect.
+    """
+
+    name = BackplaneType.MONGO_CHANGE_STREAM
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        super().__init__()
+        self.collection = db.notification_events
+        self._resume_token = None
+
+    async def start(self, handler: DeliveryHandler):
+        await super().start(handler)
+        await self.collection.create_index(
+            "created_at", expireAfterSeconds=NOTIFICATION_EVENT_TTL_SECONDS
+        )
+        self._task = asyncio.create_task(self._watch())
+
+    async def _forward(self, scope: str, target: Optional[str], text: str):
+        await self.collection.insert_one(self._envelope(scope, target, text))
+
+    async def _watch(self):
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        while True:
+            try:
+                async with self.collection.watch(pipeline, resume_after=self._resume_token) as stream:
+                    async for change in stream:
+                        self._resume_token = stream.resume_token
+                        self._receive(change["fullDocument"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["receive_errors"] += 1
+                logger.error(f"Notification backplane change stream failed: {e}")
+                await asyncio.sleep(1)
+
+
+def create_notification_backplane(
+    db: Optional[AsyncIOMotorDatabase] = None,
+    backend: Optional[str] = None
+) -> NotificationBackplane:
+    """
+    Build a backplane from configuration.
+
+    NOTIFICATION_BACKPLANE=local|mongo_capped|mongo_change_stream (default: local)
+    Run with a Mongo backplane whenever the API has more than one worker.
+    """
+    backend = backend or os.environ.get("NOTIFICATION_BACKPLANE", BackplaneType.LOCAL)
+    if db is not None:
+        if backend == BackplaneType.MONGO_CAPPED:
+            return MongoCappedBackplane(db)
+        if backend == BackplaneType.MONGO_CHANGE_STREAM:
+            return MongoChangeStreamBackplane(db)
+    if backend != BackplaneType.LOCAL:
+        logger.warning(f"Notification backplane '{backend}' unavailable; using local delivery")
+    return LocalBackplane()
@@ -18,8 +18,14 @@ from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import json
 
+from bson_dates import to_bson_date
+from time_series_rollups import time_series_rollups
+
 logger = logging.getLogger(__name__)
 
+# LLM-written insight after each saved step (one model call per save)
+ARRIS_ONBOARDING_INSIGHTS_ENABLED = os.environ.get("ARRIS_ONBOARDING_INSIGHTS_ENABLED", "false").lower() == "true"
+
 
 # ============== ONBOARDING STEPS CONFIGURATION ==============
 
@@ -506,7 +512,7 @@ class SmartOnboardingWizard:
         all_data: Dict
     ) -> Optional[Dict[str, Any]]:
         """Generate ARRIS AI insight based on step data"""
-        if not self.llm_client:
+        if not self.llm_client or not ARRIS_ONBOARDING_INSIGHTS_ENABLED:
             return None
         
         step_id = step["step_id"]
@@ -701,9 +707,10 @@ Provide a brief statement about how you'll help them based on these preferences.
             "importance": 0.9,
             "tags": ["onboarding", "profile", personalization.get("primary_goal", ""), personalization.get("primary_niche", "")],
             "recall_count": 0,
-            "created_at": now
+            "created_at": to_bson_date(now)
         }
         await self.db.arris_memories.insert_one(initial_memory)
+        await time_series_rollups.record("arris_memories", initial_memory)
         
         # Log completion event
         event = {
@@ -1358,9 +1365,10 @@ Provide a brief statement about how you'll help them based on these preferences.
             },
             "importance": 0.8,
             "tags": ["milestone", "badge", "onboarding"],
-            "created_at": now
+            "created_at": to_bson_date(now)
         }
         await self.db.arris_memories.insert_one(memory)
+        await time_series_rollups.record("arris_memories", memory)
     
     async def get_progress_timeline(self, creator_id: str) -> List[Dict[str, Any]]:
         """Get timeline of onboarding progress events"""
@@ -9,10 +9,10 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 import uuid
 import json
-import csv
-import io
 import hashlib
 
+from streaming_export import DocumentStream, csv_line, ndjson_line
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +25,8 @@ class PatternExportService:
     # Tier access configuration
     ALLOWED_TIERS = ["premium", "elite"]
     
+    CSV_FEEDBACK_HEADER = ["Feedback ID", "Pattern ID", "Helpful", "Feedback Text", "Created At"]
+    
     def __init__(self, db, feature_gating=None, pattern_insights_service=None):
         self.db = db
         self.feature_gating = feature_gating
@@ -118,6 +120,161 @@ class PatternExportService:
         if export_format not in ["json", "csv"]:
             return {"success": False, "error": "Invalid format. Supported: json, csv"}
         
+        filtered_data, export_metadata = await self._prepare_export(
+            creator_id, export_format, categories, confidence_level, date_range,
+            include_recommendations, include_trends, include_feedback
+        )
+        
+        # Generate export content
+        if export_format == "json":
+            export_content = await self._generate_json_export(filtered_data, export_metadata)
+        else:
+            export_content = await self._generate_csv_export(filtered_data, export_metadata)
+        
+        # Calculate checksum for data integrity
+        checksum = hashlib.sha256(export_content.encode()).hexdigest()[:16]
+        
+        # Log the export
+        await self._log_export(creator_id, export_metadata, checksum)
+        
+        return {
+            "success": True,
+            "export_id": export_metadata["export_id"],
+            "format": export_format,
+            "content": export_content,
+            "content_type": "application/json" if export_format == "json" else "text/csv",
+            "filename": f"pattern_export_{export_metadata['export_id']}.{export_format}",
+            "checksum": checksum,
+            "record_counts": export_metadata["record_counts"],
+            "exported_at": export_metadata["exported_at"]
+        }
+    
+    async def stream_patterns(
+        self,
+        creator_id: str,
+        export_format: str = "csv",
+        categories: List[str] = None,
+        confidence_level: str = "all",
+        date_range: str = "all",
+        include_recommendations: bool = True,
+        include_trends: bool = True,
+        include_feedback: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Streaming variant of export_patterns (CSV or NDJSON).
+        Returns the text pieces under "rows". Sections are fetched only as
+        the stream reaches them and feedback is read through a cursor, so
+        the first bytes go out before the data is loaded. Record counts
+        come last (CSV trailer / NDJSON end marker) and the export is
+        logged with its checksum once the last piece has been sent.
+        """
+        access = await self.has_access(creator_id)
+        if not access["has_access"]:
+            return {
+                "success": False,
+                "access_denied": True,
+                "upgrade_message": access["upgrade_message"],
+                "upgrade_url": access["upgrade_url"]
+            }
+        
+        if export_format not in ["csv", "ndjson"]:
+            return {"success": False, "error": "Invalid format. Supported for streaming: csv, ndjson"}
+        
+        export_metadata = self._export_metadata(
+            creator_id, export_format, categories, confidence_level, date_range,
+            include_recommendations, include_trends, include_feedback
+        )
+        pieces = self._stream_export_pieces(creator_id, export_metadata)
+        
+        return {
+            "success": True,
+            "export_id": export_metadata["export_id"],
+            "format": export_format,
+            "rows": self._logged_stream(pieces, creator_id, export_metadata)
+        }
+    
+    async def _stream_export_pieces(self, creator_id: str, metadata: Dict[str, Any]):
+        """Export sections in order, each gathered when the stream reaches it"""
+        filters = metadata["filters_applied"]
+        counts = metadata["record_counts"]
+        categories = filters["categories"]
+        as_csv = metadata["format"] == "csv"
+        
+        if as_csv:
+            yield "# PATTERN EXPORT\n"
+            yield f"# Export ID: {metadata['export_id']}\n"
+            yield f"# Exported At: {metadata['exported_at']}\n"
+            yield "\n"
+        else:
+            yield ndjson_line({"_export": {k: v for k, v in metadata.items() if k != "record_counts"}})
+        
+        patterns = self._filter_patterns(
+            await self._gather_patterns(creator_id), categories,
+            filters["confidence_level"], filters["date_range"]
+        )
+        counts["patterns"] = len(patterns)
+        for piece in (self._csv_patterns_section(patterns) if as_csv else self._ndjson_section("pattern", patterns)):
+            yield piece
+        
+        if filters["include_recommendations"]:
+            recommendations = self._filter_recommendations(await self._gather_recommendations(creator_id), categories)
+            counts["recommendations"] = len(recommendations)
+            for piece in (
+                self._csv_recommendations_section(recommendations) if as_csv
+                else self._ndjson_section("recommendation", recommendations)
+            ):
+                yield piece
+        
+        if filters["include_trends"]:
+            trends = self._filter_trends(await self._gather_trends(creator_id), categories)
+            counts["trends"] = len(trends)
+            for piece in (self._csv_trends_section(trends) if as_csv else self._ndjson_trends(trends)):
+                yield piece
+        
+        if filters["include_feedback"]:
+            feedback = DocumentStream(
+                self.db.pattern_feedback, {"creator_id": creator_id}, "created_at", {"_id": 0}, descending=False
+            )
+            async for entry in feedback:
+                if as_csv:
+                    if feedback.count == 1:
+                        yield "## FEEDBACK HISTORY\n"
+                        yield csv_line(self.CSV_FEEDBACK_HEADER)
+                    yield self._csv_feedback_line(entry)
+                else:
+                    yield ndjson_line({"record_type": "feedback", **entry})
+            counts["feedback_entries"] = feedback.count
+            if as_csv and feedback.count:
+                yield "\n"
+        
+        if as_csv:
+            yield f"# Total Patterns: {counts['patterns']}\n"
+            yield f"# Total Recommendations: {counts['recommendations']}\n"
+        else:
+            yield ndjson_line({"_export": {
+                "complete": True, "export_id": metadata["export_id"], "record_counts": counts
+            }})
+    
+    async def _logged_stream(self, pieces, creator_id: str, metadata: Dict[str, Any]):
+        """Pass pieces through, hashing them, and log the export at the end"""
+        digest = hashlib.sha256()
+        async for piece in pieces:
+            digest.update(piece.encode())
+            yield piece
+        await self._log_export(creator_id, metadata, digest.hexdigest()[:16])
+    
+    async def _prepare_export(
+        self,
+        creator_id: str,
+        export_format: str,
+        categories: List[str],
+        confidence_level: str,
+        date_range: str,
+        include_recommendations: bool,
+        include_trends: bool,
+        include_feedback: bool
+    ):
+        """Gather and filter pattern data; returns (filtered_data, export_metadata)"""
         # Gather all pattern data
         pattern_data = await self._gather_pattern_data(creator_id)
         
@@ -133,7 +290,32 @@ class PatternExportService:
         )
         
         # Add export metadata
-        export_metadata = {
+        export_metadata = self._export_metadata(
+            creator_id, export_format, categories, confidence_level, date_range,
+            include_recommendations, include_trends, include_feedback
+        )
+        export_metadata["record_counts"] = {
+            "patterns": len(filtered_data.get("patterns", [])),
+            "recommendations": len(filtered_data.get("recommendations", [])),
+            "trends": len(filtered_data.get("trends", {})),
+            "feedback_entries": len(filtered_data.get("feedback", []))
+        }
+        
+        return filtered_data, export_metadata
+    
+    def _export_metadata(
+        self,
+        creator_id: str,
+        export_format: str,
+        categories: List[str],
+        confidence_level: str,
+        date_range: str,
+        include_recommendations: bool,
+        include_trends: bool,
+        include_feedback: bool
+    ) -> Dict[str, Any]:
+        """Export metadata; record_counts start at zero and are filled in later"""
+        return {
             "export_id": f"EXP-{uuid.uuid4().hex[:8].upper()}",
             "exported_at": datetime.now(timezone.utc).isoformat(),
             "exported_by": creator_id,
@@ -146,36 +328,7 @@ class PatternExportService:
                 "include_trends": include_trends,
                 "include_feedback": include_feedback
             },
-            "record_counts": {
-                "patterns": len(filtered_data.get("patterns", [])),
-                "recommendations": len(filtered_data.get("recommendations", [])),
-                "trends": len(filtered_data.get("trends", {})),
-                "feedback_entries": len(filtered_data.get("feedback", []))
-            }
-        }
-        
-        # Generate export content
-        if export_format == "json":
-            export_content = await self._generate_json_export(filtered_data, export_metadata)
-        else:
-            export_content = await self._generate_csv_export(filtered_data, export_metadata)
-        
-        # Calculate checksum for data integrity
-        checksum = hashlib.sha256(export_content.encode()).hexdigest()[:16]
-        
-        # Log the export
-        await self._log_export(creator_id, export_metadata, checksum)
-        
-        return {
-            "success": True,
-            "export_id": export_metadata["export_id"],
-            "format": export_format,
-            "content": export_content,
-            "content_type": "application/json" if export_format == "json" else "text/csv",
-            "filename": f"pattern_export_{export_metadata['export_id']}.{export_format}",
-            "checksum": checksum,
-            "record_counts": export_metadata["record_counts"],
-            "exported_at": export_metadata["exported_at"]
+            "record_counts": {"patterns": 0, "recommendations": 0, "trends": 0, "feedback_entries": 0}
         }
     
     async def get_export_history(self, creator_id: str, limit: int = 20) -> Dict[str, Any]:
@@ -267,26 +420,31 @@ class PatternExportService:
     async def _gather_pattern_data(self, creator_id: str) -> Dict[str, Any]:
         """Gather all pattern-related data for a creator."""
         data = {
-            "patterns": [],
-            "recommendations": [],
-            "trends": {},
+            "patterns": await self._gather_patterns(creator_id),
+            "recommendations": await self._gather_recommendations(creator_id),
+            "trends": await self._gather_trends(creator_id),
             "feedback": []
         }
         
+        # Get feedback
+        feedback = await self.db.pattern_feedback.find(
+            {"creator_id": creator_id},
+            {"_id": 0}
+        ).to_list(100)
+        data["feedback"] = feedback
+        
+        return data
+    
+    async def _gather_patterns(self, creator_id: str) -> List[Dict[str, Any]]:
+        """Generated patterns merged with the creator's stored patterns."""
+        patterns = []
+        
         # Get patterns from the pattern insights service if available
         if self.pattern_insights_service:
             try:
                 patterns_result = await self.pattern_insights_service.get_creator_patterns(creator_id, limit=100)
                 if not patterns_result.get("access_denied"):
-                    data["patterns"] = patterns_result.get("patterns", [])
-                
-                recs_result = await self.pattern_insights_service.get_pattern_recommendations(creator_id)
-                if not recs_result.get("access_denied"):
-                    data["recommendations"] = recs_result.get("recommendations", [])
-                
-                trends_result = await self.pattern_insights_service.get_pattern_trends(creator_id, days=90)
-                if not trends_result.get("access_denied"):
-                    data["trends"] = trends_result.get("trends", {})
+                    patterns = patterns_result.get("patterns", [])
             except Exception as e:
                 logger.error(f"Error getting patterns from service: {e}")
         
@@ -297,19 +455,36 @@ class PatternExportService:
         ).to_list(100)
         
         # Merge stored patterns with generated ones
-        existing_ids = {p.get("pattern_id") for p in data["patterns"]}
+        existing_ids = {p.get("pattern_id") for p in patterns}
         for sp in stored_patterns:
             if sp.get("pattern_id") not in existing_ids:
-                data["patterns"].append(sp)
-        
-        # Get feedback
-        feedback = await self.db.pattern_feedback.find(
-            {"creator_id": creator_id},
-            {"_id": 0}
-        ).to_list(100)
-        data["feedback"] = feedback
+                patterns.append(sp)
         
-        return data
+        return patterns
+    
+    async def _gather_recommendations(self, creator_id: str) -> List[Dict[str, Any]]:
+        """Pattern recommendations from the pattern insights service."""
+        if not self.pattern_insights_service:
+            return []
+        try:
+            recs_result = await self.pattern_insights_service.get_pattern_recommendations(creator_id)
+            if not recs_result.get("access_denied"):
+                return recs_result.get("recommendations", [])
+        except Exception as e:
+            logger.error(f"Error getting recommendations from service: {e}")
+        return []
+    
+    async def _gather_trends(self, creator_id: str) -> Dict[str, Any]:
+        """90-day pattern trends from the pattern insights service."""
+        if not self.pattern_insights_service:
+            return {}
+        try:
+            trends_result = await self.pattern_insights_service.get_pattern_trends(creator_id, days=90)
+            if not trends_result.get("access_denied"):
+                return trends_result.get("trends", {})
+        except Exception as e:
+            logger.error(f"Error getting trends from service: {e}")
+        return {}
     
     async def _apply_filters(
         self,
@@ -324,9 +499,32 @@ class PatternExportService:
         """Apply filters to the pattern data."""
         filtered = {"patterns": [], "recommendations": [], "trends": {}, "feedback": []}
         
-        # Filter patterns
-        patterns = data.get("patterns", [])
+        filtered["patterns"] = self._filter_patterns(
+            data.get("patterns", []), categories, confidence_level, date_range
+        )
+        
+        # Include recommendations if requested
+        if include_recommendations:
+            filtered["recommendations"] = self._filter_recommendations(data.get("recommendations", []), categories)
         
+        # Include trends if requested
+        if include_trends:
+            filtered["trends"] = self._filter_trends(data.get("trends", {}), categories)
+        
+        # Include feedback if requested
+        if include_feedback:
+            filtered["feedback"] = data.get("feedback", [])
+        
+        return filtered
+    
+    def _filter_patterns(
+        self,
+        patterns: List[Dict[str, Any]],
+        categories: List[str],
+        confidence_level: str,
+        date_range: str
+    ) -> List[Dict[str, Any]]:
+        """Category, confidence and date filters for patterns."""
         # Category filter
         if categories and "all" not in categories:
             patterns = [p for p in patterns if p.get("category") in categories]
@@ -343,30 +541,19 @@ class PatternExportService:
                 if p.get("discovered_at", "") >= cutoff.isoformat()
             ]
         
-        filtered["patterns"] = patterns
-        
-        # Include recommendations if requested
-        if include_recommendations:
-            recs = data.get("recommendations", [])
-            # Filter recommendations to match pattern categories
-            if categories and "all" not in categories:
-                recs = [r for r in recs if r.get("category") in categories]
-            filtered["recommendations"] = recs
-        
-        # Include trends if requested
-        if include_trends:
-            trends = data.get("trends", {})
-            # Filter trends to match categories
-            if categories and "all" not in categories:
-                filtered["trends"] = {k: v for k, v in trends.items() if k in categories}
-            else:
-                filtered["trends"] = trends
-        
-        # Include feedback if requested
-        if include_feedback:
-            filtered["feedback"] = data.get("feedback", [])
-        
-        return filtered
+        return patterns
+    
+    def _filter_recommendations(self, recs: List[Dict[str, Any]], categories: List[str]) -> List[Dict[str, Any]]:
+        """Filter recommendations to match pattern categories."""
+        if categories and "all" not in categories:
+            return [r for r in recs if r.get("category") in categories]
+        return recs
+    
+    def _filter_trends(self, trends: Dict[str, Any], categories: List[str]) -> Dict[str, Any]:
+        """Filter trends to match categories."""
+        if categories and "all" not in categories:
+            return {k: v for k, v in trends.items() if k in categories}
+        return trends
     
     def _get_date_cutoff(self, date_range: str) -> datetime:
         """Get cutoff date for filtering."""
@@ -413,100 +600,114 @@ class PatternExportService:
         metadata: Dict[str, Any]
     ) -> str:
         """Generate CSV export content."""
-        output = io.StringIO()
-        
+        return "".join(self._csv_export_pieces(data, metadata))
+    
+    def _csv_export_pieces(self, data: Dict[str, Any], metadata: Dict[str, Any]):
+        """CSV export content, one line at a time."""
         # Write metadata section
-        output.write("# PATTERN EXPORT\n")
-        output.write(f"# Export ID: {metadata['export_id']}\n")
-        output.write(f"# Exported At: {metadata['exported_at']}\n")
-        output.write(f"# Total Patterns: {metadata['record_counts']['patterns']}\n")
-        output.write(f"# Total Recommendations: {metadata['record_counts']['recommendations']}\n")
-        output.write("\n")
-        
-        # Patterns section
-        patterns = data.get("patterns", [])
-        if patterns:
-            output.write("## PATTERNS\n")
-            pattern_writer = csv.writer(output)
-            pattern_writer.writerow([
-                "Pattern ID", "Category", "Title", "Description", 
-                "Confidence", "Confidence Level", "Actionable",
-                "Recommended Action", "Discovered At"
-            ])
-            
-            for p in patterns:
-                pattern_writer.writerow([
-                    p.get("pattern_id", ""),
-                    p.get("category", ""),
-                    p.get("title", ""),
-                    p.get("description", ""),
-                    f"{p.get('confidence', 0) * 100:.1f}%",
-                    p.get("confidence_level", ""),
-                    "Yes" if p.get("actionable") else "No",
-                    p.get("recommended_action", ""),
-                    p.get("discovered_at", "")
-                ])
-            
-            output.write("\n")
-        
-        # Recommendations section
-        recommendations = data.get("recommendations", [])
-        if recommendations:
-            output.write("## RECOMMENDATIONS\n")
-            rec_writer = csv.writer(output)
-            rec_writer.writerow([
-                "Recommendation ID", "Category", "Title", "Action",
-                "Impact", "Effort", "Priority"
-            ])
-            
-            for r in recommendations:
-                rec_writer.writerow([
-                    r.get("id", ""),
-                    r.get("category", ""),
-                    r.get("title", ""),
-                    r.get("action", ""),
-                    r.get("impact", ""),
-                    r.get("effort", ""),
-                    r.get("priority", "")
-                ])
-            
-            output.write("\n")
-        
-        # Trends summary section
-        trends = data.get("trends", {})
-        if trends:
-            output.write("## TRENDS SUMMARY\n")
-            trend_writer = csv.writer(output)
-            trend_writer.writerow(["Category", "Data Points", "Latest Confidence"])
-            
-            for category, trend_data in trends.items():
-                if trend_data:
-                    latest = trend_data[-1] if trend_data else {}
-                    trend_writer.writerow([
-                        category,
-                        len(trend_data),
-                        f"{latest.get('confidence', 0) * 100:.1f}%" if latest else "N/A"
-                    ])
-            
-            output.write("\n")
+        yield "# PATTERN EXPORT\n"
+        yield f"# Export ID: {metadata['export_id']}\n"
+        yield f"# Exported At: {metadata['exported_at']}\n"
+        yield f"# Total Patterns: {metadata['record_counts']['patterns']}\n"
+        yield f"# Total Recommendations: {metadata['record_counts']['recommendations']}\n"
+        yield "\n"
+        
+        yield from self._csv_patterns_section(data.get("patterns", []))
+        yield from self._csv_recommendations_section(data.get("recommendations", []))
+        yield from self._csv_trends_section(data.get("trends", {}))
         
         # Feedback section
         feedback = data.get("feedback", [])
         if feedback:
-            output.write("## FEEDBACK HISTORY\n")
-            fb_writer = csv.writer(output)
-            fb_writer.writerow(["Feedback ID", "Pattern ID", "Helpful", "Feedback Text", "Created At"])
+            yield "## FEEDBACK HISTORY\n"
+            yield csv_line(self.CSV_FEEDBACK_HEADER)
             
             for f in feedback:
-                fb_writer.writerow([
-                    f.get("id", ""),
-                    f.get("pattern_id", ""),
-                    "Yes" if f.get("is_helpful") else "No",
-                    f.get("feedback_text", ""),
-                    f.get("created_at", "")
+                yield self._csv_feedback_line(f)
+    
+    def _csv_patterns_section(self, patterns: List[Dict[str, Any]]):
+        """Patterns section"""
+        if not patterns:
+            return
+        yield "## PATTERNS\n"
+        yield csv_line([
+            "Pattern ID", "Category", "Title", "Description", 
+            "Confidence", "Confidence Level", "Actionable",
+            "Recommended Action", "Discovered At"
+        ])
+        
+        for p in patterns:
+            yield csv_line([
+                p.get("pattern_id", ""),
+                p.get("category", ""),
+                p.get("title", ""),
+                p.get("description", ""),
+                f"{p.get('confidence', 0) * 100:.1f}%",
+                p.get("confidence_level", ""),
+                "Yes" if p.get("actionable") else "No",
+                p.get("recommended_action", ""),
+                p.get("discovered_at", "")
+            ])
+        
+        yield "\n"
+    
+    def _csv_recommendations_section(self, recommendations: List[Dict[str, Any]]):
+        """Recommendations section"""
+        if not recommendations:
+            return
+        yield "## RECOMMENDATIONS\n"
+        yield csv_line([
+            "Recommendation ID", "Category", "Title", "Action",
+            "Impact", "Effort", "Priority"
+        ])
+        
+        for r in recommendations:
+            yield csv_line([
+                r.get("id", ""),
+                r.get("category", ""),
+                r.get("title", ""),
+                r.get("action", ""),
+                r.get("impact", ""),
+                r.get("effort", ""),
+                r.get("priority", "")
+            ])
+        
+        yield "\n"
+    
+    def _csv_trends_section(self, trends: Dict[str, Any]):
+        """Trends summary section"""
+        if not trends:
+            return
+        yield "## TRENDS SUMMARY\n"
+        yield csv_line(["Category", "Data Points", "Latest Confidence"])
+        
+        for category, trend_data in trends.items():
+            if trend_data:
+                latest = trend_data[-1] if trend_data else {}
+                yield csv_line([
+                    category,
+                    len(trend_data),
+                    f"{latest.get('confidence', 0) * 100:.1f}%" if latest else "N/A"
                 ])
         
-        return output.getvalue()
+        yield "\n"
+    
+    def _csv_feedback_line(self, f: Dict[str, Any]) -> str:
+        return csv_line([
+            f.get("id", ""),
+            f.get("pattern_id", ""),
+            "Yes" if f.get("is_helpful") else "No",
+            f.get("feedback_text", ""),
+            f.get("created_at", "")
+        ])
+    
+    def _ndjson_section(self, record_type: str, records: List[Dict[str, Any]]):
+        for record in records:
+            yield ndjson_line({"record_type": record_type, **record})
+    
+    def _ndjson_trends(self, trends: Dict[str, Any]):
+        for category, trend_data in trends.items():
+            yield ndjson_line({"record_type": "trend", "category": category, "points": trend_data})
     
     def _estimate_file_size(self, data: Dict[str, Any]) -> str:
         """Estimate the export file size."""
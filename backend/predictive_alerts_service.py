@@ -445,6 +445,43 @@ class PredictiveAlertsService:
             "notifications_sent": sent_count
         }
     
+    async def run_alert_checks(self, concurrency: int = 5) -> Dict[str, Any]:
+        """
+        Run trigger_alert_check for every active Pro+ creator.
+        Run periodically by the job scheduler.
+        """
+        creators = await self.db.creators.find(
+            {"status": {"$in": ["active", "approved"]}},
+            {"_id": 0, "id": 1}
+        ).to_list(10000)
+        creator_ids = [c["id"] for c in creators if c.get("id")]
+        
+        if self.feature_gating:
+            tiers = await self.feature_gating.get_tiers(creator_ids)
+            creator_ids = [
+                cid for cid in creator_ids
+                if getattr(tiers[cid][0], "value", tiers[cid][0]) in ["pro", "premium", "elite"]
+            ]
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def check(creator_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.trigger_alert_check(creator_id)
+                except Exception as e:
+                    logger.error(f"Alert check failed for {creator_id}: {e}")
+                    return {"success": False}
+        
+        results = await asyncio.gather(*(check(cid) for cid in creator_ids))
+        
+        return {
+            "creators_checked": len(creator_ids),
+            "alerts_generated": sum(r.get("alerts_generated", 0) for r in results),
+            "notifications_sent": sum(r.get("notifications_sent", 0) for r in results),
+            "errors": sum(1 for r in results if not r.get("success"))
+        }
+    
     # ============== PRIVATE ALERT CHECK METHODS ==============
     
     async def _check_timing_alerts(self, creator_id: str) -> List[Dict[str, Any]]:
@@ -0,0 +1,168 @@
+"""
+Principal Cache for Creators Hive HQ
+Resolves bearer tokens to the authenticated user without hitting MongoDB
+on every request
+
+This module implements:
+- PrincipalCache: token subject -> principal (user doc + tier + features)
+  with a short TTL, per process
+- Invalidation hooks for creator updates and subscription changes
+- Per-request memoization through request.state (see routes/dependencies.py)
+
+A principal looks like:
+    {
+        "user_type": "creator" | "admin",
+        "user_id": "...",
+        "email": "...",
+        "name": "...",
+        "data": {...},            # creators/admin_users doc without password
+        "tier": "pro",            # creators only (None for admins)
+        "features": {...}         # creators only
+    }
+
+Entries expire after PRINCIPAL_CACHE_TTL_SECONDS, which bounds staleness
+for changes made by other workers or code paths without an explicit hook.
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Any, Optional, Tuple
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from auth import decode_token
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = 10000
+
+
+class PrincipalCache:
+    """Short-TTL cache of resolved principals keyed by (user_type, token subject)"""
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        feature_gating=None,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS
+    ):
+        self.db = db
+        self.feature_gating = feature_gating
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._keys_by_user_id: Dict[str, Tuple[str, str]] = {}
+        self._metrics = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    # ============== RESOLUTION ==============
+
+    async def resolve(self, token: str, user_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resolve a bearer token to a principal.
+
+        Args:
+            token: JWT access token
+            user_type: "creator" or "admin" to force the lookup collection;
+                defaults to the role carried in the token
+
+        Raises:
+            HTTPException(401) for invalid tokens or unknown users
+        """
+        token_data = decode_token(token)
+        if token_data is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if user_type is None:
+            user_type = "creator" if token_data.role == "creator" else "admin"
+
+        key = (user_type, token_data.email)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._metrics["hits"] += 1
+            return self._copy(entry[1])
+
+        self._metrics["misses"] += 1
+        principal = await self._load(user_type, token_data.email)
+        if principal is None:
+            self._entries.pop(key, None)
+            detail = "Creator not found" if user_type == "creator" else "Admin not found"
+            raise HTTPException(status_code=401, detail=detail)
+
+        if len(self._entries) >= PRINCIPAL_CACHE_MAX_ENTRIES:
+            self._evict_expired()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+        self._keys_by_user_id[principal["user_id"]] = key
+        return self._copy(principal)
+
+    async def _load(self, user_type: str, email: str) -> Optional[Dict[str, Any]]:
+        collection = self.db.creators if user_type == "creator" else self.db.admin_users
+        doc = await collection.find_one({"email": email}, {"_id": 0, "hashed_password": 0})
+        if not doc:
+            return None
+
+        tier, features = None, None
+        if user_type == "creator" and self.feature_gating:
+            tier, features = await self.feature_gating.get_creator_tier(doc["id"])
+
+        return {
+            "user_type": user_type,
+            "user_id": doc["id"],
+            "email": doc["email"],
+            "name": doc.get("name"),
+            "data": doc,
+            "tier": tier,
+            "features": features,
+        }
+
+    @staticmethod
+    def _copy(principal: Dict[str, Any]) -> Dict[str, Any]:
+        # Handlers sometimes mutate the user doc; keep the cached one intact
+        return {**principal, "data": dict(principal["data"])}
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        if len(self._entries) >= PRINCIPAL_CACHE_MAX_ENTRIES:
+            self._entries.clear()
+        live_keys = set(self._entries)
+        self._keys_by_user_id = {u: k for u, k in self._keys_by_user_id.items() if k in live_keys}
+
+    # ============== INVALIDATION ==============
+
+    def invalidate_user(self, user_id: Optional[str] = None, email: Optional[str] = None):
+        """Drop cached principals for a user (by id and/or email)"""
+        if user_id:
+            key = self._keys_by_user_id.pop(user_id, None)
+            if key:
+                self._entries.pop(key, None)
+        if email:
+            for user_type in ("creator", "admin"):
+                self._entries.pop((user_type, email), None)
+        self._metrics["invalidations"] += 1
+
+    def invalidate_creator(self, creator_id: str):
+        """Hook for creator profile, status and subscription changes"""
+        self.invalidate_user(user_id=creator_id)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_user_id.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "entries": len(self._entries),
+            "hit_rate": round(self._metrics["hits"] / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Global principal cache instance (initialized in server.py startup)
+principal_cache = None
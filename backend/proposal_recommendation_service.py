@@ -31,9 +31,10 @@ class ProposalRecommendationService:
     - Platform-specific best practices
     """
     
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, llm_cache=None):
         self.db = db
         self.api_key = os.environ.get("EMERGENT_LLM_KEY")
+        self.llm_cache = llm_cache
         
     async def generate_rejection_recommendations(
         self,
@@ -254,8 +255,16 @@ Respond in JSON format with these exact keys:
                 system_message=system_message
             ).with_model("openai", "gpt-4o")
             
-            # Get response
-            response = await chat.send_message(UserMessage(text=context))
+            # Get response (identical rejections are served from the LLM cache)
+            if self.llm_cache:
+                response, _ = await self.llm_cache.get_or_generate(
+                    model="openai/gpt-4o",
+                    system_message=system_message,
+                    user_message=context,
+                    generate=lambda: chat.send_message(UserMessage(text=context))
+                )
+            else:
+                response = await chat.send_message(UserMessage(text=context))
             
             # Parse response
             recommendations = self._parse_recommendations_response(response)
@@ -0,0 +1,324 @@
+"""
+Rate Limiter for Creators Hive HQ
+Sliding-window rate limiting shared by API-key protected endpoints
+
+Backends:
+- memory: Per-process counters, zero round trips (single worker / tests)
+- mongo:  One atomic findOneAndUpdate per check on rate_limit_counters, so
+          limits hold across every uvicorn worker
+
+Algorithm:
+Sliding-window counter. Each window keeps the count for the current fixed
+bucket and the previous one; the effective usage is
+    current + previous * (1 - elapsed_fraction_of_current_bucket)
+which approximates a true sliding log without storing timestamps.
+
+Both backends consume on check: an allowed request is counted in the same
+operation that decides it. Rejections are rolled back so they don't count.
+Retry-After is the earliest moment the estimate leaves room for the
+request, and a denied key is rejected locally until then (no round trip).
+"""
+
+import os
+import math
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackendType:
+    """Available rate limit backends"""
+    MEMORY = "memory"
+    MONGO = "mongo"
+
+
+# A window is (name, limit, length in seconds)
+Window = Tuple[str, int, int]
+
+
+def _effective_usage(current: int, previous: int, bucket_start: int, window_seconds: int, now: float) -> float:
+    """Sliding-window estimate from two fixed buckets"""
+    elapsed_fraction = (now - bucket_start) / window_seconds
+    return current + previous * max(0.0, 1.0 - elapsed_fraction)
+
+
+def _rotate(counts: Dict[str, int], window_seconds: int, now: float) -> Tuple[int, int, int]:
+    """(cur, prev, start) of a window's counters as of `now` (buckets roll over)"""
+    bucket = int(now // window_seconds) * window_seconds
+    start = counts.get("start", bucket)
+    if start == bucket:
+        return counts.get("cur", 0), counts.get("prev", 0), start
+    if start == bucket - window_seconds:
+        return 0, counts.get("cur", 0), bucket
+    return 0, 0, bucket
+
+
+def _retry_at(limit: int, window_seconds: int, cur: int, prev: int, start: int, cost: int, now: float) -> float:
+    """
+    Earliest time at which prev * (1 - f) + cur + cost <= limit, assuming no
+    further traffic. The estimate only decays, so a client retrying then is
+    admitted (unless others consumed the room meanwhile).
+    """
+    if cur + cost <= limit:
+        if prev <= 0:
+            return now
+        # Still in this bucket: wait for the previous bucket's share to decay
+        fraction = 1.0 - (limit - cost - cur) / prev
+        return max(now, start + window_seconds * fraction)
+    if cost > limit:
+        return start + 2 * window_seconds
+    # Only the next bucket has room: `cur` becomes its decaying previous count
+    fraction = 1.0 - (limit - cost) / cur
+    return max(now, start + window_seconds * (1.0 + fraction))
+
+
+def _window_states(windows: List[Window], counts: Dict[str, Dict[str, int]], now: float) -> Dict[str, Dict[str, Any]]:
+    """Per-window limit/used/remaining/reset for the given counters"""
+    state = {}
+    for name, limit, seconds in windows:
+        cur, prev, start = _rotate(counts.get(name, {}), seconds, now)
+        used = int(round(_effective_usage(cur, prev, start, seconds, now)))
+        state[name] = {
+            "limit": limit,
+            "window": seconds,
+            "used": used,
+            "remaining": max(0, limit - used),
+            "reset": int(start + seconds),
+        }
+    return state
+
+
+def _evaluate(
+    windows: List[Window],
+    counts: Dict[str, Dict[str, int]],
+    now: float,
+    cost: int = 1
+) -> Dict[str, Any]:
+    """
+    Decide a request against every window.
+
+    Args:
+        windows: Windows to enforce
+        counts: {window_name: {"cur": int, "prev": int, "start": int}} after consumption
+        now: Current unix time
+        cost: Units consumed by this request (rolled back when denied)
+
+    Returns:
+        Decision dict with allowed flag, retry_after, per-window state and the
+        counters excluding this request (used to refresh cached denials)
+    """
+    allowed = True
+    for name, limit, seconds in windows:
+        cur, prev, start = _rotate(counts.get(name, {}), seconds, now)
+        if _effective_usage(cur, prev, start, seconds, now) > limit:
+            allowed = False
+
+    if allowed:
+        return {
+            "allowed": True,
+            "retry_after": 0,
+            "violated_window": None,
+            "windows": _window_states(windows, counts, now),
+        }
+
+    # Denied requests are not counted
+    base = {
+        name: {**counts.get(name, {}), "cur": counts.get(name, {}).get("cur", 0) - cost}
+        for name, _, _ in windows
+    }
+    wait = 0.0
+    violated = None
+    for name, limit, seconds in windows:
+        cur, prev, start = _rotate(base[name], seconds, now)
+        window_wait = _retry_at(limit, seconds, cur, prev, start, cost, now) - now
+        if violated is None or window_wait > wait:
+            wait = window_wait
+            violated = name
+
+    return {
+        "allowed": False,
+        "retry_after": max(1, math.ceil(wait)),
+        "violated_window": violated,
+        "windows": _window_states(windows, base, now),
+        "counts": base,
+    }
+
+
+class InMemoryRateLimitBackend:
+    """Per-process sliding-window counters (no I/O)"""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    async def hit(self, key: str, windows: List[Window], cost: int = 1) -> Dict[str, Any]:
+        now = time.time()
+        entry = self._counters.setdefault(key, {})
+
+        for name, _, seconds in windows:
+            bucket = int(now // seconds) * seconds
+            c = entry.get(name)
+            if c is None or c["start"] < bucket - seconds:
+                entry[name] = {"start": bucket, "cur": 0, "prev": 0}
+            elif c["start"] < bucket:
+                entry[name] = {"start": bucket, "cur": 0, "prev": c["cur"]}
+            entry[name]["cur"] += cost
+
+        decision = _evaluate(windows, entry, now, cost)
+        if not decision["allowed"]:
+            for name, _, _ in windows:
+                entry[name]["cur"] -= cost
+        return decision
+
+    async def reset(self, key: str):
+        self._counters.pop(key, None)
+
+
+class MongoRateLimitBackend:
+    """
+    Shared sliding-window counters stored in rate_limit_counters.
+
+    One document per key holds {window: {start, cur, prev}} for every window.
+    Bucket rotation and the increment happen in a single pipeline update.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.rate_limit_counters
+
+    async def initialize(self):
+        # Idle keys disappear once every window has rolled over twice
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def _update_pipeline(self, windows: List[Window], cost: int, now: float) -> List[Dict[str, Any]]:
+        fields: Dict[str, Any] = {}
+        longest = max(seconds for _, _, seconds in windows)
+
+        for name, _, seconds in windows:
+            bucket = int(now // seconds) * seconds
+            start_path = f"${name}.start"
+            cur_path = f"${name}.cur"
+            same_bucket = {"$eq": [start_path, bucket]}
+            previous_bucket = {"$eq": [start_path, bucket - seconds]}
+            fields[name] = {
+                "start": bucket,
+                "cur": {"$cond": [same_bucket, {"$add": [{"$ifNull": [cur_path, 0]}, cost]}, cost]},
+                "prev": {"$cond": [
+                    same_bucket,
+                    {"$ifNull": [f"${name}.prev", 0]},
+                    {"$cond": [previous_bucket, {"$ifNull": [cur_path, 0]}, 0]}
+                ]},
+            }
+
+        fields["expires_at"] = datetime.now(timezone.utc) + timedelta(seconds=2 * longest)
+        return [{"$set": fields}]
+
+    async def hit(self, key: str, windows: List[Window], cost: int = 1) -> Dict[str, Any]:
+        now = time.time()
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            self._update_pipeline(windows, cost, now),
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+        decision = _evaluate(windows, doc or {}, now, cost)
+        if not decision["allowed"]:
+            # Roll back the rejected request (only happens on the deny path)
+            await self.collection.update_one(
+                {"_id": key},
+                {"$inc": {f"{name}.cur": -cost for name, _, _ in windows}}
+            )
+        return decision
+
+    async def reset(self, key: str):
+        await self.collection.delete_one({"_id": key})
+
+
+class RateLimiter:
+    """
+    Rate limiter facade with a local deny cache.
+
+    Usage:
+        decision = await limiter.hit("arris_api:APIKEY-123", windows)
+        headers = limiter.headers(decision)
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        # key -> (retry time, cost, windows, denial)
+        self._blocked_until: Dict[str, Tuple[float, int, List[Window], Dict[str, Any]]] = {}
+
+    async def initialize(self):
+        """Prepare backend storage (indexes) if the backend needs it"""
+        if hasattr(self.backend, "initialize"):
+            await self.backend.initialize()
+
+    async def hit(self, key: str, windows: List[Window], cost: int = 1) -> Dict[str, Any]:
+        """Check and consume `cost` units for `key` against every window"""
+        blocked = self._blocked_until.get(key)
+        if blocked:
+            until, blocked_cost, blocked_windows, decision = blocked
+            now = time.time()
+            if now < until and cost >= blocked_cost and blocked_windows == windows:
+                # Same denial, answered locally with the window state as of now
+                return {
+                    **decision,
+                    "retry_after": max(1, math.ceil(until - now)),
+                    "windows": _window_states(windows, decision["counts"], now),
+                }
+            del self._blocked_until[key]
+
+        decision = await self.backend.hit(key, windows, cost)
+        if not decision["allowed"]:
+            # Nothing can be admitted before retry_after: answer locally until then
+            self._blocked_until[key] = (time.time() + decision["retry_after"], cost, windows, decision)
+        return decision
+
+    async def reset(self, key: str):
+        self._blocked_until.pop(key, None)
+        await self.backend.reset(key)
+
+    @staticmethod
+    def headers(decision: Dict[str, Any], primary_window: Optional[str] = None) -> Dict[str, str]:
+        """
+        Standard rate limit headers for a decision.
+
+        X-RateLimit-* describe the tightest window (or `primary_window`);
+        Retry-After is only present on rejected requests.
+        """
+        windows = decision.get("windows", {})
+        if not windows:
+            return {}
+
+        name = primary_window if primary_window in windows else (
+            decision.get("violated_window") or min(windows, key=lambda w: windows[w]["remaining"])
+        )
+        w = windows[name]
+        headers = {
+            "X-RateLimit-Limit": str(w["limit"]),
+            "X-RateLimit-Remaining": str(w["remaining"]),
+            "X-RateLimit-Reset": str(w["reset"]),
+            "X-RateLimit-Policy": ", ".join(f"{v['limit']};w={v['window']}" for v in windows.values()),
+        }
+        if not decision.get("allowed", True):
+            headers["Retry-After"] = str(decision.get("retry_after", 60))
+        return headers
+
+
+def create_rate_limiter(db: Optional[AsyncIOMotorDatabase] = None, backend: Optional[str] = None) -> RateLimiter:
+    """
+    Build a rate limiter from configuration.
+
+    RATE_LIMIT_BACKEND=memory|mongo (default: mongo when a database is given)
+    """
+    backend = backend or os.environ.get("RATE_LIMIT_BACKEND", RateLimitBackendType.MONGO)
+    if backend == RateLimitBackendType.MONGO and db is not None:
+        return RateLimiter(MongoRateLimitBackend(db))
+    if backend == RateLimitBackendType.MONGO:
+        logger.warning("Mongo rate limit backend requested without a database; using in-memory backend")
+    return RateLimiter(InMemoryRateLimitBackend())
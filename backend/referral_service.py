@@ -18,6 +18,8 @@ import logging
 import hashlib
 import secrets
 import string
+from dashboard_counters import dashboard_counters
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -517,6 +519,8 @@ class ReferralService:
         }
 
         await self.db.calculator.insert_one(calc_entry)
+        await dashboard_counters.record_calculator_entry(calc_entry)
+        await time_series_rollups.record("calculator", calc_entry)
         logger.info(f"Recorded referral commission ${commission_amount} for creator {referrer_id}")
 
     async def get_creator_commissions(
@@ -2,7 +2,8 @@
 Admin Routes
 ============
 Admin-only endpoints for system management.
-Includes: Escalation, Lifecycle, Waitlist management.
+Includes: Escalation, Lifecycle, Waitlist management, Scheduled jobs, Indexes, Date migration,
+Time-series rollups.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
@@ -11,6 +12,8 @@ from datetime import datetime, timezone
 import logging
 
 from routes.dependencies import security, get_db, get_service, verify_admin
+from index_registry import index_registry
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -170,12 +173,15 @@ async def run_escalation_scan(
     """
     Manually trigger a full escalation scan.
     Scans all proposals for escalation needs and auto-escalates as needed.
+    The scan is queued on the job scheduler (it also runs hourly there);
+    returns the run id, follow it in /admin/jobs/history.
     Admin only endpoint.
     """
     await verify_admin(credentials)
     
-    auto_escalation_service = get_service("auto_escalation")
-    result = await auto_escalation_service.scan_all_proposals()
+    result = await get_service("job_scheduler").run_now("escalation_scan")
+    if not result["success"]:
+        raise HTTPException(status_code=409, detail=result["error"])
     return result
 
 
@@ -231,6 +237,7 @@ async def get_lifecycle_stats(
 @router.get("/lifecycle/at-risk")
 async def get_at_risk_subscriptions(
     limit: int = Query(default=20, le=100),
+    offset: int = Query(default=0, ge=0),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
@@ -240,7 +247,7 @@ async def get_at_risk_subscriptions(
     await verify_admin(credentials)
     
     subscription_lifecycle_service = get_service("subscription_lifecycle")
-    result = await subscription_lifecycle_service.get_at_risk_subscriptions(limit=limit)
+    result = await subscription_lifecycle_service.get_at_risk_subscriptions(limit=limit, offset=offset)
     return result
 
 
@@ -359,3 +366,137 @@ async def remove_from_waitlist(
         raise HTTPException(status_code=404, detail="Entry not found")
     
     return {"success": True, "message": f"Removed {email} from waitlist"}
+
+
+# ============== SCHEDULED JOBS ==============
+
+@router.get("/jobs")
+async def get_scheduled_jobs(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    List scheduled jobs with their schedule, next run and last outcome.
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    job_scheduler = get_service("job_scheduler")
+    jobs = await job_scheduler.get_jobs()
+    return {"jobs": jobs, "worker_id": job_scheduler.worker_id}
+
+
+@router.get("/jobs/history")
+async def get_job_history(
+    job_name: str = Query(default=None, description="Filter by job"),
+    limit: int = Query(default=50, le=200),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Get recent job runs (status, duration, attempts, result summary).
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    runs = await get_service("job_scheduler").get_history(name=job_name, limit=limit)
+    return {"runs": runs, "total": len(runs)}
+
+
+@router.post("/jobs/{job_name}/run")
+async def run_scheduled_job(
+    job_name: str,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Run a scheduled job now, in the background.
+    Returns the run id; follow it in /admin/jobs/history.
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    job_scheduler = get_service("job_scheduler")
+    if job_name not in job_scheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_name}'")
+    
+    result = await job_scheduler.run_now(job_name)
+    if not result["success"]:
+        raise HTTPException(status_code=409, detail=result["error"])
+    return result
+
+
+# ============== DATABASE INDEXES ==============
+
+@router.get("/indexes")
+async def get_index_report(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Declared indexes and the drift report from the last apply
+    (created / drifted / unregistered / failed).
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    return {
+        "declared": [spec.describe() for spec in index_registry.specs.values()],
+        "report": index_registry.last_report
+    }
+
+
+@router.post("/indexes/apply")
+async def apply_indexes(
+    rebuild_drifted: bool = Query(default=False, description="Drop and rebuild drifted indexes"),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Create missing registered indexes now and return the drift report.
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    return await index_registry.apply(get_db(), rebuild_drifted=rebuild_drifted)
+
+
+@router.get("/indexes/query-plans")
+async def check_query_plans(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    explain() every registered hot query shape and flag COLLSCAN plans.
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    return await index_registry.check_query_plans(get_db())
+
+
+# ============== DATE MIGRATION ==============
+
+@router.get("/date-migration")
+async def get_date_migration_status(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Progress of the ISO-string to BSON date migration: string values left
+    per registered field, documents converted and completed passes.
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    return await get_service("date_migration").get_status()
+
+
+# ============== TIME-SERIES ROLLUPS ==============
+
+@router.get("/rollups")
+async def get_rollup_status(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Rollup series status: built / rebuilding, compacted-through date and
+    bucket counts per granularity. Rebuilds and compactions run as the
+    ts_rollup_rebuild / ts_rollup_compaction jobs.
+    Admin only endpoint.
+    """
+    await verify_admin(credentials)
+    
+    return await time_series_rollups.get_status()
@@ -7,19 +7,22 @@ Handles admin and creator authentication endpoints.
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import HTTPAuthorizationCredentials
 from datetime import datetime, timezone
+from pymongo.errors import DuplicateKeyError
 import logging
 
 from routes.dependencies import security, get_db, get_service
 from auth import (
     AdminUserCreate, AdminUserLogin, Token,
     create_admin_user, login_user, get_current_user,
-    get_password_hash, verify_password
+    get_password_hash_async
 )
 from models_creator import (
     CreatorRegistration, CreatorRegistrationCreate, CreatorRegistrationResponse,
     PLATFORM_OPTIONS, NICHE_OPTIONS, ARRIS_INTAKE_QUESTIONS
 )
 from webhook_service import WebhookEventType
+from dashboard_counters import dashboard_counters
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -97,16 +100,28 @@ async def register_creator(registration: CreatorRegistrationCreate):
     referral_code = registration_data.pop("referral_code", None)
     
     creator = CreatorRegistration(**registration_data)
-    creator.hashed_password = get_password_hash(password)
+    creator.hashed_password = await get_password_hash_async(password)
+    if referral_code:
+        creator.referred_by_code = referral_code
+    
+    doc = creator.model_dump()
+    doc['submitted_at'] = doc['submitted_at'].isoformat()
+    
+    # The unique email index settles concurrent registrations of the same
+    # address; insert before tracking the referral so a loser leaves nothing behind
+    try:
+        await db.creators.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=400, 
+            detail="This email is already registered. Please use a different email or contact support."
+        )
     
     # Track referral if code provided
     referral_result = None
-    referral_service = get_service("referral") if "referral" in str(get_service.__doc__) else None
-    
     try:
         referral_service = get_service("referral")
         if referral_code and referral_service:
-            creator.referred_by_code = referral_code
             referral_result = await referral_service.create_referral(
                 referral_code=referral_code,
                 referred_creator_id=creator.id,
@@ -114,15 +129,11 @@ async def register_creator(registration: CreatorRegistrationCreate):
             )
             if referral_result.get("success"):
                 creator.referral_id = referral_result.get("referral_id")
+                await db.creators.update_one({"id": creator.id}, {"$set": {"referral_id": creator.referral_id}})
                 logger.info(f"Referral tracked for creator {creator.id} via code {referral_code}")
     except HTTPException:
         pass  # Referral service not available
     
-    doc = creator.model_dump()
-    doc['submitted_at'] = doc['submitted_at'].isoformat()
-    
-    await db.creators.insert_one(doc)
-    
     # Log to ARRIS usage for pattern analysis
     arris_log = {
         "id": f"ARRIS-REG-{creator.id}",
@@ -140,6 +151,8 @@ async def register_creator(registration: CreatorRegistrationCreate):
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
     await db.arris_usage_log.insert_one(arris_log)
+    await dashboard_counters.record_arris_usage(arris_log)
+    await time_series_rollups.record("arris_usage_log", arris_log)
     
     # WEBHOOK: Emit creator registered event
     try:
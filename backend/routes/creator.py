@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 import logging
 
 from routes.dependencies import security, get_db, get_service, verify_creator
+from streaming_export import export_stream_response
 
 logger = logging.getLogger(__name__)
 
@@ -185,17 +186,21 @@ async def get_pattern_export_preview(
 
 @router.post("/pattern-export")
 async def export_patterns(
-    export_format: str = Query(default="json", description="Export format: json or csv"),
+    export_format: str = Query(default="json", description="Export format: json or csv; streaming sends json as ndjson"),
     categories: str = Query(default=None, description="Comma-separated categories to filter"),
     confidence_level: str = Query(default="all"),
     date_range: str = Query(default="all"),
     include_recommendations: bool = Query(default=True),
     include_trends: bool = Query(default=True),
     include_feedback: bool = Query(default=False),
+    stream: bool = Query(default=False, description="Stream the file as a download (csv or ndjson)"),
+    gzip: bool = Query(default=False, description="Gzip the streamed file"),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Export pattern analysis data in JSON or CSV format.
+    With stream=true the file is sent as a chunked download instead of
+    being embedded in the JSON response.
     Feature-gated: Requires Premium tier or higher.
     """
     db = get_db()
@@ -205,8 +210,13 @@ async def export_patterns(
     # Parse categories
     category_list = categories.split(",") if categories else None
     
+    # A streamed download is line-delimited; json becomes ndjson
+    if stream and export_format == "json":
+        export_format = "ndjson"
+    
     pattern_export_service = get_service("pattern_export")
-    result = await pattern_export_service.export_patterns(
+    export = pattern_export_service.stream_patterns if stream else pattern_export_service.export_patterns
+    result = await export(
         creator_id=creator_id,
         export_format=export_format,
         categories=category_list,
@@ -227,6 +237,11 @@ async def export_patterns(
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Export failed"))
     
+    if stream:
+        return export_stream_response(
+            result["rows"], export_format, f"pattern_export_{result['export_id']}", gzip=gzip
+        )
+    
     return result
 
 
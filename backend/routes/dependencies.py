@@ -5,7 +5,7 @@ Shared dependencies, utilities, and helpers for route handlers.
 This module is imported by all route modules to access shared resources.
 """
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Dict, Any, Optional
 
@@ -48,6 +48,11 @@ services = {
     "auto_escalation": None,
     "webhook": None,
     "email": None,
+    "memory_search_index": None,
+    "creator_metrics": None,
+    "principal_cache": None,
+    "job_scheduler": None,
+    "date_migration": None,
 }
 
 
@@ -107,3 +112,34 @@ async def verify_creator(credentials: HTTPAuthorizationCredentials = Depends(sec
     """Verify creator authentication and return creator data."""
     from auth import get_current_creator
     return await get_current_creator(credentials, get_db())
+
+
+async def get_current_principal(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """
+    Resolve the authenticated principal (user doc + tier + features) once per
+    request. Backed by the principal cache, so repeat requests within its TTL
+    need no Mongo round trips.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is None:
+        principal = await get_service("principal_cache").resolve(credentials.credentials)
+        request.state.principal = principal
+    return principal
+
+
+async def get_current_creator_principal(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """
+    Creator-only variant of get_current_principal. The token is always looked
+    up as a creator, so admin tokens get a 401 as with auth.get_current_creator.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is None or principal["user_type"] != "creator":
+        principal = await get_service("principal_cache").resolve(credentials.credentials, user_type="creator")
+        request.state.principal = principal
+    return principal
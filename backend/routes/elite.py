@@ -12,7 +12,8 @@ Elite tier feature endpoints including:
 - Multi-Brand Management
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
@@ -983,8 +984,15 @@ async def get_api_history(
 # ============== ARRIS API SPECIAL AUTH ENDPOINTS ==============
 # These endpoints use X-ARRIS-API-Key header authentication instead of Bearer token
 
-async def validate_arris_api_key(request: Request) -> Dict[str, Any]:
-    """Validate ARRIS API key from header."""
+async def validate_arris_api_key(
+    request: Request,
+    response: Optional[Response] = None,
+    cost: int = 1
+) -> Dict[str, Any]:
+    """
+    Validate ARRIS API key from header and consume `cost` rate-limit units.
+    Sets Retry-After / X-RateLimit-* headers on the 429 error or on `response`.
+    """
     api_key = request.headers.get("X-ARRIS-API-Key")
     if not api_key:
         raise HTTPException(
@@ -993,29 +1001,33 @@ async def validate_arris_api_key(request: Request) -> Dict[str, Any]:
         )
     
     arris_api_service = get_service("arris_api")
-    result = await arris_api_service.validate_api_key(api_key)
+    result = await arris_api_service.validate_api_key(api_key, cost=cost)
     
     if not result.get("valid"):
         status_code = 429 if result.get("rate_limited") else 401
         raise HTTPException(
             status_code=status_code,
             detail=result.get("error"),
-            headers={"Retry-After": str(result.get("retry_after", 60))} if result.get("rate_limited") else None
+            headers=result.get("rate_limit_headers") if result.get("rate_limited") else None
         )
     
+    if response is not None:
+        response.headers.update(result.get("rate_limit_headers", {}))
+    
     return result
 
 
 @router.post("/arris-api/analyze")
 async def api_analyze_text(
     request: Request,
+    response: Response,
     body: Dict[str, Any]
 ):
     """
     Analyze text content using ARRIS.
     Requires X-ARRIS-API-Key header.
     """
-    auth = await validate_arris_api_key(request)
+    auth = await validate_arris_api_key(request, response)
     
     text = body.get("text")
     if not text:
@@ -1039,13 +1051,14 @@ async def api_analyze_text(
 @router.post("/arris-api/insights")
 async def api_generate_insights(
     request: Request,
+    response: Response,
     body: Dict[str, Any]
 ):
     """
     Generate proposal insights using ARRIS.
     Requires X-ARRIS-API-Key header.
     """
-    auth = await validate_arris_api_key(request)
+    auth = await validate_arris_api_key(request, response)
     
     title = body.get("title")
     description = body.get("description")
@@ -1072,13 +1085,14 @@ async def api_generate_insights(
 @router.post("/arris-api/content")
 async def api_content_suggestions(
     request: Request,
+    response: Response,
     body: Dict[str, Any]
 ):
     """
     Generate content suggestions using ARRIS.
     Requires X-ARRIS-API-Key header.
     """
-    auth = await validate_arris_api_key(request)
+    auth = await validate_arris_api_key(request, response)
     
     topic = body.get("topic")
     if not topic:
@@ -1103,19 +1117,45 @@ async def api_content_suggestions(
 @router.post("/arris-api/chat")
 async def api_chat(
     request: Request,
-    body: Dict[str, Any]
+    response: Response,
+    body: Dict[str, Any],
+    stream: bool = Query(default=False, description="Stream tokens as Server-Sent Events")
 ):
     """
     Chat with ARRIS using creator's persona.
     Requires X-ARRIS-API-Key header.
+    
+    With ?stream=true the response is text/event-stream: a "start" event,
+    "token" events as text is generated, then "complete" (or "error").
+    Start/complete events are mirrored to the creator's WebSocket connections.
+    The "start" event's streaming flag is false when no token source is
+    configured; the reply then arrives as one "token" event.
     """
-    auth = await validate_arris_api_key(request)
+    auth = await validate_arris_api_key(request, response)
     
     message = body.get("message")
     if not message:
         raise HTTPException(status_code=400, detail="'message' field is required")
     
     arris_api_service = get_service("arris_api")
+    
+    if stream:
+        from arris_streaming import sse_event_stream, SSE_HEADERS
+        from websocket_service import ws_manager
+        
+        events = arris_api_service.stream_chat_with_arris(
+            creator_id=auth["creator_id"],
+            key_id=auth["key_id"],
+            message=message,
+            conversation_id=body.get("conversation_id"),
+            persona_id=body.get("persona_id")
+        )
+        return StreamingResponse(
+            sse_event_stream(events, ws_manager=ws_manager, user_id=auth["creator_id"]),
+            media_type="text/event-stream",
+            headers={**SSE_HEADERS, **dict(response.headers)}
+        )
+    
     result = await arris_api_service.chat_with_arris(
         creator_id=auth["creator_id"],
         key_id=auth["key_id"],
@@ -1133,6 +1173,7 @@ async def api_chat(
 @router.post("/arris-api/batch")
 async def api_batch_analyze(
     request: Request,
+    response: Response,
     body: Dict[str, Any]
 ):
     """
@@ -1141,9 +1182,10 @@ async def api_batch_analyze(
     """
     from arris_api_service import RATE_LIMITS
     
-    auth = await validate_arris_api_key(request)
-    
     items = body.get("items")
+    batch_cost = min(len(items), RATE_LIMITS["max_batch_size"]) if isinstance(items, list) and items else 1
+    auth = await validate_arris_api_key(request, response, cost=batch_cost)
+    
     if not items or not isinstance(items, list):
         raise HTTPException(status_code=400, detail="'items' array is required")
     
@@ -12,6 +12,7 @@ import logging
 import random
 
 from routes.dependencies import security, get_db, get_service
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -234,7 +235,8 @@ async def delete_proposal(
     db = get_db()
     auth_user = await get_any_authenticated_user(credentials, db)
     
-    proposal = await db.proposals.find_one({"id": proposal_id}, {"_id": 0})
+    # _id included: rollups read the insert day from it
+    proposal = await db.proposals.find_one({"id": proposal_id})
     
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
@@ -246,7 +248,9 @@ async def delete_proposal(
         if proposal.get("status") != "draft":
             raise HTTPException(status_code=400, detail="Can only delete draft proposals")
     
-    await db.proposals.delete_one({"id": proposal_id})
+    result = await db.proposals.delete_one({"id": proposal_id})
+    if result.deleted_count:
+        await time_series_rollups.forget("proposals", [proposal])
     
     return {"success": True, "message": "Proposal deleted"}
 
@@ -11,6 +11,8 @@ from typing import Dict, Any, List, Optional
 import logging
 
 from routes.dependencies import security, get_db, get_service
+from dashboard_counters import dashboard_counters
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -441,6 +443,8 @@ async def create_subscription(request: Request):
         calc_doc['created_at'] = calc_doc['created_at'].isoformat()
         calc_doc['updated_at'] = calc_doc['updated_at'].isoformat()
         await db.calculator.insert_one(calc_doc)
+        await dashboard_counters.record_calculator_entry(calc_doc)
+        await time_series_rollups.record("calculator", calc_doc)
         sub_obj.linked_calc_id = calc_entry.id
     
     doc = sub_obj.model_dump()
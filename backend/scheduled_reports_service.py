@@ -19,14 +19,29 @@ Features:
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from enum import Enum
+import asyncio
 import logging
 import secrets
 import json
+from pymongo.errors import DuplicateKeyError
+
+from index_registry import index_registry
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
+# One claim per creator and report period; keeps re-runs from sending twice
+REPORT_CLAIM_TTL_DAYS = 35
+# Runs (the scheduled one included) a failed report gets within its period
+REPORT_MAX_ATTEMPTS = 3
+index_registry.register(
+    "scheduled_report_claims", "claimed_at",
+    ttl_seconds=REPORT_CLAIM_TTL_DAYS * 86400, owner="scheduled_reports"
+)
+index_registry.register("scheduled_report_claims", [("status", 1), ("period", 1)], owner="scheduled_reports")
+
 
 class ReportFrequency(str, Enum):
     DAILY = "daily"
@@ -178,14 +193,7 @@ class ScheduledReportsService:
         topics = settings.get("topics", DEFAULT_REPORT_CONFIG["topics"])
 
         # Determine date range
-        if report_type == "daily":
-            start_date = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            period_label = "Yesterday"
-        else:  # weekly
-            start_date = (now - timedelta(days=7)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            period_label = "This Week"
+        start_date, end_date, period_label = self._report_period(report_type, now)
 
         # Create report record
         report_doc = {
@@ -195,6 +203,7 @@ class ScheduledReportsService:
             "creator_email": creator.get("email"),
             "report_type": report_type,
             "period_label": period_label,
+            "period_key": self._period_key(report_type, start_date),
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
             "topics": topics,
@@ -577,24 +586,29 @@ class ScheduledReportsService:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Generate engagement trends section."""
-        # Daily activity counts
-        daily_pipeline = [
-            {
-                "$match": {
-                    "user_id": creator_id,
-                    "timestamp": {"$gte": start_date.isoformat(), "$lt": end_date.isoformat()}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {"$substr": ["$timestamp", 0, 10]},
-                    "count": {"$sum": 1}
-                }
-            },
-            {"$sort": {"_id": 1}}
-        ]
-
-        daily_activity = await self.db.arris_usage_log.aggregate(daily_pipeline).to_list(30)
+        # Daily activity counts (rollup buckets; raw usage log until they are built)
+        buckets = await time_series_rollups.query(
+            "arris_usage", creator_id, start=start_date, end=end_date, granularity="day"
+        )
+        if buckets is not None:
+            daily_activity = [{"_id": b["date"], "count": b["count"]} for b in buckets[:30]]
+        else:
+            daily_pipeline = [
+                {
+                    "$match": {
+                        "user_id": creator_id,
+                        "timestamp": {"$gte": start_date.isoformat(), "$lt": end_date.isoformat()}
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": {"$substr": ["$timestamp", 0, 10]},
+                        "count": {"$sum": 1}
+                    }
+                },
+                {"$sort": {"_id": 1}}
+            ]
+            daily_activity = await self.db.arris_usage_log.aggregate(daily_pipeline).to_list(30)
 
         # Calculate trend
         if len(daily_activity) >= 2:
@@ -665,6 +679,19 @@ class ScheduledReportsService:
 
     # ============== EMAIL DELIVERY ==============
 
+    @staticmethod
+    def _report_period(report_type: str, now: datetime):
+        """(start, end, label) of the period a report generated at `now` covers"""
+        end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if report_type == "daily":
+            return end_date - timedelta(days=1), end_date, "Yesterday"
+        return end_date - timedelta(days=7), end_date, "This Week"
+
+    @staticmethod
+    def _period_key(report_type: str, start_date: datetime) -> str:
+        """Stable identifier of a report period, e.g. 'weekly:2026-03-02'"""
+        return f"{report_type}:{start_date.strftime('%Y-%m-%d')}"
+
     async def _send_report_email(self, report_id: str) -> bool:
         """Send report via email."""
         report = await self.db.arris_reports.find_one(
@@ -683,11 +710,17 @@ class ScheduledReportsService:
             # Build email content
             html_content = self._build_email_html(report)
 
+            # One email per creator and period, however often it is regenerated
+            period_key = report.get("period_key")
+            dedup_key = f"report:{report['creator_id']}:{period_key}" if period_key else f"report:{report_id}"
+
             # Send via email service
             await self.email_service.send_email(
                 to_email=report["creator_email"],
                 subject=f"Your ARRIS {report['report_type'].title()} Report - {report['period_label']}",
-                html_content=html_content
+                html_content=html_content,
+                dedup_key=dedup_key,
+                category="arris_report"
             )
 
             # Update report status
@@ -837,6 +870,85 @@ class ScheduledReportsService:
 
         return creators
 
+    async def _failed_claims(self, now: datetime) -> List[Tuple[str, str]]:
+        """(creator_id, report_type) of this period's failed reports with attempts left"""
+        periods = [
+            self._period_key(report_type, self._report_period(report_type, now)[0])
+            for report_type in ("daily", "weekly")
+        ]
+        return [
+            (claim["creator_id"], claim["report_type"])
+            async for claim in self.db.scheduled_report_claims.find(
+                {"status": "failed", "period": {"$in": periods}, "attempts": {"$lt": REPORT_MAX_ATTEMPTS}},
+                {"_id": 0, "creator_id": 1, "report_type": 1}
+            )
+        ]
+
+    async def run_scheduled_reports(self, concurrency: int = 5) -> Dict[str, Any]:
+        """
+        Generate and email every report due this hour.
+        Run hourly by the job scheduler (on the hour).
+        
+        Each (creator, report period) is claimed before generating, so a
+        retry or a manual run in the same hour skips reports already sent.
+        A failed report marks its claim failed; later runs in the same period
+        pick it up again, up to REPORT_MAX_ATTEMPTS runs in all.
+        """
+        now = datetime.now(timezone.utc)
+        daily = await self.get_creators_for_daily_reports()
+        weekly = await self.get_creators_for_weekly_reports()
+        due = [(c["creator_id"], "daily") for c in daily] + [(c["creator_id"], "weekly") for c in weekly]
+        retries = await self._failed_claims(now)
+        due += [r for r in retries if r not in due]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(creator_id: str, report_type: str) -> Optional[bool]:
+            start_date, _, _ = self._report_period(report_type, now)
+            period = self._period_key(report_type, start_date)
+            claim_id = f"{creator_id}:{period}"
+            try:
+                await self.db.scheduled_report_claims.insert_one({
+                    "_id": claim_id,
+                    "creator_id": creator_id,
+                    "report_type": report_type,
+                    "period": period,
+                    "status": "claimed",
+                    "attempts": 1,
+                    "claimed_at": now
+                })
+            except DuplicateKeyError:
+                # Sent, in progress, or failed and out of attempts
+                reclaimed = await self.db.scheduled_report_claims.find_one_and_update(
+                    {"_id": claim_id, "status": "failed", "attempts": {"$lt": REPORT_MAX_ATTEMPTS}},
+                    {"$set": {"status": "claimed", "claimed_at": now}, "$inc": {"attempts": 1}}
+                )
+                if reclaimed is None:
+                    return None
+
+            async with semaphore:
+                try:
+                    result = await self.generate_report(creator_id, report_type, send_email=True)
+                    ok = result.get("success", True)
+                except Exception as e:
+                    logger.error(f"Scheduled {report_type} report failed for {creator_id}: {e}")
+                    ok = False
+            await self.db.scheduled_report_claims.update_one(
+                {"_id": claim_id}, {"$set": {"status": "sent" if ok else "failed"}}
+            )
+            return ok
+
+        outcomes = await asyncio.gather(*(generate(cid, rtype) for cid, rtype in due))
+
+        return {
+            "daily_due": len(daily),
+            "weekly_due": len(weekly),
+            "retried": len(retries),
+            "generated": sum(1 for ok in outcomes if ok),
+            "failed": sum(1 for ok in outcomes if ok is False),
+            "already_sent": sum(1 for ok in outcomes if ok is None)
+        }
+
     # ============== ACTIVITY LOGGING ==============
 
     async def _log_report_activity(
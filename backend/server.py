@@ -9,7 +9,7 @@ Self-Funding Loop: 17_Subscriptions → 06_Calculator
 
 from fastapi import FastAPI, APIRouter, HTTPException, Query, Depends, Request, UploadFile, File
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -25,9 +25,9 @@ import uuid
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (tz-aware: BSON dates come back as UTC datetimes with an offset)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True, tzinfo=timezone.utc)
 db = client[os.environ.get('DB_NAME', 'creators_hive_hq')]
 
 # Create the main app
@@ -93,6 +93,8 @@ from arris_service import arris_service
 
 # Import webhook service
 from webhook_service import webhook_service
+from dashboard_counters import dashboard_counters
+from time_series_rollups import time_series_rollups, ROLLUP_SEED_JOB
 from models_webhook import (
     WebhookEvent, WebhookEventCreate, WebhookEventType,
     AutomationRule, DEFAULT_AUTOMATION_RULES, FOLLOW_UP_ACTIONS
@@ -113,9 +115,12 @@ from feature_gating import FeatureGatingService
 # Import WebSocket service
 from fastapi import WebSocket, WebSocketDisconnect
 from websocket_service import ws_manager, notification_service, NotificationType
+from arris_streaming import sse_event_stream, SSE_HEADERS
+from notification_backplane import create_notification_backplane
 
 # Import Export service
 from export_service import ExportService
+from streaming_export import ExportCursorError, export_stream_response
 
 # Import Elite service
 from elite_service import EliteService
@@ -141,13 +146,15 @@ from arris_voice_service import arris_voice_service
 from arris_pattern_engine import ArrisPatternEngine
 
 # Import Smart Automation Engine
-from smart_automation_engine import SmartAutomationEngine
+from smart_automation_engine import SmartAutomationEngine, EVALUATION_RUN_JOB
 
 # Import Proposal Recommendation Service
 from proposal_recommendation_service import ProposalRecommendationService
 
 # Import Enhanced Memory Palace
 from enhanced_memory_palace import EnhancedMemoryPalace
+from memory_search_index import MemorySearchIndex
+from creator_metrics_service import CreatorMetricsService
 
 # Import Smart Onboarding Wizard
 from onboarding_wizard_service import SmartOnboardingWizard, ONBOARDING_STEPS
@@ -175,6 +182,8 @@ from arris_api_service import (
     ArrisApiService, API_CAPABILITIES, RATE_LIMITS,
     ApiKeyType, ApiKeyStatus
 )
+from rate_limiter import create_rate_limiter
+from llm_cache import LlmResponseCache
 
 # Import Multi-Brand Service
 from multi_brand_service import (
@@ -192,7 +201,7 @@ from creator_pattern_insights_service import CreatorPatternInsightsService
 from predictive_alerts_service import PredictiveAlertsService, AlertType, AlertPriority
 
 # Import Subscription Lifecycle Service
-from subscription_lifecycle_service import SubscriptionLifecycleService, RiskLevel, LifecycleStage, RetentionAction
+from subscription_lifecycle_service import SubscriptionLifecycleService, RiskLevel, LifecycleStage, RetentionAction, RISK_SNAPSHOT_JOB
 
 # Import Creator Health Score Service
 from creator_health_score_service import CreatorHealthScoreService
@@ -205,6 +214,7 @@ from auto_escalation_service import AutoEscalationService
 
 # Import route modules
 from routes import dependencies as route_deps
+from routes.dependencies import get_current_creator_principal
 from routes.auth import router as auth_router, creator_auth_router
 from routes.admin import router as admin_routes_router
 from routes.creator import router as creator_routes_router
@@ -218,6 +228,8 @@ from routes.referral import router as referral_router, admin_router as referral_
 
 # Import Email service
 from email_service import email_service, EmailDeliveryError
+from email_outbox import EmailOutbox, build_transport
+from bson_dates import DateMigration
 
 # Import Calculator service
 from calculator_service import CalculatorService
@@ -230,8 +242,10 @@ from auth import (
     AdminUserCreate, AdminUserLogin, Token,
     get_current_user, create_admin_user, login_user,
     seed_default_admin, security, get_password_hash,
-    login_creator, get_current_creator, decode_token
+    login_creator, get_current_creator, set_principal_cache
 )
+from principal_cache import PrincipalCache
+from job_scheduler import JobScheduler
 
 # Configure logging
 logging.basicConfig(
@@ -245,42 +259,10 @@ logger = logging.getLogger(__name__)
 async def get_any_authenticated_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     Validates token and returns user info for either admin or creator.
-    Returns dict with user_type, user_id, email, and full user/creator data.
+    Returns dict with user_type, user_id, email, and full user/creator data
+    (plus tier and features for creators), served from the principal cache.
     """
-    token = credentials.credentials
-    token_data = decode_token(token)
-    
-    if token_data is None:
-        raise HTTPException(
-            status_code=401,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    role = getattr(token_data, 'role', 'admin')  # Default to admin for backward compatibility
-    
-    if role == "creator":
-        creator = await db.creators.find_one({"email": token_data.email}, {"_id": 0, "hashed_password": 0})
-        if not creator:
-            raise HTTPException(status_code=401, detail="Creator not found")
-        return {
-            "user_type": "creator",
-            "user_id": creator["id"],
-            "email": creator["email"],
-            "name": creator["name"],
-            "data": creator
-        }
-    else:
-        admin = await db.admin_users.find_one({"email": token_data.email}, {"_id": 0, "hashed_password": 0})
-        if not admin:
-            raise HTTPException(status_code=401, detail="Admin not found")
-        return {
-            "user_type": "admin",
-            "user_id": admin["id"],
-            "email": admin["email"],
-            "name": admin["name"],
-            "data": admin
-        }
+    return await principal_cache.resolve(credentials.credentials)
 
 # ============== STARTUP ==============
 
@@ -309,14 +291,21 @@ predictive_alerts_service = None
 subscription_lifecycle_service = None
 creator_health_score_service = None
 pattern_export_service = None
+email_outbox = None
+date_migration = None
 auto_escalation_service = None
+creator_metrics_service = None
+llm_response_cache = None
+principal_cache = None
+job_scheduler = None
 
 @app.on_event("startup")
 async def startup_db():
     """Initialize database with indexes and seed data"""
-    global stripe_service, feature_gating, elite_service, arris_memory_service, arris_historical_service, calculator_service, export_service, pattern_engine, smart_automation_engine, proposal_recommendation_service, enhanced_memory_palace, onboarding_wizard, auto_approval_service, referral_service, persona_service, scheduled_reports_service, arris_api_service, multi_brand_service, waitlist_service_instance, creator_pattern_insights_service, predictive_alerts_service, subscription_lifecycle_service, creator_health_score_service, pattern_export_service, auto_escalation_service
+    global stripe_service, feature_gating, elite_service, arris_memory_service, arris_historical_service, calculator_service, export_service, pattern_engine, smart_automation_engine, proposal_recommendation_service, enhanced_memory_palace, onboarding_wizard, auto_approval_service, referral_service, persona_service, scheduled_reports_service, arris_api_service, multi_brand_service, waitlist_service_instance, creator_pattern_insights_service, predictive_alerts_service, subscription_lifecycle_service, creator_health_score_service, pattern_export_service, auto_escalation_service, creator_metrics_service, llm_response_cache, principal_cache, job_scheduler, email_outbox, date_migration
     logger.info("Initializing Creators Hive HQ Database...")
-    await create_indexes(db)
+    index_report = await create_indexes(db)
+    logger.info(f"Index registry: {index_report['summary']}")
     await seed_schema_index(db)
     await seed_lookups(db)
     seeded = await seed_all_data(db)
@@ -328,15 +317,36 @@ async def startup_db():
         logger.info("Default admin user created: admin@hivehq.com / admin123")
     # Initialize webhook service
     await webhook_service.initialize(db)
-    # Initialize Stripe service
-    stripe_service = StripeService(db)
+    # Route WebSocket notifications through the cross-worker backplane
+    await ws_manager.set_backplane(create_notification_backplane(db))
+    logger.info(f"Notification backplane initialized - {ws_manager.backplane.name}")
     # Initialize Feature Gating service
     feature_gating = FeatureGatingService(db)
+    # Initialize principal cache (token -> user doc + tier, short TTL)
+    principal_cache = PrincipalCache(db, feature_gating=feature_gating)
+    set_principal_cache(principal_cache)
+    # Initialize ARRIS Pattern Engine (before the services that invalidate its cohort cache)
+    pattern_engine = ArrisPatternEngine(db)
+    logger.info("ARRIS Pattern Engine initialized - Platform-wide pattern detection active")
+    # Initialize Stripe service
+    stripe_service = StripeService(
+        db,
+        principal_cache=principal_cache,
+        feature_gating=feature_gating,
+        pattern_engine=pattern_engine
+    )
     # Initialize Elite service
     elite_service = EliteService(db)
     logger.info("Elite service initialized - Custom Workflows & Brand Integrations active")
+    # Initialize LLM response cache (shared by ARRIS LLM callers)
+    llm_response_cache = LlmResponseCache(db)
+    await llm_response_cache.initialize()
+    arris_service.set_llm_cache(llm_response_cache)
+    logger.info("LLM response cache initialized - Repeat ARRIS prompts served from cache")
     # Initialize ARRIS Memory service
-    arris_memory_service = ArrisMemoryService(db)
+    memory_search_index = MemorySearchIndex(db)
+    await memory_search_index.initialize()
+    arris_memory_service = ArrisMemoryService(db, search_index=memory_search_index)
     logger.info("ARRIS Memory service initialized - Memory Palace & Pattern Engine active")
     
     # Initialize ARRIS Historical Learning service
@@ -350,21 +360,23 @@ async def startup_db():
     export_service = ExportService(db)
     logger.info("Export service initialized - CSV/JSON analytics exports active")
     
-    # Initialize ARRIS Pattern Engine
-    pattern_engine = ArrisPatternEngine(db)
-    logger.info("ARRIS Pattern Engine initialized - Platform-wide pattern detection active")
-    
     # Initialize Smart Automation Engine
     smart_automation_engine = SmartAutomationEngine(db)
     await smart_automation_engine.initialize()
     logger.info("Smart Automation Engine initialized - Condition-based automations active")
     
     # Initialize Proposal Recommendation Service
-    proposal_recommendation_service = ProposalRecommendationService(db)
+    proposal_recommendation_service = ProposalRecommendationService(db, llm_cache=llm_response_cache)
     logger.info("Proposal Recommendation Service initialized - Auto-recommendations active")
     
     # Initialize Enhanced Memory Palace
-    enhanced_memory_palace = EnhancedMemoryPalace(db)
+    creator_metrics_service = CreatorMetricsService(db)
+    await creator_metrics_service.initialize()
+    enhanced_memory_palace = EnhancedMemoryPalace(
+        db,
+        search_index=memory_search_index,
+        metrics_service=creator_metrics_service
+    )
     logger.info("Enhanced Memory Palace initialized - Consolidation & Cross-Creator Insights active")
     
     # Initialize Smart Onboarding Wizard
@@ -372,7 +384,12 @@ async def startup_db():
     logger.info("Smart Onboarding Wizard initialized - ARRIS personalization active")
     
     # Initialize Auto-Approval Service
-    auto_approval_service = AutoApprovalService(db, llm_client=arris_service)
+    auto_approval_service = AutoApprovalService(
+        db,
+        llm_client=arris_service,
+        metrics_service=creator_metrics_service,
+        pattern_engine=pattern_engine
+    )
     await auto_approval_service.initialize()
     logger.info("Auto-Approval Service initialized - ARRIS evaluation active")
     
@@ -389,7 +406,15 @@ async def startup_db():
     logger.info("Scheduled Reports Service initialized - Daily/Weekly AI summaries available for Elite creators")
     
     # Initialize ARRIS API Service
-    arris_api_service = ArrisApiService(db, arris_service=arris_service, persona_service=persona_service)
+    api_rate_limiter = create_rate_limiter(db)
+    await api_rate_limiter.initialize()
+    arris_api_service = ArrisApiService(
+        db,
+        arris_service=arris_service,
+        persona_service=persona_service,
+        rate_limiter=api_rate_limiter,
+        feature_gating=feature_gating
+    )
     logger.info("ARRIS API Service initialized - Direct API access available for Elite creators")
     
     # Initialize Multi-Brand Service
@@ -418,7 +443,10 @@ async def startup_db():
         db,
         email_service=email_service,
         ws_manager=ws_manager,
-        notification_service=notification_service
+        notification_service=notification_service,
+        principal_cache=principal_cache,
+        feature_gating=feature_gating,
+        pattern_engine=pattern_engine
     )
     logger.info("Subscription Lifecycle Service initialized - At-risk detection and retention automation active")
     
@@ -438,11 +466,84 @@ async def startup_db():
     auto_escalation_service = AutoEscalationService(
         db,
         ws_manager=ws_manager,
-        notification_service=notification_service
+        notification_service=notification_service,
+        pattern_engine=pattern_engine
     )
     await auto_escalation_service.initialize()
     logger.info("Auto-Escalation Service initialized - Automatic proposal escalation system active")
     
+    # Initialize Job Scheduler (periodic sweeps, one worker per run via Mongo lease)
+    job_scheduler = JobScheduler(db)
+    job_scheduler.register(
+        "escalation_scan", "0 * * * *", auto_escalation_service.scan_all_proposals,
+        description="Scan pending proposals and auto-escalate stalled ones",
+        timeout_seconds=900
+    )
+    job_scheduler.register(
+        EVALUATION_RUN_JOB, "*/5 * * * *", smart_automation_engine.run_queued_evaluations,
+        description="Run queued evaluate-all automation runs",
+        timeout_seconds=3600,
+        max_retries=0  # A retry would re-trigger actions the first attempt already ran
+    )
+    job_scheduler.register(
+        "scheduled_reports", "0 * * * *", scheduled_reports_service.run_scheduled_reports,
+        description="Generate daily/weekly ARRIS reports due this hour",
+        timeout_seconds=1800,
+        max_retries=0  # Reports are due for the current hour only; a retry could double-send
+    )
+    job_scheduler.register(
+        "predictive_alert_checks", "15 */6 * * *", predictive_alerts_service.run_alert_checks,
+        description="Generate predictive alerts for Pro+ creators",
+        timeout_seconds=1800
+    )
+    job_scheduler.register(
+        "memory_consolidation", "30 3 * * *", enhanced_memory_palace.run_consolidation,
+        description="Consolidate old memories for all creators",
+        timeout_seconds=3600,
+        max_retries=1
+    )
+    job_scheduler.register(
+        "purge_expired_memories", "0 4 * * *", enhanced_memory_palace.purge_expired_deletions,
+        description="Permanently remove soft-deleted memories past retention"
+    )
+    job_scheduler.register(
+        RISK_SNAPSHOT_JOB, "*/30 * * * *", subscription_lifecycle_service.refresh_risk_snapshot,
+        description="Re-score active subscriptions into the at-risk snapshot",
+        timeout_seconds=1800
+    )
+    job_scheduler.register(
+        "creator_health_scores", "0 2 * * *", creator_health_score_service.run_daily_scores,
+        description="Score all Pro+ creators into creator_health_history",
+        timeout_seconds=3600
+    )
+    date_migration = DateMigration(db)
+    job_scheduler.register(
+        "date_migration", "*/15 * * * *", date_migration.run,
+        description="Convert ISO-string timestamps in registered collections to BSON dates",
+        timeout_seconds=600
+    )
+    job_scheduler.register(
+        "ts_rollup_compaction", "45 1 * * *", time_series_rollups.compact,
+        description="Fold daily rollup buckets into weekly/monthly buckets and drop expired days",
+        timeout_seconds=1800
+    )
+    job_scheduler.register(
+        ROLLUP_SEED_JOB, "*/30 * * * *", time_series_rollups.seed,
+        description="Build time-series rollup series that have never been built",
+        timeout_seconds=3600
+    )
+    job_scheduler.register(
+        "ts_rollup_rebuild", "0 5 * * 0", time_series_rollups.rebuild_all,
+        description="Recompute time-series rollups from source collections to correct drift",
+        timeout_seconds=3600,
+        max_retries=1
+    )
+    job_scheduler.register(
+        "dashboard_counter_rebuild", "0 * * * *", dashboard_counters.rebuild_totals,
+        description="Recompute materialized dashboard totals from source collections to correct drift",
+        timeout_seconds=900
+    )
+
     # Initialize ARRIS Activity Feed notification callback
     async def arris_activity_notification_callback(event_type: str, creator_id: str, data: dict):
         """Callback to send ARRIS activity notifications via WebSocket"""
@@ -504,15 +605,44 @@ async def startup_db():
         pattern_export=pattern_export_service,
         auto_escalation=auto_escalation_service,
         webhook=webhook_service,
+        memory_search_index=memory_search_index,
+        creator_metrics=creator_metrics_service,
+        principal_cache=principal_cache,
+        job_scheduler=job_scheduler,
+        date_migration=date_migration,
     )
     logger.info("Route dependencies initialized for modular route handlers")
     
+    # Materialized dashboard counters (background refresher)
+    await dashboard_counters.initialize(db)
+    
+    # Email outbox: send_email queues, background workers deliver
+    email_outbox = EmailOutbox(db, build_transport())
+    email_service.attach_outbox(email_outbox)
+    email_outbox.start()
+    
+    # Start periodic jobs last, once every service they call is ready
+    await job_scheduler.start()
+    subscription_lifecycle_service.set_job_scheduler(job_scheduler)
+    
+    # Time-series rollups for growth charts and trends (unbuilt series seed as a
+    # scheduler job, so the job's schedule document must exist first)
+    await time_series_rollups.initialize(db, job_scheduler)
+    
     logger.info("Feature Gating service initialized")
     logger.info("Stripe service initialized - Self-Funding Loop active")
     logger.info("Database ready - Zero-Human Operational Model active")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await arris_service.queue.shutdown()
+    await dashboard_counters.stop()
+    if job_scheduler is not None:
+        await job_scheduler.stop()
+    if email_outbox is not None:
+        await email_outbox.stop()
+    if ws_manager.backplane is not None:
+        await ws_manager.backplane.stop()
     client.close()
 
 # ============== ROOT & HEALTH ==============
@@ -1655,7 +1785,15 @@ async def get_creator_premium_analytics(
     }
     
     # ===== GRANULAR TRENDS (Daily for 30d, Weekly for 90d+) =====
-    if time_delta <= timedelta(days=30):
+    trend_granularity = "daily" if time_delta <= timedelta(days=30) else "weekly"
+    rollup_trends = await time_series_rollups.query(
+        "proposals", creator_id, start=start_date,
+        granularity="day" if trend_granularity == "daily" else "week"
+    )
+    if rollup_trends is not None:
+        trend_limit = 60 if trend_granularity == "daily" else 52
+        granular_trends = [{"_id": b["date"], "count": b["count"]} for b in rollup_trends[:trend_limit]]
+    elif time_delta <= timedelta(days=30):
         # Daily trends
         daily_pipeline = [
             {"$match": {"user_id": creator_id, "created_at": {"$gte": start_date.isoformat()}}},
@@ -1664,7 +1802,6 @@ async def get_creator_premium_analytics(
             {"$sort": {"_id": 1}}
         ]
         granular_trends = await db.proposals.aggregate(daily_pipeline).to_list(60)
-        trend_granularity = "daily"
     else:
         # Weekly trends
         weekly_pipeline = [
@@ -1676,7 +1813,6 @@ async def get_creator_premium_analytics(
             {"$sort": {"_id": 1}}
         ]
         granular_trends = await db.proposals.aggregate(weekly_pipeline).to_list(52)
-        trend_granularity = "weekly"
     
     # ===== PLATFORM PERFORMANCE BREAKDOWN =====
     platform_pipeline = [
@@ -1702,14 +1838,22 @@ async def get_creator_premium_analytics(
     current_month_start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
     
-    current_month_proposals = await db.proposals.count_documents({
-        "user_id": creator_id,
-        "created_at": {"$gte": current_month_start.isoformat()}
-    })
-    last_month_proposals = await db.proposals.count_documents({
-        "user_id": creator_id,
-        "created_at": {"$gte": last_month_start.isoformat(), "$lt": current_month_start.isoformat()}
-    })
+    monthly_rollup = await time_series_rollups.query(
+        "proposals", creator_id, start=last_month_start, granularity="month"
+    )
+    if monthly_rollup is not None:
+        monthly_counts = {b["date"]: b["count"] for b in monthly_rollup}
+        current_month_proposals = monthly_counts.get(current_month_start.strftime("%Y-%m"), 0)
+        last_month_proposals = monthly_counts.get(last_month_start.strftime("%Y-%m"), 0)
+    else:
+        current_month_proposals = await db.proposals.count_documents({
+            "user_id": creator_id,
+            "created_at": {"$gte": current_month_start.isoformat()}
+        })
+        last_month_proposals = await db.proposals.count_documents({
+            "user_id": creator_id,
+            "created_at": {"$gte": last_month_start.isoformat(), "$lt": current_month_start.isoformat()}
+        })
     
     mom_growth = round(((current_month_proposals - last_month_proposals) / max(1, last_month_proposals)) * 100, 1)
     
@@ -2042,10 +2186,12 @@ async def get_lifecycle_metrics(
 async def get_at_risk_subscriptions(
     threshold: str = Query(default="medium", description="Risk threshold: critical, high, medium, low"),
     limit: int = Query(default=50, le=100),
+    offset: int = Query(default=0, ge=0),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Get subscriptions at or above a given risk level.
+    Served from the risk snapshot (refreshed every 30 minutes).
     Admin only.
     """
     current_user = await get_current_user(credentials, db)
@@ -2055,10 +2201,14 @@ async def get_at_risk_subscriptions(
     if not subscription_lifecycle_service:
         raise HTTPException(status_code=503, detail="Subscription lifecycle service not available")
     
-    result = await subscription_lifecycle_service.get_at_risk_subscriptions(
-        risk_threshold=threshold,
-        limit=limit
-    )
+    try:
+        result = await subscription_lifecycle_service.get_at_risk_subscriptions(
+            risk_threshold=threshold,
+            limit=limit,
+            offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
 
 
@@ -2276,19 +2426,25 @@ async def get_health_leaderboard(
 
 @api_router.get("/export/proposals")
 async def export_proposals(
-    format: str = Query(default="json", description="Export format: json or csv"),
+    format: str = Query(default="json", description="Export format: json, csv or ndjson"),
     date_range: str = Query(default="30d", description="Date range: 7d, 30d, 90d, 1y, all"),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    stream: bool = Query(default=False, description="Stream every row as a CSV/NDJSON download"),
+    gzip: bool = Query(default=False, description="Gzip the streamed download"),
+    cursor: Optional[str] = Query(default=None, description="Resume a streamed export after this cursor"),
+    resumable: bool = Query(default=False, description="Add a resume_cursor column to streamed CSV"),
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Export proposals data.
+    JSON/CSV responses are capped at 1000 rows (see "truncated");
+    stream=true (or format=ndjson) streams the full export.
     Feature-gated: Requires Pro tier or higher.
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check Pro tier access
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     if tier.lower() not in ["pro", "premium", "elite"]:
         raise HTTPException(
             status_code=403,
@@ -2303,6 +2459,23 @@ async def export_proposals(
     # Premium tier gets insights included
     include_insights = tier.lower() in ["premium", "elite"]
     
+    if stream or format == "ndjson":
+        stream_format = "csv" if format == "csv" else "ndjson"
+        try:
+            rows = await export_service.stream_proposals(
+                creator_id=creator_id,
+                format=stream_format,
+                date_range=date_range,
+                include_insights=include_insights,
+                cursor=cursor,
+                resumable=resumable
+            )
+        except ExportCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return export_stream_response(
+            rows, stream_format, f"proposals_export_{date_range}_{datetime.now().strftime('%Y%m%d_%H%M%S')}", gzip=gzip
+        )
+    
     result = await export_service.export_proposals(
         creator_id=creator_id,
         format=format,
@@ -2317,18 +2490,18 @@ async def export_proposals(
 async def export_analytics(
     format: str = Query(default="json", description="Export format: json or csv"),
     date_range: str = Query(default="30d", description="Date range: 7d, 30d, 90d, 1y, all"),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Export analytics data.
     Pro tier: Basic analytics
     Premium/Elite tier: Enhanced with comparative analytics
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check Pro tier access
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     if tier.lower() not in ["pro", "premium", "elite"]:
         raise HTTPException(
             status_code=403,
@@ -2355,19 +2528,25 @@ async def export_analytics(
 
 @api_router.get("/export/revenue")
 async def export_revenue(
-    format: str = Query(default="json", description="Export format: json or csv"),
+    format: str = Query(default="json", description="Export format: json, csv or ndjson"),
     date_range: str = Query(default="30d", description="Date range: 7d, 30d, 90d, 1y, all"),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    stream: bool = Query(default=False, description="Stream every row as a CSV/NDJSON download"),
+    gzip: bool = Query(default=False, description="Gzip the streamed download"),
+    cursor: Optional[str] = Query(default=None, description="Resume a streamed export after this cursor"),
+    resumable: bool = Query(default=False, description="Add a resume_cursor column to streamed CSV"),
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Export revenue/financial data.
+    JSON/CSV responses are capped at 1000 rows (see "truncated");
+    stream=true (or format=ndjson) streams the full export.
     Feature-gated: Requires Premium tier or higher.
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check Premium tier access
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     if tier.lower() not in ["premium", "elite"]:
         raise HTTPException(
             status_code=403,
@@ -2379,6 +2558,22 @@ async def export_revenue(
             }
         )
     
+    if stream or format == "ndjson":
+        stream_format = "csv" if format == "csv" else "ndjson"
+        try:
+            rows = await export_service.stream_revenue_data(
+                creator_id=creator_id,
+                format=stream_format,
+                date_range=date_range,
+                cursor=cursor,
+                resumable=resumable
+            )
+        except ExportCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return export_stream_response(
+            rows, stream_format, f"revenue_export_{date_range}_{datetime.now().strftime('%Y%m%d_%H%M%S')}", gzip=gzip
+        )
+    
     result = await export_service.export_revenue_data(
         creator_id=creator_id,
         format=format,
@@ -2392,7 +2587,7 @@ async def export_revenue(
 async def export_full_report(
     format: str = Query(default="json", description="Export format: json or csv"),
     date_range: str = Query(default="30d", description="Date range: 7d, 30d, 90d, 1y, all"),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Export comprehensive report with all data.
@@ -2400,11 +2595,11 @@ async def export_full_report(
     
     Includes: Proposals, Analytics, Revenue (combined)
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check Premium tier access
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     if tier.lower() not in ["premium", "elite"]:
         raise HTTPException(
             status_code=403,
@@ -2514,6 +2709,7 @@ async def export_full_report(
 async def get_creators(
     status: Optional[str] = None,
     limit: int = Query(default=100, le=1000),
+    include_tier: bool = Query(default=False),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Get all creator registrations (admin only)"""
@@ -2524,6 +2720,13 @@ async def get_creators(
         query["status"] = status
     
     creators = await db.creators.find(query, {"_id": 0}).sort("submitted_at", -1).to_list(limit)
+    
+    if include_tier:
+        tiers = await feature_gating.get_tiers(c.get("id") for c in creators)
+        for creator in creators:
+            tier, _ = tiers.get(creator.get("id"), ("free", None))
+            creator["subscription_tier"] = tier.value if hasattr(tier, 'value') else tier
+    
     return creators
 
 @api_router.get("/creators/{creator_id}")
@@ -2563,6 +2766,8 @@ async def update_creator(
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Creator not found")
     
+    principal_cache.invalidate_creator(creator_id)
+    
     # If approved, create a user account
     if update.status == "approved":
         creator = await db.creators.find_one({"id": creator_id})
@@ -2723,6 +2928,10 @@ async def create_proposal(
     doc['updated_at'] = doc['updated_at'].isoformat()
     
     await db.proposals.insert_one(doc)
+    await time_series_rollups.record("proposals", doc)
+    feature_gating.record_proposal_created(doc.get("user_id"))
+    await creator_metrics_service.refresh_creator(doc.get("user_id"))
+    pattern_engine.invalidate_cohorts()
     
     # WEBHOOK: Emit proposal created event
     await webhook_service.emit(
@@ -2840,6 +3049,8 @@ async def submit_proposal(
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
     await db.arris_usage_log.insert_one(arris_log)
+    await dashboard_counters.record_arris_usage(arris_log)
+    await time_series_rollups.record("arris_usage_log", arris_log)
     
     # WEBHOOK: Emit proposal submitted event
     await webhook_service.emit(
@@ -2918,9 +3129,19 @@ async def submit_proposal(
 @api_router.post("/proposals/{proposal_id}/regenerate-insights")
 async def regenerate_insights(
     proposal_id: str,
+    stream: bool = Query(default=False, description="Stream insights as Server-Sent Events"),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
-    """Regenerate ARRIS insights for a proposal with priority processing for Premium/Elite"""
+    """
+    Regenerate ARRIS insights for a proposal with priority processing for Premium/Elite.
+    
+    With ?stream=true the response is text/event-stream: "token" events as text
+    is generated, "section" events as each insight field completes, then
+    "complete" with the saved insights, or "error" if ARRIS is at capacity or
+    generation failed (existing insights are kept). Start/complete/error events
+    are mirrored over WebSocket. The "start" event's streaming flag is false
+    when no token source is configured; the text then arrives in one chunk.
+    """
     auth_user = await get_any_authenticated_user(credentials)
     
     proposal = await db.proposals.find_one({"id": proposal_id}, {"_id": 0})
@@ -2932,13 +3153,63 @@ async def regenerate_insights(
     if auth_user["user_type"] == "creator":
         processing_speed = await feature_gating.get_arris_processing_speed(auth_user["user_id"])
     
-    # Regenerate insights with priority processing
+    if stream:
+        async def insight_events():
+            async for event, data in arris_service.stream_project_insights(
+                proposal,
+                None,
+                processing_speed=processing_speed
+            ):
+                if event == "complete":
+                    insights = data["insights"]
+                    failure = _regeneration_failure(insights)
+                    if failure:
+                        # Keep the proposal's existing insights; same outcome as the 503 below
+                        yield "error", {"success": False, **failure}
+                        continue
+                    await _save_regenerated_insights(proposal_id, insights, processing_speed)
+                yield event, data
+        
+        return StreamingResponse(
+            sse_event_stream(insight_events(), ws_manager=ws_manager, user_id=auth_user["user_id"]),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS
+        )
+    
+    # Regenerate insights with priority processing (always a fresh generation)
     arris_insights = await arris_service.generate_project_insights(
         proposal, 
         None,
-        processing_speed=processing_speed
+        processing_speed=processing_speed,
+        use_cache=False
     )
     
+    failure = _regeneration_failure(arris_insights)
+    if failure:
+        raise HTTPException(
+            status_code=503,
+            detail=failure["error"],
+            headers={"Retry-After": str(failure["retry_after"])}
+        )
+    
+    await _save_regenerated_insights(proposal_id, arris_insights, processing_speed)
+    
+    return {
+        "message": "Insights regenerated", 
+        "arris_insights": arris_insights,
+        "processing_speed": processing_speed,
+        "priority_processed": processing_speed == "fast"
+    }
+
+def _regeneration_failure(arris_insights: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Error payload when regeneration produced a placeholder instead of real insights"""
+    if arris_insights.get("queue_full"):
+        return {"error": "ARRIS is at capacity, please retry shortly", "retry_after": 30}
+    if arris_insights.get("fallback"):
+        return {"error": "ARRIS could not regenerate insights, existing insights were kept", "retry_after": 30}
+    return None
+
+async def _save_regenerated_insights(proposal_id: str, arris_insights: Dict[str, Any], processing_speed: str):
     await db.proposals.update_one(
         {"id": proposal_id},
         {"$set": {
@@ -2948,13 +3219,6 @@ async def regenerate_insights(
             "updated_at": datetime.now(timezone.utc).isoformat()
         }}
     )
-    
-    return {
-        "message": "Insights regenerated", 
-        "arris_insights": arris_insights,
-        "processing_speed": processing_speed,
-        "priority_processed": processing_speed == "fast"
-    }
 
 @api_router.get("/arris/queue-stats")
 async def get_arris_queue_stats(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -2970,9 +3234,13 @@ async def get_arris_queue_stats(credentials: HTTPAuthorizationCredentials = Depe
         "queue": {
             "fast_queue": queue_stats["fast_queue_length"],
             "standard_queue": queue_stats["standard_queue_length"],
-            "currently_processing": queue_stats["currently_processing"]
+            "currently_processing": queue_stats["currently_processing"],
+            "workers": queue_stats["workers"],
+            "max_queue_size": queue_stats["max_queue_size"],
+            "fast_lane_weight": queue_stats["fast_lane_weight"]
         },
         "processing_stats": queue_stats["processing_stats"],
+        "llm_cache": arris_service.get_cache_stats(),
         "message": "Premium/Elite users are processed in the fast queue with priority"
     }
 
@@ -3156,7 +3424,7 @@ async def transcribe_audio(
     )
     
     # Log usage
-    await db.arris_usage_log.insert_one({
+    usage_log = {
         "id": f"ARRIS-VOICE-{creator_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
         "user_id": creator_id,
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -3165,7 +3433,10 @@ async def transcribe_audio(
         "query_category": "Voice",
         "success": result.get("success", False),
         "processing_time_s": result.get("processing_time_seconds", 0)
-    })
+    }
+    await db.arris_usage_log.insert_one(usage_log)
+    await dashboard_counters.record_arris_usage(usage_log)
+    await time_series_rollups.record("arris_usage_log", usage_log)
     
     return result
 
@@ -3234,6 +3505,7 @@ async def voice_query(
     audio: UploadFile = File(...),
     respond_with_voice: bool = Query(default=True, description="Generate audio response"),
     voice: Optional[str] = Query(default="nova", description="Voice for response"),
+    stream: bool = Query(default=False, description="Stream the response as Server-Sent Events"),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
@@ -3244,6 +3516,12 @@ async def voice_query(
     1. Transcribes your audio question using Whisper
     2. Sends the question to ARRIS AI for processing
     3. Returns both text and audio response
+    
+    With ?stream=true the response is text/event-stream: "transcription",
+    "token" events for the reply text, "response", "audio" (if requested)
+    and "complete". Start/complete events are mirrored over WebSocket. The
+    "transcription" event's streaming flag is false when no token source is
+    configured; the reply text then arrives as one "token" event.
     """
     creator = await get_current_creator(credentials, db)
     creator_id = creator["id"]
@@ -3278,6 +3556,25 @@ async def voice_query(
         "niche": creator.get("niche", "Content Creation")
     }
     
+    if stream:
+        async def voice_events():
+            async for event, data in arris_voice_service.stream_voice_query(
+                audio_data=audio_data,
+                filename=audio.filename or "audio.webm",
+                creator_context=creator_context,
+                respond_with_voice=respond_with_voice,
+                voice=voice
+            ):
+                if event == "complete":
+                    await _log_voice_query(creator_id, data)
+                yield event, data
+        
+        return StreamingResponse(
+            sse_event_stream(voice_events(), ws_manager=ws_manager, user_id=creator_id),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS
+        )
+    
     # Process voice query
     result = await arris_voice_service.voice_query(
         audio_data=audio_data,
@@ -3287,11 +3584,18 @@ async def voice_query(
         voice=voice
     )
     
+    await _log_voice_query(creator_id, result)
+    
+    return result
+
+
+async def _log_voice_query(creator_id: str, result: Dict[str, Any]):
+    """Log a voice query and notify the creator"""
     # Log usage
-    transcription_text = result.get("transcription", {}).get("text", "")
-    arris_response_text = result.get("arris_response", {}).get("text", "")
+    transcription_text = (result.get("transcription") or {}).get("text", "")
+    arris_response_text = (result.get("arris_response") or {}).get("text", "")
     
-    await db.arris_usage_log.insert_one({
+    usage_log = {
         "id": f"ARRIS-VOICE-QUERY-{creator_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
         "user_id": creator_id,
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -3299,9 +3603,12 @@ async def voice_query(
         "response_type": "voice_conversation",
         "response_snippet": arris_response_text[:200] if arris_response_text else "",
         "query_category": "Voice",
-        "success": result.get("arris_response", {}).get("success", False),
+        "success": (result.get("arris_response") or {}).get("success", False),
         "processing_time_s": result.get("total_processing_time", 0)
-    })
+    }
+    await db.arris_usage_log.insert_one(usage_log)
+    await dashboard_counters.record_arris_usage(usage_log)
+    await time_series_rollups.record("arris_usage_log", usage_log)
     
     # Notify via WebSocket
     await notification_service.notify_arris_insights_ready(
@@ -3310,8 +3617,6 @@ async def voice_query(
         proposal_title="Voice Conversation",
         insight_type="voice"
     )
-    
-    return result
 
 
 @api_router.get("/arris/voice/voices")
@@ -3413,6 +3718,9 @@ async def update_proposal(
     
     # Get updated proposal for webhook data and email notifications
     updated_proposal = await db.proposals.find_one({"id": proposal_id}, {"_id": 0})
+    if "status" in update_data:
+        await creator_metrics_service.refresh_creator(updated_proposal.get("user_id"))
+        pattern_engine.invalidate_cohorts()
     
     # Get creator info for email notifications
     creator_email = updated_proposal.get("creator_email")
@@ -3797,6 +4105,7 @@ async def get_email_service_status(credentials: HTTPAuthorizationCredentials = D
             "proposal_completed": True
         },
         "status": "active" if email_service.is_configured() else "not_configured",
+        "outbox": await email_outbox.get_metrics() if email_outbox else None,
         "setup_instructions": None if email_service.is_configured() else {
             "step_1": "Create a SendGrid account at https://sendgrid.com",
             "step_2": "Generate an API key at https://app.sendgrid.com/settings/api_keys",
@@ -3839,10 +4148,12 @@ async def send_test_email(
 <p><strong>Timestamp:</strong> {datetime.now(timezone.utc).isoformat()}</p>
 <p style="color: #22c55e;">✅ Your email notifications are configured and working!</p>
 """
+        # Bypass the outbox so the response reflects the provider's answer
         success = await email_service.send_email(
             to_email=to_email,
             subject="🐝 Test Email - Creators Hive HQ",
-            html_content=email_service._get_base_template(content)
+            html_content=email_service._get_base_template(content),
+            deliver_now=True
         )
         
         if success:
@@ -3860,6 +4171,21 @@ async def send_test_email(
         logger.error(f"Test email error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Email error: {str(e)}")
 
+@api_router.get("/email/outbox")
+async def get_email_outbox_metrics(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Email outbox delivery metrics (admin only).
+    Queue depth by status, oldest pending message age and worker counters.
+    """
+    await get_current_user(credentials, db)
+    return await email_outbox.get_metrics()
+
+@api_router.post("/email/outbox/retry-failed")
+async def retry_failed_emails(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Re-queue emails that exhausted their delivery attempts (admin only)."""
+    await get_current_user(credentials, db)
+    return await email_outbox.retry_failed()
+
 # NOTE: Elite contact and inquiries routes migrated to /app/backend/routes/elite.py
 
 # ============== SUBSCRIPTION & STRIPE (Self-Funding Loop) ==============
@@ -4388,6 +4714,8 @@ async def create_calculator_entry(entry: CalculatorCreate):
     doc['created_at'] = doc['created_at'].isoformat()
     doc['updated_at'] = doc['updated_at'].isoformat()
     await db.calculator.insert_one(doc)
+    await dashboard_counters.record_calculator_entry(doc)
+    await time_series_rollups.record("calculator", doc)
     return {"id": calc_obj.id, "message": "Calculator entry created", "net_margin": calc_obj.net_margin}
 
 # ============== 06_CALCULATOR - ADVANCED FINANCIAL ANALYTICS ==============
@@ -4450,10 +4778,12 @@ async def get_all_key_metrics(
     """
     await get_current_user(credentials, db)
     
-    mrr = await calculator_service.get_mrr(user_id)
-    arr = await calculator_service.get_arr(user_id)
-    churn = await calculator_service.get_churn_rate(user_id)
-    ltv = await calculator_service.get_ltv(user_id)
+    mrr, churn = await asyncio.gather(
+        calculator_service.get_mrr(user_id),
+        calculator_service.get_churn_rate(user_id)
+    )
+    arr = await calculator_service.get_arr(user_id, mrr_data=mrr)
+    ltv = await calculator_service.get_ltv(user_id, mrr_data=mrr, churn_data=churn)
     
     return {
         "mrr": mrr,
@@ -4596,6 +4926,8 @@ async def create_subscription(sub: SubscriptionCreate):
         calc_doc['created_at'] = calc_doc['created_at'].isoformat()
         calc_doc['updated_at'] = calc_doc['updated_at'].isoformat()
         await db.calculator.insert_one(calc_doc)
+        await dashboard_counters.record_calculator_entry(calc_doc)
+        await time_series_rollups.record("calculator", calc_doc)
         sub_obj.linked_calc_id = calc_entry.id
     
     doc = sub_obj.model_dump()
@@ -4660,6 +4992,8 @@ async def log_arris_usage(log: ArrisUsageLogCreate):
     doc['updated_at'] = doc['updated_at'].isoformat()
     doc['timestamp'] = doc['timestamp'].isoformat()
     await db.arris_usage_log.insert_one(doc)
+    await dashboard_counters.record_arris_usage(doc)
+    await time_series_rollups.record("arris_usage_log", doc)
     return {"id": log_obj.id, "message": "ARRIS usage logged"}
 
 # NOTE: ARRIS performance and training routes migrated to /app/backend/routes/arris.py
@@ -5069,40 +5403,42 @@ async def evaluate_creator_automation(
 
 @api_router.post("/admin/automation/evaluate-all")
 async def evaluate_all_creators_automation(
+    background: bool = Query(default=False, description="Queue on the job scheduler and return a run handle"),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Evaluate automation rules for all active creators.
     Use with caution - this can trigger many actions.
+    With background=true returns a run_id; poll /admin/automation/evaluate-all/{run_id}.
     Admin-only endpoint.
     """
     current_user = await get_current_user(credentials, db)
     if not current_user:
         raise HTTPException(status_code=401, detail="Admin authentication required")
     
-    # Get all active creators
-    creators = await db.creators.find(
-        {"status": "active"},
-        {"_id": 0, "id": 1}
-    ).to_list(10000)
-    
-    total_triggered = 0
-    all_results = []
+    if background:
+        return await smart_automation_engine.start_evaluation_run(job_scheduler)
     
-    for creator in creators:
-        creator_id = creator.get("id")
-        triggered_rules = await smart_automation_engine.evaluate_creator_conditions(creator_id)
-        
-        if triggered_rules:
-            results = await smart_automation_engine.execute_triggered_rules(triggered_rules)
-            total_triggered += len(results)
-            all_results.extend(results)
+    return await smart_automation_engine.evaluate_all_creators()
+
+
+@api_router.get("/admin/automation/evaluate-all/{run_id}")
+async def get_automation_evaluation_run(
+    run_id: str,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Get progress or results of a background evaluate-all run.
+    Admin-only endpoint.
+    """
+    current_user = await get_current_user(credentials, db)
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Admin authentication required")
     
-    return {
-        "creators_evaluated": len(creators),
-        "total_rules_triggered": total_triggered,
-        "execution_results": all_results
-    }
+    run = await smart_automation_engine.get_evaluation_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Evaluation run not found")
+    return run
 
 
 @api_router.get("/admin/automation/log")
@@ -5258,14 +5594,21 @@ async def run_memory_consolidation(
     """
     Run memory consolidation to optimize storage and retrieval.
     Merges similar memories, summarizes old content, archives low-value memories.
+    A single creator is consolidated inline; the all-creator run is queued on
+    the job scheduler (it also runs nightly there) and returns the run id.
     Admin-only endpoint.
     """
     current_user = await get_current_user(credentials, db)
     if not current_user:
         raise HTTPException(status_code=401, detail="Admin authentication required")
     
-    results = await enhanced_memory_palace.run_consolidation(creator_id=creator_id)
-    return results
+    if creator_id:
+        return await enhanced_memory_palace.run_consolidation(creator_id=creator_id)
+    
+    result = await job_scheduler.run_now("memory_consolidation")
+    if not result["success"]:
+        raise HTTPException(status_code=409, detail=result["error"])
+    return result
 
 
 @api_router.get("/admin/memory/health")
@@ -5374,7 +5717,7 @@ async def search_memories(
     include_archived: bool = Query(default=False, description="Include archived memories"),
     sort_by: str = Query(default="relevance", description="Sort by: relevance, date, importance"),
     limit: int = Query(default=20, le=100, description="Maximum results"),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Full-text search across your ARRIS memories.
@@ -5401,11 +5744,11 @@ async def search_memories(
     **Pro Feature:** Requires Pro tier or higher for full search capabilities.
     Free tier limited to 10 results per search.
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check tier for feature access
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     is_paid_tier = tier.lower() in ["pro", "premium", "elite"]
     
     # Free tier limitations
@@ -5426,19 +5769,22 @@ async def search_memories(
     if sort_by not in ["relevance", "date", "importance"]:
         sort_by = "relevance"
     
-    results = await enhanced_memory_palace.search_memories(
-        creator_id=creator_id,
-        query=q,
-        memory_types=types_list,
-        tags=tags_list,
-        min_importance=min_importance,
-        date_from=date_from,
-        date_to=date_to,
-        include_archived=include_archived,
-        include_consolidated=True,
-        sort_by=sort_by,
-        limit=limit
-    )
+    try:
+        results = await enhanced_memory_palace.search_memories(
+            creator_id=creator_id,
+            query=q,
+            memory_types=types_list,
+            tags=tags_list,
+            min_importance=min_importance,
+            date_from=date_from,
+            date_to=date_to,
+            include_archived=include_archived,
+            include_consolidated=True,
+            sort_by=sort_by,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Add tier limitation info for free users
     if not is_paid_tier:
@@ -5477,7 +5823,7 @@ async def get_memory_search_suggestions(
 
 @api_router.get("/memory/search/analytics")
 async def get_memory_search_analytics(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Get your memory search analytics.
@@ -5491,11 +5837,11 @@ async def get_memory_search_analytics(
     
     **Pro Feature:** Requires Pro tier or higher.
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check tier for feature access
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     if tier.lower() not in ["pro", "premium", "elite"]:
         raise HTTPException(
             status_code=403,
@@ -5550,19 +5896,22 @@ async def admin_search_memories(
     if sort_by not in ["relevance", "date", "importance"]:
         sort_by = "relevance"
     
-    results = await enhanced_memory_palace.search_memories(
-        creator_id=creator_id,
-        query=q,
-        memory_types=types_list,
-        tags=tags_list,
-        min_importance=min_importance,
-        date_from=date_from,
-        date_to=date_to,
-        include_archived=include_archived,
-        include_consolidated=True,
-        sort_by=sort_by,
-        limit=limit
-    )
+    try:
+        results = await enhanced_memory_palace.search_memories(
+            creator_id=creator_id,
+            query=q,
+            memory_types=types_list,
+            tags=tags_list,
+            min_importance=min_importance,
+            date_from=date_from,
+            date_to=date_to,
+            include_archived=include_archived,
+            include_consolidated=True,
+            sort_by=sort_by,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Add creator info for admin context
     results["creator"] = creator
@@ -5639,7 +5988,7 @@ async def export_memories(
     include_patterns: bool = Query(default=True, description="Include pattern analysis"),
     include_metadata: bool = Query(default=True, description="Include memory metadata"),
     format: str = Query(default="json", description="Export format: json or portable"),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    principal: Dict[str, Any] = Depends(get_current_creator_principal)
 ):
     """
     Export your complete ARRIS memory profile.
@@ -5662,12 +6011,12 @@ async def export_memories(
     - Learning metrics
     - Integrity checksum for verification
     """
-    creator = await get_current_creator(credentials, db)
+    creator = principal["data"]
     creator_id = creator["id"]
     
     # Check tier - Elite gets full export, others get limited
     is_elite = await feature_gating.is_elite_tier(creator_id)
-    tier, _ = await feature_gating.get_creator_tier(creator_id)
+    tier = principal["tier"]
     
     # Free tier cannot export
     if tier.lower() == "free":
@@ -5853,16 +6202,19 @@ async def delete_memories(
             detail="At least one selection criteria required: memory_ids, memory_types, tags, or date_before"
         )
     
-    result = await enhanced_memory_palace.delete_memories(
-        creator_id=creator_id,
-        memory_ids=ids_list,
-        memory_types=types_list,
-        tags=tags_list,
-        date_before=date_before,
-        include_archived=include_archived,
-        reason="user_request",
-        permanent=permanent
-    )
+    try:
+        result = await enhanced_memory_palace.delete_memories(
+            creator_id=creator_id,
+            memory_ids=ids_list,
+            memory_types=types_list,
+            tags=tags_list,
+            date_before=date_before,
+            include_archived=include_archived,
+            reason="user_request",
+            permanent=permanent
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return result
 
@@ -6086,14 +6438,16 @@ async def admin_purge_expired_deletions(
     Permanently removes soft-deleted memories whose 30-day
     retention period has expired.
     
-    Should be run periodically (e.g., daily) for storage management.
+    Runs daily via the job scheduler; this queues an extra run there and
+    returns its run id (follow it in /admin/jobs/history).
     """
     current_user = await get_current_user(credentials, db)
     if not current_user:
         raise HTTPException(status_code=401, detail="Admin authentication required")
     
-    result = await enhanced_memory_palace.purge_expired_deletions()
-    
+    result = await job_scheduler.run_now("purge_expired_memories")
+    if not result["success"]:
+        raise HTTPException(status_code=409, detail=result["error"])
     return result
 
 
@@ -6286,54 +6640,19 @@ async def get_coach_kits(user_id: Optional[str] = None, limit: int = Query(defau
 
 @api_router.get("/dashboard")
 async def get_dashboard():
-    """Master dashboard - Zero-Human Operational Model overview"""
-    dashboard = {
+    """
+    Master dashboard - Zero-Human Operational Model overview.
+    Served from materialized counters; see "counters" for staleness.
+    """
+    snapshot = await dashboard_counters.get_snapshot()
+    
+    return {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "system_status": "Zero-Human Operational Model Active",
         "pattern_engine": "ARRIS Active",
         "self_funding_loop": "Active",
-        "stats": {}
+        **snapshot
     }
-    
-    # Collection counts
-    collections = [
-        "users", "projects", "tasks", "calculator", "subscriptions",
-        "customers", "affiliates", "arris_usage_log", "analytics",
-        "integrations", "marketing_campaigns"
-    ]
-    
-    for coll in collections:
-        dashboard["stats"][coll] = await db[coll].count_documents({})
-    
-    # Revenue summary
-    income = await db.calculator.aggregate([
-        {"$match": {"category": "Income"}},
-        {"$group": {"_id": None, "total": {"$sum": "$revenue"}}}
-    ]).to_list(1)
-    
-    expenses = await db.calculator.aggregate([
-        {"$match": {}},
-        {"$group": {"_id": None, "total": {"$sum": "$expenses"}}}
-    ]).to_list(1)
-    
-    dashboard["financials"] = {
-        "total_revenue": income[0]["total"] if income else 0,
-        "total_expenses": expenses[0]["total"] if expenses else 0,
-        "net_profit": (income[0]["total"] if income else 0) - (expenses[0]["total"] if expenses else 0)
-    }
-    
-    # ARRIS stats
-    arris_stats = await db.arris_usage_log.aggregate([
-        {"$group": {
-            "_id": None,
-            "total_queries": {"$sum": 1},
-            "avg_response_time": {"$avg": "$time_taken_s"}
-        }}
-    ]).to_list(1)
-    
-    dashboard["arris"] = arris_stats[0] if arris_stats else {"total_queries": 0, "avg_response_time": 0}
-    
-    return dashboard
 
 # ============== WEBSOCKET API ENDPOINTS ==============
 
@@ -6555,10 +6874,15 @@ async def delete_waitlist_signup(
 @api_router.get("/admin/waitlist/export")
 async def export_waitlist(
     status: Optional[str] = Query(default=None),
+    format: str = Query(default="json", description="json (inline list), csv or ndjson (streamed)"),
+    gzip: bool = Query(default=False, description="Gzip the streamed download"),
+    cursor: Optional[str] = Query(default=None, description="Resume a streamed export after this cursor"),
+    resumable: bool = Query(default=False, description="Add a resume_cursor column to streamed CSV"),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Export waitlist data (admin only).
+    format=csv / ndjson streams every signup without a row cap.
     """
     current_user = await get_current_user(credentials, db)
     if not current_user:
@@ -6567,6 +6891,17 @@ async def export_waitlist(
     if not waitlist_service_instance:
         raise HTTPException(status_code=503, detail="Waitlist service not initialized")
     
+    if format in ("csv", "ndjson"):
+        try:
+            rows = await waitlist_service_instance.stream_waitlist(
+                status=status, format=format, cursor=cursor, resumable=resumable
+            )
+        except ExportCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return export_stream_response(
+            rows, format, f"waitlist_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}", gzip=gzip
+        )
+    
     data = await waitlist_service_instance.export_waitlist(status=status)
     return data
 
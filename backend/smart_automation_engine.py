@@ -6,18 +6,29 @@ This module implements:
 1. Smart Automation Rules - Condition-based triggers with complex criteria
 2. Automated Proposal Recommendations - AI-generated improvement suggestions for rejected proposals
 3. Proactive Interventions - Automated actions based on pattern detection
+4. Bulk Evaluation - Metrics for all creators in one aggregation per chunk,
+   rule conditions evaluated as NumPy masks, one cooldown query per chunk,
+   bounded-concurrency action execution with a pollable run record
 """
 
 import os
+import uuid
 import logging
 import asyncio
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
+import numpy as np
 import json
 
 logger = logging.getLogger(__name__)
 
+APPROVED_STATUSES = ["approved", "completed", "in_progress"]
+
+BULK_EVALUATION_CHUNK_SIZE = int(os.environ.get("AUTOMATION_EVALUATION_CHUNK_SIZE", "1000"))
+AUTOMATION_ACTION_CONCURRENCY = int(os.environ.get("AUTOMATION_ACTION_CONCURRENCY", "10"))
+EVALUATION_RUN_JOB = "automation_evaluate_all"
+
 
 class ConditionType:
     """Types of conditions for smart automation rules"""
@@ -379,6 +390,348 @@ class SmartAutomationEngine:
         
         return recent_trigger is None
     
+    # ============== BULK EVALUATION ==============
+    
+    def _condition_rules(self) -> List[Dict[str, Any]]:
+        return [
+            rule for rule in self.smart_rules
+            if rule.get("trigger_type") in ("condition", "time_based")
+        ]
+    
+    @staticmethod
+    def _bulk_metrics_pipeline(creator_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Per-creator metric inputs in one pass over proposals.
+        Same definitions as _get_creator_metrics.
+        """
+        is_approved = {"$in": ["$status", APPROVED_STATUSES]}
+        return [
+            {"$match": {"user_id": {"$in": creator_ids}}},
+            {"$group": {
+                "_id": "$user_id",
+                "total_proposals": {"$sum": 1},
+                "approved_proposals": {"$sum": {"$cond": [is_approved, 1, 0]}},
+                "rejected_proposals": {"$sum": {"$cond": [{"$eq": ["$status", "rejected"]}, 1, 0]}},
+                "last_proposal_at": {"$max": "$created_at"},
+                "last_approval_at": {"$max": {"$cond": [
+                    is_approved, {"$ifNull": ["$updated_at", "$created_at"]}, None
+                ]}},
+                "last_approved_created_at": {"$max": {"$cond": [is_approved, "$created_at", None]}},
+                "rejected_created_at": {"$push": {"$cond": [
+                    {"$eq": ["$status", "rejected"]}, {"$ifNull": ["$created_at", ""]}, "$$REMOVE"
+                ]}}
+            }},
+            # Consecutive rejections = rejections newer than the latest approval
+            {"$project": {
+                "total_proposals": 1,
+                "approved_proposals": 1,
+                "rejected_proposals": 1,
+                "last_proposal_at": 1,
+                "last_approval_at": 1,
+                "consecutive_rejections": {"$size": {"$filter": {
+                    "input": "$rejected_created_at",
+                    "cond": {"$gt": ["$$this", {"$ifNull": ["$last_approved_created_at", ""]}]}
+                }}}
+            }}
+        ]
+    
+    @staticmethod
+    def _days_since(value: Optional[str], now: datetime, default: int) -> int:
+        if not value:
+            return default
+        try:
+            return (now - datetime.fromisoformat(value.replace("Z", "+00:00"))).days
+        except (ValueError, TypeError, AttributeError):
+            return default
+    
+    async def _get_bulk_creator_metrics(self, creator_ids: List[str]) -> List[Dict[str, Any]]:
+        """_get_creator_metrics for many creators: one aggregation + one subscription query"""
+        now = datetime.now(timezone.utc)
+        
+        rows = {}
+        async for row in self.db.proposals.aggregate(self._bulk_metrics_pipeline(creator_ids), allowDiskUse=True):
+            rows[row["_id"]] = row
+        
+        tiers = {}
+        async for sub in self.db.creator_subscriptions.find(
+            {"creator_id": {"$in": creator_ids}, "status": "active"},
+            {"_id": 0, "creator_id": 1, "tier": 1}
+        ):
+            tiers[sub["creator_id"]] = sub.get("tier", "Free")
+        
+        metrics = []
+        for creator_id in creator_ids:
+            row = rows.get(creator_id, {})
+            total = row.get("total_proposals", 0)
+            approved = row.get("approved_proposals", 0)
+            metrics.append({
+                "creator_id": creator_id,
+                "total_proposals": total,
+                "approved_proposals": approved,
+                "rejected_proposals": row.get("rejected_proposals", 0),
+                "approval_rate": round((approved / total * 100) if total > 0 else 0, 1),
+                "days_since_last_proposal": self._days_since(row.get("last_proposal_at"), now, 0),
+                "days_since_last_approval": self._days_since(row.get("last_approval_at"), now, 999),
+                "consecutive_rejections": row.get("consecutive_rejections", 0),
+                "tier": tiers.get(creator_id, "Free"),
+                "calculated_at": now.isoformat()
+            })
+        return metrics
+    
+    @staticmethod
+    def _metric_columns(metrics: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Numeric metric fields as float arrays (NaN where missing)"""
+        columns = {}
+        for field in metrics[0].keys() if metrics else []:
+            values = [m.get(field) for m in metrics]
+            if all(v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in values):
+                columns[field] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        return columns
+    
+    def _threshold_mask(
+        self,
+        condition: Dict,
+        columns: Dict[str, np.ndarray],
+        metrics: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Vectorized _evaluate_threshold over all creators"""
+        column = columns.get(condition.get("field"))
+        value = condition.get("value")
+        operator = condition.get("operator")
+        if column is None or not isinstance(value, (int, float)) or isinstance(value, bool):
+            # Non-numeric field or value: per-row fallback keeps exact semantics
+            return np.array([self._evaluate_threshold(condition, m) for m in metrics], dtype=bool)
+        
+        present = ~np.isnan(column)
+        with np.errstate(invalid="ignore"):
+            if operator == "lt":
+                mask = column < value
+            elif operator == "lte":
+                mask = column <= value
+            elif operator == "gt":
+                mask = column > value
+            elif operator == "gte":
+                mask = column >= value
+            elif operator == "eq":
+                mask = column == value
+            elif operator == "ne":
+                mask = column != value
+            else:
+                mask = np.zeros(len(column), dtype=bool)
+        return mask & present
+    
+    def _conditions_mask(
+        self,
+        conditions: Optional[Dict],
+        columns: Dict[str, np.ndarray],
+        metrics: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Vectorized _evaluate_conditions over all creators"""
+        if not conditions:
+            return np.ones(len(metrics), dtype=bool)
+        
+        if conditions.get("type") == ConditionType.COMPOSITE:
+            rules = conditions.get("rules", [])
+            if not rules:
+                return np.ones(len(metrics), dtype=bool)
+            masks = [self._threshold_mask(rule, columns, metrics) for rule in rules]
+            operator = conditions.get("operator", "AND")
+            if operator == "AND":
+                return np.logical_and.reduce(masks)
+            if operator == "OR":
+                return np.logical_or.reduce(masks)
+            return np.zeros(len(metrics), dtype=bool)
+        
+        return self._threshold_mask(conditions, columns, metrics)
+    
+    async def _get_cooldown_pairs(self, rules: List[Dict[str, Any]], creator_ids: List[str]) -> set:
+        """(rule_id, creator_id) pairs still in cooldown, in one query"""
+        cooldown_rules = {r["id"]: r.get("cooldown_hours", 0) for r in rules if r.get("cooldown_hours", 0) > 0}
+        if not cooldown_rules:
+            return set()
+        
+        now = datetime.now(timezone.utc)
+        oldest = (now - timedelta(hours=max(cooldown_rules.values()))).isoformat()
+        thresholds = {
+            rule_id: (now - timedelta(hours=hours)).isoformat()
+            for rule_id, hours in cooldown_rules.items()
+        }
+        
+        pairs = set()
+        cursor = self.db.smart_automation_log.aggregate([
+            {"$match": {
+                "rule_id": {"$in": list(cooldown_rules)},
+                "creator_id": {"$in": creator_ids},
+                "triggered_at": {"$gte": oldest}
+            }},
+            {"$group": {
+                "_id": {"rule_id": "$rule_id", "creator_id": "$creator_id"},
+                "last_triggered_at": {"$max": "$triggered_at"}
+            }}
+        ])
+        async for row in cursor:
+            key = row["_id"]
+            if row["last_triggered_at"] >= thresholds[key["rule_id"]]:
+                pairs.add((key["rule_id"], key["creator_id"]))
+        return pairs
+    
+    async def evaluate_creators_bulk(self, creator_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        evaluate_creator_conditions for many creators at once.
+        Returns the same triggered-rule entries, ready for execute_triggered_rules.
+        """
+        rules = self._condition_rules()
+        if not creator_ids or not rules:
+            return []
+        
+        metrics = await self._get_bulk_creator_metrics(creator_ids)
+        columns = self._metric_columns(metrics)
+        in_cooldown = await self._get_cooldown_pairs(rules, creator_ids)
+        triggered_at = datetime.now(timezone.utc).isoformat()
+        
+        triggered = []
+        for rule in rules:
+            mask = self._conditions_mask(rule.get("conditions"), columns, metrics)
+            for idx in np.flatnonzero(mask):
+                creator_id = creator_ids[idx]
+                if (rule["id"], creator_id) in in_cooldown:
+                    continue
+                triggered.append({
+                    "rule": rule,
+                    "creator_id": creator_id,
+                    "metrics": metrics[idx],
+                    "triggered_at": triggered_at
+                })
+        return triggered
+    
+    async def _execute_bounded(
+        self,
+        triggered_rules: List[Dict[str, Any]],
+        concurrency: int = AUTOMATION_ACTION_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """Execute triggered rules, up to `concurrency` creators at a time"""
+        by_creator: Dict[str, List[Dict[str, Any]]] = {}
+        for triggered in triggered_rules:
+            by_creator.setdefault(triggered["creator_id"], []).append(triggered)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(creator_triggers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # One creator's rules stay sequential (same order as before)
+            async with semaphore:
+                return await self.execute_triggered_rules(creator_triggers)
+        
+        batches = await asyncio.gather(*(run(t) for t in by_creator.values()))
+        return [result for batch in batches for result in batch]
+    
+    async def evaluate_all_creators(
+        self,
+        run_id: Optional[str] = None,
+        chunk_size: int = BULK_EVALUATION_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Evaluate and execute automation rules for all active creators, chunk by
+        chunk. Progress is written to automation_evaluation_runs when run_id is set.
+        """
+        started = datetime.now(timezone.utc)
+        creators = await self.db.creators.find(
+            {"status": "active"},
+            {"_id": 0, "id": 1}
+        ).to_list(None)
+        creator_ids = [c["id"] for c in creators if c.get("id")]
+        
+        if run_id:
+            await self.db.automation_evaluation_runs.update_one(
+                {"id": run_id}, {"$set": {"creators_total": len(creator_ids)}}
+            )
+        
+        all_results = []
+        evaluated = 0
+        for start in range(0, len(creator_ids), chunk_size):
+            chunk = creator_ids[start:start + chunk_size]
+            triggered = await self.evaluate_creators_bulk(chunk)
+            if triggered:
+                all_results.extend(await self._execute_bounded(triggered))
+            evaluated += len(chunk)
+            if run_id:
+                await self.db.automation_evaluation_runs.update_one(
+                    {"id": run_id},
+                    {"$set": {"creators_evaluated": evaluated, "total_rules_triggered": len(all_results)}}
+                )
+        
+        return {
+            "creators_evaluated": len(creator_ids),
+            "total_rules_triggered": len(all_results),
+            "execution_results": all_results,
+            "duration_seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 3)
+        }
+    
+    async def start_evaluation_run(self, job_scheduler) -> Dict[str, Any]:
+        """
+        Queue an evaluate_all_creators run and return a pollable handle.
+        
+        The run itself executes as the EVALUATION_RUN_JOB scheduler job, so it
+        holds the job lease and shows up in job_runs. If that job is already
+        running on some worker, the queued run is picked up by it or by the
+        job's next scheduled tick.
+        """
+        run_id = f"EVAL-{uuid.uuid4().hex[:10].upper()}"
+        await self.db.automation_evaluation_runs.insert_one({
+            "id": run_id,
+            "status": "queued",
+            "creators_total": None,
+            "creators_evaluated": 0,
+            "total_rules_triggered": 0,
+            "queued_at": datetime.now(timezone.utc).isoformat()
+        })
+        job = await job_scheduler.run_now(EVALUATION_RUN_JOB)
+        return {"run_id": run_id, "status": "queued", "job_run_id": job.get("run_id")}
+    
+    async def run_queued_evaluations(self) -> Dict[str, Any]:
+        """Scheduler job: run every queued evaluation, oldest first"""
+        completed = []
+        while True:
+            run = await self.db.automation_evaluation_runs.find_one_and_update(
+                {"status": "queued"},
+                {"$set": {"status": "running", "started_at": datetime.now(timezone.utc).isoformat()}},
+                sort=[("queued_at", 1)]
+            )
+            if not run:
+                return {"runs": completed}
+            await self._run_evaluation(run["id"])
+            completed.append(run["id"])
+    
+    async def _run_evaluation(self, run_id: str):
+        update = {"status": "failed", "error": "Evaluation did not finish"}
+        try:
+            result = await self.evaluate_all_creators(run_id=run_id)
+            update = {
+                "status": "completed",
+                "creators_evaluated": result["creators_evaluated"],
+                "total_rules_triggered": result["total_rules_triggered"],
+                "execution_results": result["execution_results"][:500],
+                "duration_seconds": result["duration_seconds"]
+            }
+        except asyncio.CancelledError:
+            update = {"status": "cancelled", "error": "Cancelled before completion"}
+            raise
+        except Exception as e:
+            logger.error(f"Automation evaluation run {run_id} failed: {e}")
+            update = {"status": "failed", "error": str(e)}
+        finally:
+            update["completed_at"] = datetime.now(timezone.utc).isoformat()
+            # Shielded so a cancelled run still records its final status
+            await asyncio.shield(
+                self.db.automation_evaluation_runs.update_one({"id": run_id}, {"$set": update})
+            )
+    
+    async def get_evaluation_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Progress / result of a background evaluation run"""
+        run = await self.db.automation_evaluation_runs.find_one({"id": run_id}, {"_id": 0})
+        if run and run.get("creators_total"):
+            run["progress_percent"] = round(run.get("creators_evaluated", 0) / run["creators_total"] * 100, 1)
+        return run
+    
     # ============== ACTION EXECUTION ==============
     
     async def execute_triggered_rules(self, triggered_rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -0,0 +1,272 @@
+"""
+Streaming Export Engine for Creators Hive HQ
+Cursor-driven CSV / NDJSON exports with flat memory use
+
+This module implements:
+- DocumentStream: keyset-paginated iteration over a Motor collection
+  (sort field + _id), so an export never holds more than one cursor batch
+- Opaque resume cursors: pass the last cursor seen back as ?cursor= to
+  continue an interrupted export after that record
+- CSV and NDJSON encoders that buffer rows into ~64KB chunks
+- Optional on-the-fly gzip
+- export_stream_response: wraps the chunks in a StreamingResponse with
+  download headers
+
+Resume cursors are delivered in-band:
+- NDJSON: a {"_export": {"cursor": ..., "records": n}} line every
+  EXPORT_CHECKPOINT_ROWS records and a final {"_export": {"complete": true}}
+- CSV: a trailing resume_cursor column when resumable=True
+"""
+
+import io
+import os
+import csv
+import json
+import zlib
+import base64
+import logging
+from typing import Dict, Any, List, Optional, Callable, Iterable, AsyncIterator, Union
+from bson import json_util
+from bson.errors import InvalidId
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "500"))
+EXPORT_CHUNK_BYTES = int(os.environ.get("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+EXPORT_CHECKPOINT_ROWS = int(os.environ.get("EXPORT_CHECKPOINT_ROWS", "1000"))
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_HEADERS = {
+    "Cache-Control": "no-store",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+class ExportCursorError(ValueError):
+    """Raised for a malformed or foreign resume cursor"""
+
+
+# ============== RESUME CURSORS ==============
+
+def encode_cursor(sort_field: str, sort_value: Any, doc_id: Any) -> str:
+    """Opaque, URL-safe token for the position after one record"""
+    raw = json_util.dumps([sort_field, sort_value, doc_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str):
+    """Inverse of encode_cursor; returns (sort_value, doc_id)"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        field, value, doc_id = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, InvalidId) as e:
+        raise ExportCursorError(f"Invalid export cursor: {e}")
+    if field != sort_field:
+        raise ExportCursorError("Export cursor belongs to a different export")
+    return value, doc_id
+
+
+# ============== DOCUMENT STREAM ==============
+
+class DocumentStream:
+    """
+    Async iterator over query results in (sort_field, _id) order.
+
+    Documents are yielded without _id. After each document, .cursor is the
+    resume token for the position just past it and .count the number of
+    documents yielded so far.
+    """
+
+    def __init__(
+        self,
+        collection,
+        query: Dict[str, Any],
+        sort_field: str,
+        projection: Optional[Dict[str, Any]] = None,
+        descending: bool = True,
+        cursor: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ):
+        self.collection = collection
+        self.sort_field = sort_field
+        self.descending = descending
+        self.batch_size = batch_size
+        self.projection = {k: v for k, v in (projection or {}).items() if k != "_id"} or None
+        # The sort field is needed for the resume cursor even if not exported
+        self._strip_sort = False
+        if self.projection and any(self.projection.values()) and sort_field not in self.projection:
+            self.projection[sort_field] = 1
+            self._strip_sort = True
+        self.count = 0
+        self.cursor = cursor
+
+        # Decode up front so a bad token fails before any bytes are sent
+        self.query = query
+        if cursor:
+            value, doc_id = decode_cursor(cursor, sort_field)
+            self.query = {"$and": [query, self._after(value, doc_id)]}
+
+    def _after(self, value: Any, doc_id: Any) -> Dict[str, Any]:
+        """Keyset filter for records strictly after (value, doc_id)"""
+        op = "$lt" if self.descending else "$gt"
+        field = self.sort_field
+        if value is None:
+            # Nulls sort last descending and first ascending
+            clauses = [{field: None, "_id": {op: doc_id}}]
+            if not self.descending:
+                clauses.append({field: {"$ne": None}})
+        else:
+            clauses = [{field: {op: value}}, {field: value, "_id": {op: doc_id}}]
+            if self.descending:
+                clauses.append({field: None})
+        return {"$or": clauses}
+
+    async def __aiter__(self):
+        direction = -1 if self.descending else 1
+        find = self.collection.find(self.query, self.projection)
+        find = find.sort([(self.sort_field, direction), ("_id", direction)]).batch_size(self.batch_size)
+
+        async for doc in find:
+            doc_id = doc.pop("_id")
+            self.count += 1
+            self.cursor = encode_cursor(self.sort_field, _lookup(doc, self.sort_field), doc_id)
+            if self._strip_sort:
+                doc.pop(self.sort_field.split(".")[0], None)
+            yield doc
+
+
+def _lookup(doc: Dict[str, Any], path: str) -> Any:
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+# ============== ENCODERS ==============
+
+class _ChunkBuffer:
+    """File-like sink that accumulates text until a chunk is ready"""
+
+    def __init__(self, chunk_bytes: int = EXPORT_CHUNK_BYTES):
+        self.chunk_bytes = chunk_bytes
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+
+    @property
+    def ready(self) -> bool:
+        return self._size >= self.chunk_bytes
+
+    def drain(self) -> bytes:
+        data = "".join(self._parts).encode("utf-8")
+        self._parts = []
+        self._size = 0
+        return data
+
+
+def csv_line(values: Iterable[Any]) -> str:
+    """One CSV record (with line terminator) as text"""
+    output = io.StringIO()
+    csv.writer(output).writerow(values)
+    return output.getvalue()
+
+
+async def chunked(pieces: Union[Iterable[str], AsyncIterator[str]]) -> AsyncIterator[bytes]:
+    """Coalesce text pieces (sync or async iterable) into byte chunks"""
+    buffer = _ChunkBuffer()
+    if hasattr(pieces, "__aiter__"):
+        async for piece in pieces:
+            buffer.write(piece)
+            if buffer.ready:
+                yield buffer.drain()
+    else:
+        for piece in pieces:
+            buffer.write(piece)
+            if buffer.ready:
+                yield buffer.drain()
+    tail = buffer.drain()
+    if tail:
+        yield tail
+
+
+async def csv_rows(
+    stream: DocumentStream,
+    fieldnames: List[str],
+    to_row: Callable[[Dict[str, Any]], Dict[str, Any]],
+    preamble: str = "",
+    resumable: bool = False
+) -> AsyncIterator[str]:
+    """CSV text for every document in the stream"""
+    if preamble:
+        yield preamble
+    columns = fieldnames + (["resume_cursor"] if resumable else [])
+    yield csv_line(columns)
+    async for doc in stream:
+        row = to_row(doc)
+        values = [row.get(name) for name in fieldnames]
+        if resumable:
+            values.append(stream.cursor)
+        yield csv_line(values)
+
+
+async def ndjson_rows(
+    stream: DocumentStream,
+    header: Optional[Dict[str, Any]] = None,
+    checkpoint_rows: int = EXPORT_CHECKPOINT_ROWS
+) -> AsyncIterator[str]:
+    """NDJSON text for every document, with periodic resume checkpoints"""
+    if header:
+        yield ndjson_line({"_export": header})
+    async for doc in stream:
+        yield ndjson_line(doc)
+        if stream.count % checkpoint_rows == 0:
+            yield ndjson_line({"_export": {"cursor": stream.cursor, "records": stream.count}})
+    yield ndjson_line({"_export": {"complete": True, "records": stream.count, "cursor": stream.cursor}})
+
+
+def ndjson_line(doc: Dict[str, Any]) -> str:
+    return json.dumps(doc, default=str) + "\n"
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a byte stream on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# ============== RESPONSE ==============
+
+def export_stream_response(
+    pieces: Union[Iterable[str], AsyncIterator[str]],
+    export_format: str,
+    filename_base: str,
+    gzip: bool = False
+) -> StreamingResponse:
+    """StreamingResponse download for CSV / NDJSON text pieces"""
+    filename = f"{filename_base}.{export_format}"
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    body = chunked(pieces)
+    if gzip:
+        body = gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={**EXPORT_HEADERS, "Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -25,6 +25,8 @@ from models_subscription import (
     CreatorSubscription,
     PaymentTransaction
 )
+from dashboard_counters import dashboard_counters
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +34,11 @@ logger = logging.getLogger(__name__)
 class StripeService:
     """Service for handling Stripe payments and subscriptions"""
     
-    def __init__(self, db):
+    def __init__(self, db, principal_cache=None, feature_gating=None, pattern_engine=None):
         self.db = db
+        self.principal_cache = principal_cache
+        self.feature_gating = feature_gating
+        self.pattern_engine = pattern_engine
         self.api_key = os.environ.get("STRIPE_API_KEY")
         if not self.api_key:
             logger.warning("STRIPE_API_KEY not set - Stripe features disabled")
@@ -341,6 +346,14 @@ class StripeService:
             }
         )
         
+        # Tier changed: drop cached entitlements so the next request sees it
+        if self.feature_gating:
+            self.feature_gating.invalidate_creator(creator_id)
+        if self.principal_cache:
+            self.principal_cache.invalidate_creator(creator_id)
+        if self.pattern_engine:
+            self.pattern_engine.invalidate_cohorts()
+        
         # Create Calculator entry (Self-Funding Loop)
         calculator_entry = {
             "id": f"CALC-SUB-{transaction.get('id', 'unknown')}",
@@ -360,6 +373,8 @@ class StripeService:
         }
         
         await self.db.calculator.insert_one(calculator_entry)
+        await dashboard_counters.record_calculator_entry(calculator_entry)
+        await time_series_rollups.record("calculator", calculator_entry)
         
         logger.info(f"Activated subscription {subscription_id} for creator {creator_id}, plan {plan_id}")
         logger.info(f"Created Calculator entry {calculator_entry['id']} for revenue ${amount}")
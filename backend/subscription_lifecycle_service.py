@@ -3,15 +3,32 @@ Subscription Lifecycle Automation Service (Module B3)
 =====================================================
 Auto-detects at-risk subscriptions and automates lifecycle management.
 Identifies churn risk, engagement drops, and triggers retention actions.
+
+Risk signals for many creators are gathered with three $group aggregations
+(proposals, support_tickets, payment_failures), scored in one NumPy pass
+and persisted to subscription_risk_snapshot, which the at-risk and metrics
+endpoints page through. The snapshot is refreshed by the job scheduler.
 """
 
+import time
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
+from pymongo import UpdateOne
+from index_registry import index_registry
+import numpy as np
 import uuid
 
 logger = logging.getLogger(__name__)
 
+index_registry.register("subscription_risk_snapshot", "creator_id", unique=True, owner="subscription_lifecycle")
+index_registry.register("subscription_risk_snapshot", [("risk_rank", 1), ("health_score", 1)], owner="subscription_lifecycle")
+index_registry.register_query(
+    "subscription_risk_snapshot", {"risk_rank": {"$lte": 2}},
+    sort=[("risk_rank", 1), ("health_score", 1)], owner="subscription_lifecycle"
+)
+
 
 # Risk levels
 class RiskLevel:
@@ -71,6 +88,14 @@ RISK_FACTORS = {
 }
 
 
+RISK_LEVEL_ORDER = [RiskLevel.CRITICAL, RiskLevel.HIGH, RiskLevel.MEDIUM, RiskLevel.LOW]
+
+# Job that rebuilds subscription_risk_snapshot; first-use builds share its lease
+RISK_SNAPSHOT_JOB = "subscription_risk_snapshot"
+
+RISK_SNAPSHOT_CHUNK_SIZE = 1000
+
+
 # Lifecycle stages
 class LifecycleStage:
     ONBOARDING = "onboarding"        # New subscriber (first 7 days)
@@ -131,11 +156,19 @@ class SubscriptionLifecycleService:
     Detects at-risk subscriptions and triggers retention actions.
     """
     
-    def __init__(self, db, email_service=None, ws_manager=None, notification_service=None):
+    def __init__(self, db, email_service=None, ws_manager=None, notification_service=None, principal_cache=None, feature_gating=None, pattern_engine=None):
         self.db = db
         self.email_service = email_service
         self.ws_manager = ws_manager
         self.notification_service = notification_service
+        self.principal_cache = principal_cache
+        self.feature_gating = feature_gating
+        self.pattern_engine = pattern_engine
+        self.job_scheduler = None  # set at startup, see set_job_scheduler
+    
+    def set_job_scheduler(self, job_scheduler):
+        """Serialize snapshot builds with the scheduled RISK_SNAPSHOT_JOB"""
+        self.job_scheduler = job_scheduler
     
     async def get_subscription_health(self, creator_id: str) -> Dict[str, Any]:
         """
@@ -192,106 +225,91 @@ class SubscriptionLifecycleService:
     async def get_at_risk_subscriptions(
         self,
         risk_threshold: str = RiskLevel.MEDIUM,
-        limit: int = 50
+        limit: int = 50,
+        offset: int = 0
     ) -> Dict[str, Any]:
         """
         Get all subscriptions at or above a given risk level.
         Used by admin dashboard for churn prevention.
+        Served (paginated) from subscription_risk_snapshot.
+        
+        Raises:
+            ValueError: risk_threshold is not a RiskLevel
         """
-        # Get all active subscriptions
-        subscriptions = await self.db.creator_subscriptions.find(
-            {"status": "active"},
-            {"_id": 0}
-        ).to_list(500)
+        if risk_threshold not in RISK_LEVEL_ORDER:
+            raise ValueError(
+                f"Invalid risk threshold '{risk_threshold}'. Use one of: {', '.join(RISK_LEVEL_ORDER)}"
+            )
+        meta = await self._ensure_risk_snapshot()
         
-        at_risk = []
-        for sub in subscriptions:
-            creator_id = sub.get("creator_id")
-            health = await self.get_subscription_health(creator_id)
-            
-            if health.get("error"):
-                continue
-            
-            risk_level = health.get("risk_level", RiskLevel.LOW)
-            
-            # Check if meets threshold
-            risk_order = [RiskLevel.CRITICAL, RiskLevel.HIGH, RiskLevel.MEDIUM, RiskLevel.LOW]
-            if risk_order.index(risk_level) <= risk_order.index(risk_threshold):
-                at_risk.append({
-                    "creator_id": creator_id,
-                    "email": sub.get("email"),
-                    "tier": sub.get("tier"),
-                    "health_score": health.get("health_score"),
-                    "risk_level": risk_level,
-                    "lifecycle_stage": health.get("lifecycle_stage"),
-                    "days_remaining": health.get("subscription", {}).get("days_remaining"),
-                    "top_risk_factors": self._get_top_risk_factors(health.get("risk_analysis", {})),
-                    "recommendations": health.get("recommendations", [])[:3]
-                })
-        
-        # Sort by risk (highest first)
-        risk_order_map = {RiskLevel.CRITICAL: 0, RiskLevel.HIGH: 1, RiskLevel.MEDIUM: 2, RiskLevel.LOW: 3}
-        at_risk.sort(key=lambda x: (risk_order_map.get(x["risk_level"], 4), x.get("health_score", 100)))
+        max_rank = RISK_LEVEL_ORDER.index(risk_threshold)
+        query = {"risk_rank": {"$lte": max_rank}}
+        
+        at_risk = await self.db.subscription_risk_snapshot.find(
+            query,
+            {"_id": 0, "refreshed_at": 0, "risk_rank": 0}
+        ).sort([("risk_rank", 1), ("health_score", 1)]).skip(offset).limit(limit).to_list(limit)
         
         # Count by risk level
-        risk_counts = {
-            "critical": len([x for x in at_risk if x["risk_level"] == RiskLevel.CRITICAL]),
-            "high": len([x for x in at_risk if x["risk_level"] == RiskLevel.HIGH]),
-            "medium": len([x for x in at_risk if x["risk_level"] == RiskLevel.MEDIUM]),
-            "low": len([x for x in at_risk if x["risk_level"] == RiskLevel.LOW])
-        }
+        risk_counts = {level: 0 for level in RISK_LEVEL_ORDER}
+        async for row in self.db.subscription_risk_snapshot.aggregate([
+            {"$match": query},
+            {"$group": {"_id": "$risk_level", "count": {"$sum": 1}}}
+        ]):
+            risk_counts[row["_id"]] = row["count"]
         
         return {
-            "at_risk_subscriptions": at_risk[:limit],
-            "total_at_risk": len(at_risk),
+            "at_risk_subscriptions": at_risk,
+            "total_at_risk": sum(risk_counts.values()),
             "risk_counts": risk_counts,
             "threshold_applied": risk_threshold,
-            "analyzed_at": datetime.now(timezone.utc).isoformat()
+            "offset": offset,
+            "limit": limit,
+            "analyzed_at": meta.get("refreshed_at"),
+            "snapshot": meta
         }
     
     async def get_lifecycle_metrics(self) -> Dict[str, Any]:
         """
         Get platform-wide lifecycle metrics for admin dashboard.
+        Health and stage counts come from subscription_risk_snapshot.
         """
-        # Get all subscriptions
-        all_subs = await self.db.creator_subscriptions.find({}, {"_id": 0}).to_list(1000)
-        
-        # Count by stage
-        stage_counts = {}
-        tier_counts = {}
-        health_distribution = {"healthy": 0, "at_risk": 0, "critical": 0}
+        meta = await self._ensure_risk_snapshot()
+        
+        tier_rows, snapshot_rows, churned_30d, total_active = await asyncio.gather(
+            self.db.creator_subscriptions.aggregate([
+                {"$group": {"_id": {"$ifNull": ["$tier", "free"]}, "count": {"$sum": 1}}}
+            ]).to_list(None),
+            self.db.subscription_risk_snapshot.aggregate([
+                {"$group": {
+                    "_id": "$lifecycle_stage",
+                    "count": {"$sum": 1},
+                    "healthy": {"$sum": {"$cond": [{"$gte": ["$health_score", 70]}, 1, 0]}},
+                    "critical": {"$sum": {"$cond": [{"$lt": ["$health_score", 40]}, 1, 0]}}
+                }}
+            ]).to_list(None),
+            self.db.creator_subscriptions.count_documents({
+                "status": "cancelled",
+                "cancelled_at": {"$gte": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()}
+            }),
+            self.db.creator_subscriptions.count_documents({"status": "active"})
+        )
         
-        for sub in all_subs:
-            tier = sub.get("tier", "free")
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
-            
-            # Analyze health for active subscriptions
-            if sub.get("status") == "active":
-                creator_id = sub.get("creator_id")
-                if creator_id:
-                    health = await self.get_subscription_health(creator_id)
-                    stage = health.get("lifecycle_stage", LifecycleStage.ENGAGED)
-                    stage_counts[stage] = stage_counts.get(stage, 0) + 1
-                    
-                    score = health.get("health_score", 50)
-                    if score >= 70:
-                        health_distribution["healthy"] += 1
-                    elif score >= 40:
-                        health_distribution["at_risk"] += 1
-                    else:
-                        health_distribution["critical"] += 1
+        tier_counts = {row["_id"]: row["count"] for row in tier_rows}
+        stage_counts = {row["_id"]: row["count"] for row in snapshot_rows}
+        healthy = sum(row["healthy"] for row in snapshot_rows)
+        critical = sum(row["critical"] for row in snapshot_rows)
+        health_distribution = {
+            "healthy": healthy,
+            "at_risk": sum(stage_counts.values()) - healthy - critical,
+            "critical": critical
+        }
         
         # Calculate churn metrics
-        churned_30d = await self.db.creator_subscriptions.count_documents({
-            "status": "cancelled",
-            "cancelled_at": {"$gte": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()}
-        })
-        
-        total_active = await self.db.creator_subscriptions.count_documents({"status": "active"})
         churn_rate = (churned_30d / max(total_active + churned_30d, 1)) * 100
         
         return {
-            "total_subscriptions": len(all_subs),
+            "total_subscriptions": sum(tier_counts.values()),
             "active_subscriptions": total_active,
             "lifecycle_stages": stage_counts,
             "tier_distribution": tier_counts,
@@ -301,9 +319,219 @@ class SubscriptionLifecycleService:
                 "churn_rate_30d": round(churn_rate, 2),
                 "at_risk_count": health_distribution["at_risk"] + health_distribution["critical"]
             },
-            "analyzed_at": datetime.now(timezone.utc).isoformat()
+            "analyzed_at": meta.get("refreshed_at"),
+            "snapshot": meta
         }
     
+    # ============== RISK SNAPSHOT ==============
+    
+    async def _ensure_risk_snapshot(self) -> Dict[str, Any]:
+        """Snapshot metadata; builds the snapshot first if it has never run"""
+        meta = await self.db.subscription_risk_snapshot_runs.find_one({"_id": "latest"}, {"_id": 0})
+        if meta is not None:
+            return meta
+        
+        if self.job_scheduler is None:
+            return await self.refresh_risk_snapshot()
+        
+        # Build under the job's lease: two concurrent refreshes would each
+        # delete the rows the other wrote (refreshed_at != its own)
+        run = await self.job_scheduler.run_inline(RISK_SNAPSHOT_JOB)
+        if run.get("success"):
+            return run["result"]
+        
+        # Another worker is building it; serve whatever exists so far
+        meta = await self.db.subscription_risk_snapshot_runs.find_one({"_id": "latest"}, {"_id": 0})
+        return meta or {"refreshed_at": None, "building": True}
+    
+    async def refresh_risk_snapshot(self) -> Dict[str, Any]:
+        """
+        Score every active subscription and rewrite subscription_risk_snapshot.
+        Run by the job scheduler; processes subscriptions in chunks.
+        """
+        start = time.monotonic()
+        refreshed_at = datetime.now(timezone.utc).isoformat()
+        scored = 0
+        
+        cursor = self.db.creator_subscriptions.find({"status": "active"}, {"_id": 0})
+        while True:
+            chunk = await cursor.to_list(RISK_SNAPSHOT_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunk = [sub for sub in chunk if sub.get("creator_id")]
+            rows = await self.score_subscriptions(chunk)
+            if rows:
+                await self.db.subscription_risk_snapshot.bulk_write([
+                    UpdateOne(
+                        {"creator_id": row["creator_id"]},
+                        {"$set": {**row, "refreshed_at": refreshed_at}},
+                        upsert=True
+                    )
+                    for row in rows
+                ], ordered=False)
+            scored += len(rows)
+        
+        # Drop subscriptions that are no longer active
+        removed = await self.db.subscription_risk_snapshot.delete_many(
+            {"refreshed_at": {"$ne": refreshed_at}}
+        )
+        
+        meta = {
+            "refreshed_at": refreshed_at,
+            "subscriptions_scored": scored,
+            "removed": removed.deleted_count,
+            "duration_seconds": round(time.monotonic() - start, 3)
+        }
+        await self.db.subscription_risk_snapshot_runs.update_one(
+            {"_id": "latest"}, {"$set": meta}, upsert=True
+        )
+        logger.info(f"Subscription risk snapshot: {scored} scored in {meta['duration_seconds']}s")
+        return meta
+    
+    async def score_subscriptions(self, subscriptions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch of subscriptions (same scoring as get_subscription_health)"""
+        if not subscriptions:
+            return []
+        
+        creator_ids = [sub["creator_id"] for sub in subscriptions]
+        signals = await self._gather_risk_signals(creator_ids)
+        now = datetime.now(timezone.utc)
+        
+        columns = {
+            "inactivity_days": np.array([signals[c]["days_inactive"] for c in creator_ids], dtype=np.float64),
+            "proposal_decline_rate": np.array([signals[c]["decline_rate"] for c in creator_ids], dtype=np.float64),
+            "engagement_drop": np.array([signals[c]["engagement_drop"] for c in creator_ids], dtype=np.float64),
+            "support_tickets": np.array([signals[c]["open_tickets"] for c in creator_ids], dtype=np.float64),
+            "payment_failures": np.array([signals[c]["payment_failures"] for c in creator_ids], dtype=np.float64),
+        }
+        factor_scores = {name: self._factor_scores_vector(name, values) for name, values in columns.items()}
+        factor_status = {name: self._factor_status_vector(name, values) for name, values in columns.items()}
+        
+        max_risk = sum(RISK_FACTORS[f]["weight"] for f in RISK_FACTORS)
+        total_risk = np.sum(list(factor_scores.values()), axis=0)
+        health_scores = np.clip((100 - (total_risk / max_risk) * 100).astype(int), 0, 100)
+        
+        analysis_keys = {
+            "inactivity_days": "inactivity",
+            "proposal_decline_rate": "proposal_performance",
+            "engagement_drop": "engagement",
+            "support_tickets": "support_issues",
+            "payment_failures": "payment_health",
+        }
+        
+        rows = []
+        for idx, sub in enumerate(subscriptions):
+            creator_id = creator_ids[idx]
+            scored = {
+                key: {"risk_score": float(factor_scores[name][idx]), "status": str(factor_status[name][idx])}
+                for name, key in analysis_keys.items()
+            }
+            risk_analysis = self._risk_factors_from_signals(signals[creator_id], scored)
+            health_score = int(health_scores[idx])
+            risk_level = self._score_to_risk_level(health_score)
+            stage = self._stage_from_risk(sub, float(total_risk[idx]) / max_risk * 100, now)
+            rows.append({
+                "creator_id": creator_id,
+                "email": sub.get("email"),
+                "tier": sub.get("tier"),
+                "health_score": health_score,
+                "risk_level": risk_level,
+                "risk_rank": RISK_LEVEL_ORDER.index(risk_level),
+                "lifecycle_stage": stage,
+                "days_remaining": self._days_until(sub.get("current_period_end")),
+                "top_risk_factors": self._get_top_risk_factors(risk_analysis),
+                "recommendations": self._get_recommendations(stage, risk_analysis)[:3]
+            })
+        return rows
+    
+    async def _gather_risk_signals(self, creator_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Raw risk inputs for many creators in three aggregations"""
+        now = datetime.now(timezone.utc)
+        current_start = (now - timedelta(days=30)).isoformat()
+        prev_start = (now - timedelta(days=60)).isoformat()
+        
+        proposal_rows, ticket_rows, failure_rows = await asyncio.gather(
+            self.db.proposals.aggregate([
+                {"$match": {"user_id": {"$in": creator_ids}}},
+                {"$group": {
+                    "_id": "$user_id",
+                    "total": {"$sum": 1},
+                    "rejected": {"$sum": {"$cond": [{"$eq": ["$status", "rejected"]}, 1, 0]}},
+                    "last_created_at": {"$max": "$created_at"},
+                    "current_30d": {"$sum": {"$cond": [{"$gte": ["$created_at", current_start]}, 1, 0]}},
+                    "previous_30d": {"$sum": {"$cond": [{"$and": [
+                        {"$gte": ["$created_at", prev_start]},
+                        {"$lt": ["$created_at", current_start]}
+                    ]}, 1, 0]}}
+                }}
+            ], allowDiskUse=True).to_list(None),
+            self.db.support_tickets.aggregate([
+                {"$match": {"creator_id": {"$in": creator_ids}, "status": {"$ne": "resolved"}}},
+                {"$group": {"_id": "$creator_id", "count": {"$sum": 1}}}
+            ]).to_list(None),
+            self.db.payment_failures.aggregate([
+                {"$match": {
+                    "creator_id": {"$in": creator_ids},
+                    "created_at": {"$gte": (now - timedelta(days=90)).isoformat()}
+                }},
+                {"$group": {"_id": "$creator_id", "count": {"$sum": 1}}}
+            ]).to_list(None)
+        )
+        
+        proposals = {row["_id"]: row for row in proposal_rows}
+        tickets = {row["_id"]: row["count"] for row in ticket_rows}
+        failures = {row["_id"]: row["count"] for row in failure_rows}
+        
+        signals = {}
+        for creator_id in creator_ids:
+            row = proposals.get(creator_id, {})
+            total = row.get("total", 0)
+            rejected = row.get("rejected", 0)
+            
+            # Inactivity: no proposal on record counts as 30 days
+            days_inactive = 30
+            last_created = row.get("last_created_at")
+            if isinstance(last_created, str):
+                try:
+                    days_inactive = (now - datetime.fromisoformat(last_created.replace("Z", "+00:00"))).days
+                except ValueError:
+                    pass
+            
+            # Engagement: drop from previous 30 days to the last 30 (positive only)
+            prev_count = row.get("previous_30d", 0)
+            engagement_drop = max(0, (prev_count - row.get("current_30d", 0)) / prev_count) if prev_count else 0
+            
+            signals[creator_id] = {
+                "days_inactive": days_inactive,
+                "total_proposals": total,
+                "rejected": rejected,
+                "decline_rate": rejected / total if total else 0,
+                "engagement_drop": engagement_drop,
+                "open_tickets": tickets.get(creator_id, 0),
+                "payment_failures": failures.get(creator_id, 0),
+            }
+        return signals
+    
+    def _factor_scores_vector(self, factor_name: str, values: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_factor_score"""
+        factor = RISK_FACTORS[factor_name]
+        weight = factor["weight"]
+        thresholds = factor["thresholds"]
+        return np.select(
+            [values >= thresholds["critical"], values >= thresholds["high"], values >= thresholds["medium"]],
+            [weight, weight * 0.75, weight * 0.5],
+            default=weight * 0.25
+        )
+    
+    def _factor_status_vector(self, factor_name: str, values: np.ndarray) -> np.ndarray:
+        """Vectorized _get_factor_status"""
+        thresholds = RISK_FACTORS[factor_name]["thresholds"]
+        return np.select(
+            [values >= thresholds["critical"], values >= thresholds["high"], values >= thresholds["medium"]],
+            ["critical", "high", "medium"],
+            default="low"
+        )
+    
     async def trigger_retention_action(
         self,
         creator_id: str,
@@ -399,6 +627,13 @@ class SubscriptionLifecycleService:
         if result.modified_count == 0:
             return {"success": False, "error": "Subscription not found or unchanged"}
         
+        if self.feature_gating:
+            self.feature_gating.invalidate_creator(creator_id)
+        if self.principal_cache:
+            self.principal_cache.invalidate_creator(creator_id)
+        if self.pattern_engine:
+            self.pattern_engine.invalidate_cohorts()
+        
         # Log transition
         await self.db.lifecycle_transitions.insert_one({
             "id": f"LCT-{uuid.uuid4().hex[:8].upper()}",
@@ -430,75 +665,56 @@ class SubscriptionLifecycleService:
         subscription: Dict
     ) -> Dict[str, Any]:
         """Analyze individual risk factors for a subscription."""
-        now = datetime.now(timezone.utc)
-        risk_factors = {}
-        
-        # 1. Inactivity analysis
-        last_activity = await self._get_last_activity_date(creator_id)
-        if last_activity:
-            days_inactive = (now - last_activity).days
-        else:
-            days_inactive = 30  # Assume inactive if no activity found
-        
-        risk_factors["inactivity"] = {
-            "days_inactive": days_inactive,
-            "risk_score": self._calculate_factor_score("inactivity_days", days_inactive),
-            "status": self._get_factor_status("inactivity_days", days_inactive)
-        }
-        
-        # 2. Proposal decline rate
-        proposals = await self.db.proposals.find(
-            {"user_id": creator_id},
-            {"status": 1}
-        ).to_list(100)
-        
-        if proposals:
-            rejected = len([p for p in proposals if p.get("status") == "rejected"])
-            decline_rate = rejected / len(proposals)
-        else:
-            decline_rate = 0
-        
-        risk_factors["proposal_performance"] = {
-            "total_proposals": len(proposals),
-            "rejected": rejected if proposals else 0,
-            "decline_rate": round(decline_rate, 2),
-            "risk_score": self._calculate_factor_score("proposal_decline_rate", decline_rate),
-            "status": self._get_factor_status("proposal_decline_rate", decline_rate)
-        }
-        
-        # 3. Engagement trend (compare last 30 days to previous 30)
-        engagement_drop = await self._calculate_engagement_drop(creator_id)
-        risk_factors["engagement"] = {
-            "engagement_drop": round(engagement_drop, 2),
-            "risk_score": self._calculate_factor_score("engagement_drop", engagement_drop),
-            "status": self._get_factor_status("engagement_drop", engagement_drop)
-        }
-        
-        # 4. Support tickets (simplified - count recent issues)
-        tickets = await self.db.support_tickets.count_documents({
-            "creator_id": creator_id,
-            "status": {"$ne": "resolved"}
-        })
-        
-        risk_factors["support_issues"] = {
-            "open_tickets": tickets,
-            "risk_score": self._calculate_factor_score("support_tickets", tickets),
-            "status": self._get_factor_status("support_tickets", tickets)
-        }
-        
-        # 5. Payment failures
-        payment_failures = await self.db.payment_failures.count_documents({
-            "creator_id": creator_id,
-            "created_at": {"$gte": (now - timedelta(days=90)).isoformat()}
-        })
+        signals = await self._gather_risk_signals([creator_id])
+        return self._risk_factors_from_signals(signals[creator_id])
+    
+    def _risk_factors_from_signals(
+        self,
+        signals: Dict[str, Any],
+        scored: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the risk_analysis dict from gathered signals. scored maps each
+        analysis key to a precomputed {"risk_score", "status"} (from the
+        vectorized scorers); without it each factor is scored here.
+        """
+        def factor(key: str, factor_name: str, value: float) -> Dict[str, Any]:
+            if scored:
+                return scored[key]
+            return {
+                "risk_score": self._calculate_factor_score(factor_name, value),
+                "status": self._get_factor_status(factor_name, value)
+            }
         
-        risk_factors["payment_health"] = {
-            "recent_failures": payment_failures,
-            "risk_score": self._calculate_factor_score("payment_failures", payment_failures),
-            "status": self._get_factor_status("payment_failures", payment_failures)
+        return {
+            # 1. Inactivity analysis
+            "inactivity": {
+                "days_inactive": signals["days_inactive"],
+                **factor("inactivity", "inactivity_days", signals["days_inactive"])
+            },
+            # 2. Proposal decline rate
+            "proposal_performance": {
+                "total_proposals": signals["total_proposals"],
+                "rejected": signals["rejected"],
+                "decline_rate": round(signals["decline_rate"], 2),
+                **factor("proposal_performance", "proposal_decline_rate", signals["decline_rate"])
+            },
+            # 3. Engagement trend (last 30 days vs previous 30)
+            "engagement": {
+                "engagement_drop": round(signals["engagement_drop"], 2),
+                **factor("engagement", "engagement_drop", signals["engagement_drop"])
+            },
+            # 4. Support tickets (unresolved)
+            "support_issues": {
+                "open_tickets": signals["open_tickets"],
+                **factor("support_issues", "support_tickets", signals["open_tickets"])
+            },
+            # 5. Payment failures (last 90 days)
+            "payment_health": {
+                "recent_failures": signals["payment_failures"],
+                **factor("payment_health", "payment_failures", signals["payment_failures"])
+            }
         }
-        
-        return risk_factors
     
     async def _determine_lifecycle_stage(
         self,
@@ -508,8 +724,19 @@ class SubscriptionLifecycleService:
         risk_analysis: Dict
     ) -> str:
         """Determine the current lifecycle stage based on data."""
-        now = datetime.now(timezone.utc)
+        # Calculate overall risk score
+        total_score = sum(
+            factor.get("risk_score", 0) for factor in risk_analysis.values()
+        )
+        
+        # Normalize to 0-100 (lower is better)
+        max_possible = sum(RISK_FACTORS[f]["weight"] for f in RISK_FACTORS)
+        risk_percentage = (total_score / max_possible) * 100
         
+        return self._stage_from_risk(subscription, risk_percentage, datetime.now(timezone.utc))
+    
+    def _stage_from_risk(self, subscription: Dict, risk_percentage: float, now: datetime) -> str:
+        """Lifecycle stage from subscription status/age and risk percentage"""
         # Check subscription status first
         status = subscription.get("status", "active")
         if status == "cancelled":
@@ -539,15 +766,6 @@ class SubscriptionLifecycleService:
         if age_days <= 30:
             return LifecycleStage.ACTIVATION
         
-        # Calculate overall risk score
-        total_score = sum(
-            factor.get("risk_score", 0) for factor in risk_analysis.values()
-        )
-        
-        # Normalize to 0-100 (lower is better)
-        max_possible = sum(RISK_FACTORS[f]["weight"] for f in RISK_FACTORS)
-        risk_percentage = (total_score / max_possible) * 100
-        
         # Determine stage based on risk
         if risk_percentage >= 70:
             return LifecycleStage.CHURNING
@@ -675,52 +893,6 @@ class SubscriptionLifecycleService:
                 factors.append(name)
         return factors[:3]
     
-    async def _get_last_activity_date(self, creator_id: str) -> Optional[datetime]:
-        """Get the last activity date for a creator."""
-        # Check proposals
-        last_proposal = await self.db.proposals.find_one(
-            {"user_id": creator_id},
-            {"created_at": 1},
-            sort=[("created_at", -1)]
-        )
-        
-        if last_proposal and last_proposal.get("created_at"):
-            try:
-                return datetime.fromisoformat(last_proposal["created_at"].replace("Z", "+00:00"))
-            except:
-                pass
-        
-        return None
-    
-    async def _calculate_engagement_drop(self, creator_id: str) -> float:
-        """Calculate engagement drop between current and previous periods."""
-        now = datetime.now(timezone.utc)
-        
-        # Current 30-day period
-        current_start = now - timedelta(days=30)
-        current_count = await self.db.proposals.count_documents({
-            "user_id": creator_id,
-            "created_at": {"$gte": current_start.isoformat()}
-        })
-        
-        # Previous 30-day period
-        prev_start = now - timedelta(days=60)
-        prev_end = now - timedelta(days=30)
-        prev_count = await self.db.proposals.count_documents({
-            "user_id": creator_id,
-            "created_at": {
-                "$gte": prev_start.isoformat(),
-                "$lt": prev_end.isoformat()
-            }
-        })
-        
-        if prev_count == 0:
-            return 0  # No previous activity to compare
-        
-        # Calculate drop percentage
-        drop = (prev_count - current_count) / prev_count
-        return max(0, drop)  # Only return positive drops
-    
     def _days_until(self, date_str: str) -> Optional[int]:
         """Calculate days until a date."""
         if not date_str:
@@ -0,0 +1,81 @@
+"""
+Login Throughput Benchmark
+Fires a burst of concurrent creator logins while pinging a cheap endpoint,
+to show whether password hashing stalls the event loop.
+
+Usage:
+    REACT_APP_BACKEND_URL=http://localhost:8001 python tests/benchmark_login_throughput.py --logins 50
+
+Reports login throughput plus the worst and p95 latency of /api/ pings sent
+during the burst. With bcrypt on the event loop the ping latency grows with
+the burst size; with the password thread pool it stays flat.
+"""
+
+import os
+import time
+import argparse
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://aigenthq-1.preview.emergentagent.com').rstrip('/')
+
+CREATOR = {
+    "email": "elitetest@hivehq.com",
+    "password": "testpassword123"
+}
+
+
+def login(session: requests.Session) -> float:
+    start = time.perf_counter()
+    response = session.post(f"{BASE_URL}/api/creators/login", json=CREATOR, timeout=60)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def ping_until(stop: threading.Event, latencies: list):
+    session = requests.Session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        session.get(f"{BASE_URL}/api/", timeout=30)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.02)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent login throughput")
+    parser.add_argument("--logins", type=int, default=50, help="Logins in the burst")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent login clients")
+    args = parser.parse_args()
+
+    # Warm up (connection setup, first hash)
+    login(requests.Session())
+
+    stop = threading.Event()
+    ping_latencies = []
+    pinger = threading.Thread(target=ping_until, args=(stop, ping_latencies))
+    pinger.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        login_latencies = list(pool.map(lambda _: login(requests.Session()), range(args.logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    pinger.join()
+
+    def ms(value):
+        return f"{value * 1000:.0f} ms"
+
+    print(f"Logins:            {args.logins} in {elapsed:.2f}s ({args.logins / elapsed:.1f}/s)")
+    print(f"Login latency:     p50 {ms(statistics.median(login_latencies))}, max {ms(max(login_latencies))}")
+    if ping_latencies:
+        ping_sorted = sorted(ping_latencies)
+        p95 = ping_sorted[int(len(ping_sorted) * 0.95) - 1] if len(ping_sorted) > 1 else ping_sorted[0]
+        print(f"Ping during burst: {len(ping_latencies)} pings, p95 {ms(p95)}, max {ms(max(ping_latencies))}")
+
+
+if __name__ == "__main__":
+    main()
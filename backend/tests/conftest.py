@@ -0,0 +1,12 @@
+"""
+Shared pytest configuration for backend tests.
+Unit tests import backend modules directly, so the backend directory must
+be importable however pytest is invoked.
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
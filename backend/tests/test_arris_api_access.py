@@ -357,7 +357,26 @@ class TestArrisApiAccess:
         assert "processing_time_ms" in data
         
         print(f"✅ Text analysis successful: {data['request_id']} ({data['processing_time_ms']}ms)")
-    
+
+    def test_15a_analyze_returns_rate_limit_headers(self):
+        """API responses carry X-RateLimit-* headers"""
+        if not TestArrisApiAccess.created_api_key:
+            pytest.skip("No API key available")
+
+        response = requests.post(
+            f"{BASE_URL}/api/elite/arris-api/analyze",
+            headers={"X-ARRIS-API-Key": TestArrisApiAccess.created_api_key},
+            json={"text": "Short text for rate limit header check"}
+        )
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        assert response.headers.get("X-RateLimit-Limit") == "100"
+        remaining = int(response.headers.get("X-RateLimit-Remaining", -1))
+        assert 0 <= remaining < 100
+        assert int(response.headers.get("X-RateLimit-Reset", 0)) > 0
+        assert "Retry-After" not in response.headers
+        print(f"✅ Rate limit headers present: {remaining} remaining")
+
     def test_16_analyze_missing_text(self):
         """Analyze endpoint returns 400 without text"""
         if not TestArrisApiAccess.created_api_key:
@@ -395,7 +414,34 @@ class TestArrisApiAccess:
         assert "conversation_id" in data
         
         print(f"✅ Chat successful: {data['conversation_id']}")
-    
+
+    def test_17a_chat_streaming(self):
+        """Chat endpoint streams Server-Sent Events with ?stream=true"""
+        if not TestArrisApiAccess.created_api_key:
+            pytest.skip("No API key available")
+
+        response = requests.post(
+            f"{BASE_URL}/api/elite/arris-api/chat?stream=true",
+            headers={"X-ARRIS-API-Key": TestArrisApiAccess.created_api_key},
+            json={"message": "Give me one tip for growing a podcast."},
+            stream=True
+        )
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+        assert response.headers.get("content-type", "").startswith("text/event-stream")
+
+        events = [
+            line[len("event: "):]
+            for line in response.iter_lines(decode_unicode=True)
+            if line and line.startswith("event: ")
+        ]
+
+        assert events[0] == "start"
+        assert "token" in events
+        assert events[-1] == "complete"
+
+        print(f"✅ Streaming chat: {events.count('token')} token events")
+
     def test_18_chat_missing_message(self):
         """Chat endpoint returns 400 without message"""
         if not TestArrisApiAccess.created_api_key:
@@ -0,0 +1,144 @@
+"""
+Test Module: ARRIS Priority Queue
+FAST (Premium/Elite) lane ordering and wait times against STANDARD work.
+Unit tests against ArrisPriorityQueue with a single provider slot.
+"""
+
+import asyncio
+
+from arris_service import ArrisPriorityQueue, ProcessingPriority
+
+FAST = ProcessingPriority.FAST
+STANDARD = ProcessingPriority.STANDARD
+
+
+def make_queue(workers=3, provider_slots=1, fast_weight=3):
+    return ArrisPriorityQueue(
+        max_concurrent=workers,
+        max_queue_size=100,
+        fast_weight=fast_weight,
+        provider_limits={"openai": provider_slots}
+    )
+
+
+class TestFastLane:
+    """Premium jobs overtake standard jobs still waiting for a provider slot"""
+
+    def test_fast_overtakes_standard_waiting_on_provider(self):
+        """Idle workers must not pull standard jobs off the queue while the provider is busy"""
+        order = []
+
+        async def scenario():
+            queue = make_queue(workers=3, provider_slots=1)
+            gate = asyncio.Event()
+
+            async def blocker():
+                order.append("blocker")
+                await gate.wait()
+
+            def job(name):
+                async def run():
+                    order.append(name)
+                return run
+
+            first = asyncio.ensure_future(queue.submit("blocker", STANDARD, blocker))
+            await asyncio.sleep(0.01)
+            standard = [
+                asyncio.ensure_future(queue.submit(f"std-{i}", STANDARD, job(f"std-{i}")))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            fast = asyncio.ensure_future(queue.submit("fast", FAST, job("fast")))
+            await asyncio.sleep(0.01)
+
+            # Both standard jobs are still queued, not held by blocked workers
+            assert len(queue.standard_queue) == 2
+            gate.set()
+            await asyncio.gather(first, fast, *standard)
+            await queue.shutdown()
+
+        asyncio.run(scenario())
+        assert order == ["blocker", "fast", "std-0", "std-1"]
+        print("✓ FAST job runs ahead of queued STANDARD jobs")
+
+    def test_weighted_fair_share(self):
+        """fast_weight FAST jobs per STANDARD job while both lanes are waiting"""
+        order = []
+
+        async def scenario():
+            queue = make_queue(workers=1, provider_slots=1, fast_weight=2)
+            gate = asyncio.Event()
+
+            async def blocker():
+                await gate.wait()
+
+            def job(name):
+                async def run():
+                    order.append(name)
+                return run
+
+            first = asyncio.ensure_future(queue.submit("blocker", STANDARD, blocker))
+            await asyncio.sleep(0.01)
+            jobs = [
+                asyncio.ensure_future(queue.submit(f"std-{i}", STANDARD, job(f"std-{i}")))
+                for i in range(3)
+            ] + [
+                asyncio.ensure_future(queue.submit(f"fast-{i}", FAST, job(f"fast-{i}")))
+                for i in range(4)
+            ]
+            gate.set()
+            await asyncio.gather(first, *jobs)
+            await queue.shutdown()
+
+        asyncio.run(scenario())
+        assert order == ["fast-0", "fast-1", "std-0", "fast-2", "fast-3", "std-1", "std-2"]
+        print("✓ Weighted-fair lane selection")
+
+    def test_fast_wait_lower_under_standard_backlog(self):
+        """Mixed load: average FAST queue wait is well below STANDARD wait"""
+
+        async def scenario():
+            queue = make_queue(workers=4, provider_slots=2, fast_weight=3)
+
+            async def work():
+                await asyncio.sleep(0.005)
+
+            jobs = []
+            for i in range(24):
+                jobs.append(queue.submit(f"std-{i}", STANDARD, work))
+                if i % 3 == 0:
+                    jobs.append(queue.submit(f"fast-{i}", FAST, work))
+            await asyncio.gather(*jobs)
+            await queue.shutdown()
+            return queue.stats.get_stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["fast_requests"] == 8
+        assert stats["avg_fast_wait_time"] < stats["avg_standard_wait_time"] / 2
+        print(f"✓ FAST wait {stats['avg_fast_wait_time']:.3f}s vs STANDARD {stats['avg_standard_wait_time']:.3f}s")
+
+    def test_provider_slots_released(self):
+        """Provider slots are returned after success and failure alike"""
+
+        async def scenario():
+            queue = make_queue(workers=2, provider_slots=1)
+
+            async def ok():
+                return "ok"
+
+            async def boom():
+                raise RuntimeError("provider error")
+
+            results = await asyncio.gather(
+                queue.submit("a", STANDARD, boom),
+                queue.submit("b", FAST, ok),
+                return_exceptions=True
+            )
+            active = queue.get_queue_stats()["provider_active"]
+            await queue.shutdown()
+            return results, active
+
+        results, active = asyncio.run(scenario())
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == "ok"
+        assert active == {"openai": 0}
@@ -454,28 +454,30 @@ class TestEscalationScan:
         else:
             pytest.skip("Could not authenticate as admin")
     
-    def test_scan_runs_successfully(self):
-        """POST /api/admin/escalation/scan - Runs full escalation scan"""
+    def test_scan_is_queued(self):
+        """POST /api/admin/escalation/scan - Queues a full scan on the job scheduler"""
         response = self.session.post(f"{BASE_URL}/api/admin/escalation/scan", headers=self.headers)
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
-        
-        data = response.json()
-        expected_fields = ["scanned", "needs_escalation", "escalated", "errors"]
-        for field in expected_fields:
-            assert field in data, f"Scan result should contain '{field}'"
+        # 409 when a scan is already running
+        assert response.status_code in [200, 409], f"Expected 200/409, got {response.status_code}"
         
-        print(f"✓ Scan completed: scanned={data['scanned']}, needs_escalation={data['needs_escalation']}, escalated={data['escalated']}")
-    
-    def test_scan_returns_escalations_list(self):
-        """Scan returns list of escalations created"""
+        if response.status_code == 200:
+            data = response.json()
+            assert data["queued"] is True
+            assert data["job_name"] == "escalation_scan"
+            assert data["run_id"], "Queued scan should return a run id"
+            print(f"✓ Scan queued: run_id={data['run_id']}")
+    
+    def test_scan_run_in_history(self):
+        """A queued scan shows up in the job history"""
         response = self.session.post(f"{BASE_URL}/api/admin/escalation/scan", headers=self.headers)
-        assert response.status_code == 200
+        assert response.status_code in [200, 409]
         
-        data = response.json()
-        assert "escalations" in data, "Scan should return 'escalations' list"
-        assert isinstance(data["escalations"], list), "escalations should be a list"
-        
-        print(f"✓ Scan created {len(data['escalations'])} new escalations")
+        history = self.session.get(
+            f"{BASE_URL}/api/admin/jobs/history", params={"job_name": "escalation_scan"}, headers=self.headers
+        )
+        assert history.status_code == 200
+        assert isinstance(history.json()["runs"], list)
+        print(f"✓ {len(history.json()['runs'])} escalation scan runs in history")
 
 
 class TestCheckProposal:
@@ -0,0 +1,46 @@
+"""
+Test Module: Creator Metrics
+The metrics aggregation counts each proposal once and keeps one
+platform count per distinct platform.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+
+import mongomock_motor
+
+from creator_metrics_service import CreatorMetricsService
+
+PROPOSALS = [
+    {"user_id": "CR-1", "status": "approved", "platforms": ["youtube", "tiktok"]},
+    {"user_id": "CR-1", "status": "draft", "platforms": ["youtube"]},
+    {"user_id": "CR-1", "status": "completed"},
+    {"user_id": "CR-1", "status": "in_progress", "platforms": []},
+    {"user_id": "CR-2", "status": "draft", "platforms": ["instagram"]},
+]
+
+
+def refresh(creator_id):
+    db = mongomock_motor.AsyncMongoMockClient()["creator_metrics_test"]
+    asyncio.run(db.proposals.insert_many([dict(p) for p in PROPOSALS]))
+    return asyncio.run(CreatorMetricsService(db).refresh_creator(creator_id))
+
+
+class TestMetricsPipeline:
+
+    def test_totals_count_each_proposal_once(self):
+        metrics = refresh("CR-1")
+        assert metrics["total_proposals"] == 4
+        assert metrics["approved_proposals"] == 3
+        assert metrics["approval_rate"] == 75.0
+        print("✓ Proposals with several or no platforms count once")
+
+    def test_platform_counts(self):
+        metrics = refresh("CR-1")
+        assert metrics["platform_counts"] == {"youtube": 2, "tiktok": 1}
+        assert metrics["top_platforms"][0] == ("youtube", 2)
+
+    def test_creator_without_proposals(self):
+        metrics = refresh("CR-3")
+        assert metrics["total_proposals"] == 0
+        assert metrics["platform_counts"] == {}
@@ -0,0 +1,78 @@
+"""
+Test Module: Creator Registration
+A registration that loses the race on the unique email index gets the
+usual 400 and leaves no referral behind.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import pytest
+
+import mongomock_motor
+
+from fastapi import HTTPException
+
+import routes.auth as auth_routes
+from models_creator import CreatorRegistrationCreate
+
+
+class FakeReferralService:
+    def __init__(self):
+        self.calls = []
+
+    async def create_referral(self, referral_code, referred_creator_id, referred_email):
+        self.calls.append(referred_creator_id)
+        return {"success": True, "referral_id": f"REF-{len(self.calls)}"}
+
+
+@pytest.fixture
+def setup(monkeypatch):
+    db = mongomock_motor.AsyncMongoMockClient()["registration_test"]
+    asyncio.run(db.creators.create_index("email", unique=True))
+    referrals = FakeReferralService()
+
+    def get_service(name):
+        if name == "referral":
+            return referrals
+        raise HTTPException(status_code=503, detail=f"Service '{name}' not available")
+
+    monkeypatch.setattr(auth_routes, "get_db", lambda: db)
+    monkeypatch.setattr(auth_routes, "get_service", get_service)
+    return db, referrals
+
+
+def registration(email: str = "ada@example.com") -> CreatorRegistrationCreate:
+    return CreatorRegistrationCreate(name="Ada", email=email, password="secret123", referral_code="HIVE-ADA")
+
+
+class TestDuplicateRegistration:
+
+    def test_concurrent_duplicate_gets_400_without_referral(self, setup, monkeypatch):
+        db, referrals = setup
+
+        async def hash_while_another_request_wins(password):
+            # The competing request inserts after our find_one check passed
+            await db.creators.insert_one({"id": "CR-WINNER", "email": "ada@example.com"})
+            return "hashed"
+
+        monkeypatch.setattr(auth_routes, "get_password_hash_async", hash_while_another_request_wins)
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(auth_routes.register_creator(registration()))
+        assert exc.value.status_code == 400
+        assert referrals.calls == []
+        assert asyncio.run(db.creators.count_documents({})) == 1
+        print("✓ Duplicate registration is a 400 with no orphaned referral")
+
+    def test_referral_linked_after_insert(self, setup, monkeypatch):
+        db, referrals = setup
+
+        async def fake_hash(password):
+            return "hashed"
+
+        monkeypatch.setattr(auth_routes, "get_password_hash_async", fake_hash)
+        response = asyncio.run(auth_routes.register_creator(registration("bo@example.com")))
+        stored = asyncio.run(db.creators.find_one({"id": response.id}))
+        assert referrals.calls == [response.id]
+        assert stored["referral_id"] == "REF-1"
+        assert stored["referred_by_code"] == "HIVE-ADA"
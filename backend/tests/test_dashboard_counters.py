@@ -0,0 +1,127 @@
+"""
+Test Module: Dashboard Counters
+Incremental $inc totals against the full rebuild (including increments
+that land mid-rebuild), and the served snapshot.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import mongomock_motor
+from bson import ObjectId
+
+from dashboard_counters import DashboardCounters, PLATFORM_COUNTERS_ID
+
+CALCULATOR_ROWS = [
+    {"category": "Income", "revenue": 1200, "expenses": 0},
+    {"category": "Income", "revenue": 300.5, "expenses": 50},
+    {"category": "Expense", "revenue": 999, "expenses": 400},
+]
+ARRIS_ROWS = [
+    {"time_taken_s": 1.5},
+    {"time_taken_s": 2.5},
+    {"time_taken_s": None},
+]
+
+
+@pytest.fixture
+def db():
+    return mongomock_motor.AsyncMongoMockClient()["dashboard_counters_test"]
+
+
+async def insert_and_record(db, counters, inserted_at=None):
+    """Insert the rows (optionally with ObjectIds from inserted_at) and record them"""
+    for collection, rows, record in [
+        (db.calculator, CALCULATOR_ROWS, counters.record_calculator_entry),
+        (db.arris_usage_log, ARRIS_ROWS, counters.record_arris_usage),
+    ]:
+        for n, row in enumerate(rows):
+            doc = dict(row)
+            if inserted_at:
+                doc["_id"] = ObjectId.from_datetime(inserted_at + timedelta(seconds=n))
+            await collection.insert_one(doc)
+            await record(doc)
+
+
+class TestIncrementalTotals:
+    """Running totals match what a full rebuild computes from source"""
+
+    def test_increments_match_rebuild(self, db):
+        async def scenario():
+            counters = DashboardCounters(db)
+            await counters.rebuild_totals()
+            await insert_and_record(db, counters)
+            incremental = await db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID})
+            rebuilt = await counters.rebuild_totals()
+            return incremental, rebuilt
+
+        incremental, rebuilt = asyncio.run(scenario())
+        for key, value in rebuilt.items():
+            assert incremental[key] == pytest.approx(value), key
+        assert rebuilt["total_revenue"] == pytest.approx(1500.5)
+        assert rebuilt["total_expenses"] == 450
+        assert rebuilt["arris_total_queries"] == 3
+        assert rebuilt["arris_time_samples"] == 2
+        print("✓ Incremental totals agree with rebuild")
+
+    def test_increment_during_rebuild_is_kept(self, db):
+        async def scenario():
+            counters = DashboardCounters(db)
+            await counters.rebuild_totals()
+            # Old rows: counted by the aggregation, their gens are dropped
+            await insert_and_record(db, counters, datetime.now(timezone.utc) - timedelta(hours=2))
+            rebase = counters._rebase
+
+            async def insert_after_aggregation(base, cutoff_gen):
+                doc = {"category": "Income", "revenue": 100, "expenses": 10}
+                await db.calculator.insert_one(doc)
+                await counters.record_calculator_entry(doc)
+                return await rebase(base, cutoff_gen)
+
+            counters._rebase = insert_after_aggregation
+            rebuilt = await counters.rebuild_totals()
+            stored = await db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID})
+            return rebuilt, stored
+
+        rebuilt, stored = asyncio.run(scenario())
+        assert rebuilt["total_revenue"] == pytest.approx(1600.5)
+        assert stored["total_revenue"] == pytest.approx(1600.5)
+        assert stored["total_expenses"] == 460
+        assert stored["arris_total_queries"] == 3
+        assert len(stored["gens"]) == 1
+        print("✓ Mid-rebuild increment survives the rebase")
+
+    def test_no_db_is_a_no_op(self):
+        counters = DashboardCounters()
+        asyncio.run(counters.record_calculator_entry(CALCULATOR_ROWS[0]))
+        assert counters._snapshot is None
+
+
+class TestSnapshot:
+    """get_snapshot serves counts, derived financials and staleness metadata"""
+
+    def test_snapshot_shape_and_read_your_writes(self, db):
+        async def scenario():
+            counters = DashboardCounters(db)
+            await counters.rebuild_totals()
+            await db.users.insert_many([{"n": i} for i in range(4)])
+            await counters.refresh()
+            await insert_and_record(db, counters)
+            return await counters.get_snapshot()
+
+        snapshot = asyncio.run(scenario())
+        assert snapshot["stats"]["users"] == 4
+        assert snapshot["stats"]["calculator"] == 0  # counts wait for the next refresh
+        assert snapshot["financials"]["net_profit"] == pytest.approx(1050.5)
+        assert snapshot["arris"]["total_queries"] == 3
+        assert snapshot["arris"]["avg_response_time"] == pytest.approx(2.0)
+        assert snapshot["counters"]["source"] == "materialized"
+        assert snapshot["counters"]["refreshed_at"] is not None
+        print("✓ Snapshot reflects this worker's increments")
+
+    def test_avg_response_time_without_samples(self, db):
+        snapshot = asyncio.run(DashboardCounters(db).get_snapshot())
+        assert snapshot["arris"]["avg_response_time"] == 0
+        assert snapshot["financials"]["net_profit"] == 0
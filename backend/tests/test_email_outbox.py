@@ -0,0 +1,198 @@
+"""
+Test Module: Email Outbox
+Queueing and dedup keys, delivery outcomes and retries through the
+FakeTransport, SendGrid per-recipient fallback after a rejected group, and
+the per-period scheduled report dedup key.
+Unit tests against an in-memory MongoDB (mongomock_motor); SendGrid is
+replaced by an httpx.MockTransport.
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timezone
+
+import mongomock_motor
+
+import httpx
+
+from email_outbox import DeliveryResult, EmailOutbox, FakeTransport, OutboxStatus, SendGridTransport
+
+
+@pytest.fixture
+def db():
+    db = mongomock_motor.AsyncMongoMockClient()["email_outbox_test"]
+    asyncio.run(db.email_outbox.create_index("dedup_key", unique=True, sparse=True))
+    return db
+
+
+def make_outbox(db, **options) -> EmailOutbox:
+    return EmailOutbox(db, FakeTransport(), retry_base_seconds=60, **options)
+
+
+async def statuses(db):
+    return {doc["to_email"]: doc async for doc in db.email_outbox.find()}
+
+
+class TestEnqueue:
+    """Messages are written first; a repeated dedup_key is not queued again"""
+
+    def test_enqueue_dedup(self, db):
+        async def scenario():
+            outbox = make_outbox(db)
+            first = await outbox.enqueue("a@x.com", "Hi", "<p>Hi</p>", dedup_key="welcome:a@x.com")
+            second = await outbox.enqueue("a@x.com", "Hi", "<p>Hi</p>", dedup_key="welcome:a@x.com")
+            return first, second, await db.email_outbox.count_documents({})
+
+        first, second, count = asyncio.run(scenario())
+        assert first["queued"] is True
+        assert second == {"queued": False, "duplicate": True, "dedup_key": "welcome:a@x.com"}
+        assert count == 1
+        print("✓ Dedup key")
+
+    def test_enqueue_many_counts_duplicates(self, db):
+        async def scenario():
+            outbox = make_outbox(db)
+            await outbox.enqueue("a@x.com", "Hi", "<p>Hi</p>", dedup_key="k-a")
+            return await outbox.enqueue_many([
+                {"to_email": email, "subject": "Hi", "html_content": "<p>Hi</p>", "dedup_key": f"k-{email[0]}"}
+                for email in ["a@x.com", "b@x.com", "c@x.com"]
+            ])
+
+        assert asyncio.run(scenario()) == {"queued": 2, "duplicates": 1}
+
+
+class TestDelivery:
+    """drain_once records each transport outcome on the message"""
+
+    def test_sent_with_substitutions(self, db):
+        async def scenario():
+            outbox = make_outbox(db)
+            await outbox.enqueue_many([
+                {"to_email": f"{name}@x.com", "subject": "Hi", "html_content": "<p>Hi -name-</p>",
+                 "substitutions": {"-name-": name}}
+                for name in ["ada", "bo"]
+            ])
+            handled = await outbox.drain_once()
+            return handled, outbox.transport, await statuses(db)
+
+        handled, transport, docs = asyncio.run(scenario())
+        assert handled == 2
+        assert transport.requests == 1  # Same content, one provider request
+        assert sorted(m["html_content"] for m in transport.sent) == ["<p>Hi ada</p>", "<p>Hi bo</p>"]
+        for doc in docs.values():
+            assert doc["status"] == OutboxStatus.SENT
+            assert doc["attempts"] == 1
+            assert doc["claim_id"] is None
+        print("✓ Delivered and marked sent")
+
+    def test_retryable_then_permanent_failure(self, db):
+        async def scenario():
+            outbox = make_outbox(db)
+            outbox.transport.fail_next = [
+                DeliveryResult(False, retryable=True, error="SendGrid 503"),
+                DeliveryResult(False, retryable=False, error="SendGrid 400"),
+            ]
+            await outbox.enqueue("retry@x.com", "A", "<p>A</p>")
+            await outbox.enqueue("bad@x.com", "B", "<p>B</p>")
+            await outbox.drain_once()
+            again = await outbox.drain_once()  # Backed-off message is not due yet
+            return again, await statuses(db), await outbox.get_metrics()
+
+        again, docs, metrics = asyncio.run(scenario())
+        assert again == 0
+        retry = docs["retry@x.com"]
+        assert retry["status"] == OutboxStatus.PENDING
+        assert retry["last_error"] == "SendGrid 503"
+        next_attempt = retry["next_attempt_at"].replace(tzinfo=timezone.utc)
+        assert next_attempt > datetime.now(timezone.utc)
+        assert docs["bad@x.com"]["status"] == OutboxStatus.FAILED
+        assert metrics["queue"][OutboxStatus.FAILED] == 1
+        assert metrics["worker_stats"]["retried"] == 1
+        print("✓ Retry with backoff, permanent failure")
+
+    def test_max_attempts_then_retry_failed(self, db):
+        async def scenario():
+            outbox = make_outbox(db, max_attempts=1)
+            outbox.transport.fail_next = [DeliveryResult(False, retryable=True, error="timeout")]
+            await outbox.enqueue("a@x.com", "A", "<p>A</p>")
+            await outbox.drain_once()
+            failed = (await statuses(db))["a@x.com"]["status"]
+            requeued = await outbox.retry_failed()
+            await outbox.drain_once()
+            return failed, requeued, (await statuses(db))["a@x.com"]
+
+        failed, requeued, doc = asyncio.run(scenario())
+        assert failed == OutboxStatus.FAILED
+        assert requeued["requeued"] == 1
+        assert doc["status"] == OutboxStatus.SENT
+
+
+class TestSendGridGroupFallback:
+    """A rejected multi-recipient request is resent one recipient at a time"""
+
+    BAD = "not-an-address"
+
+    def run(self, recipients, status_for_bad=400):
+        posts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            emails = [p["to"][0]["email"] for p in payload["personalizations"]]
+            posts.append(emails)
+            if self.BAD in emails:
+                return httpx.Response(status_for_bad, text="invalid email")
+            return httpx.Response(202, headers={"X-Message-Id": f"msg-{len(posts)}"})
+
+        async def scenario():
+            transport = SendGridTransport(api_key="test", max_connections=2)
+            transport._client = httpx.AsyncClient(base_url="https://sendgrid.test", transport=httpx.MockTransport(handler))
+            messages = [
+                {"to_email": email, "from_email": "hq@x.com", "subject": "Invite", "html_content": "<p>Join</p>"}
+                for email in recipients
+            ]
+            results = await transport.send_batch(messages)
+            await transport.close()
+            return results
+
+        return asyncio.run(scenario()), posts
+
+    def test_bad_recipient_isolated(self):
+        recipients = ["a@x.com", self.BAD, "b@x.com"]
+        results, posts = self.run(recipients)
+        assert posts[0] == recipients
+        assert sorted(map(tuple, posts[1:])) == [(email,) for email in sorted(recipients)]
+        assert [r.sent for r in results] == [True, False, True]
+        assert results[1].retryable is False
+        print("✓ One bad address does not fail the group")
+
+    def test_retryable_group_failure_not_split(self):
+        results, posts = self.run(["a@x.com", self.BAD], status_for_bad=503)
+        assert len(posts) == 1
+        assert all(r.retryable for r in results)
+
+
+class TestReportDedupKey:
+    """Regenerating a report for the same period does not send it twice"""
+
+    def test_same_period_sent_once(self, db):
+        from email_service import EmailService
+        from scheduled_reports_service import ScheduledReportsService
+
+        async def scenario():
+            outbox = make_outbox(db)
+            email_service = EmailService()
+            email_service.attach_outbox(outbox)
+            service = ScheduledReportsService(db, email_service=email_service)
+            for report_id in ["RPT-1", "RPT-2"]:
+                await db.arris_reports.insert_one({
+                    "id": report_id, "creator_id": "CR-1", "creator_email": "cr@x.com",
+                    "report_type": "weekly", "period_label": "Mar 2 - Mar 8",
+                    "period_key": "weekly:2026-03-02", "sections": {},
+                })
+                await service._send_report_email(report_id)
+            return await db.email_outbox.find({}, {"_id": 0, "dedup_key": 1}).to_list(10)
+
+        queued = asyncio.run(scenario())
+        assert queued == [{"dedup_key": "report:CR-1:weekly:2026-03-02"}]
+        print("✓ One report email per creator and period")
@@ -0,0 +1,106 @@
+"""
+Test Module: Escalation Notifications
+Batch notifications go through ConnectionManager and are only recorded in
+escalation_log once sent.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+import mongomock_motor
+
+import auto_escalation_service
+from auto_escalation_service import AutoEscalationService, EscalationLevel
+
+
+class FakeManager:
+    """Stands in for ConnectionManager; admin broadcasts can be made to fail"""
+
+    def __init__(self, admin_fails: bool = False):
+        self.admin_fails = admin_fails
+        self.admin = []
+        self.users = []
+
+    async def broadcast_to_admins(self, notification_type, data):
+        if self.admin_fails:
+            raise RuntimeError("backplane down")
+        self.admin.append((notification_type, data))
+
+    async def send_to_user(self, user_id, notification_type, data):
+        self.users.append((user_id, notification_type, data))
+
+
+class FakeNotificationService:
+    def __init__(self, manager):
+        self.manager = manager
+
+
+def record(n: int, level: str):
+    return {
+        "escalation_id": f"ESC-{n}",
+        "proposal_id": f"PROP-{n}",
+        "proposal_title": f"Proposal {n}",
+        "creator_id": f"CR-{n}",
+        "level": level,
+        "actions_taken": [],
+    }
+
+
+async def notify(manager, records):
+    db = mongomock_motor.AsyncMongoMockClient()["escalation_test"]
+    await db.escalation_log.insert_many([dict(r, actions_taken=[]) for r in records])
+    service = AutoEscalationService(db, notification_service=FakeNotificationService(manager))
+    await service._notify_batch(records)
+    return {doc["escalation_id"]: doc["actions_taken"] async for doc in db.escalation_log.find()}
+
+
+class TestNotifyBatch:
+
+    def test_digest_sent_and_recorded(self, monkeypatch):
+        monkeypatch.setattr(auto_escalation_service, "ESCALATION_ADMIN_DIGEST_THRESHOLD", 2)
+        manager = FakeManager()
+        records = [record(n, EscalationLevel.CRITICAL) for n in range(4)]
+        stored = asyncio.run(notify(manager, records))
+
+        assert len(manager.admin) == 1
+        assert manager.admin[0][1]["count"] == 4
+        for actions in stored.values():
+            assert "admin_notified" in actions
+        print("✓ Admin digest delivered through the manager")
+
+    def test_failed_admin_send_not_recorded(self, monkeypatch):
+        monkeypatch.setattr(auto_escalation_service, "ESCALATION_ADMIN_DIGEST_THRESHOLD", 2)
+        manager = FakeManager(admin_fails=True)
+        records = [record(n, EscalationLevel.CRITICAL) for n in range(4)]
+        stored = asyncio.run(notify(manager, records))
+
+        for escalation_id, actions in stored.items():
+            assert "admin_notified" not in actions, escalation_id
+        for r in records:
+            assert "admin_notified" not in r["actions_taken"]
+        print("✓ Failed admin notification is not recorded")
+
+
+
+class TestUntimedProposals:
+    """Proposals with no timestamps never reach the level $switch"""
+
+    def test_null_last_change_filtered(self):
+        db = mongomock_motor.AsyncMongoMockClient()["escalation_untimed"]
+        now = datetime.now(timezone.utc)
+
+        async def scenario():
+            await db.proposals.insert_many([
+                {"id": "PROP-OLD", "status": "submitted", "user_id": "CR-1",
+                 "created_at": (now - timedelta(hours=200)).isoformat()},
+                {"id": "PROP-UNTIMED", "status": "submitted", "user_id": "CR-2"},
+            ])
+            pipeline = AutoEscalationService(db)._escalation_pipeline(now)
+            # mongomock has no $type, so stop before the $switch
+            stages = pipeline[:next(i for i, stage in enumerate(pipeline) if "level" in stage.get("$addFields", {}))]
+            return await db.proposals.aggregate(stages).to_list(None)
+
+        rows = asyncio.run(scenario())
+        assert [row["pid"] for row in rows] == ["PROP-OLD"]
+        print("✓ Proposal without timestamps is dropped before level assignment")
@@ -0,0 +1,286 @@
+"""
+Test Module: Job Scheduler
+Cron parsing and next-run math, retry concurrency, lease loss, the
+scheduled reports per-period claim and lease-serialized snapshot builds.
+Unit tests; scheduler runs use an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone
+
+import mongomock_motor
+
+import job_scheduler
+from job_scheduler import CronSchedule, JobScheduler, JobStatus
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestCronSchedule:
+    """5-field cron expressions evaluated in UTC"""
+
+    def test_hourly(self):
+        cron = CronSchedule("0 * * * *")
+        assert cron.next_after(utc(2026, 3, 1, 10, 0)) == utc(2026, 3, 1, 11, 0)
+        assert cron.next_after(utc(2026, 3, 1, 10, 59, 59)) == utc(2026, 3, 1, 11, 0)
+        print("✓ Hourly")
+
+    def test_steps_lists_and_ranges(self):
+        assert CronSchedule("*/15 * * * *").next_after(utc(2026, 3, 1, 10, 14)) == utc(2026, 3, 1, 10, 15)
+        assert CronSchedule("5,35 * * * *").next_after(utc(2026, 3, 1, 10, 5)) == utc(2026, 3, 1, 10, 35)
+        assert CronSchedule("0 9-17/4 * * *").next_after(utc(2026, 3, 1, 13, 0)) == utc(2026, 3, 1, 17, 0)
+        assert CronSchedule("10/20 * * * *").minutes == {10, 30, 50}
+
+    def test_weekday_sunday_aliases(self):
+        """0 and 7 both mean Sunday; 2026-03-01 is a Sunday"""
+        for expr in ["30 3 * * 0", "30 3 * * 7"]:
+            assert CronSchedule(expr).next_after(utc(2026, 2, 27, 0, 0)) == utc(2026, 3, 1, 3, 30)
+        assert CronSchedule("0 9 * * 1").next_after(utc(2026, 3, 1, 12, 0)) == utc(2026, 3, 2, 9, 0)
+
+    def test_day_or_weekday_when_both_restricted(self):
+        """Standard cron: day-of-month OR day-of-week"""
+        cron = CronSchedule("0 0 15 * 1")
+        assert cron.next_after(utc(2026, 3, 1, 0, 0)) == utc(2026, 3, 2, 0, 0)   # Monday
+        assert cron.next_after(utc(2026, 3, 14, 0, 0)) == utc(2026, 3, 15, 0, 0)  # the 15th
+
+    def test_month_and_year_rollover(self):
+        assert CronSchedule("0 0 1 * *").next_after(utc(2026, 12, 31, 23, 59)) == utc(2027, 1, 1, 0, 0)
+        assert CronSchedule("0 12 29 2 *").next_after(utc(2026, 3, 1)) == utc(2028, 2, 29, 12, 0)
+        print("✓ Leap day")
+
+    @pytest.mark.parametrize("expr", ["* * * *", "60 * * * *", "* 24 * * *", "5-1 * * * *", "*/0 * * * *", "* * 0 * *"])
+    def test_invalid_expressions(self, expr):
+        with pytest.raises(ValueError):
+            CronSchedule(expr)
+
+    def test_never_fires(self):
+        with pytest.raises(ValueError):
+            CronSchedule("0 0 31 2 *").next_after(utc(2026, 1, 1))
+
+
+@pytest.fixture
+def db():
+    return mongomock_motor.AsyncMongoMockClient()["job_scheduler_test"]
+
+
+async def wait_for_run(scheduler, name, timeout=2.0):
+    task = scheduler._running.get(name)
+    if task:
+        await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), timeout)
+
+
+class TestRuns:
+    """Retries, the global concurrency limit and lease renewal"""
+
+    def test_backoff_releases_concurrency_slot(self, db, monkeypatch):
+        """A job sleeping between retries must not block other jobs"""
+        monkeypatch.setattr(job_scheduler, "JOB_SCHEDULER_ENABLED", False)
+        events = []
+
+        async def scenario():
+            scheduler = JobScheduler(db, max_concurrent=1)
+            attempts = {"n": 0}
+
+            async def flaky():
+                attempts["n"] += 1
+                events.append(f"flaky-{attempts['n']}")
+                if attempts["n"] == 1:
+                    raise RuntimeError("transient")
+                return {"ok": True}
+
+            async def quick():
+                events.append("quick")
+                return {"ok": True}
+
+            scheduler.register("flaky", "0 * * * *", flaky, max_retries=1, retry_base_seconds=0.2)
+            scheduler.register("quick", "0 * * * *", quick)
+            await scheduler.start()
+            await scheduler.run_now("flaky")
+            await asyncio.sleep(0.05)
+            await scheduler.run_now("quick")
+            await wait_for_run(scheduler, "quick")
+            await wait_for_run(scheduler, "flaky")
+            history = await scheduler.get_history("flaky")
+            await scheduler.stop()
+            return history
+
+        monkeypatch.setattr(job_scheduler.random, "uniform", lambda a, b: b)
+        history = asyncio.run(scenario())
+        assert events == ["flaky-1", "quick", "flaky-2"]
+        assert history[0]["status"] == JobStatus.SUCCESS
+        assert history[0]["attempts"] == 2
+        print("✓ Backoff does not hold the job semaphore")
+
+    def test_lost_lease_aborts_run(self, db, monkeypatch):
+        monkeypatch.setattr(job_scheduler, "JOB_SCHEDULER_ENABLED", False)
+
+        async def scenario():
+            scheduler = JobScheduler(db, lease_seconds=0.06)
+
+            async def slow():
+                # Another worker takes over the lease mid-run
+                await db.job_schedules.update_one({"_id": "slow"}, {"$set": {"lease_owner": "someone-else"}})
+                await asyncio.sleep(5)
+
+            scheduler.register("slow", "0 * * * *", slow, max_retries=0)
+            await scheduler.start()
+            await scheduler.run_now("slow")
+            await wait_for_run(scheduler, "slow")
+            history = await scheduler.get_history("slow")
+            await scheduler.stop()
+            return history, scheduler
+
+        history, scheduler = asyncio.run(scenario())
+        assert history[0]["status"] == JobStatus.FAILED
+        assert "no longer held" in history[0]["error"]
+        assert scheduler._lease_lost == {}
+        print("✓ Lost lease aborts the run")
+
+    def test_manual_run_is_lease_protected(self, db, monkeypatch):
+        monkeypatch.setattr(job_scheduler, "JOB_SCHEDULER_ENABLED", False)
+
+        async def scenario():
+            scheduler = JobScheduler(db)
+            gate = asyncio.Event()
+
+            async def blocked():
+                await gate.wait()
+
+            scheduler.register("blocked", "0 * * * *", blocked)
+            await scheduler.start()
+            first = await scheduler.run_now("blocked")
+            second = await scheduler.run_now("blocked")
+            gate.set()
+            await wait_for_run(scheduler, "blocked")
+            await scheduler.stop()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first["success"] is True
+        assert second == {"success": False, "error": "Job is already running"}
+
+
+class TestScheduledReportClaims:
+    """run_scheduled_reports sends each creator's report once per period"""
+
+    def test_rerun_skips_already_sent(self, db, monkeypatch):
+        from scheduled_reports_service import ScheduledReportsService
+
+        async def scenario():
+            service = ScheduledReportsService(db)
+            hour = datetime.now(timezone.utc).strftime("%H:00")
+            await db.report_settings.insert_many([
+                {"creator_id": "CR-1", "enabled": True, "frequency": "daily", "daily_time": hour},
+                {"creator_id": "CR-2", "enabled": True, "frequency": "daily", "daily_time": hour},
+            ])
+            sent = []
+
+            async def generate_report(creator_id, report_type="weekly", send_email=False):
+                sent.append(creator_id)
+                return {"success": creator_id != "CR-2"}
+
+            monkeypatch.setattr(service, "generate_report", generate_report)
+            first = await service.run_scheduled_reports()
+            second = await service.run_scheduled_reports()
+            return first, second, sent
+
+        first, second, sent = asyncio.run(scenario())
+        assert first["generated"] == 1 and first["failed"] == 1
+        # CR-1 was sent; CR-2 failed, so its claim is picked up again
+        assert second["already_sent"] == 1 and second["failed"] == 1
+        assert sorted(sent) == ["CR-1", "CR-2", "CR-2"]
+        print("✓ Re-run does not resend")
+
+    def test_failed_report_retried_in_later_hours(self, db, monkeypatch):
+        from scheduled_reports_service import ScheduledReportsService
+
+        async def scenario():
+            service = ScheduledReportsService(db)
+            hour = datetime.now(timezone.utc).strftime("%H:00")
+            await db.report_settings.insert_one(
+                {"creator_id": "CR-1", "enabled": True, "frequency": "daily", "daily_time": hour}
+            )
+            outcomes = iter([False, True])
+            sent = []
+
+            async def generate_report(creator_id, report_type="weekly", send_email=False):
+                sent.append(creator_id)
+                return {"success": next(outcomes)}
+
+            monkeypatch.setattr(service, "generate_report", generate_report)
+            await service.run_scheduled_reports()
+            # A later hour: CR-1 is no longer selected by its daily_time
+            await db.report_settings.update_one({"creator_id": "CR-1"}, {"$set": {"daily_time": "99:00"}})
+            retry = await service.run_scheduled_reports()
+            after = await service.run_scheduled_reports()
+            return retry, after, sent
+
+        retry, after, sent = asyncio.run(scenario())
+        assert retry["retried"] == 1 and retry["generated"] == 1
+        assert after["retried"] == 0 and after["generated"] == 0
+        assert sent == ["CR-1", "CR-1"]
+        print("✓ Failed report is picked up by the next run")
+
+    def test_retries_stop_after_max_attempts(self, db, monkeypatch):
+        from scheduled_reports_service import ScheduledReportsService, REPORT_MAX_ATTEMPTS
+
+        async def scenario():
+            service = ScheduledReportsService(db)
+            hour = datetime.now(timezone.utc).strftime("%H:00")
+            await db.report_settings.insert_one(
+                {"creator_id": "CR-1", "enabled": True, "frequency": "daily", "daily_time": hour}
+            )
+            sent = []
+
+            async def generate_report(creator_id, report_type="weekly", send_email=False):
+                sent.append(creator_id)
+                return {"success": False}
+
+            monkeypatch.setattr(service, "generate_report", generate_report)
+            for _ in range(REPORT_MAX_ATTEMPTS + 2):
+                await service.run_scheduled_reports()
+            return sent
+
+        assert len(asyncio.run(scenario())) == REPORT_MAX_ATTEMPTS
+
+
+class TestRiskSnapshotLease:
+    """First-use risk snapshot builds share the scheduled job's lease"""
+
+    def test_concurrent_first_use_builds_once(self, db, monkeypatch):
+        monkeypatch.setattr(job_scheduler, "JOB_SCHEDULER_ENABLED", False)
+        from subscription_lifecycle_service import SubscriptionLifecycleService, RISK_SNAPSHOT_JOB
+
+        async def scenario():
+            service = SubscriptionLifecycleService(db)
+            builds = []
+
+            async def refresh():
+                builds.append(1)
+                await asyncio.sleep(0.05)
+                meta = {"refreshed_at": "2026-03-01T00:00:00+00:00", "subscriptions_scored": 0}
+                await db.subscription_risk_snapshot_runs.update_one({"_id": "latest"}, {"$set": meta}, upsert=True)
+                return meta
+
+            scheduler = JobScheduler(db)
+            scheduler.register(RISK_SNAPSHOT_JOB, "*/30 * * * *", refresh)
+            await scheduler.start()
+            service.set_job_scheduler(scheduler)
+            first, second = await asyncio.gather(service._ensure_risk_snapshot(), service._ensure_risk_snapshot())
+            await scheduler.stop()
+            return builds, first, second
+
+        builds, first, second = asyncio.run(scenario())
+        assert builds == [1]
+        assert first["refreshed_at"] == "2026-03-01T00:00:00+00:00"
+        assert second == first or second.get("building") is True
+        print("✓ One snapshot build under the job lease")
+
+    def test_invalid_threshold(self, db):
+        from subscription_lifecycle_service import SubscriptionLifecycleService
+
+        with pytest.raises(ValueError):
+            asyncio.run(SubscriptionLifecycleService(db).get_at_risk_subscriptions(risk_threshold="severe"))
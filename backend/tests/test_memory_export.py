@@ -0,0 +1,67 @@
+"""
+Test Module: Memory Export Round Trip
+An exported memory package survives the trip through JSON and still
+passes the import checksum; dates go out as ISO strings with an offset.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timezone
+
+import mongomock_motor
+
+from bson_dates import iso_dates
+from enhanced_memory_palace import EnhancedMemoryPalace
+
+CREATED = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+
+async def export_and_validate(tz_aware: bool):
+    db = mongomock_motor.AsyncMongoMockClient(tz_aware=tz_aware)["memory_export_test"]
+    await db.arris_memories.insert_many([
+        {"id": "MEM-1", "creator_id": "CR-1", "memory_type": "pattern", "importance": 0.8,
+         "content": {"category": "timing", "title": "Mornings"}, "created_at": CREATED,
+         "last_recalled": CREATED},
+        {"id": "MEM-2", "creator_id": "CR-1", "memory_type": "interaction", "importance": 0.3,
+         "content": {"text": "hello"}, "created_at": CREATED.isoformat()},
+    ])
+    await db.arris_learning_metrics.insert_one({"creator_id": "CR-1", "updated_at": CREATED})
+    palace = EnhancedMemoryPalace(db)
+
+    exported = await palace.export_memories("CR-1")
+    # What the client receives and uploads again
+    received = json.loads(json.dumps(exported))
+    validation = await palace.import_memories("CR-2", received, validate_only=True)
+    return received, validation
+
+
+class TestExportRoundTrip:
+
+    @pytest.mark.parametrize("tz_aware", [False, True], ids=["naive-client", "tz-aware-client"])
+    def test_reimport_checksum_matches(self, tz_aware):
+        received, validation = asyncio.run(export_and_validate(tz_aware))
+        assert validation["success"] is True, validation
+        assert validation["would_import"]["active_memories"] == 2
+        print(f"✓ Re-import verifies ({'tz-aware' if tz_aware else 'naive'} client)")
+
+    def test_dates_have_offset(self):
+        received, _ = asyncio.run(export_and_validate(False))
+        memory = next(m for m in received["memories"]["active"] if m["id"] == "MEM-1")
+        assert memory["created_at"] == "2026-03-01T09:30:00+00:00"
+        assert memory["last_recalled"] == "2026-03-01T09:30:00+00:00"
+        assert received["learning_metrics"]["updated_at"] == "2026-03-01T09:30:00+00:00"
+
+
+class TestIsoDates:
+
+    def test_nested_and_naive(self):
+        naive = datetime(2026, 3, 1, 9, 30)
+        doc = {"a": naive, "b": [{"c": CREATED}, "x"], "d": None, "e": 1}
+        assert iso_dates(doc) == {
+            "a": "2026-03-01T09:30:00+00:00",
+            "b": [{"c": "2026-03-01T09:30:00+00:00"}, "x"],
+            "d": None,
+            "e": 1,
+        }
@@ -0,0 +1,73 @@
+"""
+Test Module: Memory Search Paging
+_search_collection ranks once and slices pages from the ranked ids,
+re-ranking with a larger (capped) limit only when the filter leaves too
+few hits.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+
+import mongomock_motor
+
+import enhanced_memory_palace
+from enhanced_memory_palace import EnhancedMemoryPalace
+from memory_search_index import IndexSource
+
+
+class FakeSearchIndex:
+    """Ranks every memory by descending id number and counts rank() calls"""
+
+    def __init__(self, total):
+        self.ranked = [(f"MEM-{n:04d}", float(total - n)) for n in range(total)]
+        self.rank_limits = []
+
+    async def ensure_creator_indexed(self, creator_id, source=IndexSource.ACTIVE):
+        return 0
+
+    async def rank(self, creator_id, query, source=IndexSource.ACTIVE, limit=50):
+        self.rank_limits.append(limit)
+        return self.ranked[:limit]
+
+
+def search(total, pinned_every, limit=10):
+    db = mongomock_motor.AsyncMongoMockClient()["memory_search_paging_test"]
+    asyncio.run(db.arris_memories.insert_many([
+        {"id": f"MEM-{n:04d}", "creator_id": "CR-1", "memory_type": "pattern", "importance": 0.5,
+         "content": {"text": "launch"}, "is_pinned": n % pinned_every == 0}
+        for n in range(total)
+    ]))
+    index = FakeSearchIndex(total)
+    palace = EnhancedMemoryPalace(db, search_index=index)
+    results = asyncio.run(palace._search_collection(
+        collection=db.arris_memories, creator_id="CR-1", source=IndexSource.ACTIVE,
+        query="launch", base_filter={"creator_id": "CR-1", "is_pinned": True}, limit=limit
+    ))
+    return results, index
+
+
+class TestRankOnce:
+
+    def test_pages_slice_one_ranking(self):
+        # Every 5th memory passes: needs several pages but one ranking
+        results, index = search(total=400, pinned_every=5)
+        assert len(results) == 10
+        assert index.rank_limits == [120]
+        assert [r["id"] for r in results] == [f"MEM-{n:04d}" for n in range(0, 50, 5)]
+        print("✓ One ranking serves every page")
+
+    def test_sparse_filter_widens_ranking(self):
+        # Too few hits in the first 120 ranked ids
+        results, index = search(total=2000, pinned_every=100)
+        assert len(results) == 10
+        assert index.rank_limits == [120, 480, 1920]
+        assert len({r["id"] for r in results}) == 10
+        print("✓ Sparse filter re-ranks with a larger limit")
+
+    def test_widening_stops_at_cap(self, monkeypatch):
+        # Only 6 pinned memories in 2000, and the cap stops widening at 1000
+        monkeypatch.setattr(enhanced_memory_palace, "SEARCH_MAX_RANKED", 1000)
+        results, index = search(total=2000, pinned_every=350)
+        assert index.rank_limits == [120, 480, 1000]
+        assert [r["id"] for r in results] == [f"MEM-{n:04d}" for n in range(0, 1000, 350)]
+        print("✓ Widening stops at SEARCH_MAX_RANKED")
@@ -0,0 +1,125 @@
+"""
+Test Module: Pattern Detection Runner
+The memoized detection run behind detect_all_patterns(): reuse within
+detection_cache_seconds, a fresh run after it, one shared run for
+concurrent callers, copies that callers can mutate, and failing detectors
+reported in the run timings.
+Unit tests against an in-memory MongoDB (mongomock_motor); the trend
+detector uses $dateFromString, which mongomock lacks, so it is stubbed.
+"""
+
+import asyncio
+import pytest
+
+import mongomock_motor
+
+import arris_pattern_engine
+from arris_pattern_engine import ArrisPatternEngine
+
+TREND = [{"id": "trend-stub", "type": "trend", "title": "Stubbed trend"}]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    db = mongomock_motor.AsyncMongoMockClient()["pattern_detection_test"]
+    asyncio.run(db.creators.insert_many([
+        {"id": f"CR-{n}", "name": f"Creator {n}", "status": "active", "submitted_at": "2026-01-10T00:00:00+00:00"}
+        for n in range(3)
+    ]))
+    engine = ArrisPatternEngine(db)
+    engine.snapshot_loads = 0
+    load = engine._load_detection_snapshot
+
+    async def counted_load():
+        engine.snapshot_loads += 1
+        return await load()
+
+    async def trend_stub(snapshot):
+        return [dict(p) for p in TREND]
+
+    monkeypatch.setattr(engine, "_load_detection_snapshot", counted_load)
+    monkeypatch.setattr(engine, "_detect_trend_patterns", trend_stub)
+    return engine
+
+
+class TestDetectionCache:
+    """One run is reused until detection_cache_seconds have passed"""
+
+    def test_second_call_reuses_run(self, engine):
+        async def scenario():
+            return await engine.detect_all_patterns(), await engine.detect_all_patterns()
+
+        first, second = asyncio.run(scenario())
+        assert engine.snapshot_loads == 1
+        assert (first["run"]["cached"], second["run"]["cached"]) == (False, True)
+        assert first["detected_at"] == second["detected_at"]
+        assert first["trend_patterns"] == TREND
+        assert set(first["run"]["detectors"]) == {name for name, _ in engine._detectors()}
+        print("✓ Detection run reused within the cache window")
+
+    def test_expired_run_is_replaced(self, engine):
+        async def scenario():
+            await engine.detect_all_patterns()
+            engine._detection_monotonic -= engine.detection_cache_seconds + 1
+            return await engine.detect_all_patterns()
+
+        again = asyncio.run(scenario())
+        assert engine.snapshot_loads == 2
+        assert again["run"]["cached"] is False
+
+    def test_zero_seconds_disables_reuse(self, engine):
+        engine.detection_cache_seconds = 0
+
+        async def scenario():
+            return [(await engine._get_detection_run())[1] for _ in range(3)]
+
+        assert asyncio.run(scenario()) == [False, False, False]
+        assert engine.snapshot_loads == 3
+
+    def test_concurrent_callers_share_one_run(self, engine):
+        async def scenario():
+            return await asyncio.gather(*(engine._get_detection_run() for _ in range(4)))
+
+        results = asyncio.run(scenario())
+        assert engine.snapshot_loads == 1
+        assert sorted(cached for _, cached in results) == [False, True, True, True]
+        assert all(run is results[0][0] for run, _ in results)
+        print("✓ Concurrent callers wait for the first run")
+
+
+class TestDetectionResults:
+    """Callers get copies; detector failures stay inside the run"""
+
+    def test_callers_get_copies(self, engine):
+        async def scenario():
+            first = await engine.detect_all_patterns()
+            first["trend_patterns"].clear()
+            first["run"]["detectors"].clear()
+            return await engine.detect_all_patterns()
+
+        second = asyncio.run(scenario())
+        assert second["trend_patterns"] == TREND
+        assert "trend" in second["run"]["detectors"]
+
+    def test_failing_detector_reported(self, engine, monkeypatch):
+        async def broken(snapshot):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(engine, "_detect_trend_patterns", broken)
+        patterns = asyncio.run(engine.detect_all_patterns())
+        timings = patterns["run"]["detectors"]
+        assert patterns["trend_patterns"] == []
+        assert timings["trend"]["error"] == "boom"
+        assert timings["trend"]["patterns"] == 0
+        assert all("error" not in t for name, t in timings.items() if name != "trend")
+        assert patterns["total_patterns"] == sum(t["patterns"] for t in timings.values())
+
+    def test_insights_use_the_same_run(self, engine, monkeypatch):
+        monkeypatch.setattr(arris_pattern_engine, "COHORT_ENGINE", "columnar")
+
+        async def scenario():
+            await engine.detect_all_patterns()
+            return await engine.get_actionable_insights()
+
+        assert isinstance(asyncio.run(scenario()), list)
+        assert engine.snapshot_loads == 1
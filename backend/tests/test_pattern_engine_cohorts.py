@@ -0,0 +1,147 @@
+"""
+Test Module: Pattern Engine Cohorts
+Tier and ranking-tie rules shared by the aggregation and columnar cohort
+engines: the most recently created active subscription (then highest id)
+sets the tier, ranking ties fall back to creator id, and status changes
+from auto-approval / auto-escalation drop the cached cohorts.
+Unit tests against an in-memory MongoDB (mongomock_motor); mongomock has
+no $lookup sub-pipelines, so the aggregation engine is compared only
+where the backend supports it.
+"""
+
+import asyncio
+import pytest
+
+import mongomock_motor
+
+from arris_pattern_engine import ArrisPatternEngine
+
+CREATORS = [
+    {"id": f"CR-{n}", "name": f"Creator {n}", "status": "active", "submitted_at": f"2026-0{month}-10T00:00:00+00:00"}
+    for n, month in [(3, 1), (1, 1), (4, 2), (2, 2), (5, 2)]
+] + [{"id": "CR-9", "name": "Pending", "status": "pending", "submitted_at": "2026-01-10T00:00:00+00:00"}]
+
+# Inserted out of creation order; CR-2's newest sub has no tier and CR-3's
+# two newest share a created_at, so the higher id wins
+SUBSCRIPTIONS = [
+    {"id": "SUB-b", "creator_id": "CR-1", "status": "active", "tier": "Pro", "created_at": "2026-03-01T00:00:00+00:00"},
+    {"id": "SUB-a", "creator_id": "CR-1", "status": "active", "tier": "Starter", "created_at": "2026-01-01T00:00:00+00:00"},
+    {"id": "SUB-c", "creator_id": "CR-1", "status": "cancelled", "tier": "Elite", "created_at": "2026-04-01T00:00:00+00:00"},
+    {"id": "SUB-e", "creator_id": "CR-2", "status": "active", "tier": "", "created_at": "2026-03-01T00:00:00+00:00"},
+    {"id": "SUB-d", "creator_id": "CR-2", "status": "active", "tier": "Pro", "created_at": "2026-02-01T00:00:00+00:00"},
+    {"id": "SUB-f", "creator_id": "CR-3", "status": "active", "tier": "Starter", "created_at": "2026-02-01T00:00:00+00:00"},
+    {"id": "SUB-h", "creator_id": "CR-3", "status": "active", "tier": "Elite", "created_at": "2026-02-01T00:00:00+00:00"},
+    {"id": "SUB-g", "creator_id": "CR-3", "status": "active", "tier": "Pro"},
+]
+
+# (creator, approved, other): CR-1/CR-3 tie on rate and total, CR-2/CR-4 on rate
+PROPOSALS = [("CR-3", 1, 1), ("CR-1", 1, 1), ("CR-4", 2, 2), ("CR-2", 1, 1), ("CR-5", 0, 0)]
+
+
+@pytest.fixture
+def engine():
+    db = mongomock_motor.AsyncMongoMockClient()["pattern_cohorts_test"]
+
+    async def seed():
+        await db.creators.insert_many([dict(c) for c in CREATORS])
+        await db.creator_subscriptions.insert_many([dict(s) for s in SUBSCRIPTIONS])
+        proposals = []
+        for creator_id, approved, other in PROPOSALS:
+            proposals += [{"user_id": creator_id, "status": "approved"}] * approved
+            proposals += [{"user_id": creator_id, "status": "rejected"}] * other
+        await db.proposals.insert_many([dict(p) for p in proposals])
+
+    asyncio.run(seed())
+    return ArrisPatternEngine(db)
+
+
+def ranking_ids(rows):
+    return [(r["creator_id"], r["tier"]) for r in rows]
+
+
+EXPECTED_TIERS = {
+    "Pro": (1, 2, 1),      # CR-1: newest active sub
+    "Free": (3, 6, 3),     # CR-2 (newest sub has no tier), CR-4, CR-5 (no sub)
+    "Elite": (1, 2, 1),    # CR-3: SUB-h beats SUB-f on id at the same created_at
+}
+
+
+class TestColumnarEngine:
+    """Columnar cohorts and rankings against hand-computed values"""
+
+    def test_tier_from_newest_active_subscription(self, engine):
+        tier_rows, month_rows, engagement, total = asyncio.run(engine._columnar_cohorts())
+        assert {t: (count, totals, ok) for t, count, totals, ok in tier_rows} == EXPECTED_TIERS
+        assert month_rows == [("2026-02", 3, 1), ("2026-01", 2, 2)]
+        assert engagement == {"highly_engaged": 0, "moderately_engaged": 1, "low_engaged": 3, "inactive": 1}
+        assert total == 5
+        print("✓ Newest active subscription sets the tier")
+
+    def test_ranking_ties_by_creator_id(self, engine):
+        by_rate = asyncio.run(engine._columnar_ranking("approval_rate", 10, None))
+        by_approved = asyncio.run(engine._columnar_ranking("approved_proposals", 10, None))
+        free = asyncio.run(engine._columnar_ranking("total_proposals", 10, "free"))
+        assert ranking_ids(by_rate) == [("CR-4", "Free"), ("CR-1", "Pro"), ("CR-2", "Free"), ("CR-3", "Elite")]
+        assert ranking_ids(by_approved) == [("CR-4", "Free"), ("CR-1", "Pro"), ("CR-2", "Free"), ("CR-3", "Elite")]
+        assert ranking_ids(free) == [("CR-4", "Free"), ("CR-2", "Free")]
+        print("✓ Ranking ties broken by creator id")
+
+
+class TestEnginesAgree:
+    """Both engines give the same cohorts and rankings for the same data"""
+
+    def run_both(self, method_suffix, *args, engine):
+        try:
+            aggregated = asyncio.run(getattr(engine, f"_aggregate_{method_suffix}")(*args))
+        except NotImplementedError:
+            pytest.skip("$lookup with a pipeline is not supported by mongomock")
+        return aggregated, asyncio.run(getattr(engine, f"_columnar_{method_suffix}")(*args))
+
+    def test_cohorts_match(self, engine):
+        aggregated, columnar = self.run_both("cohorts", engine=engine)
+        tier_rows, month_rows, engagement, total = aggregated
+        assert sorted(tier_rows) == sorted(columnar[0])
+        assert (month_rows, engagement, total) == (columnar[1], columnar[2], columnar[3])
+
+    @pytest.mark.parametrize("sort_by", ["approval_rate", "total_proposals", "approved_proposals", "default"])
+    def test_rankings_match(self, engine, sort_by):
+        aggregated, columnar = self.run_both("ranking", sort_by, 10, None, engine=engine)
+        assert aggregated == columnar
+
+
+class FakePatternEngine:
+    def __init__(self):
+        self.invalidations = 0
+
+    def invalidate_cohorts(self):
+        self.invalidations += 1
+
+
+class TestCohortInvalidation:
+    """Status changes outside the proposal/subscription routes drop cached cohorts"""
+
+    def test_auto_approval_invalidates(self, engine):
+        from auto_approval_service import AutoApprovalService
+
+        patterns = FakePatternEngine()
+        service = AutoApprovalService(engine.db, pattern_engine=patterns)
+
+        async def scenario():
+            await engine.db.creators.insert_one({"id": "CR-NEW", "name": "New", "email": "new@x.com", "status": "pending"})
+            await engine.db.auto_approval_config.insert_one({
+                "config_type": "approval", "enabled": True, "require_arris_review": False,
+                "notify_admin_on_auto_approve": False, "notify_admin_on_edge_case": False,
+            })
+            return await service.process_registration("CR-NEW", auto_execute=True)
+
+        result = asyncio.run(scenario())
+        assert result["new_status"] is not None
+        assert patterns.invalidations == 1
+
+    def test_escalation_invalidates(self, engine):
+        from auto_escalation_service import AutoEscalationService
+
+        patterns = FakePatternEngine()
+        service = AutoEscalationService(engine.db, pattern_engine=patterns)
+        service._invalidate_cohorts()
+        assert patterns.invalidations == 1
@@ -0,0 +1,57 @@
+"""
+Test Module: Creator Principal Dependency
+Creator-only routes resolve the token as a creator, so an admin token gets
+the same 401 auth.get_current_creator gave instead of a tier-less principal.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+import mongomock_motor
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import routes.dependencies as dependencies
+from auth import create_access_token
+from principal_cache import PrincipalCache
+
+
+class FakeFeatureGating:
+    async def get_creator_tier(self, creator_id):
+        return "pro", {"advanced_analytics": True}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    db = mongomock_motor.AsyncMongoMockClient()["principal_test"]
+    asyncio.run(db.admin_users.insert_one({"id": "AD-1", "email": "admin@example.com", "name": "Admin"}))
+    asyncio.run(db.creators.insert_one({"id": "CR-1", "email": "ada@example.com", "name": "Ada"}))
+    principal_cache = PrincipalCache(db, feature_gating=FakeFeatureGating())
+    monkeypatch.setitem(dependencies.services, "principal_cache", principal_cache)
+    return principal_cache
+
+
+def resolve_creator(token: str):
+    request = SimpleNamespace(state=SimpleNamespace())
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(dependencies.get_current_creator_principal(request, credentials))
+
+
+class TestCreatorPrincipal:
+
+    def test_admin_token_is_401(self, cache):
+        # Admin tokens carry no role claim
+        token = create_access_token({"sub": "admin@example.com", "user_id": "AD-1"})
+        with pytest.raises(HTTPException) as exc:
+            resolve_creator(token)
+        assert exc.value.status_code == 401
+        print("✓ Admin token rejected on creator routes")
+
+    def test_creator_token_has_tier(self, cache):
+        token = create_access_token({"sub": "ada@example.com", "user_id": "CR-1", "role": "creator"})
+        principal = resolve_creator(token)
+        assert principal["user_type"] == "creator"
+        assert principal["user_id"] == "CR-1"
+        assert principal["tier"] == "pro"
@@ -0,0 +1,119 @@
+"""
+Test Module: Rate Limiter
+Sliding-window math, Retry-After and the local deny cache.
+Unit tests against the in-memory backend with a controlled clock.
+"""
+
+import asyncio
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, InMemoryRateLimitBackend, _retry_at, _effective_usage
+
+HOUR = 3600
+WINDOWS = [("hour", 100, HOUR)]
+
+
+class FakeClock:
+    """Stands in for time.time() inside rate_limiter"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock(1_000 * HOUR + 10)  # 10s into an hour bucket
+    monkeypatch.setattr(rate_limiter.time, "time", fake.time)
+    return fake
+
+
+def hit(limiter, windows=WINDOWS, cost=1, key="k"):
+    return asyncio.run(limiter.hit(key, windows, cost))
+
+
+class TestRetryMath:
+    """_retry_at is the earliest time the sliding estimate admits the request"""
+
+    def test_decay_within_current_bucket(self):
+        """Room appears once the previous bucket's share has decayed enough"""
+        start = 0
+        at = _retry_at(100, HOUR, cur=40, prev=100, start=start, cost=1, now=60)
+        # 40 + 1 + 100 * (1 - f) <= 100  ->  f >= 0.41
+        assert at == pytest.approx(0.41 * HOUR)
+        assert 40 + 1 + _effective_usage(0, 100, start, HOUR, at) <= 100 + 1e-9
+        print("✓ Retry inside the current bucket")
+
+    def test_full_bucket_waits_into_next(self):
+        """A full current bucket only fits once it is the decaying previous bucket"""
+        at = _retry_at(100, HOUR, cur=100, prev=0, start=0, cost=1, now=10)
+        assert at == pytest.approx(HOUR * 1.01)
+        assert _effective_usage(0, 100, HOUR, HOUR, at) + 1 <= 100 + 1e-9
+        print("✓ Retry in the next bucket")
+
+    def test_immediate_when_room(self):
+        assert _retry_at(100, HOUR, cur=10, prev=0, start=0, cost=1, now=50) == 50
+
+
+class TestRateLimiterDecisions:
+    """Decisions, Retry-After and the deny cache"""
+
+    def test_waiting_retry_after_is_admitted(self, clock):
+        """The 101st request is denied; retrying after Retry-After succeeds"""
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        for _ in range(100):
+            assert hit(limiter)["allowed"]
+
+        denied = hit(limiter)
+        assert not denied["allowed"]
+        assert denied["violated_window"] == "hour"
+        # Boundary (3590s) plus 1% of the next hour for the old bucket to decay
+        assert denied["retry_after"] == pytest.approx(HOUR - 10 + 36, abs=1)
+
+        clock.now += denied["retry_after"]
+        assert hit(limiter)["allowed"], "Client that waited as told was denied again"
+        print(f"✓ Admitted after Retry-After={denied['retry_after']}s")
+
+    def test_cached_denial_reports_current_state(self, clock):
+        """Locally answered denials recompute usage and Retry-After"""
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        for _ in range(100):
+            hit(limiter)
+        first = hit(limiter)
+
+        clock.now += HOUR + 20  # into the next bucket, still before retry time
+        cached = hit(limiter)
+        assert not cached["allowed"]
+        assert cached["retry_after"] < first["retry_after"]
+        assert cached["windows"]["hour"]["used"] < first["windows"]["hour"]["used"]
+        assert cached["windows"]["hour"]["reset"] == first["windows"]["hour"]["reset"] + HOUR
+        print("✓ Cached denial reflects the current window")
+
+    def test_expensive_denial_does_not_block_cheaper_request(self, clock):
+        """A denied batch (cost > remaining) leaves single requests allowed"""
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        for _ in range(95):
+            hit(limiter)
+        assert not hit(limiter, cost=10)["allowed"]
+        decision = hit(limiter, cost=1)
+        assert decision["allowed"]
+        assert decision["windows"]["hour"]["used"] == 96
+        print("✓ Denied batch rolled back and not cached for smaller costs")
+
+    def test_multiple_windows_take_latest_retry(self, clock):
+        """Retry-After covers every exhausted window"""
+        windows = [("minute", 5, 60), ("hour", 6, HOUR)]
+        limiter = RateLimiter(InMemoryRateLimitBackend())
+        for _ in range(5):
+            assert hit(limiter, windows)["allowed"]
+        clock.now += 120  # minute window fully drained
+        assert hit(limiter, windows)["allowed"]
+
+        denied = hit(limiter, windows)
+        assert denied["violated_window"] == "hour"
+        clock.now += denied["retry_after"]
+        assert hit(limiter, windows)["allowed"]
+        print("✓ Multi-window Retry-After")
@@ -0,0 +1,240 @@
+"""
+Test Module: Smart Automation Bulk Evaluation
+NumPy condition masks and the bulk evaluate-all path against the
+per-creator evaluator on the same fixture.
+Unit tests; the comparison uses an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import random
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import mongomock_motor
+
+from smart_automation_engine import SmartAutomationEngine, ConditionType, EVALUATION_RUN_JOB
+
+RULES = [
+    {
+        "id": "R-STALLED", "trigger_type": "condition", "cooldown_hours": 24,
+        "conditions": {"field": "days_since_last_proposal", "operator": "gte", "value": 14},
+    },
+    {
+        "id": "R-STRUGGLING", "trigger_type": "condition", "cooldown_hours": 0,
+        "conditions": {
+            "type": ConditionType.COMPOSITE, "operator": "AND",
+            "rules": [
+                {"field": "consecutive_rejections", "operator": "gte", "value": 2},
+                {"field": "approval_rate", "operator": "lt", "value": 50},
+            ],
+        },
+    },
+    {
+        "id": "R-ACTIVE-OR-NEW", "trigger_type": "time_based", "cooldown_hours": 48,
+        "conditions": {
+            "type": ConditionType.COMPOSITE, "operator": "OR",
+            "rules": [
+                {"field": "total_proposals", "operator": "eq", "value": 0},
+                {"field": "approved_proposals", "operator": "gt", "value": 3},
+            ],
+        },
+    },
+    {
+        # String comparison goes through the per-row fallback
+        "id": "R-PREMIUM", "trigger_type": "condition", "cooldown_hours": 0,
+        "conditions": {"field": "tier", "operator": "eq", "value": "Premium"},
+    },
+    {"id": "R-PATTERN", "trigger_type": "pattern", "conditions": None},
+]
+
+STATUSES = ["approved", "completed", "in_progress", "rejected", "submitted", "draft"]
+
+
+def iso(dt: datetime) -> str:
+    return dt.isoformat()
+
+
+async def seed(db, creators: int = 60):
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    proposals, subscriptions, logs = [], [], []
+    creator_ids = [f"CR-{i:03d}" for i in range(creators)]
+    for creator_id in creator_ids:
+        for n in range(rng.randint(0, 8)):
+            created = now - timedelta(days=rng.randint(0, 60), minutes=n)
+            proposals.append({
+                "user_id": creator_id,
+                "status": rng.choice(STATUSES),
+                "created_at": iso(created),
+                "updated_at": iso(created + timedelta(days=1)) if rng.random() < 0.5 else None,
+            })
+        if rng.random() < 0.4:
+            subscriptions.append({"creator_id": creator_id, "status": "active", "tier": rng.choice(["Pro", "Premium"])})
+        if rng.random() < 0.3:
+            logs.append({
+                "rule_id": rng.choice(["R-STALLED", "R-ACTIVE-OR-NEW"]),
+                "creator_id": creator_id,
+                "triggered_at": iso(now - timedelta(hours=rng.choice([1, 30, 100]))),
+            })
+    for collection, docs in [("proposals", proposals), ("creator_subscriptions", subscriptions), ("smart_automation_log", logs)]:
+        if docs:
+            await db[collection].insert_many(docs)
+    return creator_ids
+
+
+def make_engine(db=None) -> SmartAutomationEngine:
+    engine = SmartAutomationEngine(db)
+    engine.smart_rules = RULES
+    return engine
+
+
+class TestConditionMasks:
+    """_conditions_mask matches _evaluate_conditions row by row"""
+
+    METRICS = [
+        {"approval_rate": 20.0, "consecutive_rejections": 3, "total_proposals": 5, "tier": "Free"},
+        {"approval_rate": 80.0, "consecutive_rejections": 0, "total_proposals": 0, "tier": "Premium"},
+        {"approval_rate": 49.9, "consecutive_rejections": 2, "total_proposals": 2, "tier": None},
+    ]
+
+    @pytest.mark.parametrize("rule", RULES[:4], ids=[r["id"] for r in RULES[:4]])
+    def test_mask_matches_rowwise(self, rule):
+        engine = make_engine()
+        metrics = [dict(m, days_since_last_proposal=d, approved_proposals=a)
+                   for m, d, a in zip(self.METRICS, [30, 0, 14], [4, 0, 1])]
+        columns = engine._metric_columns(metrics)
+        mask = engine._conditions_mask(rule["conditions"], columns, metrics)
+        assert list(mask) == [engine._evaluate_conditions(rule["conditions"], m) for m in metrics]
+
+    def test_missing_values_never_match(self):
+        engine = make_engine()
+        metrics = [{"score": None}, {"score": 5}]
+        columns = engine._metric_columns(metrics)
+        for operator in ["lt", "lte", "gt", "gte", "eq", "ne"]:
+            mask = engine._threshold_mask({"field": "score", "operator": operator, "value": 5}, columns, metrics)
+            assert not mask[0]
+        print("✓ Missing metric values never match")
+
+    def test_empty_composite_and_unknown_operator(self):
+        engine = make_engine()
+        metrics = [{"x": 1}, {"x": 2}]
+        columns = engine._metric_columns(metrics)
+        assert engine._conditions_mask({"type": ConditionType.COMPOSITE, "rules": []}, columns, metrics).all()
+        assert not engine._conditions_mask(
+            {"type": ConditionType.COMPOSITE, "operator": "XOR", "rules": [{"field": "x", "operator": "gt", "value": 0}]},
+            columns, metrics
+        ).any()
+        assert engine._conditions_mask(None, columns, metrics).all()
+
+
+class TestBulkMatchesPerCreator:
+    """evaluate_creators_bulk triggers exactly what evaluate_creator_conditions does"""
+
+    def test_same_rules_and_metrics(self):
+        db = mongomock_motor.AsyncMongoMockClient()["smart_automation_test"]
+
+        async def scenario():
+            creator_ids = await seed(db)
+            engine = make_engine(db)
+            bulk = await engine.evaluate_creators_bulk(creator_ids)
+            single = []
+            for creator_id in creator_ids:
+                single.extend(await engine.evaluate_creator_conditions(creator_id))
+            return bulk, single
+
+        bulk, single = asyncio.run(scenario())
+
+        def keyed(results):
+            return {(r["rule"]["id"], r["creator_id"]): r["metrics"] for r in results}
+
+        bulk_keyed, single_keyed = keyed(bulk), keyed(single)
+        assert bulk_keyed.keys() == single_keyed.keys()
+        assert len(bulk_keyed) > 0
+        for key, metrics in single_keyed.items():
+            expected = {k: v for k, v in metrics.items() if k != "calculated_at"}
+            actual = {k: v for k, v in bulk_keyed[key].items() if k != "calculated_at"}
+            assert actual == expected, key
+        assert "R-PATTERN" not in {rule_id for rule_id, _ in bulk_keyed}
+        print(f"✓ Bulk and per-creator paths agree on {len(bulk_keyed)} triggers")
+
+    def test_execute_bounded_keeps_creator_order(self):
+        engine = make_engine()
+        calls = []
+
+        async def execute(triggers):
+            calls.append([t["rule"]["id"] for t in triggers])
+            return [{"creator_id": t["creator_id"], "rule_id": t["rule"]["id"]} for t in triggers]
+
+        engine.execute_triggered_rules = execute
+        triggers = [
+            {"rule": {"id": rule_id}, "creator_id": creator_id}
+            for creator_id, rule_id in [("A", "R1"), ("B", "R1"), ("A", "R2"), ("A", "R3")]
+        ]
+        results = asyncio.run(engine._execute_bounded(triggers, concurrency=2))
+        assert ["R1", "R2", "R3"] in calls
+        assert len(results) == 4
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.queued = []
+
+    async def run_now(self, name):
+        self.queued.append(name)
+        return {"success": True, "queued": True, "job_name": name, "run_id": "JOB-1"}
+
+
+class TestEvaluationRuns:
+    """evaluate-all runs are queued for the scheduler job and always get a final status"""
+
+    def test_queued_run_completes_via_job(self):
+        db = mongomock_motor.AsyncMongoMockClient()["smart_automation_runs"]
+
+        async def scenario():
+            creator_ids = await seed(db, creators=10)
+            await db.creators.insert_many([{"id": c, "status": "active"} for c in creator_ids])
+            engine = make_engine(db)
+
+            async def execute(triggers):
+                return [{"creator_id": t["creator_id"], "rule_id": t["rule"]["id"]} for t in triggers]
+
+            engine.execute_triggered_rules = execute
+            scheduler = FakeScheduler()
+            handle = await engine.start_evaluation_run(scheduler)
+            queued = await engine.get_evaluation_run(handle["run_id"])
+            result = await engine.run_queued_evaluations()
+            return handle, queued, scheduler, result, await engine.get_evaluation_run(handle["run_id"])
+
+        handle, queued, scheduler, result, run = asyncio.run(scenario())
+        assert scheduler.queued == [EVALUATION_RUN_JOB]
+        assert handle["status"] == "queued" and queued["status"] == "queued"
+        assert result == {"runs": [handle["run_id"]]}
+        assert run["status"] == "completed"
+        assert run["creators_evaluated"] == 10
+        assert run["progress_percent"] == 100.0
+        print("✓ Queued evaluation run completed by the scheduler job")
+
+    def test_cancelled_run_records_status(self):
+        db = mongomock_motor.AsyncMongoMockClient()["smart_automation_cancel"]
+
+        async def scenario():
+            engine = make_engine(db)
+            started = asyncio.Event()
+
+            async def slow_evaluate(run_id=None):
+                started.set()
+                await asyncio.sleep(60)
+
+            engine.evaluate_all_creators = slow_evaluate
+            handle = await engine.start_evaluation_run(FakeScheduler())
+            task = asyncio.create_task(engine.run_queued_evaluations())
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await engine.get_evaluation_run(handle["run_id"])
+
+        run = asyncio.run(scenario())
+        assert run["status"] == "cancelled"
+        assert run["completed_at"]
+        print("✓ Cancelled evaluation run is not left running")
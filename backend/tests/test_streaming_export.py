@@ -0,0 +1,245 @@
+"""
+Test Module: Streaming Export
+DocumentStream keyset order and resume cursors (ties, nulls, foreign
+tokens, projections), NDJSON checkpoints and the lazily gathered pattern
+export stream.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import json
+import pytest
+
+import mongomock_motor
+
+from streaming_export import DocumentStream, ExportCursorError, encode_cursor, ndjson_rows
+
+# Ties on score so resuming has to fall back to _id
+ROWS = [
+    {"_id": 1, "name": "a", "score": 30},
+    {"_id": 2, "name": "b", "score": 20},
+    {"_id": 3, "name": "c", "score": 20},
+    {"_id": 4, "name": "d", "score": 20},
+    {"_id": 5, "name": "e", "score": None},
+    {"_id": 6, "name": "f", "score": 10},
+    {"_id": 7, "name": "g", "score": None},
+]
+
+
+@pytest.fixture
+def collection():
+    db = mongomock_motor.AsyncMongoMockClient()["streaming_export_test"]
+    asyncio.run(db.items.insert_many([dict(r) for r in ROWS]))
+    return db.items
+
+
+async def drain(stream: DocumentStream, stop_after: int = None):
+    """Names yielded and the cursor after each one"""
+    names, cursors = [], []
+    async for doc in stream:
+        names.append(doc["name"])
+        cursors.append(stream.cursor)
+        if stop_after and len(names) == stop_after:
+            break
+    return names, cursors
+
+
+class TestKeysetOrder:
+    """(sort_field, _id) order with nulls last descending, first ascending"""
+
+    def test_descending(self, collection):
+        names, _ = asyncio.run(drain(DocumentStream(collection, {}, "score", batch_size=2)))
+        assert names == ["a", "d", "c", "b", "f", "g", "e"]
+
+    def test_ascending(self, collection):
+        names, _ = asyncio.run(drain(DocumentStream(collection, {}, "score", descending=False, batch_size=2)))
+        assert names == ["e", "g", "f", "b", "c", "d", "a"]
+        print("✓ Keyset order")
+
+
+class TestResumeCursors:
+    """Resuming from any cursor continues with no gaps or duplicates"""
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_resume_from_every_position(self, collection, descending):
+        full, cursors = asyncio.run(drain(DocumentStream(collection, {}, "score", descending=descending)))
+        for position, cursor in enumerate(cursors):
+            rest, _ = asyncio.run(drain(DocumentStream(collection, {}, "score", descending=descending, cursor=cursor)))
+            assert full[:position + 1] + rest == full, (position, rest)
+        print(f"✓ Resume from every position ({'desc' if descending else 'asc'})")
+
+    def test_interrupted_export_resumes(self, collection):
+        async def scenario():
+            first = DocumentStream(collection, {}, "score", batch_size=2)
+            head, _ = await drain(first, stop_after=3)
+            tail, _ = await drain(DocumentStream(collection, {}, "score", cursor=first.cursor))
+            return head, tail
+
+        head, tail = asyncio.run(scenario())
+        assert head == ["a", "d", "c"]
+        assert tail == ["b", "f", "g", "e"]
+
+    def test_resume_respects_query(self, collection):
+        query = {"name": {"$ne": "c"}}
+        full, cursors = asyncio.run(drain(DocumentStream(collection, query, "score")))
+        rest, _ = asyncio.run(drain(DocumentStream(collection, query, "score", cursor=cursors[1])))
+        assert "c" not in full
+        assert full[2:] == rest
+
+    def test_foreign_cursor_rejected(self, collection):
+        with pytest.raises(ExportCursorError):
+            DocumentStream(collection, {}, "score", cursor=encode_cursor("created_at", 1, 1))
+
+    @pytest.mark.parametrize("token", ["not-a-cursor", "!!!", encode_cursor("score", 1, 1)[:-4]])
+    def test_malformed_cursor_rejected(self, collection, token):
+        with pytest.raises(ExportCursorError):
+            DocumentStream(collection, {}, "score", cursor=token)
+
+
+class TestProjection:
+    """The sort field is fetched for cursors but only exported if asked for"""
+
+    def test_sort_field_stripped_when_not_projected(self, collection):
+        async def scenario():
+            stream = DocumentStream(collection, {}, "score", {"name": 1, "_id": 0})
+            docs = [doc async for doc in stream]
+            return docs, stream.cursor
+
+        docs, cursor = asyncio.run(scenario())
+        assert docs[0] == {"name": "a"}
+        rest, _ = asyncio.run(drain(DocumentStream(collection, {}, "score", cursor=cursor)))
+        assert rest == []
+
+    def test_exclusion_projection_keeps_sort_field(self, collection):
+        async def scenario():
+            return [doc async for doc in DocumentStream(collection, {}, "score", {"_id": 0})]
+
+        docs = asyncio.run(scenario())
+        assert docs[0] == {"name": "a", "score": 30}
+
+
+class TestNdjsonCheckpoints:
+    """Checkpoint lines carry a cursor that resumes after that record"""
+
+    def test_checkpoints_and_end_marker(self, collection, monkeypatch):
+        async def scenario():
+            stream = DocumentStream(collection, {}, "score", {"_id": 0})
+            return [json.loads(line) async for line in ndjson_rows(stream, header={"kind": "items"}, checkpoint_rows=3)]
+
+        lines = asyncio.run(scenario())
+        markers = [line["_export"] for line in lines if "_export" in line]
+        assert markers[0] == {"kind": "items"}
+        assert [m["records"] for m in markers[1:-1]] == [3, 6]
+        assert markers[-1]["complete"] is True and markers[-1]["records"] == 7
+
+        rest, _ = asyncio.run(drain(DocumentStream(collection, {}, "score", cursor=markers[1]["cursor"])))
+        assert rest == ["b", "f", "g", "e"]
+        print("✓ NDJSON checkpoints resume")
+
+
+class FakeInsights:
+    """Pattern insights stand-in that records which sections were fetched"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def get_creator_patterns(self, creator_id, limit=100):
+        self.calls.append("patterns")
+        return {"patterns": [{"pattern_id": "P-1", "category": "timing", "confidence": 0.8}]}
+
+    async def get_pattern_recommendations(self, creator_id):
+        self.calls.append("recommendations")
+        return {"recommendations": [{"id": "R-1", "category": "timing"}]}
+
+    async def get_pattern_trends(self, creator_id, days=90):
+        self.calls.append("trends")
+        return {"trends": {"timing": [{"confidence": 0.5}]}}
+
+
+class TestPatternExportStream:
+    """stream_patterns sends the header before gathering any section"""
+
+    def make_service(self, calls):
+        from pattern_export_service import PatternExportService
+
+        db = mongomock_motor.AsyncMongoMockClient()["pattern_stream_test"]
+        asyncio.run(db.pattern_feedback.insert_many([
+            {"id": f"FB-{n}", "creator_id": "CR-1", "pattern_id": "P-1", "created_at": f"2026-03-0{n}"}
+            for n in range(1, 4)
+        ]))
+        service = PatternExportService(db, pattern_insights_service=FakeInsights(calls))
+
+        async def has_access(creator_id):
+            return {"has_access": True}
+
+        service.has_access = has_access
+        return service, db
+
+    def test_ndjson_is_lazy_and_logged(self):
+        calls = []
+        service, db = self.make_service(calls)
+
+        async def scenario():
+            result = await service.stream_patterns("CR-1", export_format="ndjson", include_feedback=True)
+            rows = result["rows"]
+            first = await rows.__anext__()
+            fetched_before_first_row = list(calls)
+            rest = [piece async for piece in rows]
+            log = await db.pattern_export_log.find_one({"export_id": result["export_id"]})
+            return first, fetched_before_first_row, rest, log
+
+        first, fetched, rest, log = asyncio.run(scenario())
+        assert fetched == []
+        assert json.loads(first)["_export"]["format"] == "ndjson"
+        records = [json.loads(line) for line in rest]
+        assert [r["record_type"] for r in records[:-1]] == ["pattern", "recommendation", "trend"] + ["feedback"] * 3
+        expected_counts = {"patterns": 1, "recommendations": 1, "trends": 1, "feedback_entries": 3}
+        assert records[-1]["_export"]["record_counts"] == expected_counts
+        assert log["record_counts"] == expected_counts
+        print("✓ Pattern stream starts before the data is gathered")
+
+    def test_csv_skips_excluded_sections(self):
+        calls = []
+        service, _ = self.make_service(calls)
+
+        async def scenario():
+            result = await service.stream_patterns("CR-1", include_recommendations=False, include_trends=False)
+            return "".join([piece async for piece in result["rows"]])
+
+        text = asyncio.run(scenario())
+        assert calls == ["patterns"]
+        assert "## PATTERNS" in text and "## RECOMMENDATIONS" not in text and "## FEEDBACK" not in text
+        assert text.rstrip().endswith("# Total Recommendations: 0")
+
+
+class TestPatternExportRoute:
+    """POST /creators/me/pattern-export with stream=true"""
+
+    def test_default_format_streams_as_ndjson(self, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        import routes.creator as creator_routes
+
+        calls = []
+        service, db = TestPatternExportStream().make_service(calls)
+
+        async def current_creator(credentials, db):
+            return {"id": "CR-1"}
+
+        monkeypatch.setattr(creator_routes, "get_db", lambda: db)
+        monkeypatch.setattr(creator_routes, "get_current_creator", current_creator)
+        monkeypatch.setattr(creator_routes, "get_service", lambda name: service)
+        app = FastAPI()
+        app.include_router(creator_routes.router)
+
+        response = TestClient(app).post(
+            "/creators/me/pattern-export", params={"stream": "true"},
+            headers={"Authorization": "Bearer test"}
+        )
+        assert response.status_code == 200, response.text
+        assert 'filename="pattern_export_' in response.headers["content-disposition"]
+        assert response.headers["content-disposition"].endswith('.ndjson"')
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["_export"]["format"] == "ndjson"
+        assert lines[-1]["_export"]["record_counts"]["patterns"] == 1
+        print("✓ stream=true with the default format downloads NDJSON")
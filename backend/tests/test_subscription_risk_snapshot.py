@@ -0,0 +1,151 @@
+"""
+Test Module: Subscription Risk Snapshot
+Vectorized score_subscriptions against the per-creator health path, and
+paging of the at-risk snapshot.
+Unit tests against an in-memory MongoDB (mongomock_motor).
+"""
+
+import asyncio
+import random
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import mongomock_motor
+import numpy as np
+
+from subscription_lifecycle_service import (
+    SubscriptionLifecycleService, RISK_FACTORS, RISK_LEVEL_ORDER, RiskLevel
+)
+
+STATUSES = ["submitted", "approved", "rejected", "in_progress", "completed"]
+
+
+def iso(dt: datetime) -> str:
+    return dt.isoformat()
+
+
+@pytest.fixture
+def db():
+    return mongomock_motor.AsyncMongoMockClient()["subscription_risk_test"]
+
+
+async def seed(db, creators: int = 40):
+    """Active subscriptions with a spread of proposal, ticket and payment signals"""
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    subscriptions, proposals, tickets, failures = [], [], [], []
+    for i in range(creators):
+        creator_id = f"CR-{i:03d}"
+        subscriptions.append({
+            "creator_id": creator_id,
+            "email": f"{creator_id.lower()}@example.com",
+            "tier": rng.choice(["Pro", "Premium", "Elite"]),
+            "status": "active",
+            "created_at": iso(now - timedelta(days=rng.choice([3, 20, 90, 400]))),
+        })
+        for n in range(rng.randint(0, 10)):
+            proposals.append({
+                "user_id": creator_id,
+                "status": rng.choice(STATUSES),
+                "created_at": iso(now - timedelta(days=rng.randint(0, 75), minutes=n)),
+            })
+        for _ in range(rng.choice([0, 0, 1, 3, 6])):
+            tickets.append({"creator_id": creator_id, "status": rng.choice(["open", "resolved", "pending"])})
+        for _ in range(rng.choice([0, 0, 1, 2, 4])):
+            failures.append({"creator_id": creator_id, "created_at": iso(now - timedelta(days=rng.randint(0, 120)))})
+    subscriptions.append({"creator_id": "CR-CANCELLED", "status": "cancelled", "tier": "Pro"})
+    for collection, docs in [
+        ("creator_subscriptions", subscriptions), ("proposals", proposals),
+        ("support_tickets", tickets), ("payment_failures", failures),
+    ]:
+        if docs:
+            await db[collection].insert_many(docs)
+    return [s for s in subscriptions if s["status"] == "active"]
+
+
+class TestVectorScoringParity:
+    """score_subscriptions matches get_subscription_health creator by creator"""
+
+    def test_rows_match_single_creator_health(self, db):
+        service = SubscriptionLifecycleService(db)
+
+        async def scenario():
+            subscriptions = await seed(db)
+            rows = await service.score_subscriptions([dict(s) for s in subscriptions])
+            single = [await service.get_subscription_health(s["creator_id"]) for s in subscriptions]
+            return rows, single
+
+        rows, single = asyncio.run(scenario())
+        assert len(rows) == len(single) == 40
+        assert len({row["risk_level"] for row in rows}) > 1
+        for row, health in zip(rows, single):
+            assert row["creator_id"] == health["creator_id"]
+            assert row["health_score"] == health["health_score"], row["creator_id"]
+            assert row["risk_level"] == health["risk_level"]
+            assert row["lifecycle_stage"] == health["lifecycle_stage"]
+            assert row["top_risk_factors"] == service._get_top_risk_factors(health["risk_analysis"])
+        print(f"✓ Vector and per-creator scoring agree on {len(rows)} subscriptions")
+
+    @pytest.mark.parametrize("factor_name", [
+        "inactivity_days", "proposal_decline_rate", "engagement_drop", "support_tickets", "payment_failures"
+    ])
+    def test_factor_vectors_match_scalar(self, factor_name):
+        service = SubscriptionLifecycleService(None)
+        thresholds = RISK_FACTORS[factor_name]["thresholds"]
+        # Each threshold, just below it, and well past critical
+        values = sorted({0.0, thresholds["critical"] * 3} | {
+            v for t in thresholds.values() if t for v in (t, t - 0.01)
+        })
+        array = np.array(values, dtype=np.float64)
+
+        vector = service._factor_scores_vector(factor_name, array)
+        status = service._factor_status_vector(factor_name, array)
+        assert list(vector) == [service._calculate_factor_score(factor_name, v) for v in values]
+        assert list(status) == [service._get_factor_status(factor_name, v) for v in values]
+        print(f"✓ {factor_name} vector scores match _calculate_factor_score")
+
+
+class TestSnapshotPaging:
+    """get_at_risk_subscriptions pages the snapshot in risk order"""
+
+    def test_pages_cover_snapshot_in_order(self, db):
+        service = SubscriptionLifecycleService(db)
+
+        async def scenario():
+            await seed(db)
+            first = await service.get_at_risk_subscriptions(RiskLevel.LOW, limit=15, offset=0)
+            pages = [first]
+            offset = 15
+            while offset < first["total_at_risk"]:
+                pages.append(await service.get_at_risk_subscriptions(RiskLevel.LOW, limit=15, offset=offset))
+                offset += 15
+            return pages
+
+        pages = asyncio.run(scenario())
+        rows = [row for page in pages for row in page["at_risk_subscriptions"]]
+        assert pages[0]["total_at_risk"] == 40
+        assert pages[0]["snapshot"]["subscriptions_scored"] == 40
+        assert len(rows) == 40
+        assert len({row["creator_id"] for row in rows}) == 40
+        assert "CR-CANCELLED" not in {row["creator_id"] for row in rows}
+        keys = [(RISK_LEVEL_ORDER.index(row["risk_level"]), row["health_score"]) for row in rows]
+        assert keys == sorted(keys)
+        print(f"✓ {len(pages)} pages cover the snapshot once, in risk order")
+
+    def test_threshold_filters_and_counts(self, db):
+        service = SubscriptionLifecycleService(db)
+
+        async def scenario():
+            await seed(db)
+            everything = await service.get_at_risk_subscriptions(RiskLevel.LOW, limit=100)
+            high = await service.get_at_risk_subscriptions(RiskLevel.HIGH, limit=5)
+            return everything, high
+
+        everything, high = asyncio.run(scenario())
+        expected = sum(everything["risk_counts"][level] for level in [RiskLevel.CRITICAL, RiskLevel.HIGH])
+        assert 0 < high["total_at_risk"] == expected
+        assert len(high["at_risk_subscriptions"]) == min(5, expected)
+        assert all(row["risk_level"] in (RiskLevel.CRITICAL, RiskLevel.HIGH) for row in high["at_risk_subscriptions"])
+        with pytest.raises(ValueError):
+            asyncio.run(service.get_at_risk_subscriptions("severe"))
+        print("✓ Threshold filters rows and risk counts")
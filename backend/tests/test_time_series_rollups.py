@@ -0,0 +1,305 @@
+"""
+Test Module: Time-Series Rollups
+Bucket boundaries, record / forget increments, compaction, query ranges and
+rebuilds that keep increments made while they run.
+Unit tests against an in-memory MongoDB (mongomock_motor); the test series
+buckets ISO-string timestamps with $substr since mongomock has no $convert.
+"""
+
+import asyncio
+import pytest
+from bson import ObjectId
+from datetime import datetime, timezone, timedelta
+
+import mongomock_motor
+
+from time_series_rollups import (
+    PLATFORM_SCOPE, RollupSeries, TimeSeriesRollups, bucket_key, bucket_start,
+)
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class StringDaySeries(RollupSeries):
+    def day_expr(self):
+        return {"$substr": [f"${self.time_field}", 0, 10]}
+
+
+SERIES = {
+    "events": StringDaySeries("events", "events", "created_at", "creator_id", by="kind", sums={"score": "score"}),
+}
+
+
+@pytest.fixture
+def rollups():
+    db = mongomock_motor.AsyncMongoMockClient()["rollups_test"]
+    service = TimeSeriesRollups(db, series=SERIES)
+    service.retention_days = 100000
+    return service
+
+
+def event(at: datetime, creator_id: str = "CR-1", kind: str = "click", score: float = 1, inserted: datetime = None):
+    doc = {"creator_id": creator_id, "kind": kind, "score": score, "created_at": at.isoformat()}
+    if inserted:
+        doc["_id"] = ObjectId.from_datetime(inserted)
+    return doc
+
+
+async def insert(rollups, doc):
+    await rollups.db.events.insert_one(doc)
+    await rollups.record("events", doc)
+    return doc
+
+
+async def day_buckets(rollups, scope=PLATFORM_SCOPE):
+    return {
+        doc["bucket"]: (doc["count"], doc.get("sums", {}), doc.get("by", {}))
+        async for doc in rollups.db.ts_rollups.find({"series": "events", "scope": scope, "granularity": "day"})
+        if doc["count"]
+    }
+
+
+class TestBucketBoundaries:
+    """UTC day / ISO week (Monday) / month starts and labels"""
+
+    def test_week_starts_monday(self):
+        assert bucket_start(utc(2026, 3, 1, 23, 59), "week") == utc(2026, 2, 23)  # Sunday
+        assert bucket_start(utc(2026, 3, 2, 0, 0), "week") == utc(2026, 3, 2)     # Monday
+        print("✓ Week boundary")
+
+    def test_month_and_day(self):
+        assert bucket_start(utc(2026, 3, 31, 23, 59, 59), "month") == utc(2026, 3, 1)
+        assert bucket_start(utc(2026, 3, 31, 23, 59, 59), "day") == utc(2026, 3, 31)
+
+    def test_offsets_and_naive_values_are_utc(self):
+        assert bucket_start("2026-03-02T01:00:00+02:00", "day") == utc(2026, 3, 1)
+        assert bucket_start(datetime(2026, 3, 2, 1, 0), "day") == utc(2026, 3, 2)
+        assert bucket_key("2026-03-01T23:30:00-01:00", "day") == "2026-03-02"
+
+    def test_iso_week_year_rollover(self):
+        assert bucket_key(utc(2027, 1, 1), "week") == "2026-W53"
+        assert bucket_start(utc(2027, 1, 1), "week") == utc(2026, 12, 28)
+        assert bucket_key(utc(2026, 1, 1), "week") == "2026-W01"
+
+
+class TestRecordAndForget:
+    """forget() reverses record() in every granularity it touched"""
+
+    def test_forget_reverses_record(self, rollups):
+        async def scenario():
+            docs = [await insert(rollups, event(utc(2026, 3, 2, 10), kind=k, score=s)) for k, s in [("click", 2), ("view", 3)]]
+            recorded = await day_buckets(rollups)
+            await rollups.db.events.delete_many({"kind": "click"})
+            await rollups.forget("events", [docs[0]])
+            return recorded, await day_buckets(rollups), await day_buckets(rollups, "CR-1")
+
+        recorded, platform, creator = asyncio.run(scenario())
+        assert recorded == {"2026-03-02": (2, {"score": 5}, {"click": 1, "view": 1})}
+        assert platform == {"2026-03-02": (1, {"score": 3}, {"click": 0, "view": 1})}
+        assert creator == platform
+        print("✓ forget() reverses record()")
+
+    def test_forget_does_not_create_buckets(self, rollups):
+        async def scenario():
+            await rollups.forget("events", [event(utc(2026, 3, 2))])
+            return await rollups.db.ts_rollups.count_documents({})
+
+        assert asyncio.run(scenario()) == 0
+
+    def test_back_dated_hits_compacted_buckets(self, rollups):
+        async def scenario():
+            await insert(rollups, event(utc(2026, 3, 2)))
+            await rollups.compact_series("events")
+            await rollups._load_state()
+            late = await insert(rollups, event(utc(2026, 3, 4)))
+            weeks = await rollups.query("events", granularity="week", start=utc(2026, 3, 2), end=utc(2026, 3, 9))
+            await rollups.forget("events", [late])
+            after = await rollups.query("events", granularity="week", start=utc(2026, 3, 2), end=utc(2026, 3, 9))
+            return weeks, after
+
+        asyncio.run(rollups.db.ts_rollup_state.insert_one({"_id": "events", "rebuilt_at": utc(2026, 3, 1)}))
+        weeks, after = asyncio.run(scenario())
+        assert [(w["date"], w["count"]) for w in weeks] == [("2026-W10", 2)]
+        assert [(w["date"], w["count"]) for w in after] == [("2026-W10", 1)]
+
+
+class TestCompactionAndQuery:
+    """Days before today fold into weeks / months; query ranges and cumulative totals"""
+
+    def test_compaction_boundaries_and_retention(self, rollups):
+        today = bucket_start(datetime.now(timezone.utc), "day")
+
+        async def scenario():
+            for at in [utc(2026, 2, 28, 23), utc(2026, 3, 1, 1), utc(2026, 3, 2, 0), today + timedelta(hours=1)]:
+                await insert(rollups, event(at))
+            rollups.retention_days = (today - utc(2026, 3, 1)).days
+            result = await rollups.compact_series("events")
+            buckets = {
+                (doc["granularity"], doc["bucket"]): doc["count"]
+                async for doc in rollups.db.ts_rollups.find({"scope": PLATFORM_SCOPE})
+            }
+            return result, buckets
+
+        result, buckets = asyncio.run(scenario())
+        assert result["expired_days"] == 2  # 02-28 for both scopes
+        assert ("day", "2026-02-28") not in buckets
+        assert buckets[("month", "2026-02")] == 1
+        assert buckets[("month", "2026-03")] == 2
+        assert buckets[("week", "2026-W09")] == 2  # Sat 02-28 and Sun 03-01
+        assert buckets[("week", "2026-W10")] == 1
+        assert ("month", bucket_key(today, "month")) not in buckets  # today is never compacted
+        assert buckets[("day", bucket_key(today, "day"))] == 1
+        print("✓ Compaction folds days before today and expires old days")
+
+    def test_query_ranges(self, rollups):
+        async def scenario():
+            assert await rollups.query("events") is None  # never built
+            await rollups.db.ts_rollup_state.insert_one({"_id": "events", "rebuilt_at": utc(2026, 1, 1)})
+            for at in [utc(2026, 3, 1, 12), utc(2026, 3, 3), utc(2026, 3, 4), utc(2026, 3, 9)]:
+                await insert(rollups, event(at))
+            days = await rollups.query("events", start=utc(2026, 3, 3, 18), end=utc(2026, 3, 9))
+            weeks = await rollups.query("events", granularity="week", start=utc(2026, 3, 4), end=utc(2026, 3, 10))
+            await rollups.compact_series("events")
+            compacted = await rollups.query("events", granularity="week", start=utc(2026, 3, 4), end=utc(2026, 3, 10))
+            return days, weeks, compacted
+
+        days, weeks, compacted = asyncio.run(scenario())
+        # start rounds down to its bucket; end is exclusive
+        assert [(d["date"], d["count"], d["cumulative"]) for d in days] == [("2026-03-03", 1, 1), ("2026-03-04", 1, 2)]
+        # Before compaction weekly buckets are empty; after it, W10 starts on Monday 03-02
+        assert weeks == []
+        assert [(w["date"], w["count"], w["cumulative"]) for w in compacted] == [("2026-W10", 2, 2), ("2026-W11", 1, 3)]
+        print("✓ Query ranges")
+
+
+class TestRebuild:
+    """Rebuilds match the source and keep increments made while they run"""
+
+    async def seed(self, rollups):
+        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+        for n in range(3):
+            await insert(rollups, event(utc(2026, 3, 2, n), kind="click", inserted=yesterday - timedelta(seconds=n)))
+        await insert(rollups, event(utc(2026, 3, 2, 5), kind="view"))  # inserted today
+
+    def test_rebuild_matches_source_and_corrects_drift(self, rollups):
+        async def scenario():
+            await self.seed(rollups)
+            # Deleted without forget(): the rebuild picks it up
+            await rollups.db.events.delete_one({"kind": "click"})
+            await rollups.rebuild("events")
+            return await day_buckets(rollups), await day_buckets(rollups, "CR-1")
+
+        platform, creator = asyncio.run(scenario())
+        assert platform == {"2026-03-02": (3, {"score": 3}, {"click": 2, "view": 1})}
+        assert creator == platform
+        print("✓ Rebuild corrects drift")
+
+    def test_record_after_snapshot_is_kept(self, rollups):
+        rebase = rollups._rebase_days
+
+        async def rebase_after_concurrent_insert(*args):
+            await insert(rollups, event(utc(2026, 3, 2, 8), kind="view"))
+            return await rebase(*args)
+
+        rollups._rebase_days = rebase_after_concurrent_insert
+
+        async def scenario():
+            await self.seed(rollups)
+            await rollups.rebuild("events")
+            return await day_buckets(rollups)
+
+        assert asyncio.run(scenario()) == {"2026-03-02": (5, {"score": 5}, {"click": 3, "view": 2})}
+        print("✓ Increment between snapshot and write survives")
+
+    def test_record_between_read_and_write_is_retried(self, rollups):
+        read = rollups._bucket_versions
+        raced = []
+
+        async def read_then_race(bucket_ids):
+            current = await read(bucket_ids)
+            if not raced:
+                raced.append(1)
+                await insert(rollups, event(utc(2026, 3, 2, 9), kind="view"))
+            return current
+
+        rollups._bucket_versions = read_then_race
+
+        async def scenario():
+            await self.seed(rollups)
+            result = await rollups.rebuild("events")
+            return result, await day_buckets(rollups)
+
+        result, buckets = asyncio.run(scenario())
+        assert raced == [1]
+        assert result["unsettled_buckets"] == 0
+        assert buckets == {"2026-03-02": (5, {"score": 5}, {"click": 3, "view": 2})}
+        print("✓ Version conflict re-read instead of overwritten")
+
+    def test_forget_after_rebuild_stays_consistent(self, rollups):
+        async def scenario():
+            await self.seed(rollups)
+            await rollups.rebuild("events")
+            docs = await rollups.db.events.find({}).to_list(None)
+            await rollups.db.events.delete_many({})
+            await rollups.forget("events", docs)
+            after_forget = await day_buckets(rollups)
+            await rollups.rebuild("events")
+            return after_forget, await day_buckets(rollups)
+
+        after_forget, rebuilt = asyncio.run(scenario())
+        assert after_forget == {} and rebuilt == {}
+
+    def test_failed_rebuild_keeps_serving_previous_buckets(self, rollups):
+        async def fail_rebase(*args):
+            raise RuntimeError("rebase failed")
+
+        async def scenario():
+            await self.seed(rollups)
+            await rollups.rebuild("events")
+            await rollups.compact()
+            weekly_before = await rollups.db.ts_rollups.count_documents({"series": "events", "granularity": "week"})
+            rollups._rebase_days = fail_rebase
+            with pytest.raises(RuntimeError):
+                await rollups.rebuild("events")
+            state = await rollups.db.ts_rollup_state.find_one({"_id": "events"})
+            weekly_after = await rollups.db.ts_rollups.count_documents({"series": "events", "granularity": "week"})
+            query = await rollups.query("events", granularity="day")
+            return weekly_before, weekly_after, state, query
+
+        weekly_before, weekly_after, state, query = asyncio.run(scenario())
+        assert state["rebuilding"] is False
+        assert weekly_after == weekly_before > 0
+        assert query is not None
+        print("✓ Failed rebuild clears rebuilding and keeps coarse buckets")
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.queued = []
+
+    async def run_now(self, name):
+        self.queued.append(name)
+        return {"success": True, "queued": True, "job_name": name, "run_id": "JOB-1"}
+
+
+class TestSeed:
+    """Unbuilt series are seeded through the scheduler job, not per worker"""
+
+    def test_initialize_queues_seed_job_once_needed(self, rollups):
+        from time_series_rollups import ROLLUP_SEED_JOB
+
+        async def scenario():
+            scheduler = FakeScheduler()
+            await rollups.initialize(rollups.db, scheduler)
+            queued_unbuilt = list(scheduler.queued)
+            result = await rollups.seed()
+            await rollups.initialize(rollups.db, scheduler)
+            return queued_unbuilt, result, scheduler.queued
+
+        queued_unbuilt, result, queued = asyncio.run(scenario())
+        assert queued_unbuilt == [ROLLUP_SEED_JOB]
+        assert [r["series"] for r in result["series"]] == ["events"]
+        assert queued == [ROLLUP_SEED_JOB]
+        print("✓ Seed queued on the scheduler only while a series is unbuilt")
@@ -0,0 +1,158 @@
+"""
+Test Module: WebSocket Outbound Channels
+ConnectionChannel queueing, slow-consumer policies, send timeouts and the
+ConnectionManager slow-consumer disconnect.
+Unit tests with an in-memory stand-in for the WebSocket.
+"""
+
+import asyncio
+
+import websocket_service
+from websocket_service import ConnectionChannel, ConnectionManager, NotificationType, SlowConsumerPolicy
+
+
+class FakeWebSocket:
+    """Records sent text; optionally blocks sends until released"""
+
+    def __init__(self, block: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.release = asyncio.Event()
+        if not block:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def settle():
+    """Let the writer and close tasks run"""
+    await asyncio.sleep(0.01)
+
+
+class TestOfferPolicies:
+    """offer() never blocks; a full queue is resolved by the policy"""
+
+    def test_drop_oldest_keeps_newest(self):
+        async def scenario():
+            channel = ConnectionChannel(FakeWebSocket(), max_queue=2)
+            for text in ["a", "b", "c"]:
+                assert channel.offer(text, SlowConsumerPolicy.DROP_OLDEST)
+            return [text for _, text in channel.queue._queue], channel.dropped
+
+        queued, dropped = asyncio.run(scenario())
+        assert queued == ["b", "c"]
+        assert dropped == 1
+        print("✓ DROP_OLDEST")
+
+    def test_drop_newest_keeps_queue(self):
+        async def scenario():
+            channel = ConnectionChannel(FakeWebSocket(), max_queue=2)
+            for text in ["a", "b", "c"]:
+                assert channel.offer(text, SlowConsumerPolicy.DROP_NEWEST)
+            return [text for _, text in channel.queue._queue], channel.dropped
+
+        queued, dropped = asyncio.run(scenario())
+        assert queued == ["a", "b"]
+        assert dropped == 1
+        print("✓ DROP_NEWEST")
+
+    def test_disconnect_reports_full(self):
+        async def scenario():
+            channel = ConnectionChannel(FakeWebSocket(), max_queue=1)
+            return [channel.offer(text, SlowConsumerPolicy.DISCONNECT) for text in ["a", "b"]]
+
+        assert asyncio.run(scenario()) == [True, False]
+        print("✓ DISCONNECT")
+
+
+class TestWriter:
+    """The writer drains in order, tracks lag and reports failed sends"""
+
+    def test_drains_in_order(self):
+        async def scenario():
+            ws = FakeWebSocket()
+            channel = ConnectionChannel(ws)
+
+            async def on_failure(websocket, reason):
+                raise AssertionError(reason)
+
+            channel.start(on_failure)
+            for text in ["a", "b", "c"]:
+                channel.offer(text, SlowConsumerPolicy.DROP_OLDEST)
+            await settle()
+            channel.stop()
+            return ws.sent, channel.get_stats()
+
+        sent, stats = asyncio.run(scenario())
+        assert sent == ["a", "b", "c"]
+        assert stats["sent"] == 3
+        assert stats["queue_depth"] == 0
+        assert stats["lag_ms"] == 0.0
+
+    def test_lag_of_oldest_pending_message(self):
+        async def scenario():
+            channel = ConnectionChannel(FakeWebSocket(block=True))
+            channel.offer("a", SlowConsumerPolicy.DROP_OLDEST)
+            await asyncio.sleep(0.02)
+            return channel.current_lag_ms()
+
+        assert asyncio.run(scenario()) >= 15
+        print("✓ Lag of undelivered messages")
+
+    def test_send_timeout_reports_failure(self, monkeypatch):
+        monkeypatch.setattr(websocket_service, "WS_SEND_TIMEOUT_SECONDS", 0.01)
+        failures = []
+
+        async def scenario():
+            ws = FakeWebSocket(block=True)
+            channel = ConnectionChannel(ws)
+
+            async def on_failure(websocket, reason):
+                failures.append((websocket, reason))
+
+            channel.start(on_failure)
+            channel.offer("a", SlowConsumerPolicy.DROP_OLDEST)
+            await asyncio.wait_for(channel.writer, timeout=1)
+            return ws
+
+        ws = asyncio.run(scenario())
+        assert failures == [(ws, "send timed out")]
+        print("✓ Send timeout")
+
+
+class TestSlowConsumerDisconnect:
+    """A full queue under DISCONNECT closes the socket from a tracked task"""
+
+    def test_close_task_is_tracked_and_runs(self):
+        async def scenario():
+            manager = ConnectionManager(slow_consumer_policy=SlowConsumerPolicy.DISCONNECT)
+            ws = FakeWebSocket(block=True)
+            await manager.connect(ws, "creator-1", user_type="creator")
+            manager.channels[ws].queue = asyncio.Queue(maxsize=1)
+
+            delivered = manager._deliver([ws], "a") + manager._deliver([ws], "b")
+            pending = len(manager._close_tasks)
+            await settle()
+            return manager, ws, delivered, pending
+
+        manager, ws, delivered, pending = asyncio.run(scenario())
+        assert delivered == 1
+        assert pending == 1
+        assert manager._close_tasks == set()
+        assert ws.closed_with == 1013
+        assert ws not in manager.all_connections
+        assert manager.slow_consumer_disconnects == 1
+        print("✓ Slow consumer closed")
+
+    def test_encode_once_shape(self):
+        text = ConnectionManager._encode(NotificationType.SYSTEM_ALERT, {"message": "hi"})
+        assert '"type": "system_alert"' in text
+        assert '"message": "hi"' in text
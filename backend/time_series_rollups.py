@@ -0,0 +1,698 @@
+"""
+Time-Series Rollups for Creators Hive HQ
+Pre-aggregated buckets so growth charts and trends never scan raw rows
+
+This module implements:
+- RollupSeries: a declared series (source collection, timestamp field,
+  scope field, optional filter, per-bucket sums and one "by" dimension)
+- Daily buckets per creator and platform-wide in ts_rollups, updated with
+  one $inc bulk_write as source documents are inserted
+- Nightly compaction: daily buckets folded into weekly / monthly buckets,
+  daily buckets past ROLLUP_DAILY_RETENTION_DAYS dropped
+- Rebuild: recompute a series from its source collection (one $group
+  pass), used to seed new series (the ROLLUP_SEED_JOB scheduler job) and
+  weekly to correct drift. Both run on the JobScheduler, so only one
+  worker rebuilds at a time
+- query(): ordered buckets with counts, sums, dimension counts and a
+  running cumulative total, reading tens of bucket documents
+
+Writers call, right after the insert:
+    await time_series_rollups.record("proposals", doc)
+and, after deleting documents they have read:
+    await time_series_rollups.forget("arris_memories", docs)
+Both are no-ops until initialize() has run. query() returns None while a
+series has never been built (or is rebuilding) so callers can fall back
+to the raw aggregation.
+
+Rebuilds never lose concurrent increments: daily buckets also keep the
+increments per insert day of the source document (from its ObjectId) in
+"gens". A rebuild aggregates only documents inserted before today, adds
+the gens from today on, and writes each bucket conditionally on its
+"version" so an increment landing mid-rebuild forces a re-read instead of
+being overwritten.
+"""
+
+import os
+import time
+import uuid
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import UpdateOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from bson_dates import DATE_KEY_FORMATS, date_key, parse_datetime, utc_now, iso
+from index_registry import index_registry
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_DAILY_RETENTION_DAYS = max(62, int(os.environ.get("ROLLUP_DAILY_RETENTION_DAYS", "400")))
+ROLLUP_STATE_REFRESH_SECONDS = 300
+ROLLUP_WRITE_BATCH = 1000
+ROLLUP_REBASE_RETRIES = 5
+ROLLUP_SEED_JOB = "ts_rollup_seed"
+
+PLATFORM_SCOPE = "platform"
+GRANULARITIES = ("day", "week", "month")
+
+index_registry.register(
+    "ts_rollups", [("series", 1), ("scope", 1), ("granularity", 1), ("start", 1)], owner="time_series_rollups"
+)
+index_registry.register_query(
+    "ts_rollups", {"series": "memories", "scope": "CR-1", "granularity": "day", "start": {"$gte": datetime(2026, 1, 1)}},
+    sort=[("start", 1)], owner="time_series_rollups"
+)
+
+
+# ============== BUCKETS ==============
+
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    """Start of the UTC day / ISO week (Monday) / month containing at"""
+    day = parse_datetime(at).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_key(at: datetime, granularity: str) -> str:
+    """Bucket label, same format as bson_dates.date_key()"""
+    return parse_datetime(at).strftime(DATE_KEY_FORMATS[granularity])
+
+
+def _bucket_id(series: str, scope: str, granularity: str, key: str) -> str:
+    return f"{series}|{scope}|{granularity}|{key}"
+
+
+def _insert_day(doc: Dict[str, Any]) -> Optional[str]:
+    """Day key of the source document's insert, read from its ObjectId"""
+    doc_id = doc.get("_id")
+    if isinstance(doc_id, ObjectId):
+        return bucket_key(doc_id.generation_time, "day")
+    return None
+
+
+def _get_path(doc: Dict[str, Any], path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _number(value) -> float:
+    if value is True:
+        return 1
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _dimension_key(value) -> Optional[str]:
+    """Dimension values become field names: no dots, no leading $"""
+    if value is None or value == "":
+        return None
+    return str(value).replace(".", "_").lstrip("$") or None
+
+
+def _numeric_expr(field: str) -> Dict[str, Any]:
+    """Aggregation twin of _number(): numbers as-is, true as 1, anything else 0"""
+    return {"$cond": [
+        {"$isNumber": f"${field}"}, f"${field}",
+        {"$cond": [{"$eq": [f"${field}", True]}, 1, 0]}
+    ]}
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {"count": 0, "sums": {}, "by": {}}
+
+
+def _fold(bucket: Dict[str, Any], count: float, sums: Dict[str, float], by: Dict[str, float]):
+    bucket["count"] += count
+    for name, value in sums.items():
+        bucket["sums"][name] = bucket["sums"].get(name, 0) + value
+    for name, value in by.items():
+        bucket["by"][name] = bucket["by"].get(name, 0) + value
+
+
+# ============== SERIES ==============
+
+class RollupSeries:
+    """A rolled-up series over one source collection"""
+
+    def __init__(
+        self,
+        name: str,
+        collection: str,
+        time_field: str,
+        scope_field: str,
+        match: Optional[Dict[str, Any]] = None,
+        by: Optional[str] = None,
+        sums: Optional[Dict[str, str]] = None,
+        month_field: bool = False
+    ):
+        self.name = name
+        self.collection = collection
+        self.time_field = time_field
+        self.scope_field = scope_field
+        self.match = match or {}
+        self.by = by
+        self.sums = sums or {}
+        # time_field holds "YYYY-MM" (calculator.month_year): bucket on the 1st
+        self.month_field = month_field
+
+    def matches(self, doc: Dict[str, Any]) -> bool:
+        """Equality-only match, mirroring self.match"""
+        return all(_get_path(doc, field) == value for field, value in self.match.items())
+
+    def timestamp(self, doc: Dict[str, Any]) -> Optional[datetime]:
+        value = _get_path(doc, self.time_field)
+        if self.month_field and isinstance(value, str) and len(value) == 7:
+            value = f"{value}-01"
+        return parse_datetime(value)
+
+    def day_expr(self) -> Dict[str, Any]:
+        """Aggregation expression for the document's day bucket label"""
+        if self.month_field:
+            return {"$concat": [f"${self.time_field}", "-01"]}
+        return date_key(self.time_field, "day")
+
+
+ROLLUP_SERIES: Dict[str, RollupSeries] = {}
+
+
+def register_series(name: str, collection: str, time_field: str, scope_field: str, **options) -> RollupSeries:
+    series = RollupSeries(name, collection, time_field, scope_field, **options)
+    ROLLUP_SERIES[name] = series
+    return series
+
+
+register_series("memories", "arris_memories", "created_at", "creator_id", by="memory_type")
+register_series(
+    "patterns", "arris_memories", "created_at", "creator_id",
+    match={"memory_type": "pattern"}, by="content.category"
+)
+register_series(
+    "outcomes", "arris_memories", "created_at", "creator_id",
+    match={"memory_type": "outcome"}, sums={"accurate": "content.prediction_accurate"}
+)
+register_series("proposals", "proposals", "created_at", "user_id")
+register_series("arris_usage", "arris_usage_log", "timestamp", "user_id", sums={"time_taken_s": "time_taken_s"})
+register_series(
+    "revenue", "calculator", "month_year", "user_id",
+    match={"category": "Income"}, sums={"revenue": "revenue"}, month_field=True
+)
+
+
+# ============== ROLLUPS ==============
+
+class TimeSeriesRollups:
+    """
+    Maintains ts_rollups buckets; ts_rollup_state holds per-series
+    rebuilt_at / rebuilding / compacted_through.
+
+    Weekly and monthly buckets cover days before compacted_through; query()
+    adds the daily buckets since then, so they are always current.
+    """
+
+    def __init__(self, db=None, series: Optional[Dict[str, RollupSeries]] = None):
+        self.db = db
+        self.series = series if series is not None else ROLLUP_SERIES
+        self.retention_days = ROLLUP_DAILY_RETENTION_DAYS
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._state_loaded = 0.0
+
+    async def initialize(self, db, job_scheduler=None):
+        """
+        Bind the database. Series never built are seeded by ROLLUP_SEED_JOB,
+        queued right away when a scheduler is given; its lease keeps workers
+        booting together from rebuilding the same series concurrently.
+        """
+        self.db = db
+        await self._load_state()
+        missing = self._unbuilt()
+        if missing and job_scheduler is not None:
+            await job_scheduler.run_now(ROLLUP_SEED_JOB)
+        logger.info(f"Time-series rollups initialized ({len(self.series)} series, {len(missing)} to seed)")
+
+    def _unbuilt(self) -> List[str]:
+        return [name for name in self.series if not self._state.get(name, {}).get("rebuilt_at")]
+
+    async def seed(self) -> Dict[str, Any]:
+        """Scheduler entry point: build every series that has never been built"""
+        await self._load_state()
+        seeded, failed = [], []
+        for name in self._unbuilt():
+            try:
+                seeded.append(await self.rebuild(name))
+            except Exception as e:
+                logger.error(f"Rollup seed failed for {name}: {e}")
+                failed.append(name)
+        if failed:
+            raise RuntimeError(f"Rollup seed failed for {', '.join(failed)}")
+        return {"series": seeded}
+
+    async def _load_state(self):
+        self._state = {s["_id"]: s async for s in self.db.ts_rollup_state.find({})}
+        self._state_loaded = time.monotonic()
+
+    def _compacted_through(self, name: str) -> Optional[datetime]:
+        return parse_datetime(self._state.get(name, {}).get("compacted_through"))
+
+    # ============== INCREMENTAL UPDATES ==============
+
+    async def record(self, collection: str, doc: Dict[str, Any]):
+        """Fold a newly inserted source document into every matching series"""
+        await self._apply(collection, [doc], 1)
+
+    async def forget(self, collection: str, docs: List[Dict[str, Any]]):
+        """Take deleted source documents (as read before the delete) out of every matching series"""
+        await self._apply(collection, docs, -1)
+
+    def projection(self, collection: str) -> Dict[str, int]:
+        """Fields forget() needs from a collection's documents"""
+        fields = {"_id": 1}
+        for series in self.series.values():
+            if series.collection != collection:
+                continue
+            for path in [series.time_field, series.scope_field, series.by, *series.match, *series.sums.values()]:
+                if path:
+                    fields[path] = 1
+        return fields
+
+    async def _apply(self, collection: str, docs: List[Dict[str, Any]], sign: int):
+        if self.db is None or not docs:
+            return
+        try:
+            if time.monotonic() - self._state_loaded > ROLLUP_STATE_REFRESH_SECONDS:
+                await self._load_state()
+            changes = self._changes(collection, docs, sign)
+            # Removals never create buckets (an expired day stays gone)
+            operations = [self._increment(bucket_id, change, upsert=sign > 0) for bucket_id, change in changes.items()]
+            for start in range(0, len(operations), ROLLUP_WRITE_BATCH):
+                await self.db.ts_rollups.bulk_write(operations[start:start + ROLLUP_WRITE_BATCH], ordered=False)
+        except Exception as e:
+            # The weekly rebuild corrects a missed increment
+            logger.warning(f"Rollup update failed for {collection}: {e}")
+
+    def _changes(self, collection: str, docs: List[Dict[str, Any]], sign: int) -> Dict[str, Dict[str, Any]]:
+        """Per bucket id: bucket fields and the combined $inc for the documents"""
+        changes: Dict[str, Dict[str, Any]] = {}
+        for doc in docs:
+            gen = _insert_day(doc)
+            for series in self.series.values():
+                if series.collection != collection or not series.matches(doc):
+                    continue
+                at = series.timestamp(doc)
+                if at is None:
+                    continue
+                inc: Dict[str, float] = {"count": sign}
+                for name, field in series.sums.items():
+                    value = _number(_get_path(doc, field))
+                    if value:
+                        inc[f"sums.{name}"] = sign * value
+                dimension = _dimension_key(_get_path(doc, series.by)) if series.by else None
+                if dimension:
+                    inc[f"by.{dimension}"] = sign
+
+                # Back-dated documents also land in already-compacted buckets
+                through = self._compacted_through(series.name)
+                granularities = GRANULARITIES if through and at < through else ("day",)
+                scopes = [PLATFORM_SCOPE]
+                if doc.get(series.scope_field):
+                    scopes.append(doc[series.scope_field])
+                for scope in scopes:
+                    for granularity in granularities:
+                        key = bucket_key(at, granularity)
+                        change = changes.setdefault(_bucket_id(series.name, scope, granularity, key), {
+                            "series": series.name,
+                            "scope": scope,
+                            "granularity": granularity,
+                            "bucket": key,
+                            "start": bucket_start(at, granularity),
+                            "inc": {},
+                        })
+                        fields = dict(inc)
+                        if granularity == "day" and gen:
+                            fields.update({f"gens.{gen}.{field}": value for field, value in inc.items()})
+                        for field, value in fields.items():
+                            change["inc"][field] = change["inc"].get(field, 0) + value
+        return changes
+
+    @staticmethod
+    def _increment(bucket_id: str, change: Dict[str, Any], upsert: bool = True) -> UpdateOne:
+        return UpdateOne(
+            {"_id": bucket_id},
+            {
+                "$inc": {**change["inc"], "version": 1},
+                "$set": {"updated_at": utc_now()},
+                "$setOnInsert": {
+                    "series": change["series"],
+                    "scope": change["scope"],
+                    "granularity": change["granularity"],
+                    "bucket": change["bucket"],
+                    "start": change["start"],
+                },
+            },
+            upsert=upsert
+        )
+
+    async def _write_buckets(self, name: str, granularity: str, buckets: Dict[Tuple[str, str], Dict[str, Any]]):
+        now = utc_now()
+        operations = []
+        for (scope, key), bucket in buckets.items():
+            bucket_id = _bucket_id(name, scope, granularity, key)
+            operations.append(ReplaceOne({"_id": bucket_id}, {
+                "_id": bucket_id,
+                "series": name,
+                "scope": scope,
+                "granularity": granularity,
+                "bucket": key,
+                "start": bucket["start"],
+                "count": bucket["count"],
+                "sums": bucket["sums"],
+                "by": bucket["by"],
+                "updated_at": now,
+            }, upsert=True))
+            if len(operations) >= ROLLUP_WRITE_BATCH:
+                await self.db.ts_rollups.bulk_write(operations, ordered=False)
+                operations = []
+        if operations:
+            await self.db.ts_rollups.bulk_write(operations, ordered=False)
+
+    # ============== REBUILD / COMPACTION ==============
+
+    async def rebuild(self, name: str) -> Dict[str, Any]:
+        """
+        Recompute a series' daily buckets from its source collection, then
+        compact. Weekly / monthly buckets are only replaced once the daily
+        buckets are rebased, and a failure clears the rebuilding flag, so a
+        failed rebuild leaves the series serving its previous buckets.
+        """
+        series = self.series[name]
+        start = time.monotonic()
+        await self.db.ts_rollup_state.update_one(
+            {"_id": name}, {"$set": {"rebuilding": True}}, upsert=True
+        )
+        finished = False
+        try:
+            result = await self._rebuild_series(name, series)
+            finished = True
+        finally:
+            if not finished:
+                await self.db.ts_rollup_state.update_one({"_id": name}, {"$set": {"rebuilding": False}})
+                await self._load_state()
+
+        result["duration_seconds"] = round(time.monotonic() - start, 3)
+        logger.info(f"Rebuilt rollup series {name}: {result}")
+        return result
+
+    async def _rebuild_series(self, name: str, series: RollupSeries) -> Dict[str, Any]:
+        group_id: Dict[str, Any] = {"scope": f"${series.scope_field}", "day": series.day_expr()}
+        if series.by:
+            group_id["by"] = f"${series.by}"
+        group: Dict[str, Any] = {"_id": group_id, "count": {"$sum": 1}}
+        for sum_name, field in series.sums.items():
+            group[f"sum_{sum_name}"] = {"$sum": _numeric_expr(field)}
+
+        # Documents inserted from today on are carried by the buckets' gens,
+        # so the snapshot stops at the start of today
+        cutoff = bucket_start(utc_now(), "day")
+        inserted_before = {"$or": [
+            {"_id": {"$lt": ObjectId.from_datetime(cutoff)}},
+            {"_id": {"$not": {"$type": "objectId"}}},
+        ]}
+
+        buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        rows = 0
+        async for row in self.db[series.collection].aggregate(
+            [{"$match": {"$and": [series.match, inserted_before]}}, {"$group": group}], allowDiskUse=True
+        ):
+            at = parse_datetime(row["_id"].get("day"))
+            if at is None:
+                continue
+            rows += 1
+            key = bucket_key(at, "day")
+            sums = {sum_name: row[f"sum_{sum_name}"] for sum_name in series.sums if row.get(f"sum_{sum_name}")}
+            dimension = _dimension_key(row["_id"].get("by"))
+            by = {dimension: row["count"]} if dimension else {}
+            scopes = [PLATFORM_SCOPE] + ([row["_id"]["scope"]] if row["_id"].get("scope") else [])
+            for scope in scopes:
+                bucket = buckets.setdefault((scope, key), {**_empty_bucket(), "start": bucket_start(at, "day")})
+                _fold(bucket, row["count"], sums, by)
+
+        unsettled = await self._rebase_days(name, buckets, bucket_key(cutoff, "day"))
+        # Weekly / monthly buckets are recomputed from the days by compaction
+        await self.db.ts_rollups.delete_many({"series": name, "granularity": {"$ne": "day"}})
+        await self.db.ts_rollup_state.update_one({"_id": name}, {"$set": {"compacted_through": None}})
+        compaction = await self.compact_series(name)
+        await self.db.ts_rollup_state.update_one(
+            {"_id": name}, {"$set": {"rebuilt_at": utc_now(), "rebuilding": False}}
+        )
+        await self._load_state()
+
+        return {
+            "series": name,
+            "source_groups": rows,
+            "daily_buckets": len(buckets),
+            "unsettled_buckets": unsettled,
+            "compaction": compaction,
+        }
+
+
+    async def _rebase_days(self, name: str, buckets: Dict[Tuple[str, str], Dict[str, Any]], cutoff_gen: str) -> int:
+        """
+        Set every daily bucket of the series to its rebuilt base plus its
+        gens from cutoff_gen on (buckets missing from the snapshot drop to
+        their gens alone). Returns the buckets still unsettled after
+        ROLLUP_REBASE_RETRIES rounds of version conflicts.
+        """
+        rebuild_id = uuid.uuid4().hex
+        pending = dict(buckets)
+        async for doc in self.db.ts_rollups.find(
+            {"series": name, "granularity": "day"}, {"_id": 0, "scope": 1, "bucket": 1, "start": 1}
+        ):
+            pending.setdefault((doc["scope"], doc["bucket"]), {**_empty_bucket(), "start": doc["start"]})
+
+        keys = list(pending)
+        for _ in range(ROLLUP_REBASE_RETRIES):
+            if not keys:
+                break
+            missed = []
+            for start in range(0, len(keys), ROLLUP_WRITE_BATCH):
+                ids = {_bucket_id(name, scope, "day", key): (scope, key) for scope, key in keys[start:start + ROLLUP_WRITE_BATCH]}
+                current = await self._bucket_versions(list(ids))
+                operations = [
+                    self._rebase(bucket_id, name, *ids[bucket_id], pending[ids[bucket_id]], current.get(bucket_id), cutoff_gen, rebuild_id)
+                    for bucket_id in ids
+                ]
+                try:
+                    await self.db.ts_rollups.bulk_write(operations, ordered=False)
+                except BulkWriteError as e:
+                    # A bucket created by record() since the read: retried below
+                    if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                        raise
+                written = {
+                    doc["_id"] async for doc in self.db.ts_rollups.find(
+                        {"_id": {"$in": list(ids)}, "rebuild_id": rebuild_id}, {"_id": 1}
+                    )
+                }
+                missed.extend(ids[bucket_id] for bucket_id in ids if bucket_id not in written)
+            keys = missed
+        if keys:
+            logger.warning(f"Rollup rebuild of {name} left {len(keys)} buckets unsettled after repeated conflicts")
+        return len(keys)
+
+    async def _bucket_versions(self, bucket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {
+            doc["_id"]: doc async for doc in self.db.ts_rollups.find(
+                {"_id": {"$in": bucket_ids}}, {"version": 1, "gens": 1}
+            )
+        }
+
+    @staticmethod
+    def _rebase(
+        bucket_id: str,
+        name: str,
+        scope: str,
+        key: str,
+        base: Dict[str, Any],
+        current: Optional[Dict[str, Any]],
+        cutoff_gen: str,
+        rebuild_id: str
+    ) -> UpdateOne:
+        """Write for one daily bucket, applied only if no increment landed since it was read"""
+        gens = {gen: delta for gen, delta in ((current or {}).get("gens") or {}).items() if gen >= cutoff_gen}
+        total = _empty_bucket()
+        _fold(total, base["count"], base["sums"], base["by"])
+        for delta in gens.values():
+            _fold(total, delta.get("count", 0), delta.get("sums") or {}, delta.get("by") or {})
+
+        version = (current or {}).get("version")
+        return UpdateOne(
+            {"_id": bucket_id, "version": version if version is not None else {"$exists": False}},
+            {
+                "$set": {
+                    "series": name,
+                    "scope": scope,
+                    "granularity": "day",
+                    "bucket": key,
+                    "start": base["start"],
+                    **total,
+                    "gens": gens,
+                    "rebuild_id": rebuild_id,
+                    "updated_at": utc_now(),
+                },
+                "$inc": {"version": 1},
+            },
+            upsert=current is None
+        )
+
+    async def rebuild_all(self) -> Dict[str, Any]:
+        """Scheduler entry point: rebuild every series from source"""
+        return {"series": [await self.rebuild(name) for name in self.series]}
+
+    async def compact_series(self, name: str) -> Dict[str, Any]:
+        """
+        Recompute the weekly / monthly buckets touched since the last
+        compaction from daily buckets before today, then drop expired days.
+        """
+        state = await self.db.ts_rollup_state.find_one({"_id": name}) or {}
+        through = parse_datetime(state.get("compacted_through"))
+        today = bucket_start(utc_now(), "day")
+        written = {}
+
+        for granularity in ("week", "month"):
+            day_range: Dict[str, Any] = {"$lt": today}
+            if through:
+                day_range["$gte"] = bucket_start(through, granularity)
+            buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            async for day in self.db.ts_rollups.find(
+                {"series": name, "granularity": "day", "start": day_range},
+                {"_id": 0, "scope": 1, "start": 1, "count": 1, "sums": 1, "by": 1}
+            ):
+                key = bucket_key(day["start"], granularity)
+                bucket = buckets.setdefault(
+                    (day["scope"], key), {**_empty_bucket(), "start": bucket_start(day["start"], granularity)}
+                )
+                _fold(bucket, day.get("count", 0), day.get("sums") or {}, day.get("by") or {})
+            await self._write_buckets(name, granularity, buckets)
+            written[granularity] = len(buckets)
+
+        expired = await self.db.ts_rollups.delete_many({
+            "series": name,
+            "granularity": "day",
+            "start": {"$lt": today - timedelta(days=self.retention_days)}
+        })
+        await self.db.ts_rollup_state.update_one(
+            {"_id": name},
+            {"$set": {"compacted_through": today, "compacted_at": utc_now()}},
+            upsert=True
+        )
+        return {**written, "expired_days": expired.deleted_count}
+
+    async def compact(self) -> Dict[str, Any]:
+        """Scheduler entry point: nightly compaction of every built series"""
+        await self._load_state()
+        results = {}
+        for name in self.series:
+            state = self._state.get(name, {})
+            if state.get("rebuilt_at") and not state.get("rebuilding"):
+                results[name] = await self.compact_series(name)
+        await self._load_state()
+        logger.info(f"Rollup compaction: {results}")
+        return results
+
+    # ============== QUERY ==============
+
+    async def query(
+        self,
+        name: str,
+        scope: str = PLATFORM_SCOPE,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        granularity: str = "day"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Non-empty buckets from start (rounded down to its bucket) to end,
+        oldest first: {"date", "start", "count", "cumulative", "sums", "by"}.
+        Returns None while the series is not built; callers fall back to
+        aggregating the source collection.
+        """
+        if self.db is None or name not in self.series or granularity not in GRANULARITIES:
+            return None
+        state = await self.db.ts_rollup_state.find_one({"_id": name})
+        if not state or not state.get("rebuilt_at") or state.get("rebuilding"):
+            return None
+
+        lower = bucket_start(start, granularity) if start else None
+        start_range: Dict[str, Any] = {"$lt": parse_datetime(end) or utc_now()}
+        if lower:
+            start_range["$gte"] = lower
+        projection = {"_id": 0, "start": 1, "count": 1, "sums": 1, "by": 1}
+
+        buckets: Dict[str, Dict[str, Any]] = {}
+        async for doc in self.db.ts_rollups.find(
+            {"series": name, "scope": scope, "granularity": granularity, "start": start_range}, projection
+        ):
+            buckets[bucket_key(doc["start"], granularity)] = {
+                "start": parse_datetime(doc["start"]),
+                "count": doc.get("count", 0),
+                "sums": dict(doc.get("sums") or {}),
+                "by": dict(doc.get("by") or {}),
+            }
+
+        through = parse_datetime(state.get("compacted_through"))
+        if granularity != "day" and through:
+            day_range = {**start_range, "$gte": max(through, lower) if lower else through}
+            async for day in self.db.ts_rollups.find(
+                {"series": name, "scope": scope, "granularity": "day", "start": day_range}, projection
+            ):
+                key = bucket_key(day["start"], granularity)
+                bucket = buckets.setdefault(key, {**_empty_bucket(), "start": bucket_start(day["start"], granularity)})
+                _fold(bucket, day.get("count", 0), day.get("sums") or {}, day.get("by") or {})
+
+        points = []
+        cumulative = 0
+        for key, bucket in sorted(buckets.items(), key=lambda item: item[1]["start"]):
+            if not bucket["count"]:
+                continue
+            cumulative += bucket["count"]
+            points.append({
+                "date": key,
+                "start": bucket["start"].isoformat(),
+                "count": bucket["count"],
+                "cumulative": cumulative,
+                "sums": bucket["sums"],
+                "by": bucket["by"],
+            })
+        return points
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Per series: build / compaction state and bucket counts"""
+        await self._load_state()
+        counts = {
+            (row["_id"]["series"], row["_id"]["granularity"]): row["count"]
+            async for row in self.db.ts_rollups.aggregate([
+                {"$group": {"_id": {"series": "$series", "granularity": "$granularity"}, "count": {"$sum": 1}}}
+            ])
+        }
+        return {
+            "retention_days": self.retention_days,
+            "series": [
+                {
+                    "name": name,
+                    "collection": series.collection,
+                    "ready": bool(self._state.get(name, {}).get("rebuilt_at")) and not self._state.get(name, {}).get("rebuilding"),
+                    "rebuilt_at": iso(self._state.get(name, {}).get("rebuilt_at")) or None,
+                    "compacted_through": iso(self._state.get(name, {}).get("compacted_through")) or None,
+                    "buckets": {g: counts.get((name, g), 0) for g in GRANULARITIES},
+                }
+                for name, series in self.series.items()
+            ],
+        }
+
+
+# Global rollups instance (initialized in server.py startup)
+time_series_rollups = TimeSeriesRollups()
@@ -13,15 +13,35 @@ Features:
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from enum import Enum
 import logging
 import secrets
 import hashlib
 import re
 
+from streaming_export import DocumentStream, csv_rows, ndjson_rows
+from index_registry import index_registry
+
 logger = logging.getLogger(__name__)
 
+index_registry.register("waitlist", "id", unique=True, owner="waitlist")
+index_registry.register("waitlist", "email", unique=True, owner="waitlist")
+index_registry.register("waitlist", "referral_code", owner="waitlist")
+index_registry.register("waitlist", "referred_by", owner="waitlist")
+index_registry.register("waitlist", [("status", 1), ("priority_score", -1)], owner="waitlist")
+index_registry.register_query("waitlist", {"email": "fan@example.com"}, owner="waitlist")
+index_registry.register_query("waitlist", {"referral_code": "HIVE-ABC123"}, owner="waitlist")
+index_registry.register_query(
+    "waitlist", {"status": "pending", "priority_score": {"$gt": 100}}, owner="waitlist"
+)
+
+WAITLIST_EXPORT_FIELDS = [
+    "id", "email", "name", "creator_type", "niche", "status", "position",
+    "priority_score", "referral_code", "referred_by", "referral_count",
+    "source", "created_at", "invited_at", "converted_at"
+]
+
 
 class WaitlistStatus(str, Enum):
     PENDING = "pending"
@@ -378,9 +398,14 @@ class WaitlistService:
         """Send invitations to selected users."""
         invited_count = 0
         errors = []
+        invited = []
+
+        signups = {
+            s["id"]: s async for s in self.db.waitlist.find({"id": {"$in": signup_ids}})
+        }
 
         for signup_id in signup_ids:
-            signup = await self.db.waitlist.find_one({"id": signup_id})
+            signup = signups.get(signup_id)
             if not signup:
                 errors.append(f"{signup_id}: Not found")
                 continue
@@ -405,12 +430,14 @@ class WaitlistService:
             if signup.get("referred_by"):
                 await self._award_points(signup["referred_by"], REFERRAL_POINTS["referral_invited"])
 
-            # Send invitation email
-            await self._send_invitation_email(signup["email"], signup["name"])
-
             await self._log_activity(signup_id, "invited", {})
+            signup["status"] = WaitlistStatus.INVITED.value  # Repeated ids report "Already invited"
+            invited.append(signup)
             invited_count += 1
 
+        # Queue all invitation emails in one write
+        await self._send_invitation_emails(invited)
+
         return {
             "success": True,
             "invited": invited_count,
@@ -458,6 +485,21 @@ class WaitlistService:
 
         return signups
 
+    async def stream_waitlist(
+        self,
+        status: Optional[str] = None,
+        format: str = "csv",
+        cursor: Optional[str] = None,
+        resumable: bool = False
+    ) -> AsyncIterator[str]:
+        """Stream every signup as CSV or NDJSON text, highest priority first."""
+        query = {"status": status} if status else {}
+        stream = DocumentStream(self.db.waitlist, query, "priority_score", {"_id": 0}, cursor=cursor)
+
+        if format == "csv":
+            return csv_rows(stream, WAITLIST_EXPORT_FIELDS, lambda signup: signup, resumable=resumable)
+        return ndjson_rows(stream, header={"export": "waitlist", "status": status})
+
     # ============== HELPER METHODS ==============
 
     def _validate_email(self, email: str) -> bool:
@@ -573,29 +615,31 @@ class WaitlistService:
             await self.email_service.send_email(
                 to_email=email,
                 subject=f"You're #{position} on the Creators Hive HQ Waitlist! 🎉",
-                html_content=html_content
+                html_content=html_content,
+                dedup_key=f"waitlist-confirm:{email}",
+                category="waitlist"
             )
             logger.info(f"Confirmation email sent to {email}")
         except Exception as e:
             logger.error(f"Failed to send confirmation email: {e}")
 
-    async def _send_invitation_email(self, email: str, name: str) -> None:
-        """Send invitation email when user is invited."""
-        if not self.email_service:
+    async def _send_invitation_emails(self, signups: List[Dict[str, Any]]) -> None:
+        """Queue invitation emails; one shared body personalised per recipient."""
+        if not self.email_service or not signups:
             return
 
         try:
-            html_content = f"""
+            html_content = """
             <!DOCTYPE html>
             <html>
             <head>
                 <style>
-                    body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #0f0f23; color: #fff; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 40px 20px; }}
-                    .header {{ text-align: center; margin-bottom: 30px; }}
-                    .logo {{ font-size: 28px; font-weight: bold; background: linear-gradient(135deg, #7C3AED, #A78BFA); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }}
-                    .card {{ background: linear-gradient(135deg, rgba(124, 58, 237, 0.2), rgba(167, 139, 250, 0.1)); border: 1px solid rgba(124, 58, 237, 0.3); border-radius: 16px; padding: 30px; text-align: center; }}
-                    .btn {{ display: inline-block; background: linear-gradient(135deg, #7C3AED, #A78BFA); color: white; padding: 16px 32px; border-radius: 8px; text-decoration: none; font-weight: 600; font-size: 18px; }}
+                    body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #0f0f23; color: #fff; }
+                    .container { max-width: 600px; margin: 0 auto; padding: 40px 20px; }
+                    .header { text-align: center; margin-bottom: 30px; }
+                    .logo { font-size: 28px; font-weight: bold; background: linear-gradient(135deg, #7C3AED, #A78BFA); -webkit-background-clip: text; -webkit-text-fill-color: transparent; }
+                    .card { background: linear-gradient(135deg, rgba(124, 58, 237, 0.2), rgba(167, 139, 250, 0.1)); border: 1px solid rgba(124, 58, 237, 0.3); border-radius: 16px; padding: 30px; text-align: center; }
+                    .btn { display: inline-block; background: linear-gradient(135deg, #7C3AED, #A78BFA); color: white; padding: 16px 32px; border-radius: 8px; text-decoration: none; font-weight: 600; font-size: 18px; }
                 </style>
             </head>
             <body>
@@ -605,7 +649,7 @@ class WaitlistService:
                     </div>
                     
                     <div class="card">
-                        <h1 style="margin-bottom: 20px;">🎉 You're In, {name}!</h1>
+                        <h1 style="margin-bottom: 20px;">🎉 You're In, -name-!</h1>
                         <p style="color: #ccc; font-size: 18px; margin-bottom: 30px;">
                             Your wait is over! You've been selected to join Creators Hive HQ.
                         </p>
@@ -621,14 +665,20 @@ class WaitlistService:
             </html>
             """
 
-            await self.email_service.send_email(
-                to_email=email,
-                subject="🎉 You're Invited to Creators Hive HQ!",
-                html_content=html_content
-            )
-            logger.info(f"Invitation email sent to {email}")
+            result = await self.email_service.send_bulk([
+                {
+                    "to_email": signup["email"],
+                    "subject": "🎉 You're Invited to Creators Hive HQ!",
+                    "html_content": html_content,
+                    "substitutions": {"-name-": signup["name"]},
+                    "dedup_key": f"waitlist-invite:{signup['id']}",
+                    "category": "waitlist"
+                }
+                for signup in signups
+            ])
+            logger.info(f"Invitation emails queued: {result.get('queued', 0)}")
         except Exception as e:
-            logger.error(f"Failed to send invitation email: {e}")
+            logger.error(f"Failed to queue invitation emails: {e}")
 
     async def _log_activity(
         self,
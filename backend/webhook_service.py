@@ -13,6 +13,8 @@ from models_webhook import (
     WebhookEvent, WebhookEventCreate, WebhookEventType,
     AutomationRule, DEFAULT_AUTOMATION_RULES, FOLLOW_UP_ACTIONS
 )
+from dashboard_counters import dashboard_counters
+from time_series_rollups import time_series_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -216,6 +218,8 @@ class WebhookService:
             "updated_at": datetime.now(timezone.utc).isoformat()
         }
         await self.db.arris_usage_log.insert_one(arris_log)
+        await dashboard_counters.record_arris_usage(arris_log)
+        await time_series_rollups.record("arris_usage_log", arris_log)
         
         # Update user activity log
         activity_log = {
@@ -6,6 +6,8 @@ Features:
 - Connection management for multiple clients
 - User-specific notifications
 - Broadcast to all connections
+- Encode-once fan-out through per-connection bounded queues with send timeouts
+- Optional cross-worker backplane (see notification_backplane.py)
 - Notification types: proposal updates, ARRIS insights, system alerts, elite inquiries
 """
 
@@ -13,7 +15,9 @@ from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, List, Optional, Set, Any
 from datetime import datetime, timezone
 from enum import Enum
+import os
 import json
+import time
 import logging
 import asyncio
 
@@ -35,6 +39,7 @@ class NotificationType(str, Enum):
     ARRIS_PROCESSING_STARTED = "arris_processing_started"  # New: Processing started
     ARRIS_PROCESSING_COMPLETE = "arris_processing_complete"  # New: Processing complete
     ARRIS_ACTIVITY_UPDATE = "arris_activity_update"     # New: Activity feed updates
+    ARRIS_STREAM = "arris_stream"                       # Streaming start/complete frames
     
     # Subscription notifications
     SUBSCRIPTION_CREATED = "subscription_created"
@@ -53,13 +58,132 @@ class NotificationType(str, Enum):
     REVENUE_MILESTONE = "revenue_milestone"
 
 
+# ============== OUTBOUND DELIVERY ==============
+
+# Messages buffered per connection before the slow-consumer policy applies
+WS_OUTBOUND_QUEUE_SIZE = int(os.environ.get("WS_OUTBOUND_QUEUE_SIZE", "256"))
+
+# A single send taking longer than this disconnects the client
+WS_SEND_TIMEOUT_SECONDS = float(os.environ.get("WS_SEND_TIMEOUT_SECONDS", "5"))
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's outbound queue is full"""
+    DROP_OLDEST = "drop_oldest"    # Discard the oldest queued message
+    DROP_NEWEST = "drop_newest"    # Discard the message being sent
+    DISCONNECT = "disconnect"      # Close the connection
+
+
+WS_SLOW_CONSUMER_POLICY = SlowConsumerPolicy(
+    os.environ.get("WS_SLOW_CONSUMER_POLICY", SlowConsumerPolicy.DROP_OLDEST.value)
+)
+
+
+class DeliveryScope:
+    """Which local sockets a published notification targets"""
+    USER = "user"
+    CREATOR = "creator"
+    ADMINS = "admins"
+    ALL = "all"
+
+
+class ConnectionChannel:
+    """
+    Outbound pipeline for one WebSocket.
+
+    Broadcasts enqueue pre-encoded text without awaiting the socket; a writer
+    task drains the queue with a per-send timeout and tracks lag.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int = WS_OUTBOUND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.writer: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.max_send_ms = 0.0
+
+    def start(self, on_failure):
+        self.writer = asyncio.create_task(self._write_loop(on_failure))
+
+    def offer(self, text: str, policy: SlowConsumerPolicy) -> bool:
+        """
+        Queue a message without blocking.
+
+        Returns False when the connection should be disconnected.
+        """
+        item = (time.monotonic(), text)
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if policy == SlowConsumerPolicy.DISCONNECT:
+            return False
+
+        self.dropped += 1
+        if policy == SlowConsumerPolicy.DROP_OLDEST:
+            self.queue.get_nowait()
+            self.queue.put_nowait(item)
+        return True
+
+    async def _write_loop(self, on_failure):
+        while True:
+            enqueued_at, text = await self.queue.get()
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(text), timeout=WS_SEND_TIMEOUT_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reason = "send timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                await on_failure(self.websocket, reason)
+                return
+
+            finished = time.monotonic()
+            self.sent += 1
+            self.last_lag_ms = (finished - enqueued_at) * 1000
+            self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+            self.max_send_ms = max(self.max_send_ms, (finished - started) * 1000)
+
+    def current_lag_ms(self) -> float:
+        """Age of the oldest undelivered message (0 when caught up)"""
+        if self.queue.empty():
+            return 0.0
+        enqueued_at, _ = self.queue._queue[0]
+        return (time.monotonic() - enqueued_at) * 1000
+
+    def stop(self):
+        if self.writer and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "lag_ms": round(self.current_lag_ms(), 1),
+            "last_lag_ms": round(self.last_lag_ms, 1),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "max_send_ms": round(self.max_send_ms, 1),
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for real-time notifications.
     Supports user-specific connections and broadcast messaging.
+    
+    Messages are JSON-encoded once per notification and handed to each
+    connection's bounded outbound queue, so a slow client never delays
+    delivery to the others. Full queues are handled by the slow-consumer
+    policy; sends that exceed WS_SEND_TIMEOUT_SECONDS disconnect the client.
     """
     
-    def __init__(self):
+    def __init__(self, slow_consumer_policy: SlowConsumerPolicy = WS_SLOW_CONSUMER_POLICY):
         # Active connections by user_id
         self.active_connections: Dict[str, List[WebSocket]] = {}
         # All connections (for broadcast)
@@ -70,6 +194,19 @@ class ConnectionManager:
         self.admin_connections: Set[WebSocket] = set()
         # Creator connections
         self.creator_connections: Dict[str, Set[WebSocket]] = {}
+        # Outbound pipeline per connection
+        self.channels: Dict[WebSocket, ConnectionChannel] = {}
+        self.slow_consumer_policy = slow_consumer_policy
+        self.slow_consumer_disconnects = 0
+        # Pending slow-consumer closes (held so they aren't garbage collected)
+        self._close_tasks: Set[asyncio.Task] = set()
+        # Cross-worker pub/sub (None = deliver in this process only)
+        self.backplane = None
+    
+    async def set_backplane(self, backplane):
+        """Route user/admin/broadcast notifications through a backplane"""
+        self.backplane = backplane
+        await backplane.start(self.deliver_local)
     
     async def connect(
         self,
@@ -103,6 +240,11 @@ class ConnectionManager:
                 self.creator_connections[user_id] = set()
             self.creator_connections[user_id].add(websocket)
         
+        # Start outbound writer
+        channel = ConnectionChannel(websocket)
+        self.channels[websocket] = channel
+        channel.start(self._on_send_failure)
+        
         logger.info(f"WebSocket connected: {user_type} {user_id} ({user_name})")
         
         # Send welcome notification
@@ -122,6 +264,11 @@ class ConnectionManager:
         user_id = metadata.get("user_id")
         user_type = metadata.get("user_type")
         
+        # Stop outbound writer
+        channel = self.channels.pop(websocket, None)
+        if channel:
+            channel.stop()
+        
         # Remove from active connections
         if user_id and user_id in self.active_connections:
             if websocket in self.active_connections[user_id]:
@@ -146,6 +293,53 @@ class ConnectionManager:
         
         logger.info(f"WebSocket disconnected: {user_type} {user_id}")
     
+    async def _on_send_failure(self, websocket: WebSocket, reason: str):
+        """Writer callback: a send failed or timed out"""
+        metadata = self.connection_metadata.get(websocket, {})
+        logger.warning(f"Dropping WebSocket {metadata.get('user_type')} {metadata.get('user_id')}: {reason}")
+        await self._close(websocket, code=1011)
+    
+    async def _close(self, websocket: WebSocket, code: int):
+        self.disconnect(websocket)
+        try:
+            await asyncio.wait_for(websocket.close(code=code), timeout=WS_SEND_TIMEOUT_SECONDS)
+        except Exception:
+            pass
+    
+    # ============== DELIVERY ==============
+    
+    @staticmethod
+    def _encode(notification_type: NotificationType, data: Dict[str, Any]) -> str:
+        """Encode a notification once for every recipient"""
+        return json.dumps({
+            "type": notification_type.value,
+            "data": data,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }, default=str)
+    
+    def _deliver(self, connections, text: str) -> int:
+        """Queue pre-encoded text on each connection; returns the number queued"""
+        delivered = 0
+        slow = []
+        for connection in list(connections):
+            channel = self.channels.get(connection)
+            if channel is None:
+                continue
+            if channel.offer(text, self.slow_consumer_policy):
+                delivered += 1
+            else:
+                slow.append(connection)
+        
+        for connection in slow:
+            self.slow_consumer_disconnects += 1
+            metadata = self.connection_metadata.get(connection, {})
+            logger.warning(f"Disconnecting slow WebSocket consumer {metadata.get('user_type')} {metadata.get('user_id')}")
+            task = asyncio.create_task(self._close(connection, code=1013))
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+        
+        return delivered
+    
     async def send_personal_notification(
         self,
         websocket: WebSocket,
@@ -153,15 +347,7 @@ class ConnectionManager:
         data: Dict[str, Any]
     ):
         """Send notification to a specific WebSocket connection"""
-        message = {
-            "type": notification_type.value,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"Failed to send notification: {e}")
+        self._deliver([websocket], self._encode(notification_type, data))
     
     async def send_to_user(
         self,
@@ -170,26 +356,7 @@ class ConnectionManager:
         data: Dict[str, Any]
     ):
         """Send notification to all connections of a specific user"""
-        if user_id not in self.active_connections:
-            return
-        
-        message = {
-            "type": notification_type.value,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
-        disconnected = []
-        for connection in self.active_connections[user_id]:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to send to user {user_id}: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected
-        for conn in disconnected:
-            self.disconnect(conn)
+        await self._publish(DeliveryScope.USER, user_id, notification_type, data)
     
     async def broadcast_to_admins(
         self,
@@ -197,22 +364,7 @@ class ConnectionManager:
         data: Dict[str, Any]
     ):
         """Broadcast notification to all admin connections"""
-        message = {
-            "type": notification_type.value,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
-        disconnected = []
-        for connection in self.admin_connections.copy():
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to broadcast to admin: {e}")
-                disconnected.append(connection)
-        
-        for conn in disconnected:
-            self.disconnect(conn)
+        await self._publish(DeliveryScope.ADMINS, None, notification_type, data)
     
     async def broadcast_to_creator(
         self,
@@ -221,25 +373,7 @@ class ConnectionManager:
         data: Dict[str, Any]
     ):
         """Broadcast notification to a specific creator's connections"""
-        if creator_id not in self.creator_connections:
-            return
-        
-        message = {
-            "type": notification_type.value,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        
-        disconnected = []
-        for connection in self.creator_connections[creator_id].copy():
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to send to creator {creator_id}: {e}")
-                disconnected.append(connection)
-        
-        for conn in disconnected:
-            self.disconnect(conn)
+        await self._publish(DeliveryScope.CREATOR, creator_id, notification_type, data)
     
     async def broadcast_all(
         self,
@@ -247,31 +381,69 @@ class ConnectionManager:
         data: Dict[str, Any]
     ):
         """Broadcast notification to all connections"""
-        message = {
-            "type": notification_type.value,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        await self._publish(DeliveryScope.ALL, None, notification_type, data)
+    
+    async def _publish(
+        self,
+        scope: str,
+        target: Optional[str],
+        notification_type: NotificationType,
+        data: Dict[str, Any]
+    ):
+        text = self._encode(notification_type, data)
+        if self.backplane is not None:
+            await self.backplane.publish(scope, target, text)
+        else:
+            self.deliver_local(scope, target, text)
+    
+    def deliver_local(self, scope: str, target: Optional[str], text: str) -> int:
+        """Deliver encoded text to the matching sockets held by this worker"""
+        if scope == DeliveryScope.USER:
+            connections = self.active_connections.get(target, [])
+        elif scope == DeliveryScope.CREATOR:
+            connections = self.creator_connections.get(target, set())
+        elif scope == DeliveryScope.ADMINS:
+            connections = self.admin_connections
+        else:
+            connections = self.all_connections
+        if not connections:
+            return 0
+        return self._deliver(connections, text)
+    
+    def get_connection_stats(self, lag_detail_limit: int = 50) -> Dict[str, Any]:
+        """
+        Get statistics about current connections.
         
-        disconnected = []
-        for connection in self.all_connections.copy():
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to broadcast: {e}")
-                disconnected.append(connection)
+        `connections` lists the `lag_detail_limit` most lagged connections.
+        """
+        per_connection = []
+        for websocket, channel in self.channels.items():
+            metadata = self.connection_metadata.get(websocket, {})
+            per_connection.append({
+                "user_id": metadata.get("user_id"),
+                "user_type": metadata.get("user_type"),
+                "connected_at": metadata.get("connected_at"),
+                **channel.get_stats()
+            })
+        per_connection.sort(key=lambda c: (c["lag_ms"], c["queue_depth"]), reverse=True)
         
-        for conn in disconnected:
-            self.disconnect(conn)
-    
-    def get_connection_stats(self) -> Dict[str, Any]:
-        """Get statistics about current connections"""
         return {
             "total_connections": len(self.all_connections),
             "admin_connections": len(self.admin_connections),
             "creator_connections": sum(len(conns) for conns in self.creator_connections.values()),
             "unique_creators": len(self.creator_connections),
-            "unique_users": len(self.active_connections)
+            "unique_users": len(self.active_connections),
+            "delivery": {
+                "slow_consumer_policy": self.slow_consumer_policy.value,
+                "outbound_queue_size": WS_OUTBOUND_QUEUE_SIZE,
+                "send_timeout_seconds": WS_SEND_TIMEOUT_SECONDS,
+                "queued_messages": sum(c["queue_depth"] for c in per_connection),
+                "max_lag_ms": per_connection[0]["lag_ms"] if per_connection else 0.0,
+                "dropped_messages": sum(c["dropped"] for c in per_connection),
+                "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            },
+            "backplane": self.backplane.get_stats() if self.backplane is not None else {"backend": "none"},
+            "connections": per_connection[:lag_detail_limit]
         }
 
 
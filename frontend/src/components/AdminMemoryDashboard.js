@@ -142,15 +142,26 @@ export function AdminMemoryDashboard({ token }) {
             <div className="flex items-center gap-4">
               <CheckCircle className="w-8 h-8 text-green-500" />
               <div>
-                <p className="font-semibold text-green-800">Consolidation Complete</p>
-                <p className="text-sm text-green-600">
-                  Processed {consolidationResult.creators_processed} creators • 
-                  Consolidated {consolidationResult.memories_consolidated} memories • 
-                  Archived {consolidationResult.memories_archived} memories
-                </p>
-                <p className="text-xs text-green-500 mt-1">
-                  Estimated storage saved: ~{(consolidationResult.storage_saved_estimate / 1024).toFixed(1)} KB
-                </p>
+                {consolidationResult.queued ? (
+                  <>
+                    <p className="font-semibold text-green-800">Consolidation Queued</p>
+                    <p className="text-sm text-green-600">
+                      Running in the background as job run {consolidationResult.run_id}
+                    </p>
+                  </>
+                ) : (
+                  <>
+                    <p className="font-semibold text-green-800">Consolidation Complete</p>
+                    <p className="text-sm text-green-600">
+                      Processed {consolidationResult.creators_processed} creators • 
+                      Consolidated {consolidationResult.memories_consolidated} memories • 
+                      Archived {consolidationResult.memories_archived} memories
+                    </p>
+                    <p className="text-xs text-green-500 mt-1">
+                      Estimated storage saved: ~{(consolidationResult.storage_saved_estimate / 1024).toFixed(1)} KB
+                    </p>
+                  </>
+                )}
               </div>
             </div>
           </CardContent>
@@ -533,7 +533,9 @@ export const AutoEscalationDashboard = ({ token }) => {
             <div className="flex items-center justify-between">
               <div>
                 <p className="text-sm font-medium text-orange-800">
-                  Scan Complete: {scanResult.scanned} proposals scanned, {scanResult.escalated} escalated
+                  {scanResult.queued
+                    ? `Scan queued (run ${scanResult.run_id}); results appear as escalations are created`
+                    : `Scan Complete: ${scanResult.scanned} proposals scanned, ${scanResult.escalated} escalated`}
                 </p>
                 {scanResult.errors?.length > 0 && (
                   <p className="text-xs text-orange-600">{scanResult.errors.length} errors</p>
@@ -676,15 +676,16 @@ class TestAdminEndpoints:
         print("✓ Admin purge expired requires authentication")
     
     def test_admin_purge_expired_deletions(self, admin_headers):
-        """Test admin can purge expired soft-deleted memories"""
+        """Test admin can queue a purge of expired soft-deleted memories"""
         response = requests.post(f"{BASE_URL}/api/admin/memory/purge-expired", headers=admin_headers)
-        assert response.status_code == 200
-        data = response.json()
+        # 409 when a purge is already running
+        assert response.status_code in [200, 409]
         
-        assert "purged" in data
-        assert isinstance(data["purged"], int)
-        
-        print(f"✓ Admin purge expired successful - {data['purged']} purged")
+        if response.status_code == 200:
+            data = response.json()
+            assert data["queued"] is True
+            assert data["job_name"] == "purge_expired_memories"
+            print(f"✓ Admin purge expired queued - run {data['run_id']}")
 
 
 # ============== TIER RESTRICTION TESTS ==============
@@ -269,6 +269,34 @@ class TestMemorySearchEndpoint:
         # (We can't directly verify creator_id without knowing it, but the API enforces this)
         assert response.status_code == 200
 
+    def test_search_unknown_term_returns_nothing(self, pro_creator_token):
+        """Test that the inverted index only returns memories containing the query terms"""
+        headers = {"Authorization": f"Bearer {pro_creator_token}"}
+        response = requests.get(
+            f"{BASE_URL}/api/memory/search",
+            params={"q": "zqxjvnonexistentterm"},
+            headers=headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["results"] == []
+        assert data["total_found"] == 0
+
+    def test_search_relevance_scores_positive_and_sorted(self, pro_creator_token):
+        """Test that index-ranked results carry descending positive relevance scores"""
+        headers = {"Authorization": f"Bearer {pro_creator_token}"}
+        response = requests.get(
+            f"{BASE_URL}/api/memory/search",
+            params={"q": "proposal approved", "sort_by": "relevance"},
+            headers=headers
+        )
+        assert response.status_code == 200
+        scores = [r["_relevance_score"] for r in response.json()["results"]]
+
+        assert all(s > 0 for s in scores)
+        assert scores == sorted(scores, reverse=True)
+
 
 class TestSearchSuggestions:
     """Tests for GET /api/memory/search/suggestions"""